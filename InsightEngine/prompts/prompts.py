@@ -35,9 +35,9 @@ output_schema_first_search = {
         "search_query": {"type": "string"},
         "search_tool": {"type": "string"},
         "reasoning": {"type": "string"},
-        "start_date": {"type": "string", "description": "开始日期，格式YYYY-MM-DD，search_topic_by_date和search_topic_on_platform工具可能需要"},
-        "end_date": {"type": "string", "description": "结束日期，格式YYYY-MM-DD，search_topic_by_date和search_topic_on_platform工具可能需要"},
-        "platform": {"type": "string", "description": "平台名称，search_topic_on_platform工具必需，可选值：bilibili, weibo, douyin, kuaishou, xhs, zhihu, tieba"},
+        "start_date": {"type": "string", "description": "开始日期，格式YYYY-MM-DD，search_topic_by_date、search_topic_on_platform、get_sentiment_trend和search_by_crawl_keyword工具可能需要"},
+        "end_date": {"type": "string", "description": "结束日期，格式YYYY-MM-DD，search_topic_by_date、search_topic_on_platform、get_sentiment_trend和search_by_crawl_keyword工具可能需要"},
+        "platform": {"type": "string", "description": "平台名称，search_topic_on_platform工具必需，get_sentiment_trend和search_by_crawl_keyword工具可选，可选值：bilibili, weibo, douyin, kuaishou, xhs, zhihu, tieba"},
         "time_period": {"type": "string", "description": "时间周期，search_hot_content工具可选，可选值：24h, week, year"},
         "enable_sentiment": {"type": "boolean", "description": "是否启用自动情感分析，默认为true，适用于除analyze_sentiment外的所有搜索工具"},
         "texts": {"type": "array", "items": {"type": "string"}, "description": "文本列表，仅用于analyze_sentiment工具"}
@@ -84,9 +84,9 @@ output_schema_reflection = {
         "search_query": {"type": "string"},
         "search_tool": {"type": "string"},
         "reasoning": {"type": "string"},
-        "start_date": {"type": "string", "description": "开始日期，格式YYYY-MM-DD，search_topic_by_date和search_topic_on_platform工具可能需要"},
-        "end_date": {"type": "string", "description": "结束日期，格式YYYY-MM-DD，search_topic_by_date和search_topic_on_platform工具可能需要"},
-        "platform": {"type": "string", "description": "平台名称，search_topic_on_platform工具必需，可选值：bilibili, weibo, douyin, kuaishou, xhs, zhihu, tieba"},
+        "start_date": {"type": "string", "description": "开始日期，格式YYYY-MM-DD，search_topic_by_date、search_topic_on_platform、get_sentiment_trend和search_by_crawl_keyword工具可能需要"},
+        "end_date": {"type": "string", "description": "结束日期，格式YYYY-MM-DD，search_topic_by_date、search_topic_on_platform、get_sentiment_trend和search_by_crawl_keyword工具可能需要"},
+        "platform": {"type": "string", "description": "平台名称，search_topic_on_platform工具必需，get_sentiment_trend和search_by_crawl_keyword工具可选，可选值：bilibili, weibo, douyin, kuaishou, xhs, zhihu, tieba"},
         "time_period": {"type": "string", "description": "时间周期，search_hot_content工具可选，可选值：24h, week, year"},
         "enable_sentiment": {"type": "boolean", "description": "是否启用自动情感分析，默认为true，适用于除analyze_sentiment外的所有搜索工具"},
         "texts": {"type": "array", "items": {"type": "string"}, "description": "文本列表，仅用于analyze_sentiment工具"}
@@ -174,7 +174,7 @@ SYSTEM_PROMPT_FIRST_SEARCH = f"""
 {json.dumps(input_schema_first_search, indent=2, ensure_ascii=False)}
 </INPUT JSON SCHEMA>
 
-你可以使用以下6种专业的本地舆情数据库查询工具来挖掘真实的民意和公众观点：
+你可以使用以下8种专业的本地舆情数据库查询工具来挖掘真实的民意和公众观点：
 
 1. **search_hot_content** - 查找热点内容工具
    - 适用于：挖掘当前最受关注的舆情事件和话题
@@ -209,6 +209,16 @@ SYSTEM_PROMPT_FIRST_SEARCH = f"""
    - 参数：texts（文本或文本列表），query也可用作单个文本输入
    - 用途：当搜索结果的情感倾向不明确或需要专门的情感分析时使用
 
+7. **get_sentiment_trend** - 话题趋势聚合工具
+   - 适用于：回答"某段时间内某平台上关于X的内容有多少、负面占比多少、情绪如何变化"这类分布与趋势问题
+   - 特点：直接读取按关键词、平台、小时预先汇总的声量、互动量和情感分布，毫秒级返回，不包含具体评论原文
+   - 参数：start_date, end_date（可选，默认最近7天），platform（可选）
+
+8. **search_by_crawl_keyword** - 爬取关键词精确查询工具
+   - 适用于：段落主题正是系统每日爬取的某个关键词时，取回该关键词下爬到的全部内容和评论
+   - 特点：按关键词id索引直接读取，比模糊搜索快且不漏评论；search_query必须与爬取关键词完全一致，未爬取过的关键词会自动改用全局搜索
+   - 参数：start_date, end_date（可选），platform（可选）
+
 **你的核心使命：挖掘真实的民意和人情味**
 
 你的任务是：
@@ -354,7 +364,7 @@ SYSTEM_PROMPT_REFLECTION = f"""
 {json.dumps(input_schema_reflection, indent=2, ensure_ascii=False)}
 </INPUT JSON SCHEMA>
 
-你可以使用以下6种专业的本地舆情数据库查询工具来深度挖掘民意：
+你可以使用以下8种专业的本地舆情数据库查询工具来深度挖掘民意：
 
 1. **search_hot_content** - 查找热点内容工具（自动情感分析）
 2. **search_topic_globally** - 全局话题搜索工具（自动情感分析）
@@ -362,6 +372,8 @@ SYSTEM_PROMPT_REFLECTION = f"""
 4. **get_comments_for_topic** - 获取话题评论工具（自动情感分析）
 5. **search_topic_on_platform** - 平台定向搜索工具（自动情感分析）
 6. **analyze_sentiment** - 多语言情感分析工具（专门的情感分析）
+7. **get_sentiment_trend** - 话题趋势聚合工具（预聚合的声量与情感分布，可选start_date、end_date、platform）
+8. **search_by_crawl_keyword** - 爬取关键词精确查询工具（按爬取关键词精确取回内容与评论，可选start_date、end_date、platform）
 
 **反思的核心目标：让报告更有人情味和真实感**
 
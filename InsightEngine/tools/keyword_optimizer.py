@@ -3,26 +3,18 @@
 使用Qwen AI将Agent生成的搜索词优化为更适合舆情数据库查询的关键词
 """
 
-from openai import OpenAI
 import json
 import sys
 import os
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 # 添加项目根目录到Python路径以导入config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config import settings
 from loguru import logger
-
-# 添加utils目录到Python路径
-current_dir = os.path.dirname(os.path.abspath(__file__))
-root_dir = os.path.dirname(os.path.dirname(current_dir))
-utils_dir = os.path.join(root_dir, 'utils')
-if utils_dir not in sys.path:
-    sys.path.append(utils_dir)
-
-from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from utils.retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
 
 @dataclass
 class KeywordOptimizationResponse:
@@ -54,6 +46,9 @@ class KeywordOptimizer:
 
         self.base_url = base_url or settings.KEYWORD_OPTIMIZER_BASE_URL
 
+        # openai SDK导入较慢，推迟到首次创建优化器时
+        from openai import OpenAI
+
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url
@@ -293,5 +288,26 @@ class KeywordOptimizer:
         
         return keywords[:20]
 
-# 全局实例
-keyword_optimizer = KeywordOptimizer()
+_keyword_optimizer: Optional[KeywordOptimizer] = None
+_keyword_optimizer_lock = threading.Lock()
+
+
+def get_keyword_optimizer() -> KeywordOptimizer:
+    """获取全局关键词优化器（首次调用时创建，缺少API密钥时在此处抛出ValueError）"""
+    global _keyword_optimizer
+    if _keyword_optimizer is None:
+        with _keyword_optimizer_lock:
+            if _keyword_optimizer is None:
+                _keyword_optimizer = KeywordOptimizer()
+    return _keyword_optimizer
+
+
+class _LazyKeywordOptimizer:
+    """全局实例的延迟代理，属性访问时才创建真正的KeywordOptimizer"""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_keyword_optimizer(), name)
+
+
+# 全局实例（延迟创建，导入本模块不会创建OpenAI客户端）
+keyword_optimizer = _LazyKeywordOptimizer()
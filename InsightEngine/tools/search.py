@@ -21,6 +21,8 @@ V3.0 核心更新:
 - search_topic_by_date: 在指定的历史日期范围内搜索与特定话题相关的内容。
 - get_comments_for_topic: 专门提取公众对于某一特定话题的评论数据。
 - search_topic_on_platform: 在指定的单个社交媒体平台上搜索特定话题。
+- get_sentiment_trend: 从预聚合表读取话题在任意时间窗口内的声量、互动与情感分布。
+- search_by_crawl_keyword: 按爬取关键词精确读取该关键词下爬到的全部内容与评论（走keyword_id索引）。
 """
 
 import os
@@ -48,6 +50,9 @@ class QueryResult:
     source_keyword: Optional[str] = None
     hotness_score: float = 0.0
     source_table: str = ""
+    row_id: Optional[int] = None
+    sentiment_label: Optional[str] = None
+    sentiment_confidence: Optional[float] = None
 
 @dataclass
 class DBResponse:
@@ -57,6 +62,7 @@ class DBResponse:
     results: List[QueryResult] = field(default_factory=list)
     results_count: int = 0
     error_message: Optional[str] = None
+    aggregates: List[Dict[str, Any]] = field(default_factory=list)
 
 # --- 2. 核心客户端与专用工具集 ---
 
@@ -68,6 +74,25 @@ class MediaCrawlerDB:
     W_SHARE = 10.0  # 分享/转发/收藏/投币等高价值互动
     W_VIEW = 0.1
     W_DANMAKU = 0.5
+    # 离线情感打分结果表（MindSpider/DeepSentimentCrawling/sentiment_enrichment.py写入）
+    SENTIMENT_TABLE = 'content_sentiment'
+    _precomputed_sentiment_available = True
+    # 情感与互动预聚合表（MindSpider/DeepSentimentCrawling/sentiment_rollup.py维护）
+    ROLLUP_TABLE = 'sentiment_rollup_hourly'
+    ROLLUP_SENTIMENT_COLUMNS = {'very_negative': '非常负面', 'negative': '负面', 'neutral': '中性', 'positive': '正面', 'very_positive': '非常正面'}
+    ROLLUP_COUNTER_COLUMNS = ['content_count', 'comment_count', 'likes', 'comments', 'shares', 'views', 'very_negative', 'negative', 'neutral', 'positive', 'very_positive', 'unscored']
+    # 爬取关键词维度表（MediaCrawler入库时写入keyword_id，MindSpider/schema/migrate_crawl_keywords.py回填存量数据）
+    KEYWORD_TABLE = 'crawl_keyword'
+    # 表 -> (内容类型, 发布时间列, 时间格式)，查询走(keyword_id, 发布时间)复合索引
+    KEYWORD_SEARCH_TABLES = {
+        'bilibili_video': ('video', 'create_time', 'sec'), 'bilibili_video_comment': ('comment', 'create_time', 'sec'),
+        'douyin_aweme': ('video', 'create_time', 'sec'), 'douyin_aweme_comment': ('comment', 'create_time', 'sec'),
+        'kuaishou_video': ('video', 'create_time', 'ms'), 'kuaishou_video_comment': ('comment', 'create_time', 'ms'),
+        'weibo_note': ('note', 'create_time', 'sec'), 'weibo_note_comment': ('comment', 'create_time', 'sec'),
+        'xhs_note': ('note', 'time', 'ms'), 'xhs_note_comment': ('comment', 'create_time', 'ms'),
+        'zhihu_content': ('content', 'created_time', 'sec_str'), 'zhihu_comment': ('comment', 'publish_time', 'sec_str'),
+        'tieba_note': ('note', 'publish_time', 'str'), 'tieba_comment': ('comment', 'publish_time', 'str'),
+    }
 
     def __init__(self):
         """
@@ -75,7 +100,7 @@ class MediaCrawlerDB:
         """
         pass
         
-    def _execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+    def _execute_query(self, query: str, params: tuple = None, raise_errors: bool = False) -> List[Dict[str, Any]]:
         try:
             # 获取或创建event loop
             try:
@@ -91,6 +116,8 @@ class MediaCrawlerDB:
             return loop.run_until_complete(fetch_all(query, params))
         
         except Exception as e:
+            if raise_errors:
+                raise
             logger.exception(f"数据库查询时发生错误: {e}")
             return []
 
@@ -108,6 +135,14 @@ class MediaCrawlerDB:
         except (ValueError, TypeError): return None
 
     _table_columns_cache = {}
+    @staticmethod
+    def _time_bound(dt: datetime, time_type: str) -> Any:
+        """把时间转换为与发布时间列同格式的比较值，保证范围条件能直接使用索引"""
+        if time_type == 'sec': return int(dt.timestamp())
+        if time_type == 'ms': return int(dt.timestamp() * 1000)
+        if time_type == 'sec_str': return str(int(dt.timestamp()))
+        return dt.strftime('%Y-%m-%d')
+
     def _get_table_columns(self, table_name: str) -> List[str]:
         if table_name in self._table_columns_cache: return self._table_columns_cache[table_name]
         results = self._execute_query(f"SHOW COLUMNS FROM `{table_name}`")
@@ -116,17 +151,70 @@ class MediaCrawlerDB:
         return columns
 
     def _extract_engagement(self, row: Dict[str, Any]) -> Dict[str, int]:
-        """从数据行中提取并统一互动指标"""
+        """从数据行中提取并统一互动指标，优先使用入库时解析好的数值列（<列名>_num）"""
         engagement = {}
         mapping = { 'likes': ['liked_count', 'like_count', 'voteup_count', 'comment_like_count'], 'comments': ['video_comment', 'comments_count', 'comment_count', 'total_replay_num', 'sub_comment_count'], 'shares': ['video_share_count', 'shared_count', 'share_count', 'total_forwards'], 'views': ['video_play_count', 'viewd_count'], 'favorites': ['video_favorite_count', 'collected_count'], 'coins': ['video_coin_count'], 'danmaku': ['video_danmaku'], }
         for key, potential_cols in mapping.items():
             for col in potential_cols:
+                typed_col = f"{col}_num"
+                if row.get(typed_col) is not None:
+                    engagement[key] = int(row[typed_col])
+                    break
                 if col in row and row[col] is not None:
                     try: engagement[key] = int(row[col])
                     except (ValueError, TypeError): engagement[key] = 0
                     break
         return engagement
 
+    @staticmethod
+    def _is_missing_table_error(error: Exception) -> bool:
+        """是否为表不存在的错误（MySQL 1146、PostgreSQL 42P01 undefined_table、SQLite no such table）"""
+        orig = getattr(error, 'orig', None) or error
+        if getattr(orig, 'args', None) and orig.args[0] == 1146:
+            return True
+        if getattr(orig, 'sqlstate', None) == '42P01' or getattr(orig, 'pgcode', None) == '42P01':
+            return True
+        message = str(error).lower()
+        return ('no such table' in message or 'undefinedtable' in message
+                or ("table '" in message and "doesn't exist" in message)
+                or ('relation "' in message and 'does not exist' in message))
+
+    def _attach_precomputed_sentiment(self, results: List[QueryResult]) -> List[QueryResult]:
+        """
+        为查询结果填充离线打分的情感标签与置信度
+
+        每张来源表一次按行id的批量查询；结果表不存在（未运行离线打分任务）时本进程内不再尝试，
+        其他错误（连接中断、超时等）只让本次查询改为实时分析
+        """
+        if not results or not MediaCrawlerDB._precomputed_sentiment_available:
+            return results
+
+        by_table: Dict[str, Dict[int, List[QueryResult]]] = {}
+        for result in results:
+            if result.row_id is not None and result.source_table:
+                by_table.setdefault(result.source_table, {}).setdefault(int(result.row_id), []).append(result)
+
+        for table, rows in by_table.items():
+            row_ids = list(rows)
+            params = {'source_table': table, **{f'id_{idx}': row_id for idx, row_id in enumerate(row_ids)}}
+            placeholders = ', '.join(f':id_{idx}' for idx in range(len(row_ids)))
+            query = (f'SELECT row_id, sentiment_label, confidence FROM {self.SENTIMENT_TABLE} '
+                     f'WHERE source_table = :source_table AND row_id IN ({placeholders})')
+            try:
+                scored = self._execute_query(query, params, raise_errors=True)
+            except Exception as e:
+                if self._is_missing_table_error(e):
+                    logger.warning(f"离线情感打分结果表不存在，本进程内改为查询时实时分析: {e}")
+                    MediaCrawlerDB._precomputed_sentiment_available = False
+                else:
+                    logger.warning(f"读取离线情感打分结果失败，本次查询改为实时分析: {e}")
+                return results
+            for row in scored:
+                for result in rows.get(int(row['row_id']), []):
+                    result.sentiment_label = row['sentiment_label']
+                    result.sentiment_confidence = float(row['confidence'])
+        return results
+
     def search_hot_content(
         self,
         time_period: Literal['24h', 'week', 'year'] = 'week',
@@ -148,14 +236,14 @@ class MediaCrawlerDB:
         now = datetime.now()
         start_time = now - timedelta(days={'24h': 1, 'week': 7}.get(time_period, 365))
 
-        # 定义各平台的热度计算SQL片段
+        # 定义各平台的热度计算SQL片段（互动计数使用入库时解析好的BIGINT列，无需逐行CAST）
         hotness_formulas = {
-            'bilibili_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(video_comment AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(video_share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_favorite_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_coin_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_danmaku AS UNSIGNED), 0) * {self.W_DANMAKU} + COALESCE(CAST(video_play_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'douyin_aweme':   f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'weibo_note':     f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comments_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(shared_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'xhs_note':       f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'kuaishou_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(viewd_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'zhihu_content':  f"(COALESCE(CAST(voteup_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT})",
+            'bilibili_video': f"(COALESCE(liked_count, 0) * {self.W_LIKE} + COALESCE(video_comment_num, 0) * {self.W_COMMENT} + COALESCE(video_share_count_num, 0) * {self.W_SHARE} + COALESCE(video_favorite_count_num, 0) * {self.W_SHARE} + COALESCE(video_coin_count_num, 0) * {self.W_SHARE} + COALESCE(video_danmaku_num, 0) * {self.W_DANMAKU} + COALESCE(video_play_count_num, 0) * {self.W_VIEW})",
+            'douyin_aweme':   f"(COALESCE(liked_count_num, 0) * {self.W_LIKE} + COALESCE(comment_count_num, 0) * {self.W_COMMENT} + COALESCE(share_count_num, 0) * {self.W_SHARE} + COALESCE(collected_count_num, 0) * {self.W_SHARE})",
+            'weibo_note':     f"(COALESCE(liked_count_num, 0) * {self.W_LIKE} + COALESCE(comments_count_num, 0) * {self.W_COMMENT} + COALESCE(shared_count_num, 0) * {self.W_SHARE})",
+            'xhs_note':       f"(COALESCE(liked_count_num, 0) * {self.W_LIKE} + COALESCE(comment_count_num, 0) * {self.W_COMMENT} + COALESCE(share_count_num, 0) * {self.W_SHARE} + COALESCE(collected_count_num, 0) * {self.W_SHARE})",
+            'kuaishou_video': f"(COALESCE(liked_count_num, 0) * {self.W_LIKE} + COALESCE(viewd_count_num, 0) * {self.W_VIEW})",
+            'zhihu_content':  f"(COALESCE(voteup_count, 0) * {self.W_LIKE} + COALESCE(comment_count, 0) * {self.W_COMMENT})",
         }
 
         all_queries, params = [], []
@@ -167,7 +255,7 @@ class MediaCrawlerDB:
             else: time_filter_sql, time_filter_param = "`create_time` >= %s", str(int(start_time.timestamp()))
 
             content_type = 'note' if table in ['weibo_note', 'xhs_note'] else 'content' if table == 'zhihu_content' else 'video'
-            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, source_keyword, '{tbl}' as tbl FROM `{tbl}` WHERE {time_filter}"
+            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, source_keyword, '{tbl}' as tbl, id as row_id FROM `{tbl}` WHERE {time_filter}"
             
             field_subs = {'platform': table.split('_')[0], 'type': content_type, 'title': 'title', 'author': 'nickname', 'url': 'video_url', 'ts': 'create_time', 'formula': formula, 'tbl': table, 'time_filter': time_filter_sql}
             if table == 'weibo_note': field_subs.update({'title': 'content', 'url': 'note_url', 'ts': 'create_date_time'})
@@ -181,7 +269,8 @@ class MediaCrawlerDB:
         final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY hotness_score DESC LIMIT %s"
         raw_results = self._execute_query(final_query, tuple(params) + (limit,))
 
-        formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
+        formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl'], row_id=r.get('row_id')) for r in raw_results]
+        self._attach_precomputed_sentiment(formatted_results)
         return DBResponse("search_hot_content", params_for_log, results=formatted_results, results_count=len(formatted_results))    
 
     def _wrap_query_field_with_dialect(self, field: str) -> str:
@@ -229,8 +318,10 @@ class MediaCrawlerDB:
                     publish_time=self._to_datetime(time_key),
                     engagement=self._extract_engagement(row),
                     source_keyword=row.get('source_keyword'),
-                    source_table=table
+                    source_table=table,
+                    row_id=row.get('id')
                 ))
+        self._attach_precomputed_sentiment(all_results)
         return DBResponse("search_topic_globally", params_for_log, results=all_results, results_count=len(all_results))
 
     def search_topic_by_date(self, topic: str, start_date: str, end_date: str, limit_per_table: int = 100) -> DBResponse:
@@ -284,8 +375,10 @@ class MediaCrawlerDB:
                     publish_time=self._to_datetime(time_key),
                     engagement=self._extract_engagement(row),
                     source_keyword=row.get('source_keyword'),
-                    source_table=table
+                    source_table=table,
+                    row_id=row.get('id')
                 ))
+        self._attach_precomputed_sentiment(all_results)
         return DBResponse("search_topic_by_date", params_for_log, results=all_results, results_count=len(all_results))
         
     def get_comments_for_topic(self, topic: str, limit: int = 500) -> DBResponse:
@@ -309,12 +402,12 @@ class MediaCrawlerDB:
         for table in comment_tables:
             cols = self._get_table_columns(table)
             author_col = 'user_nickname' if 'user_nickname' in cols else 'nickname'
-            like_col = 'comment_like_count' if 'comment_like_count' in cols else 'like_count' if 'like_count' in cols else None
+            like_col = next((col for col in ('comment_like_count_num', 'like_count_num', 'like_count') if col in cols), None)
             time_col = 'publish_time' if 'publish_time' in cols else 'create_date_time' if 'create_date_time' in cols else 'create_time'
             like_select = f"`{like_col}` as likes" if like_col else "'0' as likes"
             
             query = (f"SELECT '{table.split('_')[0]}' as platform, `content`, `{author_col}` as author, "
-                     f"`{time_col}` as ts, {like_select}, '{table}' as source_table "
+                     f"`{time_col}` as ts, {like_select}, '{table}' as source_table, `id` as row_id "
                      f"FROM `{table}` WHERE `content` LIKE %s")
             all_queries.append(query)
 
@@ -322,7 +415,8 @@ class MediaCrawlerDB:
         params = (search_term,) * len(comment_tables) + (limit,)
         raw_results = self._execute_query(final_query, params)
         
-        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement={'likes': int(r['likes']) if str(r['likes']).isdigit() else 0}, source_table=r['source_table']) for r in raw_results]
+        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement={'likes': int(r['likes']) if str(r['likes']).isdigit() else 0}, source_table=r['source_table'], row_id=r.get('row_id')) for r in raw_results]
+        self._attach_precomputed_sentiment(formatted)
         return DBResponse("get_comments_for_topic", params_for_log, results=formatted, results_count=len(formatted))
 
     def search_topic_on_platform(
@@ -392,10 +486,159 @@ class MediaCrawlerDB:
             for row in raw_results:
                 content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
                 time_key = config.get('time_col') and row.get(config.get('time_col'))
-                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=content if content else '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table))
+                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=content if content else '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table, row_id=row.get('id')))
         
+        self._attach_precomputed_sentiment(all_results)
         return DBResponse("search_topic_on_platform", params_for_log, results=all_results, results_count=len(all_results))
 
+    def get_sentiment_trend(
+        self,
+        topic: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        platform: Optional[str] = None,
+        granularity: Literal['hour', 'day', 'total'] = 'day'
+    ) -> DBResponse:
+        """
+        【工具】话题趋势聚合: 从预聚合表读取话题在任意时间窗口内的内容量、互动量与情感分布，
+        适合回答"上周微博上关于X的评论负面占比多少"这类分布与趋势问题，不扫描原始评论。
+
+        Args:
+            topic (str): 话题关键词，匹配爬取时的来源关键词。
+            start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'。默认为结束日期前7天。
+            end_date (Optional[str]): 结束日期（含），格式 'YYYY-MM-DD'。默认为今天。
+            platform (Optional[str]): 只统计指定平台，默认统计全部平台。
+            granularity (Literal['hour', 'day', 'total']): 时间粒度，默认为 'day'。
+
+        Returns:
+            DBResponse: aggregates为按(时间桶, 平台)汇总的统计，results为每个桶的文字摘要。
+        """
+        params_for_log = {'topic': topic, 'start_date': start_date, 'end_date': end_date, 'platform': platform, 'granularity': granularity}
+        logger.info(f"--- TOOL: 话题趋势聚合 (params: {params_for_log}) ---")
+
+        try:
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else end_dt - timedelta(days=8)
+        except ValueError:
+            return DBResponse("get_sentiment_trend", params_for_log, error_message="日期格式错误，请使用 'YYYY-MM-DD' 格式。")
+        if granularity not in ('hour', 'day', 'total'):
+            return DBResponse("get_sentiment_trend", params_for_log, error_message=f"不支持的时间粒度: {granularity}")
+
+        sums = ", ".join(f"SUM({col}) AS {col}" for col in self.ROLLUP_COUNTER_COLUMNS)
+        query = (f"SELECT platform, hour_ts, {sums} FROM {self.ROLLUP_TABLE} "
+                 f"WHERE source_keyword LIKE :topic AND hour_ts >= :start_ts AND hour_ts < :end_ts")
+        param_dict = {'topic': f"%{topic}%", 'start_ts': int(start_dt.timestamp()), 'end_ts': int(end_dt.timestamp())}
+        if platform:
+            query += " AND platform = :platform"
+            param_dict['platform'] = platform
+        query += " GROUP BY platform, hour_ts"
+        raw_results = self._execute_query(query, param_dict)
+
+        # 小时级结果在Python中按粒度合并，避免依赖各数据库方言的日期函数
+        buckets: Dict[tuple, Dict[str, int]] = {}
+        for row in raw_results:
+            hour = datetime.fromtimestamp(int(row['hour_ts']))
+            bucket = hour.strftime('%Y-%m-%d %H:00') if granularity == 'hour' else hour.strftime('%Y-%m-%d') if granularity == 'day' else f"{start_dt:%Y-%m-%d}~{end_dt - timedelta(days=1):%Y-%m-%d}"
+            counters = buckets.setdefault((bucket, row['platform']), dict.fromkeys(self.ROLLUP_COUNTER_COLUMNS, 0))
+            for col in self.ROLLUP_COUNTER_COLUMNS:
+                counters[col] += int(row.get(col) or 0)
+
+        aggregates, results = [], []
+        for (bucket, bucket_platform), counters in sorted(buckets.items()):
+            distribution = {label: counters[col] for col, label in self.ROLLUP_SENTIMENT_COLUMNS.items()}
+            scored = sum(distribution.values())
+            negative = distribution['非常负面'] + distribution['负面']
+            aggregate = {
+                'bucket': bucket, 'platform': bucket_platform,
+                'content_count': counters['content_count'], 'comment_count': counters['comment_count'],
+                'engagement': {key: counters[key] for key in ('likes', 'comments', 'shares', 'views')},
+                'sentiment_distribution': distribution, 'unscored': counters['unscored'],
+                'negative_ratio': round(negative / scored, 4) if scored else None,
+            }
+            aggregates.append(aggregate)
+
+            summary = f"{bucket} {bucket_platform}: 内容{counters['content_count']}条，评论{counters['comment_count']}条"
+            if scored:
+                summary += "，情感分布 " + "、".join(f"{label}{count}({count / scored:.0%})" for label, count in distribution.items() if count)
+            results.append(QueryResult(
+                platform=bucket_platform, content_type='aggregate', title_or_content=summary,
+                publish_time=datetime.strptime(bucket, '%Y-%m-%d %H:00') if granularity == 'hour' else datetime.strptime(bucket, '%Y-%m-%d') if granularity == 'day' else start_dt,
+                engagement=aggregate['engagement'], source_keyword=topic, source_table=self.ROLLUP_TABLE
+            ))
+
+        return DBResponse("get_sentiment_trend", params_for_log, results=results, results_count=len(results), aggregates=aggregates)
+
+    def search_by_crawl_keyword(
+        self,
+        keyword: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        platform: Optional[str] = None,
+        include_comments: bool = True,
+        limit_per_table: int = 100
+    ) -> DBResponse:
+        """
+        【工具】爬取关键词精确查询: 读取以某个关键词爬取到的全部内容和评论。
+        关键词需与爬取时使用的关键词完全一致，查询走(keyword_id, 发布时间)索引，不做模糊匹配。
+
+        Args:
+            keyword (str): 爬取时使用的搜索关键词。
+            start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'。默认为None。
+            end_date (Optional[str]): 结束日期（含），格式 'YYYY-MM-DD'。默认为None。
+            platform (Optional[str]): 只查询指定平台，默认查询全部平台。
+            include_comments (bool): 是否同时返回评论，默认为 True。
+            limit_per_table (int): 从每个表中返回的最大记录数，默认为 100。
+
+        Returns:
+            DBResponse: 按发布时间倒序的内容与评论；关键词未被爬取过时返回错误信息。
+        """
+        params_for_log = {'keyword': keyword, 'start_date': start_date, 'end_date': end_date, 'platform': platform,
+                          'include_comments': include_comments, 'limit_per_table': limit_per_table}
+        logger.info(f"--- TOOL: 爬取关键词精确查询 (params: {params_for_log}) ---")
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else None
+        except ValueError:
+            return DBResponse("search_by_crawl_keyword", params_for_log, error_message="日期格式错误，请使用 'YYYY-MM-DD' 格式。")
+
+        keyword_rows = self._execute_query(f"SELECT id FROM {self.KEYWORD_TABLE} WHERE keyword = :keyword", {'keyword': (keyword or '').strip()})
+        if not keyword_rows:
+            return DBResponse("search_by_crawl_keyword", params_for_log, error_message=f"未找到爬取关键词: {keyword}")
+        keyword_id = keyword_rows[0]['id']
+
+        all_results = []
+        for table, (content_type, time_col, time_type) in self.KEYWORD_SEARCH_TABLES.items():
+            if platform and table.split('_')[0] != platform:
+                continue
+            if content_type == 'comment' and not include_comments:
+                continue
+            quoted_time_col = self._wrap_query_field_with_dialect(time_col)
+            where_clauses, param_dict = ["keyword_id = :keyword_id"], {'keyword_id': keyword_id, 'limit': limit_per_table}
+            if start_dt:
+                where_clauses.append(f"{quoted_time_col} >= :start_value")
+                param_dict['start_value'] = self._time_bound(start_dt, time_type)
+            if end_dt:
+                where_clauses.append(f"{quoted_time_col} < :end_value")
+                param_dict['end_value'] = self._time_bound(end_dt, time_type)
+            query = (f"SELECT * FROM {self._wrap_query_field_with_dialect(table)} WHERE {' AND '.join(where_clauses)} "
+                     f"ORDER BY {quoted_time_col} DESC LIMIT :limit")
+            for row in self._execute_query(query, param_dict):
+                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
+                all_results.append(QueryResult(
+                    platform=table.split('_')[0], content_type=content_type,
+                    title_or_content=content if content else '',
+                    author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
+                    url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
+                    publish_time=self._to_datetime(row.get(time_col)),
+                    engagement=self._extract_engagement(row),
+                    source_keyword=row.get('source_keyword') or keyword,
+                    source_table=table,
+                    row_id=row.get('id')
+                ))
+        self._attach_precomputed_sentiment(all_results)
+        return DBResponse("search_by_crawl_keyword", params_for_log, results=all_results, results_count=len(all_results))
+
 # --- 3. 测试与使用示例 ---
 def print_response_summary(response: DBResponse):
     """简化的打印函数，用于展示测试结果"""
@@ -0,0 +1,198 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 增量爬取断点（crawl frontier）
+#            本地SQLite记录每个平台已爬内容的指纹（评论数/点赞数等）与最后爬取时间、每个关键词当天的搜索翻页断点
+#            以及已产出但尚未处理完的内容：指纹未变化的内容直接跳过，崩溃后从最早未完成的页继续
+import os
+import sqlite3
+import time
+from datetime import date
+from typing import Any, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_content (
+    platform TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    keyword TEXT NOT NULL DEFAULT '',
+    fingerprint TEXT,
+    last_crawled_at INTEGER NOT NULL,
+    PRIMARY KEY (platform, content_id)
+);
+CREATE TABLE IF NOT EXISTS crawl_search_checkpoint (
+    platform TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    crawl_day TEXT NOT NULL,
+    next_page INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (platform, keyword, crawl_day)
+);
+CREATE TABLE IF NOT EXISTS crawl_pending (
+    platform TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    crawl_day TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    fingerprint TEXT,
+    PRIMARY KEY (platform, keyword, crawl_day, content_id)
+);
+"""
+
+
+def make_fingerprint(*values: Any) -> Optional[str]:
+    """
+    由内容的评论数、点赞数等计数生成指纹，计数全部缺失时返回None（视为每次都需要爬取）
+    Args:
+        *values: 计数值
+
+    Returns:
+
+    """
+    if all(value is None for value in values):
+        return None
+    return "|".join("" if value is None else str(value) for value in values)
+
+
+class CrawlFrontier:
+    """单个平台的增量爬取断点"""
+
+    def __init__(self, platform: str, db_path: str = ":memory:", crawl_day: Optional[str] = None):
+        """
+        Args:
+            platform: 平台名称
+            db_path: SQLite文件路径，":memory:" 表示只在本次运行内去重
+            crawl_day: 搜索断点所属的日期，默认今天；第二天重新从起始页开始增量爬取
+        """
+        self.platform = platform
+        self.crawl_day = crawl_day or date.today().isoformat()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+    def resume_page(self, keyword: str, start_page: int) -> int:
+        """
+        关键词的续爬页：有未处理完的内容时从其中最早的页开始，否则从断点的下一页开始
+        Args:
+            keyword: 搜索关键词
+            start_page: 配置的起始页
+
+        Returns:
+
+        """
+        pending_page = self._conn.execute(
+            "SELECT MIN(page) FROM crawl_pending WHERE platform = ? AND keyword = ? AND crawl_day = ?",
+            (self.platform, keyword, self.crawl_day),
+        ).fetchone()[0]
+        if pending_page is not None:
+            return max(start_page, pending_page)
+        row = self._conn.execute(
+            "SELECT next_page FROM crawl_search_checkpoint WHERE platform = ? AND keyword = ? AND crawl_day = ?",
+            (self.platform, keyword, self.crawl_day),
+        ).fetchone()
+        return max(start_page, row[0]) if row else start_page
+
+    def save_page(self, keyword: str, next_page: int):
+        """
+        记录关键词已翻到的页（该页内容已全部产出）
+        Args:
+            keyword: 搜索关键词
+            next_page: 下一次要请求的页
+
+        Returns:
+
+        """
+        self._conn.execute(
+            "INSERT INTO crawl_search_checkpoint (platform, keyword, crawl_day, next_page, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (platform, keyword, crawl_day) DO UPDATE SET next_page = excluded.next_page, updated_at = excluded.updated_at",
+            (self.platform, keyword, self.crawl_day, next_page, int(time.time())),
+        )
+
+    def is_unchanged(self, content_id: str, fingerprint: Optional[str]) -> bool:
+        """
+        内容是否已爬过且指纹未变化
+        Args:
+            content_id: 内容id
+            fingerprint: 当前指纹，None表示无法判断（视为有变化）
+
+        Returns:
+
+        """
+        if fingerprint is None:
+            return False
+        row = self._conn.execute(
+            "SELECT fingerprint FROM crawl_content WHERE platform = ? AND content_id = ?",
+            (self.platform, str(content_id)),
+        ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def enqueue(self, keyword: str, page: int, content_id: str, fingerprint: Optional[str]):
+        """
+        记录已产出、尚未处理完的内容
+        Args:
+            keyword: 搜索关键词
+            page: 内容所在的搜索页
+            content_id: 内容id
+            fingerprint: 内容指纹
+
+        Returns:
+
+        """
+        self._conn.execute(
+            "INSERT INTO crawl_pending (platform, keyword, crawl_day, content_id, page, fingerprint) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (platform, keyword, crawl_day, content_id) DO UPDATE SET page = MIN(page, excluded.page), fingerprint = excluded.fingerprint",
+            (self.platform, keyword, self.crawl_day, str(content_id), page, fingerprint),
+        )
+
+    def complete(self, keyword: str, content_id: str, succeeded: bool):
+        """
+        内容处理完毕：成功时记录指纹与爬取时间，失败时只移出未完成列表（下次仍会爬取）
+        Args:
+            keyword: 搜索关键词
+            content_id: 内容id
+            succeeded: 是否成功走完详情、入库与评论
+
+        Returns:
+
+        """
+        key = (self.platform, keyword, self.crawl_day, str(content_id))
+        if succeeded:
+            self._conn.execute(
+                "INSERT INTO crawl_content (platform, content_id, keyword, fingerprint, last_crawled_at) "
+                "SELECT platform, content_id, keyword, fingerprint, ? FROM crawl_pending "
+                "WHERE platform = ? AND keyword = ? AND crawl_day = ? AND content_id = ? "
+                "ON CONFLICT (platform, content_id) DO UPDATE SET keyword = excluded.keyword, "
+                "fingerprint = excluded.fingerprint, last_crawled_at = excluded.last_crawled_at",
+                (int(time.time()), *key),
+            )
+        self._conn.execute(
+            "DELETE FROM crawl_pending WHERE platform = ? AND keyword = ? AND crawl_day = ? AND content_id = ?", key)
+
+
+def open_crawl_frontier(platform: str) -> CrawlFrontier:
+    """
+    按配置打开平台的增量爬取断点：开启时使用CRAWL_FRONTIER_DB_PATH，关闭时只在本次运行内去重
+    Args:
+        platform: 平台名称
+
+    Returns:
+
+    """
+    # 延迟导入：MindSpider下有多个名为config的模块，断点模块本身不依赖MediaCrawler配置
+    import config
+
+    return CrawlFrontier(platform, config.CRAWL_FRONTIER_DB_PATH if config.ENABLE_CRAWL_FRONTIER else ":memory:")
@@ -0,0 +1,210 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 爬虫流水线与请求预算
+#            搜索翻页 -> 详情 -> 入库 -> 评论 各阶段通过有界队列衔接、并发执行，
+#            每个平台共用一个并发上限，请求间隔由令牌桶控制，不再在每页之后固定sleep
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+# 与tools.utils.logger为同一个logger，这里不引入tools.utils以免加载playwright等依赖
+logger = logging.getLogger("MediaCrawler")
+
+Emit = Callable[[Any], Awaitable[None]]
+StageHandler = Callable[[Any, Emit], Awaitable[None]]
+Producer = Callable[[Emit], Awaitable[None]]
+OnFinished = Callable[[Any, bool], Awaitable[None]]
+
+
+class RequestRateLimiter:
+    """令牌桶限速：每秒发放rate个请求令牌，最多累积burst个"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: 每秒请求数，<=0 表示不限速
+            burst: 允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """
+        取得一个请求令牌，令牌不足时等待
+        Returns:
+
+        """
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class CrawlBudget:
+    """
+    平台级请求预算：全局并发上限 + 请求令牌
+    用法与asyncio.Semaphore一致（async with），可直接传给原先接收semaphore的任务函数
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_second: float, burst: int = 1):
+        """
+        Args:
+            max_concurrency: 同时进行中的请求数上限
+            requests_per_second: 每秒请求数，<=0 表示不限速
+            burst: 允许的突发请求数
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.limiter = RequestRateLimiter(requests_per_second, burst)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self.limiter.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+class _Stage:
+    def __init__(self, name: str, handler: StageHandler, workers: int):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.failed = 0
+
+
+class _Origin:
+    """producer产出的一条数据及其在流水线中尚未处理完的派生数据数"""
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.pending = 0
+        self.failed = False
+        self.completed = False
+
+
+class CrawlPipeline:
+    """
+    多阶段爬虫流水线
+    producer通过emit把数据送入第一个阶段，每个阶段的handler(item, emit)处理完后用emit送往下一阶段；
+    阶段之间是有界队列，下游处理不过来时上游自动等待。
+    emit时会记录当前的contextvars（如source_keyword_var），worker处理该条数据前恢复，保证入库时关键词正确
+    producer产出的每条数据离开流水线时（走完最后一个阶段、中途不再下传或处理失败）回调on_finished
+    """
+
+    def __init__(self, name: str, queue_size: int = 50):
+        """
+        Args:
+            name: 流水线名称，用于日志
+            queue_size: 每个阶段队列的容量
+        """
+        self.name = name
+        self.queue_size = max(1, queue_size)
+        self._stages: List[_Stage] = []
+
+    def add_stage(self, name: str, handler: StageHandler, workers: int = 1) -> "CrawlPipeline":
+        """
+        追加一个处理阶段
+        Args:
+            name: 阶段名称
+            handler: async handler(item, emit)，最后一个阶段的emit会丢弃数据
+            workers: 该阶段的并发worker数
+
+        Returns:
+
+        """
+        self._stages.append(_Stage(name, handler, workers))
+        return self
+
+    @staticmethod
+    def _emitter(queue: Optional[asyncio.Queue], origin: Optional[_Origin] = None) -> Emit:
+        async def emit(item: Any):
+            if queue is None or item is None:
+                return
+            item_origin = origin or _Origin(item)
+            item_origin.pending += 1
+            await queue.put((contextvars.copy_context(), item_origin, item))
+
+        return emit
+
+    async def _worker(self, stage: _Stage, queue: asyncio.Queue, next_queue: Optional[asyncio.Queue], on_finished: Optional[OnFinished]):
+        while True:
+            context, origin, item = await queue.get()
+            try:
+                for var, value in context.items():
+                    var.set(value)
+                await stage.handler(item, self._emitter(next_queue, origin))
+                stage.processed += 1
+                origin.completed = origin.completed or next_queue is None
+            except Exception as e:
+                stage.failed += 1
+                origin.failed = True
+                logger.error(f"[CrawlPipeline.{self.name}] stage {stage.name} failed: {e}")
+            finally:
+                origin.pending -= 1
+                if origin.pending == 0 and on_finished is not None:
+                    try:
+                        await on_finished(origin.item, origin.completed and not origin.failed)
+                    except Exception as e:
+                        logger.error(f"[CrawlPipeline.{self.name}] on_finished failed: {e}")
+                queue.task_done()
+
+    async def run(self, producer: Producer, on_finished: Optional[OnFinished] = None):
+        """
+        运行流水线，producer结束且各阶段队列依次清空后返回
+        Args:
+            producer: async producer(emit)，负责翻页并产出第一个阶段的数据
+            on_finished: async on_finished(item, succeeded)，producer产出的数据离开流水线时回调，
+                         succeeded表示该数据走完了最后一个阶段且没有失败
+
+        Returns:
+
+        """
+        if not self._stages:
+            raise ValueError("CrawlPipeline requires at least one stage")
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self._stages]
+        workers: List[asyncio.Task] = []
+        for index, stage in enumerate(self._stages):
+            next_queue = queues[index + 1] if index + 1 < len(queues) else None
+            for n in range(stage.workers):
+                workers.append(asyncio.create_task(self._worker(stage, queues[index], next_queue, on_finished), name=f"{self.name}-{stage.name}-{n}"))
+        try:
+            await producer(self._emitter(queues[0]))
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        summary = ", ".join(f"{stage.name}: {stage.processed} ok / {stage.failed} failed" for stage in self._stages)
+        logger.info(f"[CrawlPipeline.{self.name}] finished, {summary}")
@@ -0,0 +1,323 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 平台客户端自适应限速
+#            每个平台每个接口一个AIMD令牌桶：正常响应时线性提速，遇到429/验证码/风控时按比例降速并带抖动退避，
+#            并把吞吐、限流次数与有效并发定期写入爬虫日志
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from urllib.parse import urlparse
+
+from base.crawl_pipeline import RequestRateLimiter, logger
+
+# 限流/验证码类状态码：429 请求过多，412 B站风控拦截，418 微博反爬，461/471 小红书验证码
+THROTTLE_STATUS_CODES = frozenset({412, 418, 429, 461, 471})
+
+
+class AdaptiveRateLimiter(RequestRateLimiter):
+    """AIMD令牌桶：成功时速率加increase_step，限流时乘以decrease_factor，并进入抖动的指数退避"""
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float,
+        decrease_factor: float,
+        backoff_base: float,
+        backoff_max: float,
+        burst: int = 1,
+    ):
+        """
+        Args:
+            rate: 初始每秒请求数
+            min_rate: 速率下限
+            max_rate: 速率上限
+            increase_step: 每次成功响应增加的速率
+            decrease_factor: 每次被限流时速率的缩放比例
+            backoff_base: 首次退避秒数，连续被限流时翻倍
+            backoff_max: 退避秒数上限
+            burst: 允许的突发请求数
+        """
+        self.min_rate = max(min_rate, 1e-3)
+        self.max_rate = max(max_rate, self.min_rate)
+        super().__init__(min(max(rate, self.min_rate), self.max_rate), burst)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._backoff_until = 0.0
+        self._consecutive_throttles = 0
+
+    async def acquire(self):
+        """
+        退避期内先等待退避结束，再取请求令牌
+        Returns:
+
+        """
+        delay = self._backoff_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await super().acquire()
+
+    def on_success(self):
+        """正常响应：线性提速"""
+        self._consecutive_throttles = 0
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self) -> float:
+        """
+        被限流：按比例降速并退避
+        Returns:
+            本次退避的秒数
+        """
+        self._consecutive_throttles += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (self._consecutive_throttles - 1))
+        backoff = random.uniform(backoff / 2, backoff)
+        self._backoff_until = max(self._backoff_until, time.monotonic() + backoff)
+        # 丢弃已累积的突发令牌，退避结束后按新速率重新发放
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        return backoff
+
+
+class RequestTicket:
+    """单次请求的限速凭证，用于上报响应状态"""
+
+    def __init__(self, controller: "RateController", url: str):
+        self.controller = controller
+        self.url = url
+        self.throttled = False
+
+    def observe(self, status_code: int):
+        """
+        根据HTTP状态码判断是否被限流
+        Args:
+            status_code: 响应状态码
+
+        Returns:
+
+        """
+        if status_code in THROTTLE_STATUS_CODES:
+            self.throttle(f"HTTP {status_code}")
+
+    def throttle(self, reason: str):
+        """
+        上报被限流（验证码、风控、账号被拦截等）
+        Args:
+            reason: 限流原因
+
+        Returns:
+
+        """
+        if not self.throttled:
+            self.throttled = True
+            self.controller.report_throttle(self.url, reason)
+
+
+class RateController:
+    """平台级请求速率控制：每个接口一个自适应令牌桶，并统计吞吐、限流次数与有效并发"""
+
+    def __init__(
+        self,
+        platform: str,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0,
+        metrics_interval: float = 60.0,
+    ):
+        """
+        Args:
+            platform: 平台名称，用于日志
+            rate: 每个接口的初始每秒请求数
+            min_rate: 速率下限
+            max_rate: 速率上限
+            increase_step: 每次成功响应增加的速率
+            decrease_factor: 每次被限流时速率的缩放比例
+            backoff_base: 首次退避秒数
+            backoff_max: 退避秒数上限
+            metrics_interval: 指标写入日志的间隔秒数，<=0 表示不自动写入
+        """
+        self.platform = platform
+        self._limiter_args = dict(
+            rate=rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            increase_step=increase_step,
+            decrease_factor=decrease_factor,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+        )
+        self.metrics_interval = metrics_interval
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self.in_flight = 0
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now: float):
+        self._window_started = now
+        self._last_change = now
+        self._busy_seconds = 0.0
+        self.requests = 0
+        self.throttle_events = 0
+        self.peak_in_flight = self.in_flight
+
+    def _track_in_flight(self, delta: int):
+        now = time.monotonic()
+        self._busy_seconds += self.in_flight * (now - self._last_change)
+        self._last_change = now
+        self.in_flight += delta
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        """接口标识：URL路径（不含查询参数），路径中的内容id归一为{id}，如 /detail/{id}"""
+        segments = [
+            "{id}" if segment.isdigit() or (len(segment) >= 8 and any(c.isdigit() for c in segment)) else segment
+            for segment in urlparse(url).path.split("/")
+        ]
+        return "/".join(segments) or "/"
+
+    def limiter(self, url: str) -> AdaptiveRateLimiter:
+        """
+        获取接口对应的令牌桶，不存在时新建
+        Args:
+            url: 请求URL
+
+        Returns:
+
+        """
+        endpoint = self.endpoint_of(url)
+        if endpoint not in self._limiters:
+            self._limiters[endpoint] = AdaptiveRateLimiter(**self._limiter_args)
+        return self._limiters[endpoint]
+
+    @asynccontextmanager
+    async def request(self, url: str) -> AsyncIterator[RequestTicket]:
+        """
+        包裹一次请求：进入时取令牌，正常结束且未被限流时提速
+        用法：
+            async with rate_controller.request(url) as ticket:
+                response = await client.request(...)
+                ticket.observe(response.status_code)
+        请求抛出异常（网络错误等）时不调整速率
+        Args:
+            url: 请求URL
+
+        Returns:
+
+        """
+        limiter = self.limiter(url)
+        await limiter.acquire()
+        ticket = RequestTicket(self, url)
+        self._track_in_flight(1)
+        try:
+            yield ticket
+        finally:
+            self._track_in_flight(-1)
+            self.requests += 1
+        if not ticket.throttled:
+            limiter.on_success()
+        self._maybe_log_metrics()
+
+    def report_throttle(self, url: str, reason: str):
+        """
+        上报接口被限流，可在响应体中发现风控信号时调用
+        Args:
+            url: 请求URL
+            reason: 限流原因
+
+        Returns:
+
+        """
+        limiter = self.limiter(url)
+        backoff = limiter.on_throttle()
+        self.throttle_events += 1
+        logger.warning(f"[RateController.{self.platform}] throttled on {self.endpoint_of(url)}: {reason}, "
+                       f"rate -> {limiter.rate:.2f}/s, backoff {backoff:.1f}s")
+
+    def snapshot(self) -> Dict:
+        """
+        当前统计窗口的指标
+        Returns:
+            requests_per_sec、throttle_events、effective_concurrency、peak_concurrency、endpoint_rates
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._window_started, 1e-6)
+        busy_seconds = self._busy_seconds + self.in_flight * (now - self._last_change)
+        return {
+            "requests": self.requests,
+            "requests_per_sec": self.requests / elapsed,
+            "throttle_events": self.throttle_events,
+            "effective_concurrency": busy_seconds / elapsed,
+            "peak_concurrency": self.peak_in_flight,
+            "endpoint_rates": {endpoint: limiter.rate for endpoint, limiter in self._limiters.items()},
+        }
+
+    def log_metrics(self, reset: bool = True) -> Dict:
+        """
+        把当前窗口的指标写入爬虫日志
+        Args:
+            reset: 写入后是否开始新的统计窗口
+
+        Returns:
+            写入的指标
+        """
+        metrics = self.snapshot()
+        rates = ", ".join(f"{endpoint}={rate:.2f}" for endpoint, rate in metrics["endpoint_rates"].items())
+        logger.info(f"[RateController.{self.platform}] requests/s: {metrics['requests_per_sec']:.2f}, "
+                    f"throttle events: {metrics['throttle_events']}, effective concurrency: {metrics['effective_concurrency']:.2f}, "
+                    f"peak concurrency: {metrics['peak_concurrency']}, endpoint rates: {rates or '-'}")
+        if reset:
+            self._reset_window(time.monotonic())
+        return metrics
+
+    def _maybe_log_metrics(self):
+        if self.metrics_interval > 0 and time.monotonic() - self._window_started >= self.metrics_interval:
+            self.log_metrics()
+
+
+# 平台 -> 速率控制器，同一平台的所有客户端共用
+_rate_controllers: Dict[str, RateController] = {}
+
+
+def get_rate_controller(platform: str) -> RateController:
+    """
+    获取平台的速率控制器（按配置创建，进程内共享）
+    Args:
+        platform: 平台名称
+
+    Returns:
+
+    """
+    # 延迟导入：MindSpider下有多个名为config的模块，限速模块本身不依赖MediaCrawler配置
+    import config
+
+    if platform not in _rate_controllers:
+        _rate_controllers[platform] = RateController(
+            platform,
+            rate=config.CRAWLER_MAX_REQUESTS_PER_SEC,
+            min_rate=config.ADAPTIVE_RATE_MIN_PER_SEC,
+            max_rate=config.ADAPTIVE_RATE_MAX_PER_SEC,
+            increase_step=config.ADAPTIVE_RATE_INCREASE_STEP,
+            decrease_factor=config.ADAPTIVE_RATE_DECREASE_FACTOR,
+            backoff_base=config.ADAPTIVE_BACKOFF_BASE_SEC,
+            backoff_max=config.ADAPTIVE_BACKOFF_MAX_SEC,
+            metrics_interval=config.RATE_METRICS_LOG_INTERVAL_SEC,
+        )
+    return _rate_controllers[platform]
@@ -104,9 +104,63 @@ STOP_WORDS_FILE = "./docs/hit_stopwords.txt"
 # 中文字体文件路径
 FONT_PATH = "./docs/STZHONGS.TTF"
 
+# 词云分词进程数，0 表示在后台线程中分词
+WORDCLOUD_SEGMENT_WORKERS = 2
+
+# 每个分词任务包含的评论数
+WORDCLOUD_CHUNK_SIZE = 2000
+
+# 词频统计最多保留的词数（词汇量超过两倍时裁剪为计数最大的这些词），<=0 表示不限制
+WORDCLOUD_MAX_WORDS = 100000
+
 # 爬取间隔时间
 CRAWLER_MAX_SLEEP_SEC = 2
 
+# 每个平台每秒允许发出的请求数（令牌桶限速，搜索/详情/评论请求共用），<=0 表示不限速
+CRAWLER_MAX_REQUESTS_PER_SEC = 1 / CRAWLER_MAX_SLEEP_SEC
+
+# 令牌桶允许的突发请求数
+CRAWLER_REQUEST_BURST = 1
+
+# 搜索/详情/评论流水线各阶段队列容量
+CRAWLER_PIPELINE_QUEUE_SIZE = 50
+
+# 客户端自适应限速（AIMD）：每个平台每个接口一个令牌桶，初始速率为CRAWLER_MAX_REQUESTS_PER_SEC，
+# 正常响应时逐步提速，遇到429/验证码/风控时按比例降速并退避；爬虫层的CRAWLER_MAX_REQUESTS_PER_SEC仍是平台整体上限
+ADAPTIVE_RATE_MIN_PER_SEC = 0.05
+ADAPTIVE_RATE_MAX_PER_SEC = 2
+ADAPTIVE_RATE_INCREASE_STEP = 0.05
+ADAPTIVE_RATE_DECREASE_FACTOR = 0.5
+
+# 被限流后的退避秒数（连续被限流时翻倍，带随机抖动）
+ADAPTIVE_BACKOFF_BASE_SEC = 2
+ADAPTIVE_BACKOFF_MAX_SEC = 60
+
+# 限速指标（请求/秒、限流次数、有效并发）写入日志的间隔秒数
+RATE_METRICS_LOG_INTERVAL_SEC = 60
+
+# 增量爬取：本地SQLite（CRAWL_FRONTIER_DB_PATH）记录已爬内容的指纹与搜索翻页断点，
+# 评论数/点赞数未变化的内容不再重复爬取详情和评论，崩溃后从断点续爬；关闭时只在本次运行内去重
+ENABLE_CRAWL_FRONTIER = True
+
+# 入库去重预判：每张表一个已入库id的布隆过滤器，判定为新的id直接插入，只有可能重复的id才查询数据库决定更新还是插入；
+# 过滤器首次使用时从快照（SEEN_ID_FILTER_DIR）加载并按主键分块扫描数据库补齐，运行中定期落盘
+ENABLE_SEEN_ID_FILTER = True
+
+# 每张表过滤器的内存（MB）与目标误判率，8MB、1%约可容纳700万个id，超出后误判率上升（只多查询，不会漏查）
+SEEN_ID_FILTER_MEMORY_MB = 8
+SEEN_ID_FILTER_FALSE_POSITIVE_RATE = 0.01
+
+# 预热时每次扫描的行数
+SEEN_ID_FILTER_WARM_CHUNK_SIZE = 50000
+
+# 过滤器快照落盘并输出统计（内存、元素数、估算/实际误判率）的间隔秒数
+SEEN_ID_FILTER_SAVE_INTERVAL_SEC = 300
+
+# 签名JS（抖音a_bogus、知乎x-zse-96）常驻node进程数：进程启动时加载一次签名脚本，之后每次签名只经管道往返一次；
+# 找不到node时退回execjs
+JS_SIGNER_POOL_SIZE = 2
+
 from .bilibili_config import *
 from .xhs_config import *
 from .dy_config import *
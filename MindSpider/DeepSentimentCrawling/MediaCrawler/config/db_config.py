@@ -44,6 +44,12 @@ sqlite_db_config = {
     "db_path": SQLITE_DB_PATH
 }
 
+# 增量爬取断点（crawl frontier）文件，见 base_config.ENABLE_CRAWL_FRONTIER
+CRAWL_FRONTIER_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "crawl_frontier.db")
+
+# 已入库id布隆过滤器的快照目录，见 base_config.ENABLE_SEEN_ID_FILTER
+SEEN_ID_FILTER_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "seen_ids")
+
 # postgresql config - 使用MindSpider的数据库配置（如果DB_DIALECT是postgresql）或环境变量
 POSTGRESQL_DB_PWD = os.getenv("POSTGRESQL_DB_PWD", "bettafish")
 POSTGRESQL_DB_USER = os.getenv("POSTGRESQL_DB_USER", "bettafish")
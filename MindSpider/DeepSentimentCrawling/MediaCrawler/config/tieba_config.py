@@ -23,3 +23,6 @@ TIEBA_CREATOR_URL_LIST = [
     "https://tieba.baidu.com/home/main/?id=tb.1.7f139e2e.6CyEwxu3VJruH_-QqpCi6g&fr=frs",
     # ........................
 ]
+
+# 页面解析进程数，0 表示在事件循环线程中直接解析；贴吧详情页、评论页较大，解析是CPU密集的
+TIEBA_PARSE_WORKERS = 0
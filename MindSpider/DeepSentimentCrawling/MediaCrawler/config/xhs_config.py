@@ -30,3 +30,12 @@ XHS_CREATOR_ID_LIST = [
     "63e36c9a000000002703502b",    
     # ........................
 ]
+
+# 请求签名页面数（含主页面）：同一浏览器上下文中的多个页面并行调用window.mnsv2签名
+XHS_SIGN_PAGE_POOL_SIZE = 3
+
+# 单个签名页面一次evaluate最多签名的请求数
+XHS_SIGN_BATCH_SIZE = 16
+
+# localStorage中b1的缓存秒数，更新cookies或出现验证码时提前失效
+XHS_SIGN_B1_CACHE_SEC = 300
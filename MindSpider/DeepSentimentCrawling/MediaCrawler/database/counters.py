@@ -0,0 +1,135 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 互动计数解析与数值列映射
+#            各平台的点赞/评论/分享/播放数以文本入库（如"1.2万"、"3w"、"1.5k"、"10万+"），
+#            入库时统一解析一次写入对应的BIGINT列（原列名加_num后缀），查询端直接按数值列排序和聚合
+import re
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+# 表名 -> {文本计数列: 数值计数列}
+TYPED_COUNTER_COLUMNS: Dict[str, Dict[str, str]] = {
+    "bilibili_video": {
+        "video_play_count": "video_play_count_num",
+        "video_favorite_count": "video_favorite_count_num",
+        "video_share_count": "video_share_count_num",
+        "video_coin_count": "video_coin_count_num",
+        "video_danmaku": "video_danmaku_num",
+        "video_comment": "video_comment_num",
+    },
+    "bilibili_video_comment": {
+        "like_count": "like_count_num",
+        "sub_comment_count": "sub_comment_count_num",
+    },
+    "douyin_aweme": {
+        "liked_count": "liked_count_num",
+        "comment_count": "comment_count_num",
+        "share_count": "share_count_num",
+        "collected_count": "collected_count_num",
+    },
+    "douyin_aweme_comment": {
+        "like_count": "like_count_num",
+        "sub_comment_count": "sub_comment_count_num",
+    },
+    "kuaishou_video": {
+        "liked_count": "liked_count_num",
+        "viewd_count": "viewd_count_num",
+    },
+    "kuaishou_video_comment": {
+        "sub_comment_count": "sub_comment_count_num",
+    },
+    "weibo_note": {
+        "liked_count": "liked_count_num",
+        "comments_count": "comments_count_num",
+        "shared_count": "shared_count_num",
+    },
+    "weibo_note_comment": {
+        "comment_like_count": "comment_like_count_num",
+        "sub_comment_count": "sub_comment_count_num",
+    },
+    "xhs_note": {
+        "liked_count": "liked_count_num",
+        "collected_count": "collected_count_num",
+        "comment_count": "comment_count_num",
+        "share_count": "share_count_num",
+    },
+    "xhs_note_comment": {
+        "like_count": "like_count_num",
+    },
+}
+
+# 排序/热度查询常用的数值列，需要建立索引
+INDEXED_COUNTER_COLUMNS = {
+    "liked_count_num",
+    "like_count_num",
+    "comment_like_count_num",
+    "video_play_count_num",
+}
+
+_COUNT_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*(万|w|W|亿|k|K)?\s*\+?$")
+_COUNT_UNITS = {"万": 10_000, "w": 10_000, "W": 10_000, "亿": 100_000_000, "k": 1_000, "K": 1_000}
+
+
+def parse_count(value: Any) -> Optional[int]:
+    """
+    解析平台返回的互动计数
+    Args:
+        value: 原始计数，如 1234、"1234"、"1,234"、"1.2万"、"3w"、"1.5k"、"10万+"
+
+    Returns:
+        解析后的整数；空值或无法识别的格式（如"赞"、"-"）返回None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    match = _COUNT_PATTERN.match(str(value).strip().replace(",", ""))
+    if not match:
+        return None
+    # 用Decimal相乘，避免"1.13万"因浮点误差截断为11299
+    return int(Decimal(match.group(1)) * _COUNT_UNITS.get(match.group(2), 1))
+
+
+def fill_typed_counters(table_name: str, target: Any) -> None:
+    """
+    按文本计数列填充对象上对应的数值列（入库前调用）
+    Args:
+        table_name: 表名
+        target: ORM对象
+
+    Returns:
+
+    """
+    for text_column, num_column in TYPED_COUNTER_COLUMNS.get(table_name, {}).items():
+        raw_value = getattr(target, text_column, None)
+        if raw_value is not None:
+            setattr(target, num_column, parse_count(raw_value))
+
+
+def typed_counter_values(table_name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按文本计数列补齐更新字典中的数值列。Core的update(...).values(...)不触发ORM的before_update事件，
+    构造更新语句前需调用本函数，否则重复爬取时数值列不会随文本列更新
+    Args:
+        table_name: 表名
+        values: 列名 -> 新值
+
+    Returns:
+        补齐数值列后的新字典
+    """
+    filled = dict(values)
+    for text_column, num_column in TYPED_COUNTER_COLUMNS.get(table_name, {}).items():
+        if filled.get(text_column) is not None:
+            filled[num_column] = parse_count(filled[text_column])
+    return filled
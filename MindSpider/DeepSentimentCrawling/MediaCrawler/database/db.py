@@ -13,6 +13,7 @@ if str(project_root) not in sys.path:
 
 from tools import utils
 from database.db_session import create_tables
+from database.seen_ids import save_seen_id_filters
 
 async def init_table_schema(db_type: str):
     """
@@ -30,6 +31,6 @@ async def init_db(db_type: str = None):
 
 async def close():
     """
-    Placeholder for closing database connections if needed in the future.
+    Save the seen-id bloom filter snapshots before exit.
     """
-    pass
+    save_seen_id_filters()
@@ -0,0 +1,113 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 爬取关键词维度表
+#            每个搜索关键词在crawl_keyword表中对应一个整数id，内容/评论入库时写入keyword_id，
+#            "某关键词下爬到的全部内容"按(keyword_id, 发布时间)索引查询，不再对source_keyword做LIKE扫描
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tools.time_util import get_current_timestamp
+
+from .models import CrawlKeyword
+
+KEYWORD_MAX_LENGTH = 255
+
+# 内容表 -> 发布时间列
+KEYWORD_CONTENT_TABLES: Dict[str, str] = {
+    "bilibili_video": "create_time",
+    "douyin_aweme": "create_time",
+    "kuaishou_video": "create_time",
+    "weibo_note": "create_time",
+    "xhs_note": "time",
+    "tieba_note": "publish_time",
+    "zhihu_content": "created_time",
+}
+
+# 评论表 -> (发布时间列, 所属内容表, 关联字段)；评论的keyword_id与所属内容一致
+KEYWORD_COMMENT_TABLES: Dict[str, tuple] = {
+    "bilibili_video_comment": ("create_time", "bilibili_video", "video_id"),
+    "douyin_aweme_comment": ("create_time", "douyin_aweme", "aweme_id"),
+    "kuaishou_video_comment": ("create_time", "kuaishou_video", "video_id"),
+    "weibo_note_comment": ("create_time", "weibo_note", "note_id"),
+    "xhs_note_comment": ("create_time", "xhs_note", "note_id"),
+    "tieba_comment": ("publish_time", "tieba_note", "note_id"),
+    "zhihu_comment": ("publish_time", "zhihu_content", "content_id"),
+}
+
+# 进程内缓存：关键词 -> id（只缓存已落库的关键词），同一关键词下的内容与评论不再重复查询维度表
+_keyword_id_cache: Dict[str, int] = {}
+
+
+def normalize_keyword(keyword: Optional[str]) -> str:
+    """
+    规范化关键词（去除首尾空白并截断到维度表字段长度）
+    Args:
+        keyword: 原始关键词
+
+    Returns:
+
+    """
+    return (keyword or "").strip()[:KEYWORD_MAX_LENGTH]
+
+
+async def get_or_create_keyword_id(session: AsyncSession, keyword: Optional[str]) -> Optional[int]:
+    """
+    获取关键词在crawl_keyword表中的id，不存在时新建
+    Args:
+        session: 数据库会话
+        keyword: 搜索关键词
+
+    Returns:
+        关键词id；关键词为空（详情/创作者模式）时返回None
+    """
+    keyword = normalize_keyword(keyword)
+    if not keyword:
+        return None
+    if keyword in _keyword_id_cache:
+        return _keyword_id_cache[keyword]
+
+    stmt = select(CrawlKeyword.id).where(CrawlKeyword.keyword == keyword)
+    keyword_id = (await session.execute(stmt)).scalar_one_or_none()
+    if keyword_id is None:
+        now = get_current_timestamp()
+        db_keyword = CrawlKeyword(keyword=keyword, add_ts=now, last_modify_ts=now)
+        try:
+            async with session.begin_nested():
+                session.add(db_keyword)
+            keyword_id = db_keyword.id
+        except IntegrityError:
+            # 其他爬虫进程已写入同一关键词，以已有的行为准
+            keyword_id = (await session.execute(stmt)).scalar_one()
+        # 新建的行要等外层事务提交后才可靠，下次查到时再缓存
+        return keyword_id
+
+    _keyword_id_cache[keyword] = keyword_id
+    return keyword_id
+
+
+async def attach_keyword_id(session: AsyncSession, item: Dict, keyword: Optional[str]) -> None:
+    """
+    为待入库的内容/评论写入keyword_id（关键词为空时不覆盖已有值）
+    Args:
+        session: 数据库会话
+        item: 内容或评论字典
+        keyword: 当前搜索关键词（source_keyword_var）
+
+    Returns:
+
+    """
+    keyword_id = await get_or_create_keyword_id(session, keyword)
+    if keyword_id is not None:
+        item["keyword_id"] = keyword_id
@@ -1,11 +1,21 @@
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, ForeignKey, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from .counters import fill_typed_counters
+
 Base = declarative_base()
 
+class CrawlKeyword(Base):
+    __tablename__ = 'crawl_keyword'
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String(255), nullable=False, unique=True)
+    add_ts = Column(BigInteger)
+    last_modify_ts = Column(BigInteger)
+
 class BilibiliVideo(Base):
     __tablename__ = 'bilibili_video'
+    __table_args__ = (Index('idx_bilibili_video_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     video_id = Column(BigInteger, nullable=False, index=True, unique=True)
     video_url = Column(Text, nullable=False)
@@ -21,16 +31,24 @@ class BilibiliVideo(Base):
     create_time = Column(BigInteger, index=True)
     disliked_count = Column(Text)
     video_play_count = Column(Text)
+    video_play_count_num = Column(BigInteger, index=True)
     video_favorite_count = Column(Text)
+    video_favorite_count_num = Column(BigInteger)
     video_share_count = Column(Text)
+    video_share_count_num = Column(BigInteger)
     video_coin_count = Column(Text)
+    video_coin_count_num = Column(BigInteger)
     video_danmaku = Column(Text)
+    video_danmaku_num = Column(BigInteger)
     video_comment = Column(Text)
+    video_comment_num = Column(BigInteger)
     video_cover_url = Column(Text)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class BilibiliVideoComment(Base):
     __tablename__ = 'bilibili_video_comment'
+    __table_args__ = (Index('idx_bilibili_video_comment_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -44,8 +62,11 @@ class BilibiliVideoComment(Base):
     content = Column(Text)
     create_time = Column(BigInteger)
     sub_comment_count = Column(Text)
+    sub_comment_count_num = Column(BigInteger)
     parent_comment_id = Column(String(255))
     like_count = Column(Text, default='0')
+    like_count_num = Column(BigInteger, index=True)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class BilibiliUpInfo(Base):
     __tablename__ = 'bilibili_up_info'
@@ -93,6 +114,7 @@ class BilibiliUpDynamic(Base):
 
 class DouyinAweme(Base):
     __tablename__ = 'douyin_aweme'
+    __table_args__ = (Index('idx_douyin_aweme_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     sec_uid = Column(String(255))
@@ -110,18 +132,24 @@ class DouyinAweme(Base):
     desc = Column(Text)
     create_time = Column(BigInteger, index=True)
     liked_count = Column(Text)
+    liked_count_num = Column(BigInteger, index=True)
     comment_count = Column(Text)
+    comment_count_num = Column(BigInteger)
     share_count = Column(Text)
+    share_count_num = Column(BigInteger)
     collected_count = Column(Text)
+    collected_count_num = Column(BigInteger)
     aweme_url = Column(Text)
     cover_url = Column(Text)
     video_download_url = Column(Text)
     music_download_url = Column(Text)
     note_download_url = Column(Text)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class DouyinAwemeComment(Base):
     __tablename__ = 'douyin_aweme_comment'
+    __table_args__ = (Index('idx_douyin_aweme_comment_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     sec_uid = Column(String(255))
@@ -138,9 +166,12 @@ class DouyinAwemeComment(Base):
     content = Column(Text)
     create_time = Column(BigInteger)
     sub_comment_count = Column(Text)
+    sub_comment_count_num = Column(BigInteger)
     parent_comment_id = Column(String(255))
     like_count = Column(Text, default='0')
+    like_count_num = Column(BigInteger, index=True)
     pictures = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class DyCreator(Base):
     __tablename__ = 'dy_creator'
@@ -160,6 +191,7 @@ class DyCreator(Base):
 
 class KuaishouVideo(Base):
     __tablename__ = 'kuaishou_video'
+    __table_args__ = (Index('idx_kuaishou_video_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(64))
     nickname = Column(Text)
@@ -172,14 +204,18 @@ class KuaishouVideo(Base):
     desc = Column(Text)
     create_time = Column(BigInteger, index=True)
     liked_count = Column(Text)
+    liked_count_num = Column(BigInteger, index=True)
     viewd_count = Column(Text)
+    viewd_count_num = Column(BigInteger)
     video_url = Column(Text)
     video_cover_url = Column(Text)
     video_play_url = Column(Text)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class KuaishouVideoComment(Base):
     __tablename__ = 'kuaishou_video_comment'
+    __table_args__ = (Index('idx_kuaishou_video_comment_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(Text)
     nickname = Column(Text)
@@ -191,9 +227,12 @@ class KuaishouVideoComment(Base):
     content = Column(Text)
     create_time = Column(BigInteger)
     sub_comment_count = Column(Text)
+    sub_comment_count_num = Column(BigInteger)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class WeiboNote(Base):
     __tablename__ = 'weibo_note'
+    __table_args__ = (Index('idx_weibo_note_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -208,13 +247,18 @@ class WeiboNote(Base):
     create_time = Column(BigInteger, index=True)
     create_date_time = Column(String(255), index=True)
     liked_count = Column(Text)
+    liked_count_num = Column(BigInteger, index=True)
     comments_count = Column(Text)
+    comments_count_num = Column(BigInteger)
     shared_count = Column(Text)
+    shared_count_num = Column(BigInteger)
     note_url = Column(Text)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class WeiboNoteComment(Base):
     __tablename__ = 'weibo_note_comment'
+    __table_args__ = (Index('idx_weibo_note_comment_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -230,8 +274,11 @@ class WeiboNoteComment(Base):
     create_time = Column(BigInteger)
     create_date_time = Column(String(255), index=True)
     comment_like_count = Column(Text)
+    comment_like_count_num = Column(BigInteger, index=True)
     sub_comment_count = Column(Text)
+    sub_comment_count_num = Column(BigInteger)
     parent_comment_id = Column(String(255))
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class WeiboCreator(Base):
     __tablename__ = 'weibo_creator'
@@ -266,6 +313,7 @@ class XhsCreator(Base):
 
 class XhsNote(Base):
     __tablename__ = 'xhs_note'
+    __table_args__ = (Index('idx_xhs_note_keyword_time', 'keyword_id', 'time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -281,17 +329,23 @@ class XhsNote(Base):
     time = Column(BigInteger, index=True)
     last_update_time = Column(BigInteger)
     liked_count = Column(Text)
+    liked_count_num = Column(BigInteger, index=True)
     collected_count = Column(Text)
+    collected_count_num = Column(BigInteger)
     comment_count = Column(Text)
+    comment_count_num = Column(BigInteger)
     share_count = Column(Text)
+    share_count_num = Column(BigInteger)
     image_list = Column(Text)
     tag_list = Column(Text)
     note_url = Column(Text)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
     xsec_token = Column(Text)
 
 class XhsNoteComment(Base):
     __tablename__ = 'xhs_note_comment'
+    __table_args__ = (Index('idx_xhs_note_comment_keyword_time', 'keyword_id', 'create_time'),)
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
     nickname = Column(Text)
@@ -307,9 +361,12 @@ class XhsNoteComment(Base):
     pictures = Column(Text)
     parent_comment_id = Column(String(255))
     like_count = Column(Text)
+    like_count_num = Column(BigInteger, index=True)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class TiebaNote(Base):
     __tablename__ = 'tieba_note'
+    __table_args__ = (Index('idx_tieba_note_keyword_time', 'keyword_id', 'publish_time'),)
     id = Column(Integer, primary_key=True)
     note_id = Column(String(644), index=True)
     title = Column(Text)
@@ -328,9 +385,11 @@ class TiebaNote(Base):
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
     source_keyword = Column(Text, default='')
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class TiebaComment(Base):
     __tablename__ = 'tieba_comment'
+    __table_args__ = (Index('idx_tieba_comment_keyword_time', 'keyword_id', 'publish_time'),)
     id = Column(Integer, primary_key=True)
     comment_id = Column(String(255), index=True)
     parent_comment_id = Column(String(255), default='')
@@ -348,6 +407,7 @@ class TiebaComment(Base):
     note_url = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class TiebaCreator(Base):
     __tablename__ = 'tieba_creator'
@@ -366,6 +426,7 @@ class TiebaCreator(Base):
 
 class ZhihuContent(Base):
     __tablename__ = 'zhihu_content'
+    __table_args__ = (Index('idx_zhihu_content_keyword_time', 'keyword_id', 'created_time'),)
     id = Column(Integer, primary_key=True)
     content_id = Column(String(64), index=True)
     content_type = Column(Text)
@@ -379,6 +440,7 @@ class ZhihuContent(Base):
     voteup_count = Column(Integer, default=0)
     comment_count = Column(Integer, default=0)
     source_keyword = Column(Text)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
     user_id = Column(String(255))
     user_link = Column(Text)
     user_nickname = Column(Text)
@@ -394,6 +456,7 @@ class ZhihuContent(Base):
 
 class ZhihuComment(Base):
     __tablename__ = 'zhihu_comment'
+    __table_args__ = (Index('idx_zhihu_comment_keyword_time', 'keyword_id', 'publish_time'),)
     id = Column(Integer, primary_key=True)
     comment_id = Column(String(64), index=True)
     parent_comment_id = Column(String(64))
@@ -411,6 +474,7 @@ class ZhihuComment(Base):
     user_avatar = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
+    keyword_id = Column(Integer, ForeignKey('crawl_keyword.id', ondelete='SET NULL'))
 
 class ZhihuCreator(Base):
     __tablename__ = 'zhihu_creator'
@@ -431,4 +495,11 @@ class ZhihuCreator(Base):
     column_count = Column(Integer, default=0)
     get_voteup_count = Column(Integer, default=0)
     add_ts = Column(BigInteger)
-    last_modify_ts = Column(BigInteger)
\ No newline at end of file
+    last_modify_ts = Column(BigInteger)
+
+
+@event.listens_for(Base, "before_insert", propagate=True)
+@event.listens_for(Base, "before_update", propagate=True)
+def _fill_typed_counters(mapper, connection, target):
+    # 文本计数列（如"1.2万"）入库时解析一次写入对应的_num数值列
+    fill_typed_counters(target.__tablename__, target)
@@ -0,0 +1,231 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 已入库id的布隆过滤器
+#            DB存储实现入库前按note_id/comment_id/user_id先查询一次再决定更新还是插入，评论量大且多为新评论时每行多一次往返；
+#            这里每张表维护一个已入库id的布隆过滤器，判定为新的id直接插入，只有"可能已存在"的id才查询数据库。
+#            过滤器首次使用时加载快照，再按主键分块扫描快照之后新增的行；快照失效（数据库被清空或删过行）时全量扫描。
+#            同一张表若有其他进程在本进程预热之后写入，其写入的id不在过滤器中，不适用于多进程同时写同一平台的场景
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from config.db_config import SEEN_ID_FILTER_DIR
+from tools import utils
+from tools.bloom_filter import BloomFilter
+
+
+class SeenIdFilter:
+    """单张表某个id列的已入库id过滤器"""
+
+    def __init__(self, model, id_column: str, memory_bytes: int, false_positive_rate: float, snapshot_path: str):
+        """
+        Args:
+            model: ORM模型（需有自增主键id）
+            id_column: 去重依据的列，如note_id、comment_id、user_id
+            memory_bytes: 过滤器内存
+            false_positive_rate: 目标误判率
+            snapshot_path: 快照文件路径
+        """
+        self.model = model
+        self.id_column = id_column
+        self.name = f"{model.__tablename__}.{id_column}"
+        self.false_positive_rate = false_positive_rate
+        self.snapshot_path = snapshot_path
+        self.bloom = BloomFilter.for_memory(memory_bytes, false_positive_rate)
+        # 已扫描到的最大主键及主键不超过它的行数，用于判断快照是否仍然有效
+        self.scanned_max_pk = 0
+        self.scanned_rows = 0
+        self.saved_at = time.monotonic()
+        self.skipped_lookups = 0
+        self.lookups = 0
+        self.false_positives = 0
+
+    async def warm(self, session: AsyncSession, chunk_size: int):
+        """
+        预热：加载快照，再按主键分块扫描快照之后的行
+        Args:
+            session: 数据库会话
+            chunk_size: 每次扫描的行数
+
+        Returns:
+
+        """
+        started = time.monotonic()
+        await self._load_snapshot(session)
+        pk, id_column = self.model.id, getattr(self.model, self.id_column)
+        scanned = 0
+        while True:
+            stmt = select(pk, id_column).where(pk > self.scanned_max_pk).order_by(pk).limit(chunk_size)
+            rows = (await session.execute(stmt)).all()
+            for _, item_id in rows:
+                if item_id is not None:
+                    self.bloom.add(item_id)
+            scanned += len(rows)
+            if rows:
+                self.scanned_max_pk = rows[-1][0]
+                self.scanned_rows += len(rows)
+            if len(rows) < chunk_size:
+                break
+        utils.logger.info(f"[SeenIdFilter.warm] {self.name}: scanned {scanned} rows in {time.monotonic() - started:.1f}s, "
+                          f"{self.bloom.count} ids in filter")
+
+    async def _load_snapshot(self, session: AsyncSession):
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            bloom, meta = BloomFilter.load(self.snapshot_path)
+        except (OSError, ValueError) as e:
+            utils.logger.warning(f"[SeenIdFilter._load_snapshot] {self.name}: ignore broken snapshot: {e}")
+            return
+        if (bloom.num_bits, bloom.num_hashes) != (self.bloom.num_bits, self.bloom.num_hashes):
+            utils.logger.info(f"[SeenIdFilter._load_snapshot] {self.name}: filter size changed, rebuild from database")
+            return
+        max_pk, rows = meta.get("scanned_max_pk", 0), meta.get("scanned_rows", 0)
+        stmt = select(func.count()).select_from(self.model).where(self.model.id <= max_pk)
+        if (await session.execute(stmt)).scalar_one() != rows:
+            utils.logger.info(f"[SeenIdFilter._load_snapshot] {self.name}: database changed since snapshot, rebuild from database")
+            return
+        self.bloom, self.scanned_max_pk, self.scanned_rows = bloom, max_pk, rows
+
+    def might_exist(self, item_id: Any) -> bool:
+        """
+        id是否可能已入库（False表示一定未入库）
+        Args:
+            item_id: 内容/评论/用户id
+
+        Returns:
+
+        """
+        return item_id in self.bloom
+
+    def add(self, item_id: Any):
+        """
+        记录即将入库的id，并按间隔落盘
+        Args:
+            item_id: 内容/评论/用户id
+
+        Returns:
+
+        """
+        self.bloom.add(item_id)
+        if time.monotonic() - self.saved_at >= config.SEEN_ID_FILTER_SAVE_INTERVAL_SEC:
+            self.save()
+
+    def save(self):
+        """快照落盘并输出统计"""
+        self.saved_at = time.monotonic()
+        try:
+            self.bloom.save(self.snapshot_path, {"scanned_max_pk": self.scanned_max_pk, "scanned_rows": self.scanned_rows})
+        except OSError as e:
+            utils.logger.warning(f"[SeenIdFilter.save] {self.name}: save snapshot failed: {e}")
+        self.log_stats()
+
+    def stats(self) -> Dict:
+        """
+        过滤器统计
+        Returns:
+            memory_bytes、ids、capacity、estimated_false_positive_rate、
+            skipped_lookups（判定为新而省去的查询）、lookups、observed_false_positive_rate（查询后发现并不存在的比例）
+        """
+        return {
+            "memory_bytes": self.bloom.memory_bytes,
+            "ids": self.bloom.count,
+            "capacity": self.bloom.capacity(self.false_positive_rate),
+            "estimated_false_positive_rate": self.bloom.estimated_false_positive_rate(),
+            "skipped_lookups": self.skipped_lookups,
+            "lookups": self.lookups,
+            "observed_false_positive_rate": self.false_positives / self.lookups if self.lookups else 0.0,
+        }
+
+    def log_stats(self):
+        """把统计写入爬虫日志，元素数超过容量时提示调大内存"""
+        stats = self.stats()
+        utils.logger.info(f"[SeenIdFilter] {self.name}: memory {stats['memory_bytes'] / 1024 / 1024:.1f}MB, "
+                          f"ids {stats['ids']}/{stats['capacity']}, "
+                          f"false positive rate estimated {stats['estimated_false_positive_rate']:.4f} "
+                          f"observed {stats['observed_false_positive_rate']:.4f}, "
+                          f"lookups skipped {stats['skipped_lookups']} / done {stats['lookups']}")
+        if stats["ids"] > stats["capacity"]:
+            utils.logger.warning(f"[SeenIdFilter] {self.name}: ids exceed capacity, increase SEEN_ID_FILTER_MEMORY_MB")
+
+
+# 表名.id列 -> 过滤器，进程内共享
+_seen_id_filters: Dict[str, SeenIdFilter] = {}
+_warm_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_seen_id_filter(session: AsyncSession, model, id_column: str) -> SeenIdFilter:
+    """
+    获取表的已入库id过滤器，首次使用时预热
+    Args:
+        session: 数据库会话
+        model: ORM模型
+        id_column: 去重依据的列
+
+    Returns:
+
+    """
+    name = f"{model.__tablename__}.{id_column}"
+    if name in _seen_id_filters:
+        return _seen_id_filters[name]
+    lock = _warm_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        if name not in _seen_id_filters:
+            seen_ids = SeenIdFilter(
+                model,
+                id_column,
+                memory_bytes=int(config.SEEN_ID_FILTER_MEMORY_MB * 1024 * 1024),
+                false_positive_rate=config.SEEN_ID_FILTER_FALSE_POSITIVE_RATE,
+                snapshot_path=os.path.join(SEEN_ID_FILTER_DIR, f"{config.SAVE_DATA_OPTION}_{name}.bloom"),
+            )
+            await seen_ids.warm(session, config.SEEN_ID_FILTER_WARM_CHUNK_SIZE)
+            _seen_id_filters[name] = seen_ids
+    return _seen_id_filters[name]
+
+
+async def find_existing(session: AsyncSession, model, id_column: str, item_id: Any) -> Optional[Any]:
+    """
+    按id查询已入库的行：过滤器判定为新的id不再查询数据库，直接返回None
+    Args:
+        session: 数据库会话
+        model: ORM模型
+        id_column: 去重依据的列
+        item_id: 内容/评论/用户id
+
+    Returns:
+        已入库的行，不存在时返回None
+    """
+    stmt = select(model).where(getattr(model, id_column) == item_id)
+    if not config.ENABLE_SEEN_ID_FILTER or item_id is None:
+        return (await session.execute(stmt)).scalars().first()
+
+    seen_ids = await get_seen_id_filter(session, model, id_column)
+    if not seen_ids.might_exist(item_id):
+        seen_ids.skipped_lookups += 1
+        seen_ids.add(item_id)
+        return None
+    seen_ids.lookups += 1
+    row = (await session.execute(stmt)).scalars().first()
+    if row is None:
+        seen_ids.false_positives += 1
+    return row
+
+
+def save_seen_id_filters():
+    """保存全部过滤器快照并输出统计（爬虫退出时调用）"""
+    for seen_ids in _seen_id_filters.values():
+        seen_ids.save()
@@ -23,6 +23,7 @@ from playwright.async_api import BrowserContext, Page
 
 import config
 from base.base_crawler import AbstractApiClient
+from base.rate_control import get_rate_controller
 from tools import utils
 
 from .exception import DataFetchError
@@ -31,6 +32,8 @@ from .help import BilibiliSign
 
 
 class BilibiliClient(AbstractApiClient):
+    # 风控拦截：-412 请求被拦截，-352 风控校验失败
+    RISK_CONTROL_CODES = (-412, -352)
 
     def __init__(
         self,
@@ -47,13 +50,21 @@ class BilibiliClient(AbstractApiClient):
         self._host = "https://api.bilibili.com"
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        self.rate_controller = get_rate_controller("bilibili")
 
     async def request(self, method, url, **kwargs) -> Any:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
-        try:
-            data: Dict = response.json()
-        except json.JSONDecodeError:
+        async with self.rate_controller.request(url) as ticket:
+            async with httpx.AsyncClient(proxy=self.proxy) as client:
+                response = await client.request(method, url, timeout=self.timeout, **kwargs)
+            ticket.observe(response.status_code)
+            try:
+                data: Optional[Dict] = response.json()
+            except json.JSONDecodeError:
+                data = None
+            # 风控码在响应体中，需在退出限速上下文前上报，否则本次请求会被记为成功并重置连续限流次数
+            if data is not None and data.get("code") in self.RISK_CONTROL_CODES:
+                ticket.throttle(f"code {data.get('code')}")
+        if data is None:
             utils.logger.error(f"[BilibiliClient.request] Failed to decode JSON from response. status_code: {response.status_code}, response_text: {response.text}")
             raise DataFetchError(f"Failed to decode JSON, content: {response.text}")
         if data.get("code") != 0:
@@ -32,6 +32,8 @@ from playwright._impl._errors import TargetClosedError
 
 import config
 from base.base_crawler import AbstractCrawler
+from base.crawl_frontier import CrawlFrontier, make_fingerprint, open_crawl_frontier
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import bilibili as bilibili_store
 from tools import utils
@@ -50,6 +52,7 @@ class BilibiliCrawler(AbstractCrawler):
     bili_client: BilibiliClient
     browser_context: BrowserContext
     cdp_manager: Optional[CDPBrowserManager]
+    crawl_frontier: CrawlFrontier
 
     def __init__(self):
         self.index_url = "https://www.bilibili.com"
@@ -57,6 +60,8 @@ class BilibiliCrawler(AbstractCrawler):
         self.cdp_manager = None
 
     async def start(self):
+        # 本平台所有请求共用的并发上限与请求令牌
+        self.crawl_budget = CrawlBudget(config.MAX_CONCURRENCY_NUM, config.CRAWLER_MAX_REQUESTS_PER_SEC, config.CRAWLER_REQUEST_BURST)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(config.IP_PROXY_POOL_COUNT, enable_validate_ip=True)
@@ -169,9 +174,26 @@ class BilibiliCrawler(AbstractCrawler):
     async def search_by_keywords(self):
         """
         search bilibili video with keywords in normal mode
+        搜索翻页、视频详情入库、评论抓取三个阶段通过流水线并发执行，已爬且未变化的视频跳过
         :return:
         """
         utils.logger.info("[BilibiliCrawler.search_by_keywords] Begin search bilibli keywords")
+        pipeline = CrawlPipeline("bilibili", queue_size=config.CRAWLER_PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage("detail", self.handle_search_video, workers=config.MAX_CONCURRENCY_NUM)
+        if config.ENABLE_GET_COMMENTS:
+            pipeline.add_stage("comments", self.handle_video_comments, workers=config.MAX_CONCURRENCY_NUM)
+        self.crawl_frontier = open_crawl_frontier("bilibili")
+        try:
+            await pipeline.run(self.produce_search_videos, on_finished=self.on_search_video_finished)
+        finally:
+            self.crawl_frontier.close()
+
+    async def produce_search_videos(self, emit):
+        """
+        search pages producer: emit video aid of each search result
+        :param emit:
+        :return:
+        """
         bili_limit_count = 20  # bilibili limit page fixed value
         if config.CRAWLER_MAX_NOTES_COUNT < bili_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = bili_limit_count
@@ -179,49 +201,72 @@ class BilibiliCrawler(AbstractCrawler):
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Current search keyword: {keyword}")
+            resume_page = self.crawl_frontier.resume_page(keyword, start_page)
             page = 1
             while (page - start_page + 1) * bili_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Skip page: {page}")
                     page += 1
                     continue
 
                 utils.logger.info(f"[BilibiliCrawler.search_by_keywords] search bilibili keyword: {keyword}, page: {page}")
-                video_id_list: List[str] = []
-                videos_res = await self.bili_client.search_video_by_keyword(
-                    keyword=keyword,
-                    page=page,
-                    page_size=bili_limit_count,
-                    order=SearchOrderType.DEFAULT,
-                    pubtime_begin_s=0,  # 作品发布日期起始时间戳
-                    pubtime_end_s=0,  # 作品发布日期结束日期时间戳
-                )
+                async with self.crawl_budget:
+                    videos_res = await self.bili_client.search_video_by_keyword(
+                        keyword=keyword,
+                        page=page,
+                        page_size=bili_limit_count,
+                        order=SearchOrderType.DEFAULT,
+                        pubtime_begin_s=0,  # 作品发布日期起始时间戳
+                        pubtime_end_s=0,  # 作品发布日期结束日期时间戳
+                    )
                 video_list: List[Dict] = videos_res.get("result")
 
                 if not video_list:
                     utils.logger.info(f"[BilibiliCrawler.search_by_keywords] No more videos for '{keyword}', moving to next keyword.")
                     break
 
-                semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-                task_list = []
-                try:
-                    task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
-                except Exception as e:
-                    utils.logger.warning(f"[BilibiliCrawler.search_by_keywords] error in the task list. The video for this page will not be included. {e}")
-                video_items = await asyncio.gather(*task_list)
-                for video_item in video_items:
-                    if video_item:
-                        video_id_list.append(video_item.get("View").get("aid"))
-                        await bilibili_store.update_bilibili_video(video_item)
-                        await bilibili_store.update_up_info(video_item)
-                        await self.get_bilibili_video(video_item, semaphore)
+                for video_item in video_list:
+                    aid = video_item.get("aid")
+                    fingerprint = make_fingerprint(video_item.get("review"), video_item.get("play"))
+                    if self.crawl_frontier.is_unchanged(aid, fingerprint):
+                        continue
+                    self.crawl_frontier.enqueue(keyword, page, aid, fingerprint)
+                    await emit(aid)
+                self.crawl_frontier.save_page(keyword, page + 1)
                 page += 1
-                
-                # Sleep after page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
-                
-                await self.batch_get_video_comments(video_id_list)
+
+    async def on_search_video_finished(self, aid: int, succeeded: bool):
+        """
+        record video in crawl frontier when it leaves the pipeline
+        :param aid:
+        :param succeeded:
+        :return:
+        """
+        self.crawl_frontier.complete(source_keyword_var.get(), aid, succeeded)
+
+    async def handle_search_video(self, aid: int, emit):
+        """
+        detail stage: get video detail, store it and emit aid to comment stage
+        :param aid:
+        :param emit:
+        :return:
+        """
+        video_item = await self.get_video_info_task(aid=aid, bvid="", semaphore=self.crawl_budget)
+        if not video_item:
+            return
+        await bilibili_store.update_bilibili_video(video_item)
+        await bilibili_store.update_up_info(video_item)
+        await self.get_bilibili_video(video_item, self.crawl_budget)
+        await emit(video_item.get("View").get("aid"))
+
+    async def handle_video_comments(self, video_id: str, emit):
+        """
+        comment stage: get comments for video id
+        :param video_id:
+        :param emit:
+        :return:
+        """
+        await self.get_comments(video_id, self.crawl_budget)
 
     async def search_by_keywords_in_time_range(self, daily_limit: bool):
         """
@@ -263,22 +308,22 @@ class BilibiliCrawler(AbstractCrawler):
                     try:
                         utils.logger.info(f"[BilibiliCrawler.search] search bilibili keyword: {keyword}, date: {day.ctime()}, page: {page}")
                         video_id_list: List[str] = []
-                        videos_res = await self.bili_client.search_video_by_keyword(
-                            keyword=keyword,
-                            page=page,
-                            page_size=bili_limit_count,
-                            order=SearchOrderType.DEFAULT,
-                            pubtime_begin_s=pubtime_begin_s,
-                            pubtime_end_s=pubtime_end_s,
-                        )
+                        async with self.crawl_budget:
+                            videos_res = await self.bili_client.search_video_by_keyword(
+                                keyword=keyword,
+                                page=page,
+                                page_size=bili_limit_count,
+                                order=SearchOrderType.DEFAULT,
+                                pubtime_begin_s=pubtime_begin_s,
+                                pubtime_end_s=pubtime_end_s,
+                            )
                         video_list: List[Dict] = videos_res.get("result")
 
                         if not video_list:
                             utils.logger.info(f"[BilibiliCrawler.search] No more videos for '{keyword}' on {day.ctime()}, moving to next day.")
                             break
 
-                        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-                        task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
+                        task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=self.crawl_budget) for video_item in video_list]
                         video_items = await asyncio.gather(*task_list)
 
                         for video_item in video_items:
@@ -294,14 +339,9 @@ class BilibiliCrawler(AbstractCrawler):
                                 video_id_list.append(video_item.get("View").get("aid"))
                                 await bilibili_store.update_bilibili_video(video_item)
                                 await bilibili_store.update_up_info(video_item)
-                                await self.get_bilibili_video(video_item, semaphore)
+                                await self.get_bilibili_video(video_item, self.crawl_budget)
 
                         page += 1
-                        
-                        # Sleep after page navigation
-                        await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                        utils.logger.info(f"[BilibiliCrawler.search_by_keywords_in_time_range] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
-                        
                         await self.batch_get_video_comments(video_id_list)
 
                     except Exception as e:
@@ -319,10 +359,9 @@ class BilibiliCrawler(AbstractCrawler):
             return
 
         utils.logger.info(f"[BilibiliCrawler.batch_get_video_comments] video ids:{video_id_list}")
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list: List[Task] = []
         for video_id in video_id_list:
-            task = asyncio.create_task(self.get_comments(video_id, semaphore), name=video_id)
+            task = asyncio.create_task(self.get_comments(video_id, self.crawl_budget), name=video_id)
             task_list.append(task)
         await asyncio.gather(*task_list)
 
@@ -336,8 +375,6 @@ class BilibiliCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 utils.logger.info(f"[BilibiliCrawler.get_comments] begin get video_id: {video_id} comments ...")
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[BilibiliCrawler.get_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching comments for video {video_id}")
                 await self.bili_client.get_video_all_comments(
                     video_id=video_id,
                     crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
@@ -387,8 +424,7 @@ class BilibiliCrawler(AbstractCrawler):
                 utils.logger.error(f"[BilibiliCrawler.get_specified_videos] Failed to parse video URL: {e}")
                 continue
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-        task_list = [self.get_video_info_task(aid=0, bvid=video_id, semaphore=semaphore) for video_id in bvids_list]
+        task_list = [self.get_video_info_task(aid=0, bvid=video_id, semaphore=self.crawl_budget) for video_id in bvids_list]
         video_details = await asyncio.gather(*task_list)
         video_aids_list = []
         for video_detail in video_details:
@@ -399,7 +435,7 @@ class BilibiliCrawler(AbstractCrawler):
                     video_aids_list.append(video_aid)
                 await bilibili_store.update_bilibili_video(video_detail)
                 await bilibili_store.update_up_info(video_detail)
-                await self.get_bilibili_video(video_detail, semaphore)
+                await self.get_bilibili_video(video_detail, self.crawl_budget)
         await self.batch_get_video_comments(video_aids_list)
 
     async def get_video_info_task(self, aid: int, bvid: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
@@ -413,11 +449,6 @@ class BilibiliCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 result = await self.bili_client.get_video_info(aid=aid, bvid=bvid)
-                
-                # Sleep after fetching video details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[BilibiliCrawler.get_video_info_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching video details {bvid or aid}")
-                
                 return result
             except DataFetchError as ex:
                 utils.logger.error(f"[BilibiliCrawler.get_video_info_task] Get video detail error: {ex}")
@@ -607,11 +638,10 @@ class BilibiliCrawler(AbstractCrawler):
 
         utils.logger.info(f"[BilibiliCrawler.get_all_creator_details] creator ids:{creator_id_list}")
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list: List[Task] = []
         try:
             for creator_id in creator_id_list:
-                task = asyncio.create_task(self.get_creator_details(creator_id, semaphore), name=str(creator_id))
+                task = asyncio.create_task(self.get_creator_details(creator_id, self.crawl_budget), name=str(creator_id))
                 task_list.append(task)
         except Exception as e:
             utils.logger.warning(f"[BilibiliCrawler.get_all_creator_details] error in the task list. The creator will not be included. {e}")
@@ -18,6 +18,7 @@ import httpx
 from playwright.async_api import BrowserContext
 
 from base.base_crawler import AbstractApiClient
+from base.rate_control import get_rate_controller
 from tools import utils
 from var import request_keyword_var
 
@@ -43,6 +44,7 @@ class DouYinClient(AbstractApiClient):
         self._host = "https://www.douyin.com"
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        self.rate_controller = get_rate_controller("douyin")
 
     async def __process_req_params(
         self,
@@ -95,8 +97,12 @@ class DouYinClient(AbstractApiClient):
         params["a_bogus"] = a_bogus
 
     async def request(self, method, url, **kwargs):
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        async with self.rate_controller.request(url) as ticket:
+            async with httpx.AsyncClient(proxy=self.proxy) as client:
+                response = await client.request(method, url, timeout=self.timeout, **kwargs)
+            ticket.observe(response.status_code)
+            if response.text == "blocked":
+                ticket.throttle("account blocked")
         try:
             if response.text == "" or response.text == "blocked":
                 utils.logger.error(f"request params incrr, response.text: {response.text}")
@@ -24,16 +24,19 @@ from playwright.async_api import (
 
 import config
 from base.base_crawler import AbstractCrawler
+from base.crawl_frontier import CrawlFrontier, make_fingerprint, open_crawl_frontier
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import douyin as douyin_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.js_signer import get_js_signer
 from var import crawler_type_var, source_keyword_var
 
 from .client import DouYinClient
 from .exception import DataFetchError
 from .field import PublishTimeType
-from .help import parse_video_info_from_url, parse_creator_info_from_url
+from .help import DOUYIN_SIGN_JS, parse_video_info_from_url, parse_creator_info_from_url
 from .login import DouYinLogin
 
 
@@ -42,12 +45,17 @@ class DouYinCrawler(AbstractCrawler):
     dy_client: DouYinClient
     browser_context: BrowserContext
     cdp_manager: Optional[CDPBrowserManager]
+    crawl_frontier: CrawlFrontier
 
     def __init__(self) -> None:
         self.index_url = "https://www.douyin.com"
         self.cdp_manager = None
 
     async def start(self) -> None:
+        # 本平台所有请求共用的并发上限与请求令牌
+        self.crawl_budget = CrawlBudget(config.MAX_CONCURRENCY_NUM, config.CRAWLER_MAX_REQUESTS_PER_SEC, config.CRAWLER_REQUEST_BURST)
+        # 预热签名进程池，首个请求不再等待node启动与签名脚本加载
+        await asyncio.to_thread(get_js_signer, DOUYIN_SIGN_JS)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(config.IP_PROXY_POOL_COUNT, enable_validate_ip=True)
@@ -105,7 +113,20 @@ class DouYinCrawler(AbstractCrawler):
             utils.logger.info("[DouYinCrawler.start] Douyin Crawler finished ...")
 
     async def search(self) -> None:
+        """Search pages, store awemes and get comments in a pipeline, skip unchanged awemes"""
         utils.logger.info("[DouYinCrawler.search] Begin search douyin keywords")
+        pipeline = CrawlPipeline("douyin", queue_size=config.CRAWLER_PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage("store", self.handle_search_aweme, workers=config.MAX_CONCURRENCY_NUM)
+        if config.ENABLE_GET_COMMENTS:
+            pipeline.add_stage("comments", self.handle_aweme_comments, workers=config.MAX_CONCURRENCY_NUM)
+        self.crawl_frontier = open_crawl_frontier("douyin")
+        try:
+            await pipeline.run(self.produce_search_awemes, on_finished=self.on_search_aweme_finished)
+        finally:
+            self.crawl_frontier.close()
+
+    async def produce_search_awemes(self, emit) -> None:
+        """Search pages producer: emit aweme info of each search result"""
         dy_limit_count = 10  # douyin limit page fixed value
         if config.CRAWLER_MAX_NOTES_COUNT < dy_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = dy_limit_count
@@ -113,22 +134,23 @@ class DouYinCrawler(AbstractCrawler):
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[DouYinCrawler.search] Current keyword: {keyword}")
-            aweme_list: List[str] = []
+            resume_page = self.crawl_frontier.resume_page(keyword, start_page)
             page = 0
             dy_search_id = ""
             while (page - start_page + 1) * dy_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[DouYinCrawler.search] Skip {page}")
                     page += 1
                     continue
                 try:
                     utils.logger.info(f"[DouYinCrawler.search] search douyin keyword: {keyword}, page: {page}")
-                    posts_res = await self.dy_client.search_info_by_keyword(
-                        keyword=keyword,
-                        offset=page * dy_limit_count - dy_limit_count,
-                        publish_time=PublishTimeType(config.PUBLISH_TIME_TYPE),
-                        search_id=dy_search_id,
-                    )
+                    async with self.crawl_budget:
+                        posts_res = await self.dy_client.search_info_by_keyword(
+                            keyword=keyword,
+                            offset=page * dy_limit_count - dy_limit_count,
+                            publish_time=PublishTimeType(config.PUBLISH_TIME_TYPE),
+                            search_id=dy_search_id,
+                        )
                     if posts_res.get("data") is None or posts_res.get("data") == []:
                         utils.logger.info(f"[DouYinCrawler.search] search douyin keyword: {keyword}, page: {page} is empty,{posts_res.get('data')}`")
                         break
@@ -146,14 +168,28 @@ class DouYinCrawler(AbstractCrawler):
                         aweme_info: Dict = (post_item.get("aweme_info") or post_item.get("aweme_mix_info", {}).get("mix_items")[0])
                     except TypeError:
                         continue
-                    aweme_list.append(aweme_info.get("aweme_id", ""))
-                    await douyin_store.update_douyin_aweme(aweme_item=aweme_info)
-                    await self.get_aweme_media(aweme_item=aweme_info)
-                # Sleep after each page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[DouYinCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
-            utils.logger.info(f"[DouYinCrawler.search] keyword:{keyword}, aweme_list:{aweme_list}")
-            await self.batch_get_note_comments(aweme_list)
+                    aweme_id = aweme_info.get("aweme_id", "")
+                    statistics = aweme_info.get("statistics", {})
+                    fingerprint = make_fingerprint(statistics.get("comment_count"), statistics.get("digg_count"))
+                    if self.crawl_frontier.is_unchanged(aweme_id, fingerprint):
+                        continue
+                    self.crawl_frontier.enqueue(keyword, page - 1, aweme_id, fingerprint)
+                    await emit(aweme_info)
+                self.crawl_frontier.save_page(keyword, page)
+
+    async def on_search_aweme_finished(self, aweme_info: Dict, succeeded: bool) -> None:
+        """Record aweme in crawl frontier when it leaves the pipeline"""
+        self.crawl_frontier.complete(source_keyword_var.get(), aweme_info.get("aweme_id", ""), succeeded)
+
+    async def handle_search_aweme(self, aweme_info: Dict, emit) -> None:
+        """Store stage: store aweme, download media and emit aweme id to comment stage"""
+        await douyin_store.update_douyin_aweme(aweme_item=aweme_info)
+        await self.get_aweme_media(aweme_item=aweme_info)
+        await emit(aweme_info.get("aweme_id", ""))
+
+    async def handle_aweme_comments(self, aweme_id: str, emit) -> None:
+        """Comment stage: get comments for aweme id"""
+        await self.get_comments(aweme_id, self.crawl_budget)
 
     async def get_specified_awemes(self):
         """Get the information and comments of the specified post from URLs or IDs"""
@@ -181,8 +217,7 @@ class DouYinCrawler(AbstractCrawler):
                 utils.logger.error(f"[DouYinCrawler.get_specified_awemes] Failed to parse video URL: {e}")
                 continue
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-        task_list = [self.get_aweme_detail(aweme_id=aweme_id, semaphore=semaphore) for aweme_id in aweme_id_list]
+        task_list = [self.get_aweme_detail(aweme_id=aweme_id, semaphore=self.crawl_budget) for aweme_id in aweme_id_list]
         aweme_details = await asyncio.gather(*task_list)
         for aweme_detail in aweme_details:
             if aweme_detail is not None:
@@ -195,9 +230,6 @@ class DouYinCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 result = await self.dy_client.get_video_by_id(aweme_id)
-                # Sleep after fetching aweme detail
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[DouYinCrawler.get_aweme_detail] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching aweme {aweme_id}")
                 return result
             except DataFetchError as ex:
                 utils.logger.error(f"[DouYinCrawler.get_aweme_detail] Get aweme detail error: {ex}")
@@ -215,9 +247,8 @@ class DouYinCrawler(AbstractCrawler):
             return
 
         task_list: List[Task] = []
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         for aweme_id in aweme_list:
-            task = asyncio.create_task(self.get_comments(aweme_id, semaphore), name=aweme_id)
+            task = asyncio.create_task(self.get_comments(aweme_id, self.crawl_budget), name=aweme_id)
             task_list.append(task)
         if len(task_list) > 0:
             await asyncio.wait(task_list)
@@ -235,9 +266,6 @@ class DouYinCrawler(AbstractCrawler):
                     callback=douyin_store.batch_update_dy_aweme_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
-                # Sleep after fetching comments
-                await asyncio.sleep(crawl_interval)
-                utils.logger.info(f"[DouYinCrawler.get_comments] Sleeping for {crawl_interval} seconds after fetching comments for aweme {aweme_id}")
                 utils.logger.info(f"[DouYinCrawler.get_comments] aweme_id: {aweme_id} comments have all been obtained and filtered ...")
             except DataFetchError as e:
                 utils.logger.error(f"[DouYinCrawler.get_comments] aweme_id: {aweme_id} get comments failed, error: {e}")
@@ -272,8 +300,7 @@ class DouYinCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-        task_list = [self.get_aweme_detail(post_item.get("aweme_id"), semaphore) for post_item in video_list]
+        task_list = [self.get_aweme_detail(post_item.get("aweme_id"), self.crawl_budget) for post_item in video_list]
 
         note_details = await asyncio.gather(*task_list)
         for aweme_item in note_details:
@@ -19,13 +19,13 @@ import random
 import re
 from typing import Optional
 
-import execjs
 from playwright.async_api import Page
 
 from model.m_douyin import VideoUrlInfo, CreatorUrlInfo
 from tools.crawler_util import extract_url_params_to_dict
+from tools.js_signer import get_js_signer
 
-douyin_sign_obj = execjs.compile(open('libs/douyin.js', encoding='utf-8-sig').read())
+DOUYIN_SIGN_JS = "libs/douyin.js"
 
 def get_web_id():
     """
@@ -52,8 +52,23 @@ def get_web_id():
 async def get_a_bogus(url: str, params: str, post_data: dict, user_agent: str, page: Page = None):
     """
     获取 a_bogus 参数, 目前不支持post请求类型的签名
+    签名在常驻node进程中执行，等待结果时不阻塞事件循环
     """
-    return get_a_bogus_from_js(url, params, user_agent)
+    return await get_js_signer(DOUYIN_SIGN_JS).acall(get_sign_js_name(url), params, user_agent)
+
+
+def get_sign_js_name(url: str) -> str:
+    """
+    根据请求地址选择签名函数
+    Args:
+        url:
+
+    Returns:
+
+    """
+    if "/reply" in url:
+        return "sign_reply"
+    return "sign_datail"
 
 def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     """
@@ -66,10 +81,7 @@ def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     Returns:
 
     """
-    sign_js_name = "sign_datail"
-    if "/reply" in url:
-        sign_js_name = "sign_reply"
-    return douyin_sign_obj.call(sign_js_name, params, user_agent)
+    return get_js_signer(DOUYIN_SIGN_JS).call(get_sign_js_name(url), params, user_agent)
 
 
 
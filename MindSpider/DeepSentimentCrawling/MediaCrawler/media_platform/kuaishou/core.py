@@ -26,6 +26,8 @@ from playwright.async_api import (
 
 import config
 from base.base_crawler import AbstractCrawler
+from base.crawl_frontier import CrawlFrontier, make_fingerprint, open_crawl_frontier
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
 from model.m_kuaishou import VideoUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import kuaishou as kuaishou_store
@@ -44,6 +46,7 @@ class KuaishouCrawler(AbstractCrawler):
     ks_client: KuaiShouClient
     browser_context: BrowserContext
     cdp_manager: Optional[CDPBrowserManager]
+    crawl_frontier: CrawlFrontier
 
     def __init__(self):
         self.index_url = "https://www.kuaishou.com"
@@ -51,6 +54,8 @@ class KuaishouCrawler(AbstractCrawler):
         self.cdp_manager = None
 
     async def start(self):
+        # 本平台所有请求共用的并发上限与请求令牌
+        self.crawl_budget = CrawlBudget(config.MAX_CONCURRENCY_NUM, config.CRAWLER_MAX_REQUESTS_PER_SEC, config.CRAWLER_REQUEST_BURST)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(
@@ -116,7 +121,20 @@ class KuaishouCrawler(AbstractCrawler):
             utils.logger.info("[KuaishouCrawler.start] Kuaishou Crawler finished ...")
 
     async def search(self):
+        """Search pages, store videos and get comments in a pipeline, skip unchanged videos"""
         utils.logger.info("[KuaishouCrawler.search] Begin search kuaishou keywords")
+        pipeline = CrawlPipeline("kuaishou", queue_size=config.CRAWLER_PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage("store", self.handle_search_video)
+        if config.ENABLE_GET_COMMENTS:
+            pipeline.add_stage("comments", self.handle_video_comments, workers=config.MAX_CONCURRENCY_NUM)
+        self.crawl_frontier = open_crawl_frontier("kuaishou")
+        try:
+            await pipeline.run(self.produce_search_videos, on_finished=self.on_search_video_finished)
+        finally:
+            self.crawl_frontier.close()
+
+    async def produce_search_videos(self, emit):
+        """Search pages producer: emit video feed of each search result"""
         ks_limit_count = 20  # kuaishou limit page fixed value
         if config.CRAWLER_MAX_NOTES_COUNT < ks_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = ks_limit_count
@@ -127,23 +145,24 @@ class KuaishouCrawler(AbstractCrawler):
             utils.logger.info(
                 f"[KuaishouCrawler.search] Current search keyword: {keyword}"
             )
+            resume_page = self.crawl_frontier.resume_page(keyword, start_page)
             page = 1
             while (
                 page - start_page + 1
             ) * ks_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[KuaishouCrawler.search] Skip page: {page}")
                     page += 1
                     continue
                 utils.logger.info(
                     f"[KuaishouCrawler.search] search kuaishou keyword: {keyword}, page: {page}"
                 )
-                video_id_list: List[str] = []
-                videos_res = await self.ks_client.search_info_by_keyword(
-                    keyword=keyword,
-                    pcursor=str(page),
-                    search_session_id=search_session_id,
-                )
+                async with self.crawl_budget:
+                    videos_res = await self.ks_client.search_info_by_keyword(
+                        keyword=keyword,
+                        pcursor=str(page),
+                        search_session_id=search_session_id,
+                    )
                 if not videos_res:
                     utils.logger.error(
                         f"[KuaishouCrawler.search] search info by keyword:{keyword} not found data"
@@ -158,17 +177,28 @@ class KuaishouCrawler(AbstractCrawler):
                     continue
                 search_session_id = vision_search_photo.get("searchSessionId", "")
                 for video_detail in vision_search_photo.get("feeds"):
-                    video_id_list.append(video_detail.get("photo", {}).get("id"))
-                    await kuaishou_store.update_kuaishou_video(video_item=video_detail)
-
-                # batch fetch video comments
+                    photo_info: Dict = video_detail.get("photo", {})
+                    video_id = photo_info.get("id")
+                    fingerprint = make_fingerprint(photo_info.get("commentCount"), photo_info.get("realLikeCount"))
+                    if self.crawl_frontier.is_unchanged(video_id, fingerprint):
+                        continue
+                    self.crawl_frontier.enqueue(keyword, page, video_id, fingerprint)
+                    await emit(video_detail)
+                self.crawl_frontier.save_page(keyword, page + 1)
                 page += 1
-                
-                # Sleep after page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
-                
-                await self.batch_get_video_comments(video_id_list)
+
+    async def on_search_video_finished(self, video_detail: Dict, succeeded: bool):
+        """Record video in crawl frontier when it leaves the pipeline"""
+        self.crawl_frontier.complete(source_keyword_var.get(), video_detail.get("photo", {}).get("id"), succeeded)
+
+    async def handle_search_video(self, video_detail: Dict, emit):
+        """Store stage: store video and emit video id to comment stage"""
+        await kuaishou_store.update_kuaishou_video(video_item=video_detail)
+        await emit(video_detail.get("photo", {}).get("id"))
+
+    async def handle_video_comments(self, video_id: str, emit):
+        """Comment stage: get comments for video id"""
+        await self.get_comments(video_id, self.crawl_budget)
 
     async def get_specified_videos(self):
         """Get the information and comments of the specified post"""
@@ -183,9 +213,8 @@ class KuaishouCrawler(AbstractCrawler):
                 utils.logger.error(f"Failed to parse video URL: {e}")
                 continue
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list = [
-            self.get_video_info_task(video_id=video_id, semaphore=semaphore)
+            self.get_video_info_task(video_id=video_id, semaphore=self.crawl_budget)
             for video_id in video_ids
         ]
         video_details = await asyncio.gather(*task_list)
@@ -201,11 +230,6 @@ class KuaishouCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 result = await self.ks_client.get_video_info(video_id)
-                
-                # Sleep after fetching video details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.get_video_info_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching video details {video_id}")
-                
                 utils.logger.info(
                     f"[KuaishouCrawler.get_video_info_task] Get video_id:{video_id} info result: {result} ..."
                 )
@@ -236,11 +260,10 @@ class KuaishouCrawler(AbstractCrawler):
         utils.logger.info(
             f"[KuaishouCrawler.batch_get_video_comments] video ids:{video_id_list}"
         )
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list: List[Task] = []
         for video_id in video_id_list:
             task = asyncio.create_task(
-                self.get_comments(video_id, semaphore), name=video_id
+                self.get_comments(video_id, self.crawl_budget), name=video_id
             )
             task_list.append(task)
 
@@ -259,11 +282,6 @@ class KuaishouCrawler(AbstractCrawler):
                 utils.logger.info(
                     f"[KuaishouCrawler.get_comments] begin get video_id: {video_id} comments ..."
                 )
-                
-                # Sleep before fetching comments
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.get_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds before fetching comments for video {video_id}")
-                
                 await self.ks_client.get_video_all_comments(
                     photo_id=video_id,
                     crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
@@ -413,9 +431,8 @@ class KuaishouCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list = [
-            self.get_video_info_task(post_item.get("photo", {}).get("id"), semaphore)
+            self.get_video_info_task(post_item.get("photo", {}).get("id"), self.crawl_budget)
             for post_item in video_list
         ]
 
@@ -10,4 +10,12 @@
 
 
 # -*- coding: utf-8 -*-
-from .core import TieBaCrawler
\ No newline at end of file
+# 延迟导入爬虫：解析进程与页面提取（help）只需要lxml，不应加载playwright等爬虫依赖
+
+
+def __getattr__(name):
+    if name == "TieBaCrawler":
+        from .core import TieBaCrawler
+
+        return TieBaCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
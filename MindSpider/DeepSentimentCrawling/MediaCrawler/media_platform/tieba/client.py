@@ -19,6 +19,7 @@ from tenacity import RetryError, retry, stop_after_attempt, wait_fixed
 
 import config
 from base.base_crawler import AbstractApiClient
+from base.rate_control import get_rate_controller
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import ProxyIpPool
 from tools import utils
@@ -45,9 +46,10 @@ class BaiduTieBaClient(AbstractApiClient):
             "Cookie": "",
         }
         self._host = "https://tieba.baidu.com"
-        self._page_extractor = TieBaExtractor()
+        self._page_extractor = TieBaExtractor(parse_workers=config.TIEBA_PARSE_WORKERS)
         self.default_ip_proxy = default_ip_proxy
         self.playwright_page = playwright_page  # Playwright页面对象
+        self.rate_controller = get_rate_controller("tieba")
 
     def _sync_request(self, method, url, proxy=None, **kwargs):
         """
@@ -97,13 +99,17 @@ class BaiduTieBaClient(AbstractApiClient):
         actual_proxy = proxy if proxy else self.default_ip_proxy
 
         # 在线程池中执行同步的requests请求
-        response = await asyncio.to_thread(
-            self._sync_request,
-            method,
-            url,
-            actual_proxy,
-            **kwargs
-        )
+        async with self.rate_controller.request(url) as ticket:
+            response = await asyncio.to_thread(
+                self._sync_request,
+                method,
+                url,
+                actual_proxy,
+                **kwargs
+            )
+            ticket.observe(response.status_code)
+            if response.text == "blocked":
+                ticket.throttle("account blocked")
 
         if response.status_code != 200:
             utils.logger.error(f"Request failed, method: {method}, url: {url}, status code: {response.status_code}")
@@ -210,6 +216,10 @@ class BaiduTieBaClient(AbstractApiClient):
         self.headers["Cookie"] = cookie_str
         utils.logger.info("[BaiduTieBaClient.update_cookies] Cookie has been updated")
 
+    def close(self):
+        """关闭页面解析进程池"""
+        self._page_extractor.close()
+
     async def get_notes_by_keyword(
         self,
         keyword: str,
@@ -261,7 +271,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_keyword] 成功获取搜索页面HTML,长度: {len(page_content)}")
 
             # 提取搜索结果
-            notes = self._page_extractor.extract_search_note_list(page_content)
+            notes = await self._page_extractor.run("extract_search_note_list", page_content)
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_keyword] 提取到 {len(notes)} 条帖子")
             return notes
 
@@ -298,7 +308,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_note_by_id] 成功获取帖子详情HTML,长度: {len(page_content)}")
 
             # 提取帖子详情
-            note_detail = self._page_extractor.extract_note_detail(page_content)
+            note_detail = await self._page_extractor.run("extract_note_detail", page_content)
             return note_detail
 
         except Exception as e:
@@ -345,8 +355,8 @@ class BaiduTieBaClient(AbstractApiClient):
                 page_content = await self.playwright_page.content()
 
                 # 提取评论
-                comments = self._page_extractor.extract_tieba_note_parment_comments(
-                    page_content, note_id=note_detail.note_id
+                comments = await self._page_extractor.run(
+                    "extract_tieba_note_parment_comments", page_content, note_detail.note_id
                 )
 
                 if not comments:
@@ -431,8 +441,8 @@ class BaiduTieBaClient(AbstractApiClient):
                     page_content = await self.playwright_page.content()
 
                     # 提取子评论
-                    sub_comments = self._page_extractor.extract_tieba_note_sub_comments(
-                        page_content, parent_comment=parment_comment
+                    sub_comments = await self._page_extractor.run(
+                        "extract_tieba_note_sub_comments", page_content, parment_comment
                     )
 
                     if not sub_comments:
@@ -489,7 +499,7 @@ class BaiduTieBaClient(AbstractApiClient):
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_tieba_name] 成功获取贴吧页面HTML,长度: {len(page_content)}")
 
             # 提取帖子列表
-            notes = self._page_extractor.extract_tieba_note_list(page_content)
+            notes = await self._page_extractor.run("extract_tieba_note_list", page_content)
             utils.logger.info(f"[BaiduTieBaClient.get_notes_by_tieba_name] 提取到 {len(notes)} 条帖子")
             return notes
 
@@ -596,7 +606,7 @@ class BaiduTieBaClient(AbstractApiClient):
         # 百度贴吧比较特殊一些，前10个帖子是直接展示在主页上的，要单独处理，通过API获取不到
         result: List[TiebaNote] = []
         if creator_page_html_content:
-            thread_id_list = (self._page_extractor.extract_tieba_thread_id_list_from_creator_page(creator_page_html_content))
+            thread_id_list = await self._page_extractor.run("extract_tieba_thread_id_list_from_creator_page", creator_page_html_content)
             utils.logger.info(f"[BaiduTieBaClient.get_all_notes_by_creator] got user_name:{user_name} thread_id_list len : {len(thread_id_list)}")
             note_detail_task = [self.get_note_by_id(thread_id) for thread_id in thread_id_list]
             notes = await asyncio.gather(*note_detail_task)
@@ -130,6 +130,7 @@ class TieBaCrawler(AbstractCrawler):
             else:
                 pass
 
+            self.tieba_client.close()
             utils.logger.info("[BaiduTieBaCrawler.start] Tieba Crawler finished ...")
 
     async def search(self) -> None:
@@ -10,25 +10,172 @@
 
 
 # -*- coding: utf-8 -*-
+# @Desc    : 贴吧页面提取
+#            XPath与正则在模块加载时编译一次；每个页面只解析一次为lxml树，各字段的提取共用这棵树，
+#            不再为每个字段包装parsel Selector。解析是CPU密集的，可以交给解析进程池执行（TieBaExtractor.run）
+import asyncio
 import html
 import json
 import re
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, unquote
 
-from parsel import Selector
+from lxml import etree
+from lxml.html import HTMLParser
 
 from constant import baidu_tieba as const
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
-from tools import utils
 
 GENDER_MALE = "sex_male"
 GENDER_FEMALE = "sex_female"
 
+_PUB_TIME_PATTERN = re.compile(r'<span class="tail-info">(\d{4}-\d{2}-\d{2} \d{2}:\d{2})</span>')
+_PUB_TIME_TEXT_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}')
+_IP_PATTERN = re.compile(r'IP属地:(\S+)</span>')
+_IP_TEXT_PATTERN = re.compile(r'IP属地:(\S+)')
+_CONCERN_NUM_PATTERN = re.compile(r'<span class="concern_num">\(<a[^>]*>(\d+)</a>\)</span>')
+_REGISTRATION_DURATION_PATTERN = re.compile(r'<span>吧龄:(\S+)</span>')
+# 与tools.utils.extract_text_from_html一致，这里不引入tools.utils以免解析进程加载playwright等依赖
+_SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL)
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+_XPATH_EXPRESSIONS = {
+    # 关键词搜索结果页
+    "search_posts": "//div[@class='s_post']",
+    "search_note_id": ".//span[@class='p_title']/a/@data-tid",
+    "search_title": ".//span[@class='p_title']/a/text()",
+    "search_desc": ".//div[@class='p_content']/text()",
+    "search_note_href": ".//span[@class='p_title']/a/@href",
+    "search_user_nickname": ".//a[starts-with(@href, '/home/main')]/font/text()",
+    "search_user_href": ".//a[starts-with(@href, '/home/main')]/@href",
+    "search_tieba_name": ".//a[@class='p_forum']/font/text()",
+    "search_tieba_href": ".//a[@class='p_forum']/@href",
+    "search_publish_time": ".//font[@class='p_green p_date']/text()",
+    # 贴吧帖子列表页
+    "thread_list": "//ul[@id='thread_list']/li",
+    "thread_title": ".//a[@class='j_th_tit ']/text()",
+    "thread_desc": ".//div[@class='threadlist_abs threadlist_abs_onlyline ']/text()",
+    "thread_author_href": ".//a[@class='frs-author-name j_user_card ']/@href",
+    # 帖子详情、评论页
+    "tieba_name": "//a[@class='card_title_fname']/text()",
+    "tieba_href": "//a[@class='card_title_fname']/@href",
+    "first_floor": "//div[@class='p_postlist'][1]",
+    "only_view_author_href": "//*[@id='lzonly_cntn']/@href",
+    "reply_num_infos": "//div[@id='thread_theme_5']//li[@class='l_reply_num']//span[@class='red']",
+    "title": "//title/text()",
+    "description": "//meta[@name='description']/@content",
+    "post_tail_wrap": ".//div[@class='post-tail-wrap']",
+    "tail_info_text": ".//span[@class='tail-info']/text()",
+    "ip_text": ".//span[starts-with(text(), 'IP属地:')]/text()",
+    "comments": "//div[@class='l_post l_post_bright j_l_post clearfix  ']",
+    "author_face_href": ".//a[@class='p_author_face ']/@href",
+    "author_avatar": ".//a[@class='p_author_face ']/img/@src",
+    "author_name": ".//a[@class='p_author_name j_user_card']/text()",
+    # 楼中楼（二级评论）
+    "sub_comments_first": "//li[@class='lzl_single_post j_lzl_s_p first_no_border']",
+    "sub_comments_rest": "//li[@class='lzl_single_post j_lzl_s_p ']",
+    "sub_comment_user": "./a[@class='j_user_card lzl_p_p']",
+    "sub_comment_content": ".//span[@class='lzl_content_main']",
+    "sub_comment_time": ".//span[@class='lzl_time']/text()",
+    # 创作者主页
+    "creator_space_href": "//p[@class='space']/a/@href",
+    "creator_userdata": "//div[@class='userinfo_userdata']",
+    "creator_concern_num": "//span[@class='concern_num']",
+    "creator_nickname": ".//span[@class='userinfo_username ']/text()",
+    "creator_avatar": ".//div[@class='userinfo_left_head']//img/@src",
+    "creator_thread_hrefs": "//ul[@class='new_list clearfix']//div[@class='thread_name']/a[1]/@href",
+    # 通用
+    "text": "./text()",
+    "href": "./@href",
+    "img_src": "./img/@src",
+}
+_XPATHS: Dict[str, etree.XPath] = {name: etree.XPath(expression) for name, expression in _XPATH_EXPRESSIONS.items()}
+
+
+def _xpath(element: etree._Element, name: str) -> List[Any]:
+    return _XPATHS[name](element)
+
+
+def _first(element: etree._Element, name: str, default: str = "") -> str:
+    """
+    预编译XPath的第一个结果（与parsel的 .get(default=...) 一致：元素返回其HTML，字符串原样返回）
+    Args:
+        element: lxml元素，为None时返回default
+        name: _XPATH_EXPRESSIONS中的名字
+        default: 没有结果时的返回值
+
+    Returns:
+
+    """
+    if element is None:
+        return default
+    values = _xpath(element, name)
+    if not values:
+        return default
+    value = values[0]
+    if isinstance(value, etree._Element):
+        return _outer_html(value)
+    return str(value)
+
+
+def _outer_html(element: etree._Element) -> str:
+    return etree.tostring(element, method="html", encoding="unicode", with_tail=False)
+
+
+def _extract_text_from_html(html_content: str) -> str:
+    if not html_content:
+        return ""
+    return _HTML_TAG_PATTERN.sub("", _SCRIPT_STYLE_PATTERN.sub("", html_content)).strip()
+
+
+def parse_page(page_content: str) -> etree._Element:
+    """
+    把页面解析为lxml树（解析参数与parsel.Selector(text=...)一致）
+    Args:
+        page_content: 页面HTML
+
+    Returns:
+        根元素
+    """
+    parser = HTMLParser(recover=True, encoding="utf-8", huge_tree=True)
+    body = page_content.strip().replace("\x00", "").encode("utf-8") or b"<html/>"
+    root = etree.fromstring(body, parser=parser)
+    if root is None:
+        root = etree.fromstring(b"<html/>", parser=parser)
+    return root
+
 
 class TieBaExtractor:
-    def __init__(self):
-        pass
+    def __init__(self, parse_workers: int = 0):
+        """
+        Args:
+            parse_workers: 解析进程数，0 表示在调用方线程中直接解析
+        """
+        self.parse_workers = parse_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def run(self, method: str, *args: Any) -> Any:
+        """
+        执行提取方法，配置了解析进程时在进程池中执行，不阻塞事件循环
+        Args:
+            method: 提取方法名，如 extract_note_detail
+            *args: 提取方法的参数（需可pickle）
+
+        Returns:
+            提取方法的返回值
+        """
+        if self.parse_workers <= 0:
+            return getattr(self, method)(*args)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _run_extractor, method, args)
+
+    def close(self):
+        """关闭解析进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
 
     @staticmethod
     def extract_search_note_list(page_content: str) -> List[TiebaNote]:
@@ -40,23 +187,17 @@ class TieBaExtractor:
         Returns:
             包含帖子信息的字典列表
         """
-        xpath_selector = "//div[@class='s_post']"
-        post_list = Selector(text=page_content).xpath(xpath_selector)
         result: List[TiebaNote] = []
-        for post in post_list:
-            tieba_note = TiebaNote(note_id=post.xpath(".//span[@class='p_title']/a/@data-tid").get(default='').strip(),
-                                   title=post.xpath(".//span[@class='p_title']/a/text()").get(default='').strip(),
-                                   desc=post.xpath(".//div[@class='p_content']/text()").get(default='').strip(),
-                                   note_url=const.TIEBA_URL + post.xpath(".//span[@class='p_title']/a/@href").get(
-                                       default=''),
-                                   user_nickname=post.xpath(".//a[starts-with(@href, '/home/main')]/font/text()").get(
-                                       default='').strip(), user_link=const.TIEBA_URL + post.xpath(
-                    ".//a[starts-with(@href, '/home/main')]/@href").get(default=''),
-                                   tieba_name=post.xpath(".//a[@class='p_forum']/font/text()").get(default='').strip(),
-                                   tieba_link=const.TIEBA_URL + post.xpath(".//a[@class='p_forum']/@href").get(
-                                       default=''),
-                                   publish_time=post.xpath(".//font[@class='p_green p_date']/text()").get(
-                                       default='').strip(), )
+        for post in _xpath(parse_page(page_content), "search_posts"):
+            tieba_note = TiebaNote(note_id=_first(post, "search_note_id").strip(),
+                                   title=_first(post, "search_title").strip(),
+                                   desc=_first(post, "search_desc").strip(),
+                                   note_url=const.TIEBA_URL + _first(post, "search_note_href"),
+                                   user_nickname=_first(post, "search_user_nickname").strip(),
+                                   user_link=const.TIEBA_URL + _first(post, "search_user_href"),
+                                   tieba_name=_first(post, "search_tieba_name").strip(),
+                                   tieba_link=const.TIEBA_URL + _first(post, "search_tieba_href"),
+                                   publish_time=_first(post, "search_publish_time").strip(), )
             result.append(tieba_note)
         return result
 
@@ -69,28 +210,23 @@ class TieBaExtractor:
         Returns:
 
         """
-        page_content = page_content.replace('<!--', "")
-        content_selector = Selector(text=page_content)
-        xpath_selector = "//ul[@id='thread_list']/li"
-        post_list = content_selector.xpath(xpath_selector)
+        root = parse_page(page_content.replace('<!--', ""))
+        tieba_name = _first(root, "tieba_name").strip()
+        tieba_link = const.TIEBA_URL + _first(root, "tieba_href")
         result: List[TiebaNote] = []
-        for post_selector in post_list:
-            post_field_value: Dict = self.extract_data_field_value(post_selector)
+        for post in _xpath(root, "thread_list"):
+            post_field_value: Dict = self.extract_data_field_value(post)
             if not post_field_value:
                 continue
             note_id = str(post_field_value.get("id"))
             tieba_note = TiebaNote(note_id=note_id,
-                                   title=post_selector.xpath(".//a[@class='j_th_tit ']/text()").get(default='').strip(),
-                                   desc=post_selector.xpath(
-                                       ".//div[@class='threadlist_abs threadlist_abs_onlyline ']/text()").get(
-                                       default='').strip(), note_url=const.TIEBA_URL + f"/p/{note_id}",
-                                   user_link=const.TIEBA_URL + post_selector.xpath(
-                                       ".//a[@class='frs-author-name j_user_card ']/@href").get(default='').strip(),
+                                   title=_first(post, "thread_title").strip(),
+                                   desc=_first(post, "thread_desc").strip(),
+                                   note_url=const.TIEBA_URL + f"/p/{note_id}",
+                                   user_link=const.TIEBA_URL + _first(post, "thread_author_href").strip(),
                                    user_nickname=post_field_value.get("authoer_nickname") or post_field_value.get(
                                        "author_name"),
-                                   tieba_name=content_selector.xpath("//a[@class='card_title_fname']/text()").get(
-                                       default='').strip(), tieba_link=const.TIEBA_URL + content_selector.xpath(
-                    "//a[@class='card_title_fname']/@href").get(default=''),
+                                   tieba_name=tieba_name, tieba_link=tieba_link,
                                    total_replay_num=post_field_value.get("reply_num", 0))
             result.append(tieba_note)
         return result
@@ -104,31 +240,25 @@ class TieBaExtractor:
         Returns:
 
         """
-        content_selector = Selector(text=page_content)
-        first_floor_selector = content_selector.xpath("//div[@class='p_postlist'][1]")
-        only_view_author_link = content_selector.xpath("//*[@id='lzonly_cntn']/@href").get(default='').strip()
-        note_id = only_view_author_link.split("?")[0].split("/")[-1]
+        root = parse_page(page_content)
+        first_floor = _xpath(root, "first_floor")
+        first_floor = first_floor[0] if first_floor else None
+        note_id = _first(root, "only_view_author_href").strip().split("?")[0].split("/")[-1]
         # 帖子回复数、回复页数
-        thread_num_infos = content_selector.xpath(
-            "//div[@id='thread_theme_5']//li[@class='l_reply_num']//span[@class='red']")
+        thread_num_infos = _xpath(root, "reply_num_infos")
         # IP地理位置、发表时间
-        other_info_content = content_selector.xpath(".//div[@class='post-tail-wrap']").get(default="").strip()
-        ip_location, publish_time = self.extract_ip_and_pub_time(other_info_content)
-        note = TiebaNote(note_id=note_id, title=content_selector.xpath("//title/text()").get(default='').strip(),
-                         desc=content_selector.xpath("//meta[@name='description']/@content").get(default='').strip(),
+        ip_location, publish_time = self._extract_post_tail(root)
+        tieba_name = _first(root, "tieba_name").strip()
+        note = TiebaNote(note_id=note_id, title=_first(root, "title").strip(),
+                         desc=_first(root, "description").strip(),
                          note_url=const.TIEBA_URL + f"/p/{note_id}",
-                         user_link=const.TIEBA_URL + first_floor_selector.xpath(
-                             ".//a[@class='p_author_face ']/@href").get(default='').strip(),
-                         user_nickname=first_floor_selector.xpath(
-                             ".//a[@class='p_author_name j_user_card']/text()").get(default='').strip(),
-                         user_avatar=first_floor_selector.xpath(".//a[@class='p_author_face ']/img/@src").get(
-                             default='').strip(),
-                         tieba_name=content_selector.xpath("//a[@class='card_title_fname']/text()").get(
-                             default='').strip(), tieba_link=const.TIEBA_URL + content_selector.xpath(
-                "//a[@class='card_title_fname']/@href").get(default=''), ip_location=ip_location,
-                         publish_time=publish_time,
-                         total_replay_num=thread_num_infos[0].xpath("./text()").get(default='').strip(),
-                         total_replay_page=thread_num_infos[1].xpath("./text()").get(default='').strip(), )
+                         user_link=const.TIEBA_URL + _first(first_floor, "author_face_href").strip(),
+                         user_nickname=_first(first_floor, "author_name").strip(),
+                         user_avatar=_first(first_floor, "author_avatar").strip(),
+                         tieba_name=tieba_name, tieba_link=const.TIEBA_URL + _first(root, "tieba_href"),
+                         ip_location=ip_location, publish_time=publish_time,
+                         total_replay_num=_first(thread_num_infos[0], "text").strip(),
+                         total_replay_page=_first(thread_num_infos[1], "text").strip(), )
         note.title = note.title.replace(f"【{note.tieba_name}】_百度贴吧", "")
         return note
 
@@ -142,27 +272,22 @@ class TieBaExtractor:
         Returns:
 
         """
-        xpath_selector = "//div[@class='l_post l_post_bright j_l_post clearfix  ']"
-        comment_list = Selector(text=page_content).xpath(xpath_selector)
+        root = parse_page(page_content)
+        tieba_name = _first(root, "tieba_name").strip()
         result: List[TiebaComment] = []
-        for comment_selector in comment_list:
-            comment_field_value: Dict = self.extract_data_field_value(comment_selector)
+        for comment_element in _xpath(root, "comments"):
+            comment_field_value: Dict = self.extract_data_field_value(comment_element)
             if not comment_field_value:
                 continue
-            tieba_name = comment_selector.xpath("//a[@class='card_title_fname']/text()").get(default='').strip()
-            other_info_content = comment_selector.xpath(".//div[@class='post-tail-wrap']").get(default="").strip()
-            ip_location, publish_time = self.extract_ip_and_pub_time(other_info_content)
+            ip_location, publish_time = self._extract_post_tail(comment_element)
             tieba_comment = TiebaComment(comment_id=str(comment_field_value.get("content").get("post_id")),
                                          sub_comment_count=comment_field_value.get("content").get("comment_num"),
-                                         content=utils.extract_text_from_html(
+                                         content=_extract_text_from_html(
                                              comment_field_value.get("content").get("content")),
                                          note_url=const.TIEBA_URL + f"/p/{note_id}",
-                                         user_link=const.TIEBA_URL + comment_selector.xpath(
-                                             ".//a[@class='p_author_face ']/@href").get(default='').strip(),
-                                         user_nickname=comment_selector.xpath(
-                                             ".//a[@class='p_author_name j_user_card']/text()").get(default='').strip(),
-                                         user_avatar=comment_selector.xpath(
-                                             ".//a[@class='p_author_face ']/img/@src").get(default='').strip(),
+                                         user_link=const.TIEBA_URL + _first(comment_element, "author_face_href").strip(),
+                                         user_nickname=_first(comment_element, "author_name").strip(),
+                                         user_avatar=_first(comment_element, "author_avatar").strip(),
                                          tieba_id=str(comment_field_value.get("content").get("forum_id", "")),
                                          tieba_name=tieba_name, tieba_link=f"https://tieba.baidu.com/f?kw={tieba_name}",
                                          ip_location=ip_location, publish_time=publish_time, note_id=note_id, )
@@ -179,23 +304,21 @@ class TieBaExtractor:
         Returns:
 
         """
-        selector = Selector(page_content)
+        root = parse_page(page_content)
         comments = []
-        comment_ele_list = selector.xpath("//li[@class='lzl_single_post j_lzl_s_p first_no_border']")
-        comment_ele_list.extend(selector.xpath("//li[@class='lzl_single_post j_lzl_s_p ']"))
+        comment_ele_list = _xpath(root, "sub_comments_first") + _xpath(root, "sub_comments_rest")
         for comment_ele in comment_ele_list:
             comment_value = self.extract_data_field_value(comment_ele)
             if not comment_value:
                 continue
-            comment_user_a_selector = comment_ele.xpath("./a[@class='j_user_card lzl_p_p']")[0]
-            content = utils.extract_text_from_html(
-                comment_ele.xpath(".//span[@class='lzl_content_main']").get(default=""))
+            comment_user_a = _xpath(comment_ele, "sub_comment_user")[0]
+            content = _extract_text_from_html(_first(comment_ele, "sub_comment_content"))
             comment = TiebaComment(
                 comment_id=str(comment_value.get("spid")), content=content,
-                user_link=comment_user_a_selector.xpath("./@href").get(default=""),
+                user_link=_first(comment_user_a, "href"),
                 user_nickname=comment_value.get("showname"),
-                user_avatar=comment_user_a_selector.xpath("./img/@src").get(default=""),
-                publish_time=comment_ele.xpath(".//span[@class='lzl_time']/text()").get(default="").strip(),
+                user_avatar=_first(comment_user_a, "img_src"),
+                publish_time=_first(comment_ele, "sub_comment_time").strip(),
                 parent_comment_id=parent_comment.comment_id,
                 note_id=parent_comment.note_id, note_url=parent_comment.note_url,
                 tieba_id=parent_comment.tieba_id, tieba_name=parent_comment.tieba_name,
@@ -213,23 +336,19 @@ class TieBaExtractor:
         Returns:
 
         """
-        selector = Selector(text=html_content)
-        user_link_selector = selector.xpath("//p[@class='space']/a")
-        user_link: str = user_link_selector.xpath("./@href").get(default='')
+        root = parse_page(html_content)
+        user_link: str = _first(root, "creator_space_href")
         user_link_params: Dict = parse_qs(unquote(user_link.split("?")[-1]))
         user_name = user_link_params.get("un")[0] if user_link_params.get("un") else ""
         user_id = user_link_params.get("id")[0] if user_link_params.get("id") else ""
-        userinfo_userdata_selector = selector.xpath("//div[@class='userinfo_userdata']")
-        follow_fans_selector = selector.xpath("//span[@class='concern_num']")
+        follow_fans_elements = _xpath(root, "creator_concern_num")
         follows, fans = 0, 0
-        if len(follow_fans_selector) == 2:
-            follows, fans = self.extract_follow_and_fans(follow_fans_selector)
-        user_content = userinfo_userdata_selector.get(default='')
+        if len(follow_fans_elements) == 2:
+            follows, fans = self.extract_follow_and_fans([_outer_html(element) for element in follow_fans_elements])
+        user_content = _first(root, "creator_userdata")
         return TiebaCreator(user_id=user_id, user_name=user_name,
-                            nickname=selector.xpath(".//span[@class='userinfo_username ']/text()").get(
-                                default='').strip(),
-                            avatar=selector.xpath(".//div[@class='userinfo_left_head']//img/@src").get(
-                                default='').strip(),
+                            nickname=_first(root, "creator_nickname").strip(),
+                            avatar=_first(root, "creator_avatar").strip(),
                             gender=self.extract_gender(user_content),
                             ip_location=self.extract_ip(user_content),
                             follows=follows,
@@ -249,16 +368,27 @@ class TieBaExtractor:
         Returns:
 
         """
-        selector = Selector(text=html_content)
-        thread_id_list = []
-        xpath_selector = (
-            "//ul[@class='new_list clearfix']//div[@class='thread_name']/a[1]/@href"
-        )
-        thread_url_list = selector.xpath(xpath_selector).getall()
-        for thread_url in thread_url_list:
-            thread_id = thread_url.split("?")[0].split("/")[-1]
-            thread_id_list.append(thread_id)
-        return thread_id_list
+        thread_url_list = _xpath(parse_page(html_content), "creator_thread_hrefs")
+        return [str(thread_url).split("?")[0].split("/")[-1] for thread_url in thread_url_list]
+
+    @staticmethod
+    def _extract_post_tail(element: etree._Element) -> Tuple[str, str]:
+        """
+        从元素下第一个post-tail-wrap中直接读取IP位置和发布时间，不再序列化为HTML后用正则匹配
+        Args:
+            element: 楼层或整页的lxml元素
+
+        Returns:
+            (IP位置, 发布时间)
+        """
+        post_tail = _xpath(element, "post_tail_wrap")
+        if not post_tail:
+            return "", ""
+        pub_time = next((str(text) for text in _xpath(post_tail[0], "tail_info_text")
+                         if _PUB_TIME_TEXT_PATTERN.fullmatch(text)), "")
+        ip_match = next((match for match in map(_IP_TEXT_PATTERN.fullmatch, _xpath(post_tail[0], "ip_text")) if match),
+                        None)
+        return (ip_match.group(1) if ip_match else ""), pub_time
 
     def extract_ip_and_pub_time(self, html_content: str) -> Tuple[str, str]:
         """
@@ -269,8 +399,7 @@ class TieBaExtractor:
         Returns:
 
         """
-        pattern_pub_time = re.compile(r'<span class="tail-info">(\d{4}-\d{2}-\d{2} \d{2}:\d{2})</span>')
-        time_match = pattern_pub_time.search(html_content)
+        time_match = _PUB_TIME_PATTERN.search(html_content)
         pub_time = time_match.group(1) if time_match else ""
         return self.extract_ip(html_content), pub_time
 
@@ -284,8 +413,7 @@ class TieBaExtractor:
         Returns:
 
         """
-        pattern_ip = re.compile(r'IP属地:(\S+)</span>')
-        ip_match = pattern_ip.search(html_content)
+        ip_match = _IP_PATTERN.search(html_content)
         ip = ip_match.group(1) if ip_match else ""
         return ip
 
@@ -306,18 +434,17 @@ class TieBaExtractor:
         return '未知'
 
     @staticmethod
-    def extract_follow_and_fans(selectors: List[Selector]) -> Tuple[str, str]:
+    def extract_follow_and_fans(html_contents: List[str]) -> Tuple[str, str]:
         """
         提取关注数和粉丝数
         Args:
-            selectors:
+            html_contents: 两个concern_num元素的HTML
 
         Returns:
 
         """
-        pattern = re.compile(r'<span class="concern_num">\(<a[^>]*>(\d+)</a>\)</span>')
-        follow_match = pattern.findall(selectors[0].get())
-        fans_match = pattern.findall(selectors[1].get())
+        follow_match = _CONCERN_NUM_PATTERN.findall(html_contents[0])
+        fans_match = _CONCERN_NUM_PATTERN.findall(html_contents[1])
         follows = follow_match[0] if follow_match else 0
         fans = fans_match[0] if fans_match else 0
         return follows, fans
@@ -329,21 +456,20 @@ class TieBaExtractor:
         Returns: 1.9年
 
         """
-        pattern = re.compile(r'<span>吧龄:(\S+)</span>')
-        match = pattern.search(html_content)
+        match = _REGISTRATION_DURATION_PATTERN.search(html_content)
         return match.group(1) if match else ""
 
     @staticmethod
-    def extract_data_field_value(selector: Selector) -> Dict:
+    def extract_data_field_value(element: etree._Element) -> Dict:
         """
         提取data-field的值
         Args:
-            selector:
+            element:
 
         Returns:
 
         """
-        data_field_value = selector.xpath("./@data-field").get(default='').strip()
+        data_field_value = (element.get("data-field") or "").strip()
         if not data_field_value or data_field_value == "{}":
             return {}
         try:
@@ -356,6 +482,14 @@ class TieBaExtractor:
         return data_field_dict_value
 
 
+# 解析进程内的提取器
+_process_extractor = TieBaExtractor()
+
+
+def _run_extractor(method: str, args: Tuple) -> Any:
+    return getattr(_process_extractor, method)(*args)
+
+
 def test_extract_search_note_list():
     with open("test_data/search_keyword_notes.html", "r", encoding="utf-8") as f:
         content = f.read()
@@ -25,6 +25,7 @@ from httpx import Response
 from playwright.async_api import BrowserContext, Page
 
 import config
+from base.rate_control import get_rate_controller
 from tools import utils
 
 from .exception import DataFetchError
@@ -49,11 +50,14 @@ class WeiboClient:
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
         self._image_agent_host = "https://i1.wp.com/"
+        self.rate_controller = get_rate_controller("weibo")
 
     async def request(self, method, url, **kwargs) -> Union[Response, Dict]:
         enable_return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        async with self.rate_controller.request(url) as ticket:
+            async with httpx.AsyncClient(proxy=self.proxy) as client:
+                response = await client.request(method, url, timeout=self.timeout, **kwargs)
+            ticket.observe(response.status_code)
 
         if enable_return_response:
             return response
@@ -217,8 +221,9 @@ class WeiboClient:
         :return:
         """
         url = f"{self._host}/detail/{note_id}"
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
+        async with self.rate_controller.request(url) as ticket, httpx.AsyncClient(proxy=self.proxy) as client:
             response = await client.request("GET", url, timeout=self.timeout, headers=self.headers)
+            ticket.observe(response.status_code)
             if response.status_code != 200:
                 raise DataFetchError(f"get weibo detail err: {response.text}")
             match = re.search(r'var \$render_data = (\[.*?\])\[0\]', response.text, re.DOTALL)
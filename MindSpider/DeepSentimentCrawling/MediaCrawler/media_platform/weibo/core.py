@@ -29,6 +29,8 @@ from playwright.async_api import (
 
 import config
 from base.base_crawler import AbstractCrawler
+from base.crawl_frontier import CrawlFrontier, make_fingerprint, open_crawl_frontier
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import weibo as weibo_store
 from tools import utils
@@ -47,6 +49,7 @@ class WeiboCrawler(AbstractCrawler):
     wb_client: WeiboClient
     browser_context: BrowserContext
     cdp_manager: Optional[CDPBrowserManager]
+    crawl_frontier: CrawlFrontier
 
     def __init__(self):
         self.index_url = "https://www.weibo.com"
@@ -56,6 +59,8 @@ class WeiboCrawler(AbstractCrawler):
         self.cdp_manager = None
 
     async def start(self):
+        # 本平台所有请求共用的并发上限与请求令牌
+        self.crawl_budget = CrawlBudget(config.MAX_CONCURRENCY_NUM, config.CRAWLER_MAX_REQUESTS_PER_SEC, config.CRAWLER_REQUEST_BURST)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(config.IP_PROXY_POOL_COUNT, enable_validate_ip=True)
@@ -126,7 +131,6 @@ class WeiboCrawler(AbstractCrawler):
         weibo_limit_count = 10  # weibo limit page fixed value
         if config.CRAWLER_MAX_NOTES_COUNT < weibo_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = weibo_limit_count
-        start_page = config.START_PAGE
 
         # Set the search type based on the configuration for weibo
         if config.WEIBO_SEARCH_TYPE == "default":
@@ -141,42 +145,87 @@ class WeiboCrawler(AbstractCrawler):
             utils.logger.error(f"[WeiboCrawler.search] Invalid WEIBO_SEARCH_TYPE: {config.WEIBO_SEARCH_TYPE}")
             return
 
+        pipeline = CrawlPipeline("weibo", queue_size=config.CRAWLER_PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage("store", self.handle_search_note)
+        if config.ENABLE_GET_COMMENTS:
+            pipeline.add_stage("comments", self.handle_note_comments, workers=config.MAX_CONCURRENCY_NUM)
+        self.crawl_frontier = open_crawl_frontier("weibo")
+        try:
+            await pipeline.run(lambda emit: self.produce_search_notes(emit, search_type, weibo_limit_count), on_finished=self.on_search_note_finished)
+        finally:
+            self.crawl_frontier.close()
+
+    async def produce_search_notes(self, emit, search_type: SearchType, weibo_limit_count: int):
+        """
+        search pages producer: emit mblog card of each search result
+        :param emit:
+        :param search_type:
+        :param weibo_limit_count:
+        :return:
+        """
+        start_page = config.START_PAGE
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[WeiboCrawler.search] Current search keyword: {keyword}")
+            resume_page = self.crawl_frontier.resume_page(keyword, start_page)
             page = 1
             while (page - start_page + 1) * weibo_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[WeiboCrawler.search] Skip page: {page}")
                     page += 1
                     continue
                 utils.logger.info(f"[WeiboCrawler.search] search weibo keyword: {keyword}, page: {page}")
-                search_res = await self.wb_client.get_note_by_keyword(keyword=keyword, page=page, search_type=search_type)
-                note_id_list: List[str] = []
+                async with self.crawl_budget:
+                    search_res = await self.wb_client.get_note_by_keyword(keyword=keyword, page=page, search_type=search_type)
                 note_list = filter_search_result_card(search_res.get("cards"))
                 for note_item in note_list:
-                    if note_item:
-                        mblog: Dict = note_item.get("mblog")
-                        if mblog:
-                            note_id_list.append(mblog.get("id"))
-                            await weibo_store.update_weibo_note(note_item)
-                            await self.get_note_images(mblog)
-
+                    if not note_item or not note_item.get("mblog"):
+                        continue
+                    mblog: Dict = note_item.get("mblog")
+                    fingerprint = make_fingerprint(mblog.get("comments_count"), mblog.get("attitudes_count"))
+                    if self.crawl_frontier.is_unchanged(mblog.get("id"), fingerprint):
+                        continue
+                    self.crawl_frontier.enqueue(keyword, page, mblog.get("id"), fingerprint)
+                    await emit(note_item)
+                self.crawl_frontier.save_page(keyword, page + 1)
                 page += 1
-                
-                # Sleep after page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[WeiboCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
-                
-                await self.batch_get_notes_comments(note_id_list)
+
+    async def on_search_note_finished(self, note_item: Dict, succeeded: bool):
+        """
+        record note in crawl frontier when it leaves the pipeline
+        :param note_item:
+        :param succeeded:
+        :return:
+        """
+        self.crawl_frontier.complete(source_keyword_var.get(), note_item.get("mblog").get("id"), succeeded)
+
+    async def handle_search_note(self, note_item: Dict, emit):
+        """
+        store stage: store note, download images and emit note id to comment stage
+        :param note_item:
+        :param emit:
+        :return:
+        """
+        mblog: Dict = note_item.get("mblog")
+        await weibo_store.update_weibo_note(note_item)
+        await self.get_note_images(mblog)
+        await emit(mblog.get("id"))
+
+    async def handle_note_comments(self, note_id: str, emit):
+        """
+        comment stage: get comments for note id
+        :param note_id:
+        :param emit:
+        :return:
+        """
+        await self.get_note_comments(note_id, self.crawl_budget)
 
     async def get_specified_notes(self):
         """
         get specified notes info
         :return:
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-        task_list = [self.get_note_info_task(note_id=note_id, semaphore=semaphore) for note_id in config.WEIBO_SPECIFIED_ID_LIST]
+        task_list = [self.get_note_info_task(note_id=note_id, semaphore=self.crawl_budget) for note_id in config.WEIBO_SPECIFIED_ID_LIST]
         video_details = await asyncio.gather(*task_list)
         for note_item in video_details:
             if note_item:
@@ -193,11 +242,6 @@ class WeiboCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 result = await self.wb_client.get_note_info_by_id(note_id)
-                
-                # Sleep after fetching note details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[WeiboCrawler.get_note_info_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching note details {note_id}")
-                
                 return result
             except DataFetchError as ex:
                 utils.logger.error(f"[WeiboCrawler.get_note_info_task] Get note detail error: {ex}")
@@ -217,10 +261,9 @@ class WeiboCrawler(AbstractCrawler):
             return
 
         utils.logger.info(f"[WeiboCrawler.batch_get_notes_comments] note ids:{note_id_list}")
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list: List[Task] = []
         for note_id in note_id_list:
-            task = asyncio.create_task(self.get_note_comments(note_id, semaphore), name=note_id)
+            task = asyncio.create_task(self.get_note_comments(note_id, self.crawl_budget), name=note_id)
             task_list.append(task)
         await asyncio.gather(*task_list)
 
@@ -234,11 +277,6 @@ class WeiboCrawler(AbstractCrawler):
         async with semaphore:
             try:
                 utils.logger.info(f"[WeiboCrawler.get_note_comments] begin get note_id: {note_id} comments ...")
-                
-                # Sleep before fetching comments
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[WeiboCrawler.get_note_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds before fetching comments for note {note_id}")
-                
                 await self.wb_client.get_note_all_comments(
                     note_id=note_id,
                     crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,  # Use fixed interval instead of random
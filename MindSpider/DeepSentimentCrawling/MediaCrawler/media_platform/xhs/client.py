@@ -10,7 +10,6 @@
 
 import asyncio
 import json
-import time
 from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
@@ -20,14 +19,15 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 
 import config
 from base.base_crawler import AbstractApiClient
+from base.rate_control import get_rate_controller
 from tools import utils
 
 
 from .exception import DataFetchError, IPBlockError
 from .field import SearchNoteType, SearchSortType
-from .help import get_search_id, sign
+from .help import get_search_id
 from .extractor import XiaoHongShuExtractor
-from .secsign import seccore_signv2_playwright
+from .sign_service import XhsSignService
 
 
 class XiaoHongShuClient(AbstractApiClient):
@@ -53,6 +53,13 @@ class XiaoHongShuClient(AbstractApiClient):
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
         self._extractor = XiaoHongShuExtractor()
+        self.rate_controller = get_rate_controller("xhs")
+        self.sign_service = XhsSignService(
+            playwright_page,
+            batch_size=config.XHS_SIGN_BATCH_SIZE,
+            b1_cache_sec=config.XHS_SIGN_B1_CACHE_SEC,
+            metrics_interval=config.RATE_METRICS_LOG_INTERVAL_SEC,
+        )
 
     async def _pre_headers(self, url: str, data=None) -> Dict:
         """
@@ -64,23 +71,16 @@ class XiaoHongShuClient(AbstractApiClient):
         Returns:
 
         """
-        x_s = await seccore_signv2_playwright(self.playwright_page, url, data)
-        local_storage = await self.playwright_page.evaluate("() => window.localStorage")
-        signs = sign(
-            a1=self.cookie_dict.get("a1", ""),
-            b1=local_storage.get("b1", ""),
-            x_s=x_s,
-            x_t=str(int(time.time())),
-        )
+        signs = await self.sign_service.sign(url, data, a1=self.cookie_dict.get("a1", ""))
 
-        headers = {
+        # 签名头每个请求不同，返回副本，避免并发请求互相覆盖
+        return {
+            **self.headers,
             "X-S": signs["x-s"],
             "X-T": signs["x-t"],
             "x-S-Common": signs["x-s-common"],
             "X-B3-Traceid": signs["x-b3-traceid"],
         }
-        self.headers.update(headers)
-        return self.headers
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
     async def request(self, method, url, **kwargs) -> Union[str, Any]:
@@ -96,20 +96,28 @@ class XiaoHongShuClient(AbstractApiClient):
         """
         # return response.text
         return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        async with self.rate_controller.request(url) as ticket:
+            async with httpx.AsyncClient(proxy=self.proxy) as client:
+                response = await client.request(method, url, timeout=self.timeout, **kwargs)
+            ticket.observe(response.status_code)
+            data: Optional[Dict] = None
+            if not return_response and response.status_code not in (461, 471):
+                data = response.json()
+                # IP被封的错误码在响应体中，需在退出限速上下文前上报，否则连续限流时退避不会递增
+                if not data["success"] and data["code"] == self.IP_ERROR_CODE:
+                    ticket.throttle(self.IP_ERROR_STR)
 
         if response.status_code == 471 or response.status_code == 461:
             # someday someone maybe will bypass captcha
             verify_type = response.headers["Verifytype"]
             verify_uuid = response.headers["Verifyuuid"]
+            self.sign_service.invalidate()
             msg = f"出现验证码，请求失败，Verifytype: {verify_type}，Verifyuuid: {verify_uuid}, Response: {response}"
             utils.logger.error(msg)
             raise Exception(msg)
 
         if return_response:
             return response.text
-        data: Dict = response.json()
         if data["success"]:
             return data.get("data", data.get("success", {}))
         elif data["code"] == self.IP_ERROR_CODE:
@@ -207,6 +215,7 @@ class XiaoHongShuClient(AbstractApiClient):
         cookie_str, cookie_dict = utils.convert_cookies(await browser_context.cookies())
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
+        self.sign_service.invalidate()
 
     async def get_note_by_keyword(
         self,
@@ -12,7 +12,7 @@ import asyncio
 import os
 import random
 from asyncio import Task
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from playwright.async_api import (
     BrowserContext,
@@ -25,6 +25,8 @@ from tenacity import RetryError
 
 import config
 from base.base_crawler import AbstractCrawler
+from base.crawl_frontier import CrawlFrontier, make_fingerprint, open_crawl_frontier
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
 from config import CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES
 from model.m_xiaohongshu import NoteUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
@@ -45,6 +47,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
     xhs_client: XiaoHongShuClient
     browser_context: BrowserContext
     cdp_manager: Optional[CDPBrowserManager]
+    crawl_frontier: CrawlFrontier
 
     def __init__(self) -> None:
         self.index_url = "https://www.xiaohongshu.com"
@@ -53,6 +56,8 @@ class XiaoHongShuCrawler(AbstractCrawler):
         self.cdp_manager = None
 
     async def start(self) -> None:
+        # 本平台所有请求共用的并发上限与请求令牌
+        self.crawl_budget = CrawlBudget(config.MAX_CONCURRENCY_NUM, config.CRAWLER_MAX_REQUESTS_PER_SEC, config.CRAWLER_REQUEST_BURST)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(config.IP_PROXY_POOL_COUNT, enable_validate_ip=True)
@@ -87,35 +92,52 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
             # Create a client to interact with the xiaohongshu website.
             self.xhs_client = await self.create_xhs_client(httpx_proxy_format)
-            if not await self.xhs_client.pong():
-                login_obj = XiaoHongShuLogin(
-                    login_type=config.LOGIN_TYPE,
-                    login_phone="",  # input your phone number
-                    browser_context=self.browser_context,
-                    context_page=self.context_page,
-                    cookie_str=config.COOKIES,
-                )
-                await login_obj.begin()
-                await self.xhs_client.update_cookies(browser_context=self.browser_context)
-
-            crawler_type_var.set(config.CRAWLER_TYPE)
-            if config.CRAWLER_TYPE == "search":
-                # Search for notes and retrieve their comment information.
-                await self.search()
-            elif config.CRAWLER_TYPE == "detail":
-                # Get the information and comments of the specified post
-                await self.get_specified_notes()
-            elif config.CRAWLER_TYPE == "creator":
-                # Get creator's information and their notes and comments
-                await self.get_creators_and_notes()
-            else:
-                pass
-
+            try:
+                if not await self.xhs_client.pong():
+                    login_obj = XiaoHongShuLogin(
+                        login_type=config.LOGIN_TYPE,
+                        login_phone="",  # input your phone number
+                        browser_context=self.browser_context,
+                        context_page=self.context_page,
+                        cookie_str=config.COOKIES,
+                    )
+                    await login_obj.begin()
+                    await self.xhs_client.update_cookies(browser_context=self.browser_context)
+                # 补开签名页面，多个请求并行签名
+                await self.xhs_client.sign_service.expand(self.browser_context, self.index_url, config.XHS_SIGN_PAGE_POOL_SIZE)
+
+                crawler_type_var.set(config.CRAWLER_TYPE)
+                if config.CRAWLER_TYPE == "search":
+                    # Search for notes and retrieve their comment information.
+                    await self.search()
+                elif config.CRAWLER_TYPE == "detail":
+                    # Get the information and comments of the specified post
+                    await self.get_specified_notes()
+                elif config.CRAWLER_TYPE == "creator":
+                    # Get creator's information and their notes and comments
+                    await self.get_creators_and_notes()
+                else:
+                    pass
+            finally:
+                # 签名worker与补开的签名页面在爬取异常退出时也要关闭
+                await self.xhs_client.sign_service.close()
             utils.logger.info("[XiaoHongShuCrawler.start] Xhs Crawler finished ...")
 
     async def search(self) -> None:
         """Search for notes and retrieve their comment information."""
         utils.logger.info("[XiaoHongShuCrawler.search] Begin search xiaohongshu keywords")
+        pipeline = CrawlPipeline("xhs", queue_size=config.CRAWLER_PIPELINE_QUEUE_SIZE)
+        pipeline.add_stage("detail", self.handle_search_note, workers=config.MAX_CONCURRENCY_NUM)
+        if config.ENABLE_GET_COMMENTS:
+            pipeline.add_stage("comments", self.handle_note_comments, workers=config.MAX_CONCURRENCY_NUM)
+        self.crawl_frontier = open_crawl_frontier("xhs")
+        try:
+            await pipeline.run(self.produce_search_notes, on_finished=self.on_search_note_finished)
+        finally:
+            self.crawl_frontier.close()
+
+    async def produce_search_notes(self, emit) -> None:
+        """Search pages producer: emit each search result note item"""
         xhs_limit_count = 20  # xhs limit page fixed value
         if config.CRAWLER_MAX_NOTES_COUNT < xhs_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = xhs_limit_count
@@ -123,54 +145,65 @@ class XiaoHongShuCrawler(AbstractCrawler):
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
             utils.logger.info(f"[XiaoHongShuCrawler.search] Current search keyword: {keyword}")
+            resume_page = self.crawl_frontier.resume_page(keyword, start_page)
             page = 1
             search_id = get_search_id()
             while (page - start_page + 1) * xhs_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
-                if page < start_page:
+                if page < resume_page:
                     utils.logger.info(f"[XiaoHongShuCrawler.search] Skip page {page}")
                     page += 1
                     continue
 
                 try:
                     utils.logger.info(f"[XiaoHongShuCrawler.search] search xhs keyword: {keyword}, page: {page}")
-                    note_ids: List[str] = []
-                    xsec_tokens: List[str] = []
-                    notes_res = await self.xhs_client.get_note_by_keyword(
-                        keyword=keyword,
-                        search_id=search_id,
-                        page=page,
-                        sort=(SearchSortType(config.SORT_TYPE) if config.SORT_TYPE != "" else SearchSortType.GENERAL),
-                    )
+                    async with self.crawl_budget:
+                        notes_res = await self.xhs_client.get_note_by_keyword(
+                            keyword=keyword,
+                            search_id=search_id,
+                            page=page,
+                            sort=(SearchSortType(config.SORT_TYPE) if config.SORT_TYPE != "" else SearchSortType.GENERAL),
+                        )
                     utils.logger.info(f"[XiaoHongShuCrawler.search] Search notes res:{notes_res}")
                     if not notes_res or not notes_res.get("has_more", False):
                         utils.logger.info("No more content!")
                         break
-                    semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-                    task_list = [
-                        self.get_note_detail_async_task(
-                            note_id=post_item.get("id"),
-                            xsec_source=post_item.get("xsec_source"),
-                            xsec_token=post_item.get("xsec_token"),
-                            semaphore=semaphore,
-                        ) for post_item in notes_res.get("items", {}) if post_item.get("model_type") not in ("rec_query", "hot_query")
-                    ]
-                    note_details = await asyncio.gather(*task_list)
-                    for note_detail in note_details:
-                        if note_detail:
-                            await xhs_store.update_xhs_note(note_detail)
-                            await self.get_notice_media(note_detail)
-                            note_ids.append(note_detail.get("note_id"))
-                            xsec_tokens.append(note_detail.get("xsec_token"))
-                    page += 1
-                    utils.logger.info(f"[XiaoHongShuCrawler.search] Note details: {note_details}")
-                    await self.batch_get_note_comments(note_ids, xsec_tokens)
-                    
-                    # Sleep after each page navigation
-                    await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                    utils.logger.info(f"[XiaoHongShuCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
                 except DataFetchError:
                     utils.logger.error("[XiaoHongShuCrawler.search] Get note detail error")
                     break
+                for post_item in notes_res.get("items", {}):
+                    if post_item.get("model_type") in ("rec_query", "hot_query"):
+                        continue
+                    interact_info: Dict = post_item.get("note_card", {}).get("interact_info", {})
+                    fingerprint = make_fingerprint(interact_info.get("comment_count"), interact_info.get("liked_count"))
+                    if self.crawl_frontier.is_unchanged(post_item.get("id"), fingerprint):
+                        continue
+                    self.crawl_frontier.enqueue(keyword, page, post_item.get("id"), fingerprint)
+                    await emit(post_item)
+                self.crawl_frontier.save_page(keyword, page + 1)
+                page += 1
+
+    async def on_search_note_finished(self, post_item: Dict, succeeded: bool) -> None:
+        """Record note in crawl frontier when it leaves the pipeline"""
+        self.crawl_frontier.complete(source_keyword_var.get(), post_item.get("id"), succeeded)
+
+    async def handle_search_note(self, post_item: Dict, emit) -> None:
+        """Detail stage: get note detail, store it and emit (note_id, xsec_token) to comment stage"""
+        note_detail = await self.get_note_detail_async_task(
+            note_id=post_item.get("id"),
+            xsec_source=post_item.get("xsec_source"),
+            xsec_token=post_item.get("xsec_token"),
+            semaphore=self.crawl_budget,
+        )
+        if not note_detail:
+            return
+        await xhs_store.update_xhs_note(note_detail)
+        await self.get_notice_media(note_detail)
+        await emit((note_detail.get("note_id"), note_detail.get("xsec_token")))
+
+    async def handle_note_comments(self, note: Tuple[str, str], emit) -> None:
+        """Comment stage: get comments for note"""
+        note_id, xsec_token = note
+        await self.get_comments(note_id=note_id, xsec_token=xsec_token, semaphore=self.crawl_budget)
 
     async def get_creators_and_notes(self) -> None:
         """Get creator's notes and retrieve their comment information."""
@@ -214,13 +247,12 @@ class XiaoHongShuCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list = [
             self.get_note_detail_async_task(
                 note_id=post_item.get("note_id"),
                 xsec_source=post_item.get("xsec_source"),
                 xsec_token=post_item.get("xsec_token"),
-                semaphore=semaphore,
+                semaphore=self.crawl_budget,
             ) for post_item in note_list
         ]
 
@@ -245,7 +277,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 note_id=note_url_info.note_id,
                 xsec_source=note_url_info.xsec_source,
                 xsec_token=note_url_info.xsec_token,
-                semaphore=asyncio.Semaphore(config.MAX_CONCURRENCY_NUM),
+                semaphore=self.crawl_budget,
             )
             get_note_detail_task_list.append(crawler_task)
 
@@ -287,11 +319,6 @@ class XiaoHongShuCrawler(AbstractCrawler):
                     raise Exception(f"[get_note_detail_async_task] Failed to get note detail, Id: {note_id}")
 
                 note_detail.update({"xsec_token": xsec_token, "xsec_source": xsec_source})
-                
-                # Sleep after fetching note detail
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[get_note_detail_async_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching note {note_id}")
-                
                 return note_detail
 
             except DataFetchError as ex:
@@ -308,11 +335,10 @@ class XiaoHongShuCrawler(AbstractCrawler):
             return
 
         utils.logger.info(f"[XiaoHongShuCrawler.batch_get_note_comments] Begin batch get note comments, note list: {note_list}")
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
         task_list: List[Task] = []
         for index, note_id in enumerate(note_list):
             task = asyncio.create_task(
-                self.get_comments(note_id=note_id, xsec_token=xsec_tokens[index], semaphore=semaphore),
+                self.get_comments(note_id=note_id, xsec_token=xsec_tokens[index], semaphore=self.crawl_budget),
                 name=note_id,
             )
             task_list.append(task)
@@ -331,10 +357,6 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 callback=xhs_store.batch_update_xhs_note_comments,
                 max_count=CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
             )
-            
-            # Sleep after fetching comments
-            await asyncio.sleep(crawl_interval)
-            utils.logger.info(f"[XiaoHongShuCrawler.get_comments] Sleeping for {crawl_interval} seconds after fetching comments for note {note_id}")
 
     async def create_xhs_client(self, httpx_proxy: Optional[str]) -> XiaoHongShuClient:
         """Create xhs client"""
@@ -12,7 +12,7 @@
 import hashlib
 import base64
 import json
-from typing import Any
+from typing import Any, Tuple
 
 def _build_c(e: Any, a: Any) -> str:
     c = str(e)
@@ -32,9 +32,33 @@ def _md5_hex(s: str) -> str:
 
 
 
+def build_sign_input(e: Any, a: Any) -> Tuple[str, str]:
+    """
+    window.mnsv2 的入参：c 为 URI 与请求体拼接串，d 为 c 的 MD5
+    """
+    c = _build_c(e, a)
+    return c, _md5_hex(c)
+
+
+def build_xs_token(s: str, a: Any) -> str:
+    """
+    由 window.mnsv2 的返回值 s 组装 X-S 头（XYS_ + base64(JSON)）
+    """
+    f = {
+        "x0": "4.2.6",
+        "x1": "xhs-pc-web",
+        "x2": "Mac OS",
+        "x3": s,
+        "x4": a,
+    }
+    payload = json.dumps(f, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return "XYS_" + base64.b64encode(payload).decode("ascii")
+
+
 # ============================================================
 # Playwright 版本（异步）：传入 page（Page 对象）
 #    内部用 page.evaluate('window.mnsv2(...)')
+#    批量、多页面并行签名见 sign_service.XhsSignService
 # ============================================================
 async def seccore_signv2_playwright(
     page,  # Playwright Page
@@ -48,19 +72,8 @@ async def seccore_signv2_playwright(
     用法：
       s = await page.evaluate("(c, d) => window.mnsv2(c, d)", c, d)
     """
-    c = _build_c(e, a)
-    d = _md5_hex(c)
+    c, d = build_sign_input(e, a)
 
     # 调用浏览器上下文里的 window.mnsv2
     s = await page.evaluate("(c, d) => window.mnsv2(c, d)", [c, d])
-    f = {
-        "x0": "4.2.6",
-        "x1": "xhs-pc-web",
-        "x2": "Mac OS",
-        "x3": s,
-        "x4": a,
-    }
-    payload = json.dumps(f, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    token = "XYS_" + base64.b64encode(payload).decode("ascii")
-    print(token)
-    return token
\ No newline at end of file
+    return build_xs_token(s, a)
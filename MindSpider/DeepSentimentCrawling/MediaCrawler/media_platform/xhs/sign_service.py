@@ -0,0 +1,230 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 小红书请求签名服务
+#            原先每个请求在同一个页面上先evaluate一次window.mnsv2、再evaluate一次整个localStorage，
+#            所有请求排队在一个页面的evaluate上。这里：
+#            1. b1只读取localStorage.getItem("b1")并缓存，过期、更新cookies或出现验证码时失效
+#            2. 同一浏览器上下文中开多个页面，每个页面一个worker并行签名
+#            3. worker一次取出队列中等待的多个签名请求，在一次evaluate中批量调用window.mnsv2
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.async_api import BrowserContext, Page
+
+from tools import utils
+
+from .help import sign
+from .secsign import build_sign_input, build_xs_token
+
+_BATCH_SIGN_SCRIPT = "(items) => items.map(([c, d]) => window.mnsv2(c, d))"
+_SIGN_READY_SCRIPT = "() => typeof window.mnsv2 === 'function'"
+
+
+class XhsSignService:
+    """小红书请求签名服务：多页面并行、批量调用window.mnsv2，缓存b1"""
+
+    def __init__(self, page: Page, batch_size: int = 16, b1_cache_sec: float = 300, metrics_interval: float = 60):
+        """
+        Args:
+            page: 已打开小红书首页的页面（爬虫主页面）
+            batch_size: 一次evaluate最多签名的请求数
+            b1_cache_sec: b1缓存秒数
+            metrics_interval: 签名指标写入日志的间隔秒数，<=0 表示不自动写入
+        """
+        self.batch_size = max(1, batch_size)
+        self.b1_cache_sec = b1_cache_sec
+        self.metrics_interval = metrics_interval
+        self._primary_page = page
+        self._extra_pages: List[Page] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._b1: Optional[str] = None
+        self._b1_expires_at = 0.0
+        self._b1_lock = asyncio.Lock()
+        self._reset_metrics(time.monotonic())
+
+    def _reset_metrics(self, now: float):
+        self._window_started = now
+        self.signed = 0
+        self.failed = 0
+        self.batches = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def pages(self) -> List[Page]:
+        return [self._primary_page, *self._extra_pages]
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        while len(self._workers) < len(self.pages):
+            page = self.pages[len(self._workers)]
+            self._workers.append(asyncio.create_task(self._worker(page), name=f"xhs-sign-{len(self._workers)}"))
+
+    async def expand(self, browser_context: BrowserContext, index_url: str, pool_size: int):
+        """
+        在同一浏览器上下文中补开签名页面（共享cookies与localStorage），直到共有pool_size个页面
+        Args:
+            browser_context: 浏览器上下文
+            index_url: 小红书首页
+            pool_size: 签名页面总数（含主页面）
+
+        Returns:
+
+        """
+        while len(self.pages) < pool_size:
+            page = await browser_context.new_page()
+            try:
+                await page.goto(index_url)
+                await page.wait_for_function(_SIGN_READY_SCRIPT, timeout=30000)
+            except Exception as e:
+                utils.logger.warning(f"[XhsSignService.expand] open sign page failed, keep {len(self.pages)} pages: {e}")
+                await page.close()
+                break
+            self._extra_pages.append(page)
+        utils.logger.info(f"[XhsSignService.expand] {len(self.pages)} sign pages ready")
+        if self._queue is not None:
+            self._ensure_workers()
+
+    async def _worker(self, page: Page):
+        while True:
+            batch: List[Tuple[str, str, asyncio.Future]] = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            pending = [item for item in batch if not item[2].done()]
+            try:
+                if pending:
+                    results = await page.evaluate(_BATCH_SIGN_SCRIPT, [[c, d] for c, d, _ in pending])
+                    for (_, _, future), result in zip(pending, results):
+                        if not future.done():
+                            future.set_result(result)
+                    self.batches += 1
+            except asyncio.CancelledError:
+                # close()取消worker时，本批次在途的请求也要结束，否则等待签名的调用方会一直挂起
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(RuntimeError("xhs sign service closed"))
+                raise
+            except Exception as e:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _mnsv2(self, c: str, d: str) -> str:
+        self._ensure_workers()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((c, d, future))
+        return await future
+
+    async def get_b1(self) -> str:
+        """
+        localStorage中的b1（带缓存）
+        Returns:
+
+        """
+        if self._b1 is not None and time.monotonic() < self._b1_expires_at:
+            return self._b1
+        async with self._b1_lock:
+            if self._b1 is None or time.monotonic() >= self._b1_expires_at:
+                self._b1 = await self._primary_page.evaluate("() => window.localStorage.getItem('b1') || ''")
+                self._b1_expires_at = time.monotonic() + self.b1_cache_sec
+        return self._b1
+
+    def invalidate(self):
+        """使缓存的b1失效（更新cookies、出现验证码后调用）"""
+        self._b1 = None
+        self._b1_expires_at = 0.0
+
+    async def sign(self, url: str, data: Any, a1: str) -> Dict[str, str]:
+        """
+        生成请求的签名头
+        Args:
+            url: 请求路由（GET时含查询参数）
+            data: POST请求体
+            a1: cookie中的a1
+
+        Returns:
+            x-s、x-t、x-s-common、x-b3-traceid
+        """
+        started = time.monotonic()
+        try:
+            c, d = build_sign_input(url, data)
+            mnsv2, b1 = await asyncio.gather(self._mnsv2(c, d), self.get_b1())
+            signs = sign(a1=a1, b1=b1, x_s=build_xs_token(mnsv2, data), x_t=str(int(time.time())))
+        except Exception:
+            self.failed += 1
+            raise
+        latency = time.monotonic() - started
+        self.signed += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        if self.metrics_interval > 0 and time.monotonic() - self._window_started >= self.metrics_interval:
+            self.log_metrics()
+        return signs
+
+    def snapshot(self) -> Dict:
+        """
+        当前统计窗口的签名指标
+        Returns:
+            signs_per_sec、avg_latency、max_latency、avg_batch_size、failed、pages
+        """
+        elapsed = max(time.monotonic() - self._window_started, 1e-6)
+        return {
+            "signed": self.signed,
+            "signs_per_sec": self.signed / elapsed,
+            "avg_latency": self.latency_total / self.signed if self.signed else 0.0,
+            "max_latency": self.latency_max,
+            "avg_batch_size": self.signed / self.batches if self.batches else 0.0,
+            "failed": self.failed,
+            "pages": len(self.pages),
+        }
+
+    def log_metrics(self, reset: bool = True) -> Dict:
+        """
+        把签名指标写入爬虫日志
+        Args:
+            reset: 写入后是否开始新的统计窗口
+
+        Returns:
+            写入的指标
+        """
+        metrics = self.snapshot()
+        utils.logger.info(f"[XhsSignService] signs/s: {metrics['signs_per_sec']:.2f}, "
+                          f"latency avg {metrics['avg_latency'] * 1000:.0f}ms max {metrics['max_latency'] * 1000:.0f}ms, "
+                          f"avg batch size: {metrics['avg_batch_size']:.1f}, failed: {metrics['failed']}, pages: {metrics['pages']}")
+        if reset:
+            self._reset_metrics(time.monotonic())
+        return metrics
+
+    async def close(self):
+        """停止签名worker、关闭补开的页面并输出最后的指标"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("xhs sign service closed"))
+        for page in self._extra_pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._extra_pages = []
+        if self.signed or self.failed:
+            self.log_metrics()
@@ -32,11 +32,12 @@ from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import zhihu as zhihu_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.js_signer import get_js_signer
 from var import crawler_type_var, source_keyword_var
 
 from .client import ZhiHuClient
 from .exception import DataFetchError
-from .help import ZhihuExtractor, judge_zhihu_url
+from .help import ZHIHU_SIGN_JS, ZhihuExtractor, judge_zhihu_url
 from .login import ZhiHuLogin
 
 
@@ -59,6 +60,8 @@ class ZhihuCrawler(AbstractCrawler):
         Returns:
 
         """
+        # 预热签名进程池，首个请求不再等待node启动与签名脚本加载
+        await asyncio.to_thread(get_js_signer, ZHIHU_SIGN_JS)
         playwright_proxy_format, httpx_proxy_format = None, None
         if config.ENABLE_IP_PROXY:
             ip_proxy_pool = await create_ip_pool(
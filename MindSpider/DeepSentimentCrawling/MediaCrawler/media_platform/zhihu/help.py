@@ -14,20 +14,20 @@ import json
 from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
-import execjs
 from parsel import Selector
 
 from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from tools import utils
 from tools.crawler_util import extract_text_from_html
+from tools.js_signer import get_js_signer
 
-ZHIHU_SGIN_JS = None
+ZHIHU_SIGN_JS = "libs/zhihu.js"
 
 
-def sign(url: str, cookies: str) -> Dict:
+async def sign(url: str, cookies: str) -> Dict:
     """
-    zhihu sign algorithm
+    zhihu sign algorithm, executed in the long-lived node signer pool
     Args:
         url: request url with query string
         cookies: request cookies with d_c0 key
@@ -35,12 +35,7 @@ def sign(url: str, cookies: str) -> Dict:
     Returns:
 
     """
-    global ZHIHU_SGIN_JS
-    if not ZHIHU_SGIN_JS:
-        with open("libs/zhihu.js", mode="r", encoding="utf-8-sig") as f:
-            ZHIHU_SGIN_JS = execjs.compile(f.read())
-
-    return ZHIHU_SGIN_JS.call("get_sign", url, cookies)
+    return await get_js_signer(ZHIHU_SIGN_JS).acall("get_sign", url, cookies)
 
 
 class ZhihuExtractor:
@@ -588,3 +588,44 @@ alter table douyin_aweme_comment add column `like_count` varchar(255) NOT NULL D
 alter table xhs_note add column xsec_token varchar(50) default null comment '签名算法';
 alter table douyin_aweme_comment add column `pictures` varchar(500) NOT NULL DEFAULT '' COMMENT '评论图片列表';
 alter table bilibili_video_comment add column `like_count` varchar(255) NOT NULL DEFAULT '0' COMMENT '点赞数';
+
+-- ----------------------------
+-- Table structure for crawl_keyword
+-- ----------------------------
+DROP TABLE IF EXISTS `crawl_keyword`;
+CREATE TABLE `crawl_keyword`
+(
+    `id`             int          NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `keyword`        varchar(255) NOT NULL COMMENT '搜索关键词',
+    `add_ts`         bigint       DEFAULT NULL COMMENT '记录添加时间戳',
+    `last_modify_ts` bigint       DEFAULT NULL COMMENT '记录最后修改时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `idx_crawl_keyword_keyword` (`keyword`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='爬取关键词维度表';
+
+alter table bilibili_video add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_bilibili_video_keyword_time` (`keyword_id`, `create_time`);
+alter table douyin_aweme add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_douyin_aweme_keyword_time` (`keyword_id`, `create_time`);
+alter table kuaishou_video add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_kuaishou_video_keyword_time` (`keyword_id`, `create_time`);
+alter table weibo_note add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_weibo_note_keyword_time` (`keyword_id`, `create_time`);
+alter table xhs_note add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_xhs_note_keyword_time` (`keyword_id`, `time`);
+alter table tieba_note add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_tieba_note_keyword_time` (`keyword_id`, `publish_time`);
+alter table zhihu_content add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_zhihu_content_keyword_time` (`keyword_id`, `created_time`);
+alter table bilibili_video_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_bilibili_video_comment_keyword_time` (`keyword_id`, `create_time`);
+alter table douyin_aweme_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_douyin_aweme_comment_keyword_time` (`keyword_id`, `create_time`);
+alter table kuaishou_video_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_kuaishou_video_comment_keyword_time` (`keyword_id`, `create_time`);
+alter table weibo_note_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_weibo_note_comment_keyword_time` (`keyword_id`, `create_time`);
+alter table xhs_note_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_xhs_note_comment_keyword_time` (`keyword_id`, `create_time`);
+alter table tieba_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_tieba_comment_keyword_time` (`keyword_id`, `publish_time`);
+alter table zhihu_comment add column `keyword_id` int DEFAULT NULL COMMENT '爬取关键词ID', add index `idx_zhihu_comment_keyword_time` (`keyword_id`, `publish_time`);
+
+-- 互动计数数值列（原文本计数列名加_num后缀，入库时解析填充），热点排序常用的列建立索引
+alter table bilibili_video add column `video_play_count_num` bigint DEFAULT NULL COMMENT '视频播放数量（数值）', add column `video_favorite_count_num` bigint DEFAULT NULL COMMENT '视频收藏数量（数值）', add column `video_share_count_num` bigint DEFAULT NULL COMMENT '视频分享数量（数值）', add column `video_coin_count_num` bigint DEFAULT NULL COMMENT '视频投币数量（数值）', add column `video_danmaku_num` bigint DEFAULT NULL COMMENT '视频弹幕数量（数值）', add column `video_comment_num` bigint DEFAULT NULL COMMENT '视频评论数量（数值）', add index `ix_bilibili_video_video_play_count_num` (`video_play_count_num`);
+alter table bilibili_video_comment add column `like_count_num` bigint DEFAULT NULL COMMENT '点赞数（数值）', add column `sub_comment_count_num` bigint DEFAULT NULL COMMENT '评论回复数（数值）', add index `ix_bilibili_video_comment_like_count_num` (`like_count_num`);
+alter table douyin_aweme add column `liked_count_num` bigint DEFAULT NULL COMMENT '视频点赞数（数值）', add column `comment_count_num` bigint DEFAULT NULL COMMENT '视频评论数（数值）', add column `share_count_num` bigint DEFAULT NULL COMMENT '视频分享数（数值）', add column `collected_count_num` bigint DEFAULT NULL COMMENT '视频收藏数（数值）', add index `ix_douyin_aweme_liked_count_num` (`liked_count_num`);
+alter table douyin_aweme_comment add column `like_count_num` bigint DEFAULT NULL COMMENT '点赞数（数值）', add column `sub_comment_count_num` bigint DEFAULT NULL COMMENT '评论回复数（数值）', add index `ix_douyin_aweme_comment_like_count_num` (`like_count_num`);
+alter table kuaishou_video add column `liked_count_num` bigint DEFAULT NULL COMMENT '视频点赞数（数值）', add column `viewd_count_num` bigint DEFAULT NULL COMMENT '视频浏览数量（数值）', add index `ix_kuaishou_video_liked_count_num` (`liked_count_num`);
+alter table kuaishou_video_comment add column `sub_comment_count_num` bigint DEFAULT NULL COMMENT '评论回复数（数值）';
+alter table weibo_note add column `liked_count_num` bigint DEFAULT NULL COMMENT '帖子点赞数（数值）', add column `comments_count_num` bigint DEFAULT NULL COMMENT '帖子评论数量（数值）', add column `shared_count_num` bigint DEFAULT NULL COMMENT '帖子转发数量（数值）', add index `ix_weibo_note_liked_count_num` (`liked_count_num`);
+alter table weibo_note_comment add column `comment_like_count_num` bigint DEFAULT NULL COMMENT '评论点赞数量（数值）', add column `sub_comment_count_num` bigint DEFAULT NULL COMMENT '评论回复数（数值）', add index `ix_weibo_note_comment_comment_like_count_num` (`comment_like_count_num`);
+alter table xhs_note add column `liked_count_num` bigint DEFAULT NULL COMMENT '笔记点赞数（数值）', add column `collected_count_num` bigint DEFAULT NULL COMMENT '笔记收藏数（数值）', add column `comment_count_num` bigint DEFAULT NULL COMMENT '笔记评论数（数值）', add column `share_count_num` bigint DEFAULT NULL COMMENT '笔记分享数（数值）', add index `ix_xhs_note_liked_count_num` (`liked_count_num`);
+alter table xhs_note_comment add column `like_count` varchar(255) NOT NULL DEFAULT '0' COMMENT '点赞数', add column `like_count_num` bigint DEFAULT NULL COMMENT '点赞数（数值）', add index `ix_xhs_note_comment_like_count_num` (`like_count_num`);
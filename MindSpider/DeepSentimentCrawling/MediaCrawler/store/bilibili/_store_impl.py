@@ -27,10 +27,12 @@ from sqlalchemy.orm import sessionmaker
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
 from database.models import BilibiliVideoComment, BilibiliVideo, BilibiliUpInfo, BilibiliUpDynamic, BilibiliContactInfo
 from tools.async_file_writer import AsyncFileWriter
 from tools import utils, words
-from var import crawler_type_var
+from var import crawler_type_var, source_keyword_var
 
 
 class BiliCsvStoreImplement(AbstractStore):
@@ -123,8 +125,8 @@ class BiliDbStoreImplement(AbstractStore):
         if video_id is not None:
             video_id = int(video_id) if not isinstance(video_id, int) else video_id
         async with get_session() as session:
-            result = await session.execute(select(BilibiliVideo).where(BilibiliVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            video_detail = await find_existing(session, BilibiliVideo, "video_id", video_id)
 
             if not video_detail:
                 content_item["add_ts"] = utils.get_current_timestamp()
@@ -146,8 +148,8 @@ class BiliDbStoreImplement(AbstractStore):
         if comment_id is not None:
             comment_id = int(comment_id) if not isinstance(comment_id, int) else comment_id
         async with get_session() as session:
-            result = await session.execute(select(BilibiliVideoComment).where(BilibiliVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            comment_detail = await find_existing(session, BilibiliVideoComment, "comment_id", comment_id)
 
             if not comment_detail:
                 comment_item["add_ts"] = utils.get_current_timestamp()
@@ -169,8 +171,7 @@ class BiliDbStoreImplement(AbstractStore):
         if creator_id is not None:
             creator_id = int(creator_id) if not isinstance(creator_id, int) else creator_id
         async with get_session() as session:
-            result = await session.execute(select(BilibiliUpInfo).where(BilibiliUpInfo.user_id == creator_id))
-            creator_detail = result.scalar_one_or_none()
+            creator_detail = await find_existing(session, BilibiliUpInfo, "user_id", creator_id)
 
             if not creator_detail:
                 creator["add_ts"] = utils.get_current_timestamp()
@@ -217,8 +218,7 @@ class BiliDbStoreImplement(AbstractStore):
         """
         dynamic_id = dynamic_item.get("dynamic_id")
         async with get_session() as session:
-            result = await session.execute(select(BilibiliUpDynamic).where(BilibiliUpDynamic.dynamic_id == dynamic_id))
-            dynamic_detail = result.scalar_one_or_none()
+            dynamic_detail = await find_existing(session, BilibiliUpDynamic, "dynamic_id", dynamic_id)
 
             if not dynamic_detail:
                 dynamic_item["add_ts"] = utils.get_current_timestamp()
@@ -19,15 +19,15 @@ import os
 import pathlib
 from typing import Dict
 
-from sqlalchemy import select
-
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
 from database.models import DouyinAweme, DouyinAwemeComment, DyCreator
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
-from var import crawler_type_var
+from var import crawler_type_var, source_keyword_var
 
 
 class DouyinCsvStoreImplement(AbstractStore):
@@ -89,8 +89,8 @@ class DouyinDbStoreImplement(AbstractStore):
         """
         aweme_id = content_item.get("aweme_id")
         async with get_session() as session:
-            result = await session.execute(select(DouyinAweme).where(DouyinAweme.aweme_id == aweme_id))
-            aweme_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            aweme_detail = await find_existing(session, DouyinAweme, "aweme_id", aweme_id)
 
             if not aweme_detail:
                 content_item["add_ts"] = utils.get_current_timestamp()
@@ -110,8 +110,8 @@ class DouyinDbStoreImplement(AbstractStore):
         """
         comment_id = comment_item.get("comment_id")
         async with get_session() as session:
-            result = await session.execute(select(DouyinAwemeComment).where(DouyinAwemeComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            comment_detail = await find_existing(session, DouyinAwemeComment, "comment_id", comment_id)
 
             if not comment_detail:
                 comment_item["add_ts"] = utils.get_current_timestamp()
@@ -130,8 +130,7 @@ class DouyinDbStoreImplement(AbstractStore):
         """
         user_id = creator.get("user_id")
         async with get_session() as session:
-            result = await session.execute(select(DyCreator).where(DyCreator.user_id == user_id))
-            user_detail = result.scalar_one_or_none()
+            user_detail = await find_existing(session, DyCreator, "user_id", user_id)
 
             if not user_detail:
                 creator["add_ts"] = utils.get_current_timestamp()
@@ -22,14 +22,15 @@ from typing import Dict
 from tools.async_file_writer import AsyncFileWriter
 
 import aiofiles
-from sqlalchemy import select
 
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
 from database.models import KuaishouVideo, KuaishouVideoComment
 from tools import utils, words
-from var import crawler_type_var
+from var import crawler_type_var, source_keyword_var
 
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -90,8 +91,8 @@ class KuaishouDbStoreImplement(AbstractStore):
         """
         video_id = content_item.get("video_id")
         async with get_session() as session:
-            result = await session.execute(select(KuaishouVideo).where(KuaishouVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            video_detail = await find_existing(session, KuaishouVideo, "video_id", video_id)
 
             if not video_detail:
                 content_item["add_ts"] = utils.get_current_timestamp()
@@ -110,9 +111,8 @@ class KuaishouDbStoreImplement(AbstractStore):
         """
         comment_id = comment_item.get("comment_id")
         async with get_session() as session:
-            result = await session.execute(
-                select(KuaishouVideoComment).where(KuaishouVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            comment_detail = await find_existing(session, KuaishouVideoComment, "comment_id", comment_id)
 
             if not comment_detail:
                 comment_item["add_ts"] = utils.get_current_timestamp()
@@ -21,7 +21,6 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
@@ -29,7 +28,9 @@ from base.base_crawler import AbstractStore
 from database.models import TiebaNote, TiebaComment, TiebaCreator
 from tools import utils, words
 from database.db_session import get_session
-from var import crawler_type_var
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
+from var import crawler_type_var, source_keyword_var
 from tools.async_file_writer import AsyncFileWriter
 
 
@@ -96,9 +97,8 @@ class TieBaDbStoreImplement(AbstractStore):
         """
         note_id = content_item.get("note_id")
         async with get_session() as session:
-            stmt = select(TiebaNote).where(TiebaNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            db_note = await find_existing(session, TiebaNote, "note_id", note_id)
             if db_note:
                 for key, value in content_item.items():
                     setattr(db_note, key, value)
@@ -115,9 +115,8 @@ class TieBaDbStoreImplement(AbstractStore):
         """
         comment_id = comment_item.get("comment_id")
         async with get_session() as session:
-            stmt = select(TiebaComment).where(TiebaComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            db_comment = await find_existing(session, TiebaComment, "comment_id", comment_id)
             if db_comment:
                 for key, value in comment_item.items():
                     setattr(db_comment, key, value)
@@ -134,9 +133,7 @@ class TieBaDbStoreImplement(AbstractStore):
         """
         user_id = creator.get("user_id")
         async with get_session() as session:
-            stmt = select(TiebaCreator).where(TiebaCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
+            db_creator = await find_existing(session, TiebaCreator, "user_id", user_id)
             if db_creator:
                 for key, value in creator.items():
                     setattr(db_creator, key, value)
@@ -21,7 +21,6 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
@@ -30,7 +29,9 @@ from database.models import WeiboCreator, WeiboNote, WeiboNoteComment
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
 from database.db_session import get_session
-from var import crawler_type_var
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
+from var import crawler_type_var, source_keyword_var
 
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -100,9 +101,8 @@ class WeiboDbStoreImplement(AbstractStore):
         """
         note_id = content_item.get("note_id")
         async with get_session() as session:
-            stmt = select(WeiboNote).where(WeiboNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            db_note = await find_existing(session, WeiboNote, "note_id", note_id)
             if db_note:
                 db_note.last_modify_ts = utils.get_current_timestamp()
                 for key, value in content_item.items():
@@ -126,9 +126,8 @@ class WeiboDbStoreImplement(AbstractStore):
         """
         comment_id = comment_item.get("comment_id")
         async with get_session() as session:
-            stmt = select(WeiboNoteComment).where(WeiboNoteComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            db_comment = await find_existing(session, WeiboNoteComment, "comment_id", comment_id)
             if db_comment:
                 db_comment.last_modify_ts = utils.get_current_timestamp()
                 for key, value in comment_item.items():
@@ -152,9 +151,7 @@ class WeiboDbStoreImplement(AbstractStore):
         """
         user_id = creator.get("user_id")
         async with get_session() as session:
-            stmt = select(WeiboCreator).where(WeiboCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
+            db_creator = await find_existing(session, WeiboCreator, "user_id", user_id)
             if db_creator:
                 db_creator.last_modify_ts = utils.get_current_timestamp()
                 for key, value in creator.items():
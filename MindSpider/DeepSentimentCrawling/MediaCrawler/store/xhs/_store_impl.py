@@ -12,12 +12,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from base.base_crawler import AbstractStore
+from database.counters import typed_counter_values
 from database.db_session import get_session
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
 from database.models import XhsNote, XhsNoteComment, XhsCreator
 
 from tools.async_file_writer import AsyncFileWriter
 from tools.time_util import get_current_timestamp
-from var import crawler_type_var
+from var import crawler_type_var, source_keyword_var
 
 class XhsCsvStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -90,6 +93,7 @@ class XhsDbStoreImplement(AbstractStore):
         if not note_id:
             return
         async with get_session() as session:
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
             if await self.content_is_exist(session, note_id):
                 await self.update_content(session, content_item)
             else:
@@ -120,7 +124,8 @@ class XhsDbStoreImplement(AbstractStore):
             tag_list=json.dumps(content_item.get("tag_list")),
             note_url=content_item.get("note_url"),
             source_keyword=content_item.get("source_keyword", ""),
-            xsec_token=content_item.get("xsec_token", "")
+            xsec_token=content_item.get("xsec_token", ""),
+            keyword_id=content_item.get("keyword_id")
         )
         session.add(note)
 
@@ -135,18 +140,18 @@ class XhsDbStoreImplement(AbstractStore):
             "share_count": str(content_item.get("share_count")),
             "last_update_time": content_item.get("last_update_time"),
         }
+        update_data = typed_counter_values(XhsNote.__tablename__, update_data)
         stmt = update(XhsNote).where(XhsNote.note_id == note_id).values(**update_data)
         await session.execute(stmt)
 
     async def content_is_exist(self, session: AsyncSession, note_id: str) -> bool:
-        stmt = select(XhsNote).where(XhsNote.note_id == note_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
+        return await find_existing(session, XhsNote, "note_id", note_id) is not None
 
     async def store_comment(self, comment_item: Dict):
         if not comment_item:
             return
         async with get_session() as session:
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
             comment_id = comment_item.get("comment_id")
             if not comment_id:
                 return
@@ -172,7 +177,8 @@ class XhsDbStoreImplement(AbstractStore):
             sub_comment_count=comment_item.get("sub_comment_count"),
             pictures=json.dumps(comment_item.get("pictures")),
             parent_comment_id=comment_item.get("parent_comment_id"),
-            like_count=str(comment_item.get("like_count"))
+            like_count=str(comment_item.get("like_count")),
+            keyword_id=comment_item.get("keyword_id")
         )
         session.add(comment)
 
@@ -184,13 +190,12 @@ class XhsDbStoreImplement(AbstractStore):
             "like_count": str(comment_item.get("like_count")),
             "sub_comment_count": comment_item.get("sub_comment_count"),
         }
+        update_data = typed_counter_values(XhsNoteComment.__tablename__, update_data)
         stmt = update(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id).values(**update_data)
         await session.execute(stmt)
 
     async def comment_is_exist(self, session: AsyncSession, comment_id: str) -> bool:
-        stmt = select(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
+        return await find_existing(session, XhsNoteComment, "comment_id", comment_id) is not None
 
     async def store_creator(self, creator_item: Dict):
         user_id = creator_item.get("user_id")
@@ -234,13 +239,12 @@ class XhsDbStoreImplement(AbstractStore):
             "interaction": str(creator_item.get("interaction")),
             "tag_list": json.dumps(creator_item.get("tag_list"))
         }
+        update_data = typed_counter_values(XhsCreator.__tablename__, update_data)
         stmt = update(XhsCreator).where(XhsCreator.user_id == user_id).values(**update_data)
         await session.execute(stmt)
 
     async def creator_is_exist(self, session: AsyncSession, user_id: str) -> bool:
-        stmt = select(XhsCreator).where(XhsCreator.user_id == user_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
+        return await find_existing(session, XhsCreator, "user_id", user_id) is not None
 
     async def get_all_content(self) -> List[Dict]:
         async with get_session() as session:
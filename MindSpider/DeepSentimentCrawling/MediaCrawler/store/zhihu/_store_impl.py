@@ -21,15 +21,16 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.keywords import attach_keyword_id
+from database.seen_ids import find_existing
 from database.models import ZhihuContent, ZhihuComment, ZhihuCreator
 from tools import utils, words
-from var import crawler_type_var
+from var import crawler_type_var, source_keyword_var
 from tools.async_file_writer import AsyncFileWriter
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -95,9 +96,8 @@ class ZhihuDbStoreImplement(AbstractStore):
         """
         content_id = content_item.get("content_id")
         async with get_session() as session:
-            stmt = select(ZhihuContent).where(ZhihuContent.content_id == content_id)
-            result = await session.execute(stmt)
-            existing_content = result.scalars().first()
+            await attach_keyword_id(session, content_item, source_keyword_var.get())
+            existing_content = await find_existing(session, ZhihuContent, "content_id", content_id)
             if existing_content:
                 for key, value in content_item.items():
                     setattr(existing_content, key, value)
@@ -114,9 +114,8 @@ class ZhihuDbStoreImplement(AbstractStore):
         """
         comment_id = comment_item.get("comment_id")
         async with get_session() as session:
-            stmt = select(ZhihuComment).where(ZhihuComment.comment_id == comment_id)
-            result = await session.execute(stmt)
-            existing_comment = result.scalars().first()
+            await attach_keyword_id(session, comment_item, source_keyword_var.get())
+            existing_comment = await find_existing(session, ZhihuComment, "comment_id", comment_id)
             if existing_comment:
                 for key, value in comment_item.items():
                     setattr(existing_comment, key, value)
@@ -133,9 +132,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         """
         user_id = creator.get("user_id")
         async with get_session() as session:
-            stmt = select(ZhihuCreator).where(ZhihuCreator.user_id == user_id)
-            result = await session.execute(stmt)
-            existing_creator = result.scalars().first()
+            existing_creator = await find_existing(session, ZhihuCreator, "user_id", user_id)
             if existing_creator:
                 for key, value in creator.items():
                     setattr(existing_creator, key, value)
@@ -7,6 +7,7 @@ from typing import Dict, List
 import aiofiles
 import config
 from tools.utils import utils
+from tools.word_frequency import iter_json_array
 from tools.words import AsyncWordCloudGenerator
 
 class AsyncFileWriter:
@@ -70,37 +71,26 @@ class AsyncFileWriter:
                 utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
                 return
 
-            async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
-                    return
-
-                comments_data = json.loads(content)
-                if not isinstance(comments_data, list):
-                    comments_data = [comments_data]
-
-            # Filter comments data to only include 'content' field
+            # Stream comments from the JSON file instead of loading it all into memory
             # Handle different comment data structures across platforms
-            filtered_data = []
-            for comment in comments_data:
-                if isinstance(comment, dict):
-                    # Try different possible content field names
-                    content_text = comment.get('content') or comment.get('comment_text') or comment.get('text') or ''
-                    if content_text:
-                        filtered_data.append({'content': content_text})
-
-            if not filtered_data:
-                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No valid comment content found")
-                return
+            def iter_comment_contents():
+                for comment in iter_json_array(comments_file_path):
+                    if isinstance(comment, dict):
+                        # Try different possible content field names
+                        content_text = comment.get('content') or comment.get('comment_text') or comment.get('text') or ''
+                        if content_text:
+                            yield {'content': content_text}
 
             # Generate wordcloud
             words_base_path = f"data/{self.platform}/words"
             pathlib.Path(words_base_path).mkdir(parents=True, exist_ok=True)
             words_file_prefix = f"{words_base_path}/{self.crawler_type}_comments_{utils.get_current_date()}"
 
-            utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Generating wordcloud from {len(filtered_data)} comments")
-            await self.wordcloud_generator.generate_word_frequency_and_cloud(filtered_data, words_file_prefix)
+            utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Generating wordcloud from {comments_file_path}")
+            word_freq = await self.wordcloud_generator.generate_word_frequency_and_cloud(iter_comment_contents(), words_file_prefix)
+            if not word_freq:
+                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No valid comment content found")
+                return
             utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Wordcloud generated successfully at {words_file_prefix}")
 
         except Exception as e:
@@ -0,0 +1,140 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 布隆过滤器
+#            判定为"不存在"的元素一定不存在，判定为"可能存在"的元素有一定误判率；
+#            位数组大小由内存上限决定，哈希函数个数由目标误判率决定，可整体落盘后再加载
+import hashlib
+import json
+import math
+import os
+from typing import Any, Dict, Optional, Tuple
+
+_FILE_MAGIC = b"MCBLOOM1\n"
+
+
+class BloomFilter:
+    """基于双重哈希的布隆过滤器"""
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        """
+        Args:
+            num_bits: 位数组的位数
+            num_hashes: 每个元素置位的哈希函数个数
+        """
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def for_memory(cls, memory_bytes: int, false_positive_rate: float) -> "BloomFilter":
+        """
+        按内存上限与目标误判率创建：哈希函数个数取最优值 -log2(p)
+        Args:
+            memory_bytes: 位数组占用的字节数
+            false_positive_rate: 容量内的目标误判率
+
+        Returns:
+
+        """
+        num_hashes = max(1, round(-math.log2(false_positive_rate)))
+        return cls(memory_bytes * 8, num_hashes)
+
+    @property
+    def memory_bytes(self) -> int:
+        """位数组占用的字节数"""
+        return len(self._bits)
+
+    def capacity(self, false_positive_rate: float) -> int:
+        """
+        误判率不超过false_positive_rate时最多可容纳的元素数
+        Args:
+            false_positive_rate: 目标误判率
+
+        Returns:
+
+        """
+        return int(self.num_bits * math.log(2) ** 2 / -math.log(false_positive_rate))
+
+    def estimated_false_positive_rate(self) -> float:
+        """按当前元素数估算的误判率 (1 - e^(-kn/m))^k"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def _positions(self, key: Any):
+        digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: Any) -> bool:
+        """
+        加入元素
+        Args:
+            key: 元素，按str(key)哈希（整数id与其字符串形式视为同一元素）
+
+        Returns:
+            加入前是否可能已存在
+        """
+        existed = True
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self._bits[byte] & mask:
+                existed = False
+                self._bits[byte] |= mask
+        if not existed:
+            self.count += 1
+        return existed
+
+    def __contains__(self, key: Any) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def save(self, path: str, meta: Optional[Dict] = None):
+        """
+        落盘（先写临时文件再替换，中途崩溃不会留下不完整的文件）
+        Args:
+            path: 文件路径
+            meta: 随过滤器一起保存的附加信息
+
+        Returns:
+
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        header = {"num_bits": self.num_bits, "num_hashes": self.num_hashes, "count": self.count, "meta": meta or {}}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_FILE_MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(self._bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["BloomFilter", Dict]:
+        """
+        从文件加载
+        Args:
+            path: 文件路径
+
+        Returns:
+            (过滤器, 附加信息)；文件格式不正确时抛出ValueError
+        """
+        with open(path, "rb") as f:
+            if f.readline() != _FILE_MAGIC:
+                raise ValueError(f"not a bloom filter file: {path}")
+            header = json.loads(f.readline())
+            bloom = cls(header["num_bits"], header["num_hashes"])
+            bits = f.read()
+        if len(bits) != len(bloom._bits):
+            raise ValueError(f"truncated bloom filter file: {path}")
+        bloom._bits = bytearray(bits)
+        bloom.count = header["count"]
+        return bloom, header["meta"]
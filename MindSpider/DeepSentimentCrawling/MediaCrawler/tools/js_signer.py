@@ -0,0 +1,329 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 常驻JS签名进程池
+#            execjs每次call都会启动一个node进程重新加载整段签名脚本，高并发时签名本身成为瓶颈；
+#            这里启动若干常驻node进程，启动时加载一次签名脚本，请求以一行JSON经stdin管道发送，
+#            同一管道上可以有多个在途请求，结果按id回填。找不到node时退回execjs
+import asyncio
+import atexit
+import concurrent.futures
+import itertools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional
+
+# 与tools.utils.logger为同一个logger，这里不引入tools.utils以免加载playwright等依赖
+logger = logging.getLogger("MediaCrawler")
+
+# node端宿主脚本：在独立的vm上下文中加载签名脚本（顶层函数成为上下文的属性），逐行读取请求并调用，
+# 签名脚本里的console输出改写到stderr，避免干扰stdout上的应答
+_NODE_HOST_SCRIPT = r"""
+const fs = require('fs');
+const vm = require('vm');
+const readline = require('readline');
+const scriptPath = process.env.JS_SIGNER_SCRIPT;
+const context = vm.createContext({
+    require, Buffer, process, URL, URLSearchParams, TextEncoder, TextDecoder, atob, btoa,
+    setTimeout, clearTimeout, setInterval, clearInterval,
+    console: new console.Console(process.stderr, process.stderr),
+});
+vm.runInContext(fs.readFileSync(scriptPath, 'utf8').replace(/^\uFEFF/, ''), context, {filename: scriptPath});
+readline.createInterface({input: process.stdin}).on('line', (line) => {
+    const request = JSON.parse(line);
+    let reply;
+    try {
+        reply = {id: request.id, result: context[request.fn](...request.args)};
+    } catch (e) {
+        reply = {id: request.id, error: String((e && e.stack) || e)};
+    }
+    process.stdout.write(JSON.stringify(reply) + '\n');
+});
+process.stdout.write(JSON.stringify({ready: true}) + '\n');
+"""
+
+
+class JsSignerError(Exception):
+    """签名脚本执行出错或签名进程退出"""
+
+
+class _NodeWorker:
+    """一个常驻node进程，后台线程读取应答并完成对应的future"""
+
+    def __init__(self, node_path: str, script_path: str, start_timeout: float):
+        self.script_path = script_path
+        self.process = subprocess.Popen(
+            [node_path, "-e", _NODE_HOST_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(os.environ, JS_SIGNER_SCRIPT=os.path.abspath(script_path)),
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._ids = itertools.count()
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._ready = concurrent.futures.Future()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+        try:
+            self._ready.result(timeout=start_timeout)
+        except concurrent.futures.TimeoutError:
+            self.close()
+            raise JsSignerError(f"js signer process for {script_path} did not start in {start_timeout}s")
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def _read_stderr(self):
+        for line in self.process.stderr:
+            logger.debug(f"[JsSigner] {os.path.basename(self.script_path)}: {line.rstrip()}")
+
+    def _read_replies(self):
+        for line in self.process.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if reply.get("ready"):
+                self._ready.set_result(True)
+                continue
+            with self._lock:
+                future = self._pending.pop(reply.get("id"), None)
+            # 调用方已超时取消的请求不再回填
+            if future is None or not future.set_running_or_notify_cancel():
+                continue
+            if "error" in reply:
+                future.set_exception(JsSignerError(reply["error"]))
+            else:
+                future.set_result(reply.get("result"))
+        # 进程退出：启动中或在途的请求全部失败
+        error = JsSignerError(f"js signer process for {self.script_path} exited with code {self.process.wait()}")
+        if not self._ready.done():
+            self._ready.set_exception(error)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def submit(self, fn: str, args: List[Any]) -> concurrent.futures.Future:
+        """
+        发送一次调用，不等待结果
+        Args:
+            fn: 签名脚本中的函数名
+            args: 参数（需可JSON序列化）
+
+        Returns:
+
+        """
+        future = concurrent.futures.Future()
+        with self._lock:
+            if not self.alive:
+                raise JsSignerError(f"js signer process for {self.script_path} is not running")
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            self.process.stdin.write(json.dumps({"id": request_id, "fn": fn, "args": args}) + "\n")
+            self.process.stdin.flush()
+        return future
+
+    def discard(self, future: concurrent.futures.Future):
+        """
+        移除调用方不再等待（如已超时）的请求，避免在途计数虚高
+        Args:
+            future: submit返回的future
+
+        Returns:
+
+        """
+        with self._lock:
+            for request_id, pending in list(self._pending.items()):
+                if pending is future:
+                    del self._pending[request_id]
+                    break
+
+    def close(self):
+        if self.alive:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class JsSignerPool:
+    """常驻node签名进程池，同一个签名脚本共用"""
+
+    def __init__(self, script_path: str, size: int = 2, node_path: Optional[str] = None,
+                 call_timeout: float = 10.0, start_timeout: float = 10.0):
+        """
+        Args:
+            script_path: 签名脚本路径
+            size: 常驻node进程数
+            node_path: node可执行文件，默认从PATH查找
+            call_timeout: 单次签名超时秒数
+            start_timeout: 进程启动（加载签名脚本）超时秒数
+        """
+        self.script_path = script_path
+        self.size = max(1, size)
+        self.node_path = node_path or shutil.which("node")
+        if not self.node_path:
+            raise JsSignerError("node executable not found")
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self._workers: List[_NodeWorker] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> "JsSignerPool":
+        """
+        预热：启动全部进程并加载签名脚本
+        Returns:
+
+        """
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.alive]
+            while len(self._workers) < self.size:
+                self._workers.append(_NodeWorker(self.node_path, self.script_path, self.start_timeout))
+        return self
+
+    def _needs_start(self) -> bool:
+        return len(self._workers) < self.size or not all(worker.alive for worker in self._workers)
+
+    def _pick_worker(self) -> _NodeWorker:
+        if self._needs_start():
+            # 首次调用或有进程退出时补齐
+            self.start()
+        return min(self._workers, key=lambda worker: worker.in_flight)
+
+    def submit(self, fn: str, *args: Any) -> concurrent.futures.Future:
+        """
+        发送一次调用到在途请求最少的进程
+        Args:
+            fn: 签名脚本中的函数名
+            *args: 参数
+
+        Returns:
+
+        """
+        return self._pick_worker().submit(fn, list(args))
+
+    def call(self, fn: str, *args: Any) -> Any:
+        """
+        同步调用签名函数
+        Args:
+            fn: 签名脚本中的函数名
+            *args: 参数
+
+        Returns:
+
+        """
+        worker = self._pick_worker()
+        future = worker.submit(fn, list(args))
+        try:
+            return future.result(timeout=self.call_timeout)
+        finally:
+            worker.discard(future)
+
+    async def acall(self, fn: str, *args: Any) -> Any:
+        """
+        异步调用签名函数，等待结果时不阻塞事件循环
+        Args:
+            fn: 签名脚本中的函数名
+            *args: 参数
+
+        Returns:
+
+        """
+        if self._needs_start():
+            # 启动node进程并等待加载签名脚本是阻塞的，放到线程中执行
+            await asyncio.to_thread(self.start)
+        worker = self._pick_worker()
+        future = worker.submit(fn, list(args))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.call_timeout)
+        finally:
+            worker.discard(future)
+
+    def close(self):
+        """关闭全部进程"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+
+class ExecJsSigner:
+    """找不到node时的退回方案：execjs（每次调用由execjs选择的JS运行时执行）"""
+
+    def __init__(self, script_path: str):
+        import execjs
+
+        with open(script_path, mode="r", encoding="utf-8-sig") as f:
+            self._compiled = execjs.compile(f.read())
+
+    def call(self, fn: str, *args: Any) -> Any:
+        return self._compiled.call(fn, *args)
+
+    async def acall(self, fn: str, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self.call(fn, *args))
+
+    def close(self):
+        pass
+
+
+# 签名脚本路径 -> 签名器，进程内共享
+_js_signers: Dict[str, Any] = {}
+_js_signers_lock = threading.Lock()
+
+
+def get_js_signer(script_path: str):
+    """
+    获取签名脚本对应的签名器（首次获取时启动并预热node进程池）
+    Args:
+        script_path: 签名脚本路径，如 libs/douyin.js
+
+    Returns:
+        JsSignerPool，找不到node时为ExecJsSigner
+    """
+    with _js_signers_lock:
+        if script_path not in _js_signers:
+            # 延迟导入：MindSpider下有多个名为config的模块，签名池本身不依赖MediaCrawler配置
+            import config
+
+            try:
+                _js_signers[script_path] = JsSignerPool(script_path, size=config.JS_SIGNER_POOL_SIZE).start()
+            except JsSignerError as e:
+                logger.warning(f"[get_js_signer] {e}, fall back to execjs for {script_path}")
+                _js_signers[script_path] = ExecJsSigner(script_path)
+        return _js_signers[script_path]
+
+
+@atexit.register
+def close_js_signers():
+    """关闭全部签名进程"""
+    with _js_signers_lock:
+        for signer in _js_signers.values():
+            signer.close()
+        _js_signers.clear()
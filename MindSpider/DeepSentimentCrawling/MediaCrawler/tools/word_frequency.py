@@ -0,0 +1,227 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 流式词频统计
+#            评论逐条从JSON文件中读出，按块交给分词进程池，各块的计数合并到有界的TopKCounter，
+#            读文件、分词都不在事件循环线程中执行；词汇量过大时只保留计数最大的若干个词
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+# 与tools.utils.logger为同一个logger，这里不引入tools.utils以免分词进程加载playwright等依赖
+logger = logging.getLogger("MediaCrawler")
+
+_JSON_WHITESPACE = " \t\r\n"
+# 缓冲区末尾的这几个字符可能是被截断的数字或字面量（如"-"、"3."、"1e-"、"fals"），需要再读一块才能判断
+_JSON_TOKEN_TAIL = 5
+
+
+def iter_json_array(path: str, read_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    逐个读出JSON数组文件中的元素，不把整个文件读入内存；文件内容不是数组时读出整个值
+    Args:
+        path: JSON文件路径
+        read_size: 每次读取的字符数
+
+    Returns:
+        元素迭代器，文件被截断或内容不是合法JSON时抛出ValueError
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(read_size).lstrip(_JSON_WHITESPACE)
+        if not buffer:
+            return
+        if not buffer.startswith("["):
+            yield json.loads(buffer + f.read())
+            return
+        pos, eof = 1, False
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE + ",":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            need_more = pos >= len(buffer)
+            if not need_more:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # 未闭合的字符串、或出错位置在缓冲区末尾附近时，可能只是元素跨越了读取块
+                    truncated = e.msg.startswith("Unterminated string") or e.pos >= len(buffer)
+                    need_more = truncated or e.pos >= len(buffer) - _JSON_TOKEN_TAIL
+                    if not need_more or eof:
+                        raise ValueError(f"{'truncated' if truncated else 'invalid'} JSON array in {path}: {e}") from e
+                else:
+                    following = end
+                    while following < len(buffer) and buffer[following] in _JSON_WHITESPACE:
+                        following += 1
+                    if following < len(buffer) and buffer[following] in ",]":
+                        yield item
+                        pos = end
+                        continue
+                    # 元素后面还没读到分隔符，或紧跟的字符可能属于被截断的数字（如"-3."后的"5"）
+                    truncated = following == len(buffer)
+                    need_more = truncated or len(buffer) - end <= _JSON_TOKEN_TAIL
+                    if not need_more or eof:
+                        raise ValueError(f"truncated JSON array in {path}" if truncated else
+                                         f"invalid JSON array in {path}: unexpected {buffer[end:end + 20]!r} after item")
+            if eof:
+                raise ValueError(f"truncated JSON array in {path}")
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+
+class TopKCounter:
+    """
+    有界词频计数：词数超过容量的两倍时裁剪为计数最大的capacity个词（批量裁剪的lossy counting），
+    保留下来的计数是下界，任一词被低估的次数不超过max_error
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        Args:
+            capacity: 最多保留的词数，<=0 表示不限制（精确计数）
+        """
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.max_error = 0
+        self.prunes = 0
+
+    def update(self, counts: Mapping[str, int]):
+        """
+        合并一批词频
+        Args:
+            counts: 词 -> 次数
+
+        Returns:
+
+        """
+        self.counts.update(counts)
+        self.total += sum(counts.values())
+        if self.capacity > 0 and len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        top = heapq.nlargest(self.capacity + 1, self.counts.items(), key=lambda item: item[1])
+        # 被裁掉的词计数都不超过第capacity+1大的计数
+        self.max_error += top[-1][1]
+        self.counts = Counter(dict(top[:-1]))
+        self.prunes += 1
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self.counts.most_common(n)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+# 分词进程内的停用词，由_init_segment_worker设置
+_stop_words: Set[str] = set()
+
+
+def _init_segment_worker(stop_words: Set[str], custom_words: List[str]):
+    global _stop_words
+    import jieba
+
+    logging.getLogger("jieba").setLevel(logging.WARNING)
+    for word in custom_words:
+        jieba.add_word(word)
+    _stop_words = stop_words
+
+
+def count_words(texts: List[str]) -> Counter:
+    """
+    对一批文本分词并计数（在分词进程中执行）
+    Args:
+        texts: 文本列表
+
+    Returns:
+        词 -> 次数，已去掉停用词与空白
+    """
+    import jieba
+
+    counts = Counter()
+    for text in texts:
+        counts.update(word for word in jieba.lcut(text) if word not in _stop_words and word.strip())
+    return counts
+
+
+def _take(iterator: Iterator[str], size: int) -> List[str]:
+    return list(itertools.islice(iterator, size))
+
+
+class WordFrequencyCounter:
+    """流式词频统计：文本按块交给分词进程池（workers为0时在后台线程中分词），各块的计数合并到TopKCounter"""
+
+    def __init__(self, stop_words: Set[str], custom_words: Iterable[str] = (), workers: int = 2,
+                 chunk_size: int = 2000, max_words: int = 0):
+        """
+        Args:
+            stop_words: 停用词
+            custom_words: 加入jieba词典的自定义词
+            workers: 分词进程数，0 表示在后台线程中分词
+            chunk_size: 每个分词任务包含的文本数
+            max_words: 最多保留的词数，<=0 表示不限制
+        """
+        self.stop_words = set(stop_words)
+        self.custom_words = list(custom_words)
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.max_words = max_words
+
+    def _create_executor(self) -> Executor:
+        initargs = (self.stop_words, self.custom_words)
+        if self.workers <= 0:
+            return ThreadPoolExecutor(max_workers=1, initializer=_init_segment_worker, initargs=initargs)
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_segment_worker, initargs=initargs)
+
+    async def count(self, texts: Iterable[str]) -> TopKCounter:
+        """
+        统计词频。texts在后台线程中逐块读取，可以是逐条读文件的生成器；在途的分词任务不超过分词进程数的两倍
+        Args:
+            texts: 文本
+
+        Returns:
+            TopKCounter
+        """
+        loop = asyncio.get_running_loop()
+        result = TopKCounter(self.max_words)
+        executor = self._create_executor()
+        max_in_flight = 2 * max(1, self.workers)
+        iterator = iter(texts)
+        pending = set()
+        chunks = 0
+        try:
+            while True:
+                chunk = await asyncio.to_thread(_take, iterator, self.chunk_size)
+                if not chunk:
+                    break
+                chunks += 1
+                pending.add(loop.run_in_executor(executor, count_words, chunk))
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        result.update(future.result())
+            for counts in await asyncio.gather(*pending):
+                result.update(counts)
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+        logger.info(f"[WordFrequencyCounter.count] {chunks} chunks, {result.total} words, {len(result)} distinct kept, "
+                    f"{result.prunes} prunes, max error: {result.max_error}")
+        return result
@@ -12,15 +12,15 @@
 import asyncio
 import json
 import logging
-from collections import Counter
+import os
+from typing import Any, Dict, Iterable
 
 import aiofiles
 import jieba
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 
 import config
 from tools import utils
+from tools.word_frequency import WordFrequencyCounter
 
 plot_lock = asyncio.Lock()
 
@@ -40,10 +40,24 @@ class AsyncWordCloudGenerator:
         with open(self.stop_words_file, 'r', encoding='utf-8') as f:
             return set(f.read().strip().split('\n'))
 
-    async def generate_word_frequency_and_cloud(self, data, save_words_prefix):
-        all_text = ' '.join(item['content'] for item in data)
-        words = [word for word in jieba.lcut(all_text) if word not in self.stop_words and len(word.strip()) > 0]
-        word_freq = Counter(words)
+    async def generate_word_frequency_and_cloud(self, data: Iterable[Dict[str, Any]], save_words_prefix: str) -> Dict[str, int]:
+        """
+        统计词频并生成词云，分词在分词进程池中进行，不阻塞事件循环
+        Args:
+            data: 含content字段的评论，可以是逐条读文件的生成器
+            save_words_prefix: 词频文件与词云图片的路径前缀
+
+        Returns:
+            词 -> 次数（按次数降序），没有可统计的词时为空
+        """
+        counter = WordFrequencyCounter(self.stop_words, self.custom_words,
+                                       workers=config.WORDCLOUD_SEGMENT_WORKERS,
+                                       chunk_size=config.WORDCLOUD_CHUNK_SIZE,
+                                       max_words=config.WORDCLOUD_MAX_WORDS)
+        word_counts = await counter.count(item['content'] for item in data)
+        word_freq = dict(word_counts.most_common())
+        if not word_freq:
+            return word_freq
 
         # Save word frequency to file
         freq_file = f"{save_words_prefix}_word_freq.json"
@@ -53,12 +67,20 @@ class AsyncWordCloudGenerator:
         # Try to acquire the plot lock without waiting
         if plot_lock.locked():
             utils.logger.info("Skipping word cloud generation as the lock is held.")
-            return
+            return word_freq
 
         await self.generate_word_cloud(word_freq, save_words_prefix)
+        return word_freq
 
     async def generate_word_cloud(self, word_freq, save_words_prefix):
-        await plot_lock.acquire()
+        async with plot_lock:
+            await asyncio.to_thread(self._render_word_cloud, word_freq, save_words_prefix)
+
+    def _render_word_cloud(self, word_freq, save_words_prefix):
+        # 在后台线程中绘图：用Figure而不是pyplot，pyplot的全局状态不是线程安全的
+        from matplotlib.figure import Figure
+        from wordcloud import WordCloud
+
         top_20_word_freq = {word: freq for word, freq in
                             sorted(word_freq.items(), key=lambda item: item[1], reverse=True)[:20]}
         wordcloud = WordCloud(
@@ -74,12 +96,10 @@ class AsyncWordCloudGenerator:
         ).generate_from_frequencies(top_20_word_freq)
 
         # Save word cloud image
-        plt.figure(figsize=(10, 5), facecolor='white')
-        plt.imshow(wordcloud, interpolation='bilinear')
-
-        plt.axis('off')
-        plt.tight_layout(pad=0)
-        plt.savefig(f"{save_words_prefix}_word_cloud.png", format='png', dpi=300)
-        plt.close()
+        figure = Figure(figsize=(10, 5), facecolor='white')
+        axes = figure.add_subplot()
+        axes.imshow(wordcloud, interpolation='bilinear')
 
-        plot_lock.release()
\ No newline at end of file
+        axes.axis('off')
+        figure.tight_layout(pad=0)
+        figure.savefig(f"{save_words_prefix}_word_cloud.png", format='png', dpi=300)
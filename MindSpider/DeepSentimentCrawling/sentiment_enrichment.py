@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DeepSentimentCrawling模块 - 离线情感打分
+按add_ts水位线增量扫描新爬取的内容与评论，用多语言情感模型大批量打分，
+结果按(来源表, 行id)写入content_sentiment表，供InsightEngine的MediaCrawlerDB工具直接读取，
+Agent检索时不再需要临时加载模型推理。
+
+运行方式：
+    python DeepSentimentCrawling/sentiment_enrichment.py                 # 处理所有表的新增数据
+    python DeepSentimentCrawling/sentiment_enrichment.py --tables weibo_note_comment --window 5000
+    python DeepSentimentCrawling/sentiment_enrichment.py --service-url http://127.0.0.1:8700
+"""
+
+import sys
+import time
+import argparse
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+# 情感模型与共享推理服务客户端位于仓库根目录
+sys.path.append(str(project_root.parent))
+
+try:
+    import config
+except ImportError:
+    raise ImportError("无法导入config.py配置文件")
+
+from config import settings
+
+# 需要打分的来源表及其文本字段（按优先级取第一个非空字段，与MediaCrawlerDB展示的文本一致）
+ENRICHMENT_TABLES: Dict[str, List[str]] = {
+    'bilibili_video': ['title', 'desc'],
+    'bilibili_video_comment': ['content'],
+    'douyin_aweme': ['title', 'desc'],
+    'douyin_aweme_comment': ['content'],
+    'kuaishou_video': ['title', 'desc'],
+    'kuaishou_video_comment': ['content'],
+    'weibo_note': ['content'],
+    'weibo_note_comment': ['content'],
+    'xhs_note': ['title', 'desc'],
+    'xhs_note_comment': ['content'],
+    'zhihu_content': ['title', 'desc', 'content_text'],
+    'zhihu_comment': ['content'],
+    'tieba_note': ['title', 'desc'],
+    'tieba_comment': ['content'],
+}
+
+SENTIMENT_TABLE = "content_sentiment"
+STATE_TABLE = "sentiment_enrichment_state"
+
+# 每次从来源表读取的行数，一个窗口打分并写入后才推进水位线
+DEFAULT_WINDOW = 2000
+# 本地推理时单次前向计算的文本数，离线任务可以比在线查询时大
+DEFAULT_INFERENCE_BATCH_SIZE = 128
+# 情感分析器对无效输入返回的标签
+INVALID_INPUT_LABEL = "输入错误"
+
+Scorer = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+def pick_text(row: Dict[str, Any], columns: List[str]) -> str:
+    """按字段优先级取第一个非空文本"""
+    for column in columns:
+        value = row.get(column)
+        if value and str(value).strip():
+            return str(value)
+    return ""
+
+
+def score_by_length(scorer: Scorer, texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    按文本长度排序后整体打分，再还原为输入顺序
+
+    排序后相邻文本长度接近，模型分块推理时的padding更少
+
+    Args:
+        scorer: 批量打分函数
+        texts: 文本列表
+
+    Returns:
+        与输入顺序一致的结果列表
+    """
+    order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+    sorted_results = scorer([texts[index] for index in order])
+    if len(sorted_results) != len(texts):
+        raise RuntimeError(f"打分结果数量不匹配: {len(sorted_results)} != {len(texts)}")
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    for index, result in zip(order, sorted_results):
+        results[index] = result
+    return results  # type: ignore[return-value]
+
+
+def build_scorer(service_url: Optional[str] = None,
+                 inference_batch_size: int = DEFAULT_INFERENCE_BATCH_SIZE) -> Tuple[Scorer, str]:
+    """
+    构建批量打分函数
+
+    配置了共享推理服务时直接调用服务，否则在本进程加载WeiboMultilingualSentiment模型
+
+    Args:
+        service_url: 共享推理服务地址
+        inference_batch_size: 本地推理时单次前向计算的文本数
+
+    Returns:
+        (打分函数, 模型名称)
+    """
+    if service_url:
+        from utils.sentiment_service import SentimentServiceClient
+
+        client = SentimentServiceClient(service_url)
+        if not client.health():
+            raise RuntimeError(f"共享情感分析服务不可用: {service_url}")
+        logger.info(f"使用共享情感分析服务打分: {service_url}")
+        return client.analyze, "WeiboMultilingualSentiment@service"
+
+    from InsightEngine.tools import sentiment_analyzer as analyzer_module
+
+    # 显式传入空地址，分析器不再读取根目录配置中的服务地址
+    analyzer_module.LOCAL_INFERENCE_BATCH_SIZE = inference_batch_size
+    analyzer = analyzer_module.WeiboMultilingualSentimentAnalyzer(service_url="")
+    if not analyzer.initialize():
+        raise RuntimeError(f"情感模型加载失败: {analyzer.disable_reason}")
+
+    def score(texts: List[str]) -> List[Dict[str, Any]]:
+        return [asdict(result) for result in analyzer.predict_texts(texts)]
+
+    return score, analyzer.get_model_info().get('model_name', 'WeiboMultilingualSentiment')
+
+
+class SentimentEnrichment:
+    """离线情感打分任务"""
+
+    def __init__(self, scorer: Scorer, model_name: str, window: int = DEFAULT_WINDOW):
+        """
+        初始化打分任务
+
+        Args:
+            scorer: 批量打分函数，返回含sentiment_label/confidence/success字段的结果
+            model_name: 写入结果表的模型名称
+            window: 每个窗口读取的行数
+        """
+        self.scorer = scorer
+        self.model_name = model_name
+        self.window = max(1, window)
+        self.engine: Engine = None
+        self.connect()
+
+    def connect(self):
+        """连接数据库"""
+        dialect = (settings.DB_DIALECT or "mysql").lower()
+        if dialect in ("postgresql", "postgres"):
+            url = f"postgresql+psycopg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+        else:
+            url = f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset={settings.DB_CHARSET}"
+        self.engine = create_engine(url, future=True)
+        logger.info(f"情感打分任务成功连接到数据库: {settings.DB_NAME}")
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.engine:
+            self.engine.dispose()
+
+    def get_watermark(self, table: str) -> Tuple[int, int]:
+        """读取来源表的水位线(add_ts, id)，未处理过时为(0, 0)"""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(f"SELECT last_add_ts, last_row_id FROM {STATE_TABLE} WHERE source_table = :table"),
+                {"table": table},
+            ).mappings().first()
+        return (int(row['last_add_ts']), int(row['last_row_id'])) if row else (0, 0)
+
+    def fetch_window(self, table: str, columns: List[str], last_add_ts: int, last_row_id: int) -> List[Dict[str, Any]]:
+        """
+        读取水位线之后的一个窗口
+
+        按(add_ts, id)排序做键集分页，同一毫秒写入的多行也不会漏读；add_ts为空的行不参与打分
+        """
+        select_cols = ", ".join(f'"{column}"' if self.engine.dialect.name == 'postgresql' else f'`{column}`'
+                                for column in columns)
+        query = (f"SELECT id, add_ts, {select_cols} FROM {table} "
+                 f"WHERE add_ts > :ts OR (add_ts = :ts AND id > :row_id) "
+                 f"ORDER BY add_ts, id LIMIT :limit")
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(query), {"ts": last_add_ts, "row_id": last_row_id, "limit": self.window})
+            return [dict(row) for row in rows.mappings()]
+
+    def score_rows(self, rows: List[Dict[str, Any]], columns: List[str]) -> List[Dict[str, Any]]:
+        """
+        为一个窗口的行打分
+
+        Returns:
+            待写入结果表的记录列表（空文本的行跳过）
+
+        Raises:
+            RuntimeError: 有文本打分失败，整个窗口不写入，水位线不推进
+        """
+        pending = [(row['id'], pick_text(row, columns)) for row in rows]
+        pending = [(row_id, content) for row_id, content in pending if content]
+        if not pending:
+            return []
+
+        results = score_by_length(self.scorer, [content for _, content in pending])
+        # 预处理后为空的文本（纯链接、纯表情等）模型标记为输入错误，直接跳过；其余失败视为推理故障
+        failed = [result for result in results
+                  if not result.get('success') and result.get('sentiment_label') != INVALID_INPUT_LABEL]
+        if failed:
+            raise RuntimeError(f"{len(failed)}条文本打分失败: {failed[0].get('error_message')}")
+
+        scored_ts = int(time.time() * 1000)
+        return [
+            {
+                "row_id": row_id,
+                "sentiment_label": result['sentiment_label'],
+                "confidence": float(result['confidence']),
+                "model_name": self.model_name,
+                "scored_ts": scored_ts,
+            }
+            for (row_id, _), result in zip(pending, results)
+            if result.get('success')
+        ]
+
+    def save_window(self, table: str, records: List[Dict[str, Any]], last_add_ts: int, last_row_id: int):
+        """
+        写入一个窗口的打分结果并推进水位线（同一事务）
+
+        先删除同一批行的旧结果再插入，窗口重跑时结果不会重复
+        """
+        now = int(time.time() * 1000)
+        with self.engine.begin() as conn:
+            if records:
+                row_ids = [record['row_id'] for record in records]
+                placeholders = ", ".join(f":id_{index}" for index in range(len(row_ids)))
+                conn.execute(
+                    text(f"DELETE FROM {SENTIMENT_TABLE} WHERE source_table = :table AND row_id IN ({placeholders})"),
+                    {"table": table, **{f"id_{index}": row_id for index, row_id in enumerate(row_ids)}},
+                )
+                conn.execute(
+                    text(f"INSERT INTO {SENTIMENT_TABLE} "
+                         f"(source_table, row_id, sentiment_label, confidence, model_name, scored_ts) "
+                         f"VALUES (:source_table, :row_id, :sentiment_label, :confidence, :model_name, :scored_ts)"),
+                    [{"source_table": table, **record} for record in records],
+                )
+
+            updated = conn.execute(
+                text(f"UPDATE {STATE_TABLE} SET last_add_ts = :ts, last_row_id = :row_id, "
+                     f"scored_count = scored_count + :count, last_modify_ts = :now WHERE source_table = :table"),
+                {"ts": last_add_ts, "row_id": last_row_id, "count": len(records), "now": now, "table": table},
+            )
+            if updated.rowcount == 0:
+                conn.execute(
+                    text(f"INSERT INTO {STATE_TABLE} (source_table, last_add_ts, last_row_id, scored_count, last_modify_ts) "
+                         f"VALUES (:table, :ts, :row_id, :count, :now)"),
+                    {"table": table, "ts": last_add_ts, "row_id": last_row_id, "count": len(records), "now": now},
+                )
+
+    def enrich_table(self, table: str, max_rows: Optional[int] = None) -> Dict[str, int]:
+        """
+        增量处理一张来源表，直到没有新数据或达到max_rows
+
+        Args:
+            table: 来源表名
+            max_rows: 本次最多读取的行数，None表示不限
+
+        Returns:
+            统计信息 {'scanned': 读取行数, 'scored': 写入结果数}
+        """
+        columns = ENRICHMENT_TABLES[table]
+        last_add_ts, last_row_id = self.get_watermark(table)
+        stats = {'scanned': 0, 'scored': 0}
+
+        while max_rows is None or stats['scanned'] < max_rows:
+            rows = self.fetch_window(table, columns, last_add_ts, last_row_id)
+            if not rows:
+                break
+
+            records = self.score_rows(rows, columns)
+            last_add_ts, last_row_id = int(rows[-1]['add_ts']), int(rows[-1]['id'])
+            self.save_window(table, records, last_add_ts, last_row_id)
+
+            stats['scanned'] += len(rows)
+            stats['scored'] += len(records)
+            logger.info(f"{table}: 已读取 {stats['scanned']} 行，打分 {stats['scored']} 条，"
+                        f"水位线 add_ts={last_add_ts} id={last_row_id}")
+            if len(rows) < self.window:
+                break
+
+        return stats
+
+    def run(self, tables: Optional[List[str]] = None, max_rows: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """
+        依次处理多张来源表
+
+        单张表失败（表不存在、打分失败等）只记录错误，已完成的窗口保留，下次从水位线继续
+
+        Args:
+            tables: 来源表列表，默认处理ENRICHMENT_TABLES中的全部表
+            max_rows: 每张表本次最多读取的行数
+
+        Returns:
+            每张表的统计信息
+        """
+        summary = {}
+        start = time.perf_counter()
+        for table in tables or list(ENRICHMENT_TABLES):
+            if table not in ENRICHMENT_TABLES:
+                logger.warning(f"跳过不支持的表: {table}")
+                continue
+            try:
+                summary[table] = self.enrich_table(table, max_rows=max_rows)
+            except Exception as e:
+                logger.exception(f"{table} 情感打分失败: {e}")
+                summary[table] = {'scanned': 0, 'scored': 0, 'error': 1}
+
+        elapsed = time.perf_counter() - start
+        total_scored = sum(stats['scored'] for stats in summary.values())
+        logger.info(f"情感打分完成: 共 {total_scored} 条，耗时 {elapsed:.1f}s"
+                    f"（{total_scored / elapsed if elapsed > 0 else 0:.1f} 条/秒）")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MindSpider离线情感打分")
+    parser.add_argument('--tables', nargs='+', choices=list(ENRICHMENT_TABLES), help='要处理的来源表，默认全部')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='每个窗口读取的行数')
+    parser.add_argument('--max-rows', type=int, default=None, help='每张表本次最多读取的行数')
+    parser.add_argument('--service-url', default=getattr(settings, 'SENTIMENT_SERVICE_URL', None),
+                        help='共享情感分析服务地址，不填则本地加载模型')
+    parser.add_argument('--inference-batch-size', type=int, default=DEFAULT_INFERENCE_BATCH_SIZE,
+                        help='本地推理时单次前向计算的文本数')
+    args = parser.parse_args()
+
+    scorer, model_name = build_scorer(args.service_url, args.inference_batch_size)
+    job = SentimentEnrichment(scorer, model_name, window=args.window)
+    try:
+        summary = job.run(args.tables, max_rows=args.max_rows)
+    finally:
+        job.close()
+
+    for table, stats in summary.items():
+        status = "失败" if stats.get('error') else "完成"
+        logger.info(f"  {table}: {status}，读取 {stats['scanned']} 行，打分 {stats['scored']} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DeepSentimentCrawling模块 - 情感与互动预聚合
+按(来源关键词, 平台, 小时)增量汇总内容数、评论数、互动量与情感分布，写入sentiment_rollup_hourly表，
+InsightEngine的get_sentiment_trend工具直接读取汇总结果回答分布与趋势类问题，无需扫描原始评论。
+
+情感标签来自离线打分任务（sentiment_enrichment.py），因此每张表只汇总到打分任务的水位线为止，
+保证汇总时行的情感结果已经就绪；建议在打分任务之后运行。
+
+运行方式：
+    python DeepSentimentCrawling/sentiment_rollup.py
+    python DeepSentimentCrawling/sentiment_rollup.py --tables weibo_note weibo_note_comment
+    python DeepSentimentCrawling/sentiment_rollup.py --without-sentiment   # 未运行打分任务时只汇总数量与互动
+"""
+
+import sys
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+# 互动计数的解析规则与数值列映射以MediaCrawler入库时使用的为准
+sys.path.append(str(Path(__file__).parent / "MediaCrawler"))
+
+try:
+    import config
+except ImportError:
+    raise ImportError("无法导入config.py配置文件")
+
+from config import settings
+from sentiment_enrichment import SENTIMENT_TABLE, STATE_TABLE as ENRICHMENT_STATE_TABLE
+from database.counters import TYPED_COUNTER_COLUMNS, parse_count
+
+ROLLUP_TABLE = "sentiment_rollup_hourly"
+ROLLUP_STATE_TABLE = "sentiment_rollup_state"
+
+# 每次从来源表读取的行数
+DEFAULT_WINDOW = 5000
+
+# 来源表配置：kind区分内容/评论，time_col为发布时间字段，engagement为互动字段映射
+# （文本计数列读取时自动换成对应的BIGINT数值列）；
+# 评论表本身没有source_keyword，通过parent=(父表, 评论表关联字段, 父表关联字段)取所属内容的关键词
+ROLLUP_TABLES: Dict[str, Dict[str, Any]] = {
+    'bilibili_video': {'kind': 'content', 'time_col': 'create_time',
+                       'engagement': {'likes': 'liked_count', 'comments': 'video_comment', 'shares': 'video_share_count', 'views': 'video_play_count'}},
+    'bilibili_video_comment': {'kind': 'comment', 'time_col': 'create_time', 'engagement': {'likes': 'like_count'},
+                               'parent': ('bilibili_video', 'video_id', 'video_id')},
+    'douyin_aweme': {'kind': 'content', 'time_col': 'create_time',
+                     'engagement': {'likes': 'liked_count', 'comments': 'comment_count', 'shares': 'share_count'}},
+    'douyin_aweme_comment': {'kind': 'comment', 'time_col': 'create_time', 'engagement': {'likes': 'like_count'},
+                             'parent': ('douyin_aweme', 'aweme_id', 'aweme_id')},
+    'kuaishou_video': {'kind': 'content', 'time_col': 'create_time',
+                       'engagement': {'likes': 'liked_count', 'views': 'viewd_count'}},
+    'kuaishou_video_comment': {'kind': 'comment', 'time_col': 'create_time', 'engagement': {},
+                               'parent': ('kuaishou_video', 'video_id', 'video_id')},
+    'weibo_note': {'kind': 'content', 'time_col': 'create_time',
+                   'engagement': {'likes': 'liked_count', 'comments': 'comments_count', 'shares': 'shared_count'}},
+    'weibo_note_comment': {'kind': 'comment', 'time_col': 'create_time', 'engagement': {'likes': 'comment_like_count'},
+                           'parent': ('weibo_note', 'note_id', 'note_id')},
+    'xhs_note': {'kind': 'content', 'time_col': 'time',
+                 'engagement': {'likes': 'liked_count', 'comments': 'comment_count', 'shares': 'share_count'}},
+    'xhs_note_comment': {'kind': 'comment', 'time_col': 'create_time', 'engagement': {'likes': 'like_count'},
+                         'parent': ('xhs_note', 'note_id', 'note_id')},
+    'zhihu_content': {'kind': 'content', 'time_col': 'created_time',
+                      'engagement': {'likes': 'voteup_count', 'comments': 'comment_count'}},
+    'zhihu_comment': {'kind': 'comment', 'time_col': 'publish_time', 'engagement': {'likes': 'like_count'},
+                      'parent': ('zhihu_content', 'content_id', 'content_id')},
+    'tieba_note': {'kind': 'content', 'time_col': 'publish_time', 'engagement': {'comments': 'total_replay_num'}},
+    'tieba_comment': {'kind': 'comment', 'time_col': 'publish_time', 'engagement': {},
+                      'parent': ('tieba_note', 'note_id', 'note_id')},
+}
+
+ENGAGEMENT_FIELDS = ['likes', 'comments', 'shares', 'views']
+
+# 情感标签到汇总字段的映射
+SENTIMENT_COLUMNS = {
+    '非常负面': 'very_negative',
+    '负面': 'negative',
+    '中性': 'neutral',
+    '正面': 'positive',
+    '非常正面': 'very_positive',
+}
+
+COUNTER_FIELDS = (['content_count', 'comment_count'] + ENGAGEMENT_FIELDS
+                  + list(SENTIMENT_COLUMNS.values()) + ['unscored'])
+
+_TIME_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d']
+
+
+def to_hour_ts(value: Any) -> Optional[int]:
+    """
+    把各平台的发布时间统一为小时起点的Unix时间戳（秒）
+
+    兼容秒/毫秒时间戳（数字或数字字符串）与常见日期时间字符串，无法解析时返回None
+    """
+    if value is None or value == '':
+        return None
+    try:
+        if isinstance(value, datetime):
+            seconds = value.timestamp()
+        elif isinstance(value, (int, float)) or str(value).strip().isdigit():
+            seconds = float(value)
+            if seconds > 1_000_000_000_000:
+                seconds /= 1000
+        else:
+            raw = str(value).strip().split('+')[0].strip()
+            for fmt in _TIME_FORMATS:
+                try:
+                    seconds = datetime.strptime(raw, fmt).timestamp()
+                    break
+                except ValueError:
+                    continue
+            else:
+                return None
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+    if seconds <= 0:
+        return None
+    return int(seconds) // 3600 * 3600
+
+
+def platform_of(table: str) -> str:
+    """来源表对应的平台名，与MediaCrawlerDB返回结果中的platform一致"""
+    return table.split('_')[0]
+
+
+def aggregate_rows(table: str, rows: List[Dict[str, Any]]) -> Dict[Tuple[str, str, int], Dict[str, int]]:
+    """
+    把一个窗口的行汇总为各(关键词, 平台, 小时)桶的增量
+
+    Args:
+        table: 来源表名
+        rows: fetch_window返回的行（含source_keyword/ts/add_ts/sentiment_label及互动字段）
+
+    Returns:
+        {(source_keyword, platform, hour_ts): 各计数字段的增量}
+    """
+    table_config = ROLLUP_TABLES[table]
+    platform = platform_of(table)
+    count_field = 'content_count' if table_config['kind'] == 'content' else 'comment_count'
+    buckets: Dict[Tuple[str, str, int], Dict[str, int]] = {}
+
+    for row in rows:
+        hour_ts = to_hour_ts(row.get('ts'))
+        if hour_ts is None:
+            # 发布时间缺失时退回入库时间
+            hour_ts = to_hour_ts(row.get('add_ts'))
+        if hour_ts is None:
+            continue
+
+        keyword = (row.get('source_keyword') or '').strip()[:255]
+        counters = buckets.setdefault((keyword, platform, hour_ts), dict.fromkeys(COUNTER_FIELDS, 0))
+        counters[count_field] += 1
+        for field_name in table_config['engagement']:
+            counters[field_name] += parse_count(row.get(field_name)) or 0
+        counters[SENTIMENT_COLUMNS.get(row.get('sentiment_label'), 'unscored')] += 1
+
+    return buckets
+
+
+class SentimentRollup:
+    """情感与互动预聚合任务"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, without_sentiment: bool = False):
+        """
+        初始化预聚合任务
+
+        Args:
+            window: 每个窗口读取的行数
+            without_sentiment: 不等待离线打分，直接汇总到最新数据（情感计入unscored）
+        """
+        self.window = max(1, window)
+        self.without_sentiment = without_sentiment
+        self.engine: Engine = None
+        self.connect()
+
+    def connect(self):
+        """连接数据库"""
+        dialect = (settings.DB_DIALECT or "mysql").lower()
+        if dialect in ("postgresql", "postgres"):
+            url = f"postgresql+psycopg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+        else:
+            url = f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset={settings.DB_CHARSET}"
+        self.engine = create_engine(url, future=True)
+        logger.info(f"预聚合任务成功连接到数据库: {settings.DB_NAME}")
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.engine:
+            self.engine.dispose()
+
+    def _quote(self, name: str) -> str:
+        return f'"{name}"' if self.engine.dialect.name == 'postgresql' else f'`{name}`'
+
+    def _read_state(self, state_table: str, table: str) -> Optional[Tuple[int, int]]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(f"SELECT last_add_ts, last_row_id FROM {state_table} WHERE source_table = :table"),
+                {"table": table},
+            ).mappings().first()
+        return (int(row['last_add_ts']), int(row['last_row_id'])) if row else None
+
+    def fetch_window(self, table: str, start: Tuple[int, int], end: Optional[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        读取(start, end]区间内的一个窗口，按(add_ts, id)排序
+
+        评论行的关键词通过相关子查询取所属内容的source_keyword，同一内容被多个关键词爬到时取最早的一条，
+        避免JOIN放大评论行数
+        """
+        table_config = ROLLUP_TABLES[table]
+        q = self._quote
+        selects = ["c.id", "c.add_ts", f"c.{q(table_config['time_col'])} AS ts", "s.sentiment_label"]
+        typed_columns = TYPED_COUNTER_COLUMNS.get(table, {})
+        selects += [f"c.{q(typed_columns.get(column, column))} AS {field_name}"
+                    for field_name, column in table_config['engagement'].items()]
+        if table_config['kind'] == 'content':
+            selects.append("c.source_keyword")
+        else:
+            parent_table, child_key, parent_key = table_config['parent']
+            selects.append(f"(SELECT p.source_keyword FROM {parent_table} p WHERE p.{q(parent_key)} = c.{q(child_key)} "
+                           f"ORDER BY p.id LIMIT 1) AS source_keyword")
+
+        where = "(c.add_ts > :start_ts OR (c.add_ts = :start_ts AND c.id > :start_id))"
+        params: Dict[str, Any] = {"table": table, "start_ts": start[0], "start_id": start[1], "limit": self.window}
+        if end is not None:
+            where += " AND (c.add_ts < :end_ts OR (c.add_ts = :end_ts AND c.id <= :end_id))"
+            params.update({"end_ts": end[0], "end_id": end[1]})
+
+        query = (f"SELECT {', '.join(selects)} FROM {table} c "
+                 f"LEFT JOIN {SENTIMENT_TABLE} s ON s.source_table = :table AND s.row_id = c.id "
+                 f"WHERE {where} ORDER BY c.add_ts, c.id LIMIT :limit")
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(text(query), params).mappings()]
+
+    def save_window(self, table: str, buckets: Dict[Tuple[str, str, int], Dict[str, int]], last_add_ts: int, last_row_id: int):
+        """累加各桶的增量并推进水位线（同一事务）"""
+        now = int(time.time() * 1000)
+        increments = ", ".join(f"{name} = {name} + :{name}" for name in COUNTER_FIELDS)
+        insert_columns = ", ".join(COUNTER_FIELDS)
+        insert_values = ", ".join(f":{name}" for name in COUNTER_FIELDS)
+
+        with self.engine.begin() as conn:
+            for (keyword, platform, hour_ts), counters in buckets.items():
+                params = {"source_keyword": keyword, "platform": platform, "hour_ts": hour_ts, "now": now, **counters}
+                updated = conn.execute(
+                    text(f"UPDATE {ROLLUP_TABLE} SET {increments}, last_modify_ts = :now "
+                         f"WHERE source_keyword = :source_keyword AND platform = :platform AND hour_ts = :hour_ts"),
+                    params,
+                )
+                if updated.rowcount == 0:
+                    conn.execute(
+                        text(f"INSERT INTO {ROLLUP_TABLE} (source_keyword, platform, hour_ts, {insert_columns}, last_modify_ts) "
+                             f"VALUES (:source_keyword, :platform, :hour_ts, {insert_values}, :now)"),
+                        params,
+                    )
+
+            state_params = {"table": table, "ts": last_add_ts, "row_id": last_row_id, "now": now}
+            updated = conn.execute(
+                text(f"UPDATE {ROLLUP_STATE_TABLE} SET last_add_ts = :ts, last_row_id = :row_id, last_modify_ts = :now "
+                     f"WHERE source_table = :table"),
+                state_params,
+            )
+            if updated.rowcount == 0:
+                conn.execute(
+                    text(f"INSERT INTO {ROLLUP_STATE_TABLE} (source_table, last_add_ts, last_row_id, last_modify_ts) "
+                         f"VALUES (:table, :ts, :row_id, :now)"),
+                    state_params,
+                )
+
+    def rollup_table(self, table: str) -> Dict[str, int]:
+        """
+        增量汇总一张来源表
+
+        Returns:
+            统计信息 {'rows': 汇总行数, 'buckets': 更新的桶数}
+        """
+        stats = {'rows': 0, 'buckets': 0}
+        end = None
+        if not self.without_sentiment:
+            end = self._read_state(ENRICHMENT_STATE_TABLE, table)
+            if end is None:
+                logger.info(f"{table}: 尚未运行离线情感打分，跳过（可使用--without-sentiment只汇总数量与互动）")
+                return stats
+
+        start = self._read_state(ROLLUP_STATE_TABLE, table) or (0, 0)
+        while True:
+            rows = self.fetch_window(table, start, end)
+            if not rows:
+                break
+
+            buckets = aggregate_rows(table, rows)
+            start = (int(rows[-1]['add_ts']), int(rows[-1]['id']))
+            self.save_window(table, buckets, *start)
+
+            stats['rows'] += len(rows)
+            stats['buckets'] += len(buckets)
+            logger.info(f"{table}: 已汇总 {stats['rows']} 行，水位线 add_ts={start[0]} id={start[1]}")
+            if len(rows) < self.window:
+                break
+
+        return stats
+
+    def run(self, tables: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        依次汇总多张来源表，单张表失败只记录错误
+
+        Args:
+            tables: 来源表列表，默认处理ROLLUP_TABLES中的全部表
+
+        Returns:
+            每张表的统计信息
+        """
+        summary = {}
+        for table in tables or list(ROLLUP_TABLES):
+            if table not in ROLLUP_TABLES:
+                logger.warning(f"跳过不支持的表: {table}")
+                continue
+            try:
+                summary[table] = self.rollup_table(table)
+            except Exception as e:
+                logger.exception(f"{table} 预聚合失败: {e}")
+                summary[table] = {'rows': 0, 'buckets': 0, 'error': 1}
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MindSpider情感与互动预聚合")
+    parser.add_argument('--tables', nargs='+', choices=list(ROLLUP_TABLES), help='要汇总的来源表，默认全部')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='每个窗口读取的行数')
+    parser.add_argument('--without-sentiment', action='store_true', help='不等待离线情感打分，直接汇总到最新数据')
+    args = parser.parse_args()
+
+    job = SentimentRollup(window=args.window, without_sentiment=args.without_sentiment)
+    try:
+        summary = job.run(args.tables)
+    finally:
+        job.close()
+
+    for table, stats in summary.items():
+        status = "失败" if stats.get('error') else "完成"
+        logger.info(f"  {table}: {status}，汇总 {stats['rows']} 行")
+
+
+if __name__ == "__main__":
+    main()
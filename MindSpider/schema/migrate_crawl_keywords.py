@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MindSpider AI爬虫项目 - 爬取关键词维度迁移
+创建crawl_keyword维度表，为MediaCrawler内容/评论表补充keyword_id列与(keyword_id, 发布时间)复合索引，
+并回填存量数据：内容按source_keyword关联关键词id，评论沿用所属内容的keyword_id。
+新爬取的数据由MediaCrawler入库时自动写入keyword_id，此脚本只需对存量数据执行一次（可重复执行）。
+
+运行方式：
+    python schema/migrate_crawl_keywords.py
+    python schema/migrate_crawl_keywords.py --tables weibo_note weibo_note_comment --chunk-size 5000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+# 关键词规范化规则与表映射以MediaCrawler入库时使用的为准
+sys.path.append(str(project_root / "DeepSentimentCrawling" / "MediaCrawler"))
+
+try:
+    import config
+except ImportError:
+    logger.error("错误: 无法导入config.py配置文件")
+    sys.exit(1)
+
+from config import settings
+from database.keywords import KEYWORD_COMMENT_TABLES, KEYWORD_CONTENT_TABLES, normalize_keyword
+from models_bigdata import CrawlKeyword
+
+DEFAULT_CHUNK_SIZE = 5000
+KEYWORD_TABLE = CrawlKeyword.__tablename__
+
+
+class CrawlKeywordMigration:
+    """爬取关键词维度迁移"""
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        初始化迁移
+
+        Args:
+            chunk_size: 评论表每次回填的id区间大小
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.engine: Engine = None
+        self.connect()
+
+    def connect(self):
+        """连接数据库"""
+        dialect = (settings.DB_DIALECT or "mysql").lower()
+        if dialect in ("postgresql", "postgres"):
+            url = f"postgresql+psycopg://{settings.DB_USER}:{quote_plus(settings.DB_PASSWORD)}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+        else:
+            url = f"mysql+pymysql://{settings.DB_USER}:{quote_plus(settings.DB_PASSWORD)}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset={settings.DB_CHARSET}"
+        self.engine = create_engine(url, future=True)
+        logger.info(f"成功连接到数据库: {settings.DB_NAME}")
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.engine:
+            self.engine.dispose()
+
+    def add_keyword_column(self, table: str) -> bool:
+        """为表补充keyword_id列，返回是否新增"""
+        existing = {column['name'] for column in inspect(self.engine).get_columns(table)}
+        if 'keyword_id' in existing:
+            return False
+        with self.engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN keyword_id INTEGER NULL"))
+        return True
+
+    def create_keyword_index(self, table: str, time_col: str) -> Optional[str]:
+        """建立(keyword_id, 发布时间)复合索引（命名与ORM模型一致），返回新建的索引名"""
+        index_name = f"idx_{table}_keyword_time"
+        existing = {index['name'] for index in inspect(self.engine).get_indexes(table)}
+        if index_name in existing:
+            return None
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX {index_name} ON {table} (keyword_id, {time_col})"))
+        return index_name
+
+    def load_keyword_ids(self) -> Dict[str, int]:
+        """读取维度表中已有的关键词id"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT id, keyword FROM {KEYWORD_TABLE}")).mappings()
+            return {row['keyword']: row['id'] for row in rows}
+
+    def backfill_content(self, table: str, keyword_ids: Dict[str, int]) -> int:
+        """
+        按source_keyword回填内容表的keyword_id，维度表中缺少的关键词先补齐
+
+        Returns:
+            回填的行数
+        """
+        with self.engine.connect() as conn:
+            raw_keywords = [row[0] for row in conn.execute(text(
+                f"SELECT DISTINCT source_keyword FROM {table} WHERE keyword_id IS NULL AND source_keyword IS NOT NULL"))]
+
+        total = 0
+        for raw_keyword in raw_keywords:
+            keyword = normalize_keyword(raw_keyword)
+            if not keyword:
+                continue
+            with self.engine.begin() as conn:
+                if keyword not in keyword_ids:
+                    now = int(time.time() * 1000)
+                    conn.execute(text(f"INSERT INTO {KEYWORD_TABLE} (keyword, add_ts, last_modify_ts) VALUES (:keyword, :now, :now)"),
+                                 {"keyword": keyword, "now": now})
+                    keyword_ids[keyword] = conn.execute(text(f"SELECT id FROM {KEYWORD_TABLE} WHERE keyword = :keyword"),
+                                                        {"keyword": keyword}).scalar_one()
+                result = conn.execute(text(f"UPDATE {table} SET keyword_id = :keyword_id WHERE source_keyword = :raw_keyword AND keyword_id IS NULL"),
+                                      {"keyword_id": keyword_ids[keyword], "raw_keyword": raw_keyword})
+                total += result.rowcount or 0
+        return total
+
+    def backfill_comments(self, table: str, parent_table: str, parent_key: str) -> int:
+        """
+        按id区间分块，把所属内容的keyword_id回填到评论表
+
+        Returns:
+            回填的行数
+        """
+        with self.engine.connect() as conn:
+            max_id = conn.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+
+        update_sql = text(
+            f"UPDATE {table} SET keyword_id = (SELECT MAX(p.keyword_id) FROM {parent_table} p WHERE p.{parent_key} = {table}.{parent_key}) "
+            f"WHERE id > :low AND id <= :high AND keyword_id IS NULL"
+        )
+        low, total = 0, 0
+        while low < max_id:
+            high = low + self.chunk_size
+            with self.engine.begin() as conn:
+                total += conn.execute(update_sql, {"low": low, "high": high}).rowcount or 0
+            low = high
+            logger.info(f"{table}: 已处理到 id <= {min(high, max_id)}")
+        return total
+
+    def migrate(self, tables: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        依次迁移各表（内容表先于评论表），不存在的表跳过
+
+        Args:
+            tables: 要迁移的表，默认全部
+
+        Returns:
+            每张表的迁移结果
+        """
+        CrawlKeyword.__table__.create(self.engine, checkfirst=True)
+        keyword_ids = self.load_keyword_ids()
+        existing_tables = set(inspect(self.engine).get_table_names())
+        selected = tables or list(KEYWORD_CONTENT_TABLES) + list(KEYWORD_COMMENT_TABLES)
+        summary = {}
+
+        for table in [t for t in KEYWORD_CONTENT_TABLES if t in selected] + [t for t in KEYWORD_COMMENT_TABLES if t in selected]:
+            if table not in existing_tables:
+                logger.info(f"{table}: 表不存在，跳过")
+                continue
+            added = self.add_keyword_column(table)
+            if table in KEYWORD_CONTENT_TABLES:
+                time_col = KEYWORD_CONTENT_TABLES[table]
+                backfilled = self.backfill_content(table, keyword_ids)
+            else:
+                time_col, parent_table, parent_key = KEYWORD_COMMENT_TABLES[table]
+                parent_ready = parent_table in existing_tables and any(
+                    column['name'] == 'keyword_id' for column in inspect(self.engine).get_columns(parent_table))
+                if not parent_ready:
+                    logger.warning(f"{table}: 所属内容表 {parent_table} 尚未迁移，跳过回填")
+                backfilled = self.backfill_comments(table, parent_table, parent_key) if parent_ready else 0
+            index = self.create_keyword_index(table, time_col)
+            summary[table] = {"added_column": added, "backfilled": backfilled, "index": index}
+            logger.info(f"{table}: {'新增keyword_id列，' if added else ''}回填 {backfilled} 行，新建索引 {index or '无'}")
+        return summary
+
+
+def main():
+    all_tables = list(KEYWORD_CONTENT_TABLES) + list(KEYWORD_COMMENT_TABLES)
+    parser = argparse.ArgumentParser(description="MediaCrawler爬取关键词维度迁移")
+    parser.add_argument('--tables', nargs='+', choices=all_tables, help='要迁移的表，默认全部')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='评论表每次回填的id区间大小')
+    args = parser.parse_args()
+
+    migration = CrawlKeywordMigration(chunk_size=args.chunk_size)
+    try:
+        migration.migrate(args.tables)
+    finally:
+        migration.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MindSpider AI爬虫项目 - 互动计数数值列迁移
+为MediaCrawler内容/评论表补充BIGINT互动计数列（原文本列名加_num后缀），
+按id分块把已有的文本计数（"1.2万"、"3w"、"1.5k"等）解析回填，并为热点排序常用的列建立索引。
+新爬取的数据由MediaCrawler入库时自动填充，此脚本只需对存量数据执行一次（可重复执行）。
+
+运行方式：
+    python schema/migrate_engagement_counters.py
+    python schema/migrate_engagement_counters.py --tables weibo_note weibo_note_comment --chunk-size 5000
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+# 解析规则与列映射以MediaCrawler入库时使用的为准
+sys.path.append(str(project_root / "DeepSentimentCrawling" / "MediaCrawler"))
+
+try:
+    import config
+except ImportError:
+    logger.error("错误: 无法导入config.py配置文件")
+    sys.exit(1)
+
+from config import settings
+from database.counters import INDEXED_COUNTER_COLUMNS, TYPED_COUNTER_COLUMNS, parse_count
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class EngagementCounterMigration:
+    """互动计数数值列迁移"""
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        初始化迁移
+
+        Args:
+            chunk_size: 每次回填的行数
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.engine: Engine = None
+        self.connect()
+
+    def connect(self):
+        """连接数据库"""
+        dialect = (settings.DB_DIALECT or "mysql").lower()
+        if dialect in ("postgresql", "postgres"):
+            url = f"postgresql+psycopg://{settings.DB_USER}:{quote_plus(settings.DB_PASSWORD)}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+        else:
+            url = f"mysql+pymysql://{settings.DB_USER}:{quote_plus(settings.DB_PASSWORD)}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset={settings.DB_CHARSET}"
+        self.engine = create_engine(url, future=True)
+        logger.info(f"成功连接到数据库: {settings.DB_NAME}")
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.engine:
+            self.engine.dispose()
+
+    def add_columns(self, table: str, mapping: Dict[str, str]) -> List[str]:
+        """为表补充缺失的数值列，返回新增的列名"""
+        existing = {column['name'] for column in inspect(self.engine).get_columns(table)}
+        added = []
+        with self.engine.begin() as conn:
+            for num_column in mapping.values():
+                if num_column not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {num_column} BIGINT NULL"))
+                    added.append(num_column)
+        return added
+
+    def backfill(self, table: str, mapping: Dict[str, str]) -> int:
+        """
+        按id分块解析文本计数并回填数值列
+
+        Returns:
+            回填的行数
+        """
+        text_columns = list(mapping)
+        assignments = ", ".join(f"{num_column} = :{num_column}" for num_column in mapping.values())
+        select_sql = text(f"SELECT id, {', '.join(text_columns)} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit")
+        update_sql = text(f"UPDATE {table} SET {assignments} WHERE id = :id")
+
+        last_id, total = 0, 0
+        while True:
+            with self.engine.connect() as conn:
+                rows = [dict(row) for row in conn.execute(select_sql, {"last_id": last_id, "limit": self.chunk_size}).mappings()]
+            if not rows:
+                break
+
+            updates = [
+                {"id": row["id"], **{num_column: parse_count(row[text_column]) for text_column, num_column in mapping.items()}}
+                for row in rows
+            ]
+            with self.engine.begin() as conn:
+                conn.execute(update_sql, updates)
+
+            last_id = rows[-1]["id"]
+            total += len(rows)
+            logger.info(f"{table}: 已回填 {total} 行（id <= {last_id}）")
+            if len(rows) < self.chunk_size:
+                break
+        return total
+
+    def create_indexes(self, table: str, mapping: Dict[str, str]) -> List[str]:
+        """为热点排序常用的数值列建立索引（命名与ORM模型index=True一致）"""
+        existing = {index['name'] for index in inspect(self.engine).get_indexes(table)}
+        created = []
+        with self.engine.begin() as conn:
+            for num_column in mapping.values():
+                index_name = f"ix_{table}_{num_column}"
+                if num_column in INDEXED_COUNTER_COLUMNS and index_name not in existing:
+                    conn.execute(text(f"CREATE INDEX {index_name} ON {table} ({num_column})"))
+                    created.append(index_name)
+        return created
+
+    def migrate(self, tables: Optional[List[str]] = None, skip_backfill: bool = False) -> Dict[str, Dict]:
+        """
+        依次迁移各表，不存在的表跳过
+
+        Args:
+            tables: 要迁移的表，默认全部
+            skip_backfill: 只加列和索引，不回填数据
+
+        Returns:
+            每张表的迁移结果
+        """
+        existing_tables = set(inspect(self.engine).get_table_names())
+        summary = {}
+        for table in tables or list(TYPED_COUNTER_COLUMNS):
+            mapping = TYPED_COUNTER_COLUMNS[table]
+            if table not in existing_tables:
+                logger.info(f"{table}: 表不存在，跳过")
+                continue
+            added = self.add_columns(table, mapping)
+            backfilled = 0 if skip_backfill else self.backfill(table, mapping)
+            indexes = self.create_indexes(table, mapping)
+            summary[table] = {"added_columns": added, "backfilled": backfilled, "indexes": indexes}
+            logger.info(f"{table}: 新增列 {added or '无'}，回填 {backfilled} 行，新建索引 {indexes or '无'}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaCrawler互动计数数值列迁移")
+    parser.add_argument('--tables', nargs='+', choices=list(TYPED_COUNTER_COLUMNS), help='要迁移的表，默认全部')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='每次回填的行数')
+    parser.add_argument('--skip-backfill', action='store_true', help='只加列和索引，不回填存量数据')
+    args = parser.parse_args()
+
+    migration = EngagementCounterMigration(chunk_size=args.chunk_size)
+    try:
+        migration.migrate(args.tables, skip_backfill=args.skip_backfill)
+    finally:
+        migration.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -105,6 +105,78 @@ CREATE TABLE `crawling_tasks` (
     FOREIGN KEY (`topic_id`) REFERENCES `daily_topics`(`topic_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='爬取任务表';
 
+-- ----------------------------
+-- 离线情感打分结果表
+-- 按(来源表, 行id)关联MediaCrawler内容/评论表，由DeepSentimentCrawling/sentiment_enrichment.py写入
+-- ----------------------------
+DROP TABLE IF EXISTS `content_sentiment`;
+CREATE TABLE `content_sentiment` (
+    `id` int NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `source_table` varchar(64) NOT NULL COMMENT '来源表名(如weibo_note_comment)',
+    `row_id` int NOT NULL COMMENT '来源表中的行id',
+    `sentiment_label` varchar(16) NOT NULL COMMENT '情感标签(非常负面|负面|中性|正面|非常正面)',
+    `confidence` float NOT NULL COMMENT '置信度',
+    `model_name` varchar(128) DEFAULT NULL COMMENT '打分模型',
+    `scored_ts` bigint NOT NULL COMMENT '打分时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uq_content_sentiment_row` (`source_table`, `row_id`),
+    KEY `idx_content_sentiment_label` (`source_table`, `sentiment_label`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='离线情感打分结果表';
+
+-- ----------------------------
+-- 离线情感打分水位线表
+-- ----------------------------
+DROP TABLE IF EXISTS `sentiment_enrichment_state`;
+CREATE TABLE `sentiment_enrichment_state` (
+    `source_table` varchar(64) NOT NULL COMMENT '来源表名',
+    `last_add_ts` bigint NOT NULL DEFAULT 0 COMMENT '已处理到的add_ts',
+    `last_row_id` int NOT NULL DEFAULT 0 COMMENT '同一add_ts下已处理到的行id',
+    `scored_count` bigint NOT NULL DEFAULT 0 COMMENT '累计打分行数',
+    `last_modify_ts` bigint NOT NULL COMMENT '记录最后修改时间戳',
+    PRIMARY KEY (`source_table`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='离线情感打分水位线表';
+
+-- ----------------------------
+-- 情感与互动预聚合表
+-- 按(来源关键词, 平台, 小时)汇总，由DeepSentimentCrawling/sentiment_rollup.py增量维护
+-- ----------------------------
+DROP TABLE IF EXISTS `sentiment_rollup_hourly`;
+CREATE TABLE `sentiment_rollup_hourly` (
+    `id` int NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `source_keyword` varchar(255) NOT NULL DEFAULT '' COMMENT '爬取时使用的关键词',
+    `platform` varchar(32) NOT NULL COMMENT '平台(bilibili|douyin|kuaishou|weibo|xhs|zhihu|tieba)',
+    `hour_ts` bigint NOT NULL COMMENT '小时起点的Unix时间戳(秒)',
+    `content_count` int NOT NULL DEFAULT 0 COMMENT '内容数',
+    `comment_count` int NOT NULL DEFAULT 0 COMMENT '评论数',
+    `likes` bigint NOT NULL DEFAULT 0 COMMENT '点赞总数',
+    `comments` bigint NOT NULL DEFAULT 0 COMMENT '评论总数(内容上的计数)',
+    `shares` bigint NOT NULL DEFAULT 0 COMMENT '分享/转发总数',
+    `views` bigint NOT NULL DEFAULT 0 COMMENT '播放/浏览总数',
+    `very_negative` int NOT NULL DEFAULT 0 COMMENT '非常负面条数',
+    `negative` int NOT NULL DEFAULT 0 COMMENT '负面条数',
+    `neutral` int NOT NULL DEFAULT 0 COMMENT '中性条数',
+    `positive` int NOT NULL DEFAULT 0 COMMENT '正面条数',
+    `very_positive` int NOT NULL DEFAULT 0 COMMENT '非常正面条数',
+    `unscored` int NOT NULL DEFAULT 0 COMMENT '未打分条数',
+    `last_modify_ts` bigint NOT NULL COMMENT '记录最后修改时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uq_sentiment_rollup_bucket` (`source_keyword`, `platform`, `hour_ts`),
+    KEY `idx_sentiment_rollup_platform_hour` (`platform`, `hour_ts`),
+    KEY `idx_sentiment_rollup_hour` (`hour_ts`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='情感与互动预聚合表';
+
+-- ----------------------------
+-- 预聚合水位线表
+-- ----------------------------
+DROP TABLE IF EXISTS `sentiment_rollup_state`;
+CREATE TABLE `sentiment_rollup_state` (
+    `source_table` varchar(64) NOT NULL COMMENT '来源表名',
+    `last_add_ts` bigint NOT NULL DEFAULT 0 COMMENT '已汇总到的add_ts',
+    `last_row_id` int NOT NULL DEFAULT 0 COMMENT '同一add_ts下已汇总到的行id',
+    `last_modify_ts` bigint NOT NULL COMMENT '记录最后修改时间戳',
+    PRIMARY KEY (`source_table`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='预聚合水位线表';
+
 -- ===============================
 -- MediaCrawler表结构扩展字段
 -- ===============================
@@ -10,13 +10,22 @@
 """
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey
+from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey, Index
 
 # 使用 models_sa 中的 Base，确保所有表在同一个 metadata 中，外键引用可以正常工作
 from models_sa import Base
 
+class CrawlKeyword(Base):
+    """爬取关键词维度表，内容/评论表通过keyword_id关联"""
+    __tablename__ = "crawl_keyword"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    keyword: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
 class BilibiliVideo(Base):
     __tablename__ = "bilibili_video"
+    __table_args__ = (Index("idx_bilibili_video_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     video_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True, unique=True)
     video_url: Mapped[str] = mapped_column(Text, nullable=False)
@@ -32,18 +41,26 @@ class BilibiliVideo(Base):
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     disliked_count: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_play_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_play_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     video_favorite_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_favorite_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_share_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_share_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_coin_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_coin_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_danmaku: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_danmaku_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
+    video_comment_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_cover_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
 class BilibiliVideoComment(Base):
     __tablename__ = "bilibili_video_comment"
+    __table_args__ = (Index("idx_bilibili_video_comment_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -57,8 +74,11 @@ class BilibiliVideoComment(Base):
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     sub_comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sub_comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     like_count: Mapped[str | None] = mapped_column(Text, default='0', nullable=True)
+    like_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 
 class BilibiliUpInfo(Base):
@@ -110,6 +130,7 @@ class BilibiliUpDynamic(Base):
 
 class DouyinAweme(Base):
     __tablename__ = "douyin_aweme"
+    __table_args__ = (Index("idx_douyin_aweme_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     sec_uid: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -127,20 +148,26 @@ class DouyinAweme(Base):
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     liked_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    liked_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     share_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    share_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     collected_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    collected_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     aweme_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     cover_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_download_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     music_download_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     note_download_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
 class DouyinAwemeComment(Base):
     __tablename__ = "douyin_aweme_comment"
+    __table_args__ = (Index("idx_douyin_aweme_comment_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     sec_uid: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -157,9 +184,12 @@ class DouyinAwemeComment(Base):
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     sub_comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sub_comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     like_count: Mapped[str | None] = mapped_column(Text, default='0', nullable=True)
+    like_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     pictures: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 
 class DyCreator(Base):
@@ -181,6 +211,7 @@ class DyCreator(Base):
 
 class KuaishouVideo(Base):
     __tablename__ = "kuaishou_video"
+    __table_args__ = (Index("idx_kuaishou_video_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -193,16 +224,20 @@ class KuaishouVideo(Base):
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     liked_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    liked_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     viewd_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    viewd_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     video_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_cover_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_play_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
 class KuaishouVideoComment(Base):
     __tablename__ = "kuaishou_video_comment"
+    __table_args__ = (Index("idx_kuaishou_video_comment_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -214,9 +249,12 @@ class KuaishouVideoComment(Base):
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     sub_comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sub_comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 class WeiboNote(Base):
     __tablename__ = "weibo_note"
+    __table_args__ = (Index("idx_weibo_note_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -231,15 +269,20 @@ class WeiboNote(Base):
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     create_date_time: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     liked_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    liked_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     comments_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    comments_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     shared_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    shared_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
 class WeiboNoteComment(Base):
     __tablename__ = "weibo_note_comment"
+    __table_args__ = (Index("idx_weibo_note_comment_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -255,8 +298,11 @@ class WeiboNoteComment(Base):
     create_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     create_date_time: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     comment_like_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    comment_like_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     sub_comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sub_comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 
 class WeiboCreator(Base):
@@ -294,6 +340,7 @@ class XhsCreator(Base):
 
 class XhsNote(Base):
     __tablename__ = "xhs_note"
+    __table_args__ = (Index("idx_xhs_note_keyword_time", "keyword_id", "time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -309,13 +356,18 @@ class XhsNote(Base):
     time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     last_update_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     liked_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    liked_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     collected_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    collected_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    comment_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     share_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    share_count_num: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     image_list: Mapped[str | None] = mapped_column(Text, nullable=True)
     tag_list: Mapped[str | None] = mapped_column(Text, nullable=True)
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     xsec_token: Mapped[str | None] = mapped_column(Text, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
@@ -323,6 +375,7 @@ class XhsNote(Base):
 
 class XhsNoteComment(Base):
     __tablename__ = "xhs_note_comment"
+    __table_args__ = (Index("idx_xhs_note_comment_keyword_time", "keyword_id", "create_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -338,9 +391,12 @@ class XhsNoteComment(Base):
     pictures: Mapped[str | None] = mapped_column(Text, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     like_count: Mapped[str | None] = mapped_column(Text, nullable=True)
+    like_count_num: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 class TiebaNote(Base):
     __tablename__ = "tieba_note"
+    __table_args__ = (Index("idx_tieba_note_keyword_time", "keyword_id", "publish_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     note_id: Mapped[str | None] = mapped_column(String(644), index=True, nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -359,11 +415,13 @@ class TiebaNote(Base):
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
 class TiebaComment(Base):
     __tablename__ = "tieba_comment"
+    __table_args__ = (Index("idx_tieba_comment_keyword_time", "keyword_id", "publish_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     comment_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), default='', nullable=True)
@@ -381,6 +439,7 @@ class TiebaComment(Base):
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 
 class TiebaCreator(Base):
@@ -401,6 +460,7 @@ class TiebaCreator(Base):
 
 class ZhihuContent(Base):
     __tablename__ = "zhihu_content"
+    __table_args__ = (Index("idx_zhihu_content_keyword_time", "keyword_id", "created_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     content_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
     content_type: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -414,6 +474,7 @@ class ZhihuContent(Base):
     voteup_count: Mapped[int | None] = mapped_column(Integer, default=0, nullable=True)
     comment_count: Mapped[int | None] = mapped_column(Integer, default=0, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     user_link: Mapped[str | None] = mapped_column(Text, nullable=True)
     user_nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -426,6 +487,7 @@ class ZhihuContent(Base):
 
 class ZhihuComment(Base):
     __tablename__ = "zhihu_comment"
+    __table_args__ = (Index("idx_zhihu_comment_keyword_time", "keyword_id", "publish_time"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     comment_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
     parent_comment_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -443,6 +505,7 @@ class ZhihuComment(Base):
     user_avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    keyword_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawl_keyword.id", ondelete="SET NULL"), nullable=True)
 
 
 class ZhihuCreator(Base):
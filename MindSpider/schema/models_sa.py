@@ -21,6 +21,10 @@ __all__ = [
     "DailyTopic",
     "TopicNewsRelation",
     "CrawlingTask",
+    "ContentSentiment",
+    "SentimentEnrichmentState",
+    "SentimentRollupHourly",
+    "SentimentRollupState",
 ]
 
 
@@ -124,3 +128,67 @@ class CrawlingTask(Base):
     last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
 
+class ContentSentiment(Base):
+    """离线情感打分结果，按(来源表, 行id)关联MediaCrawler内容/评论表"""
+    __tablename__ = "content_sentiment"
+    __table_args__ = (
+        UniqueConstraint("source_table", "row_id", name="uq_content_sentiment_row"),
+        Index("idx_content_sentiment_label", "source_table", "sentiment_label"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source_table: Mapped[str] = mapped_column(String(64), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    sentiment_label: Mapped[str] = mapped_column(String(16), nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    model_name: Mapped[Optional[str]] = mapped_column(String(128))
+    scored_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class SentimentEnrichmentState(Base):
+    """离线情感打分水位线：每张来源表已处理到的(add_ts, id)"""
+    __tablename__ = "sentiment_enrichment_state"
+
+    source_table: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_add_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_row_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    scored_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class SentimentRollupHourly(Base):
+    """按(来源关键词, 平台, 小时)预聚合的内容量、互动量与情感分布"""
+    __tablename__ = "sentiment_rollup_hourly"
+    __table_args__ = (
+        UniqueConstraint("source_keyword", "platform", "hour_ts", name="uq_sentiment_rollup_bucket"),
+        Index("idx_sentiment_rollup_platform_hour", "platform", "hour_ts"),
+        Index("idx_sentiment_rollup_hour", "hour_ts"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source_keyword: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    platform: Mapped[str] = mapped_column(String(32), nullable=False)
+    hour_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    likes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    comments: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    shares: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    very_negative: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    negative: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    neutral: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    very_positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unscored: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class SentimentRollupState(Base):
+    """预聚合水位线：每张来源表已汇总到的(add_ts, id)"""
+    __tablename__ = "sentiment_rollup_state"
+
+    source_table: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_add_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_row_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -22,6 +22,7 @@ from .state import State
 from .tools import TavilyNewsAgency, TavilyResponse
 from .utils import Settings, format_search_results_for_prompt
 from loguru import logger
+from utils.report_registry import register_report
 
 class DeepSearchAgent:
     """Deep Search Agent主类"""
@@ -48,6 +49,9 @@ class DeepSearchAgent:
         
         # 状态
         self.state = State()
+
+        # 前端搜索会话ID（由调用方设置），保存报告时一并登记
+        self.session_id: Optional[str] = None
         
         # 确保输出目录存在
         os.makedirs(self.config.OUTPUT_DIR, exist_ok=True)
@@ -438,6 +442,7 @@ class DeepSearchAgent:
             f.write(report_content)
         
         logger.info(f"报告已保存到: {filepath}")
+        register_report('query', filepath, self.state.query, self.session_id)
         
         # 保存状态（如果配置允许）
         if self.config.SAVE_INTERMEDIATE_STATES:
@@ -445,6 +450,8 @@ class DeepSearchAgent:
             state_filepath = os.path.join(self.config.OUTPUT_DIR, state_filename)
             self.state.save_to_file(state_filepath)
             logger.info(f"状态已保存到: {state_filepath}")
+        
+        return filepath
     
     def get_progress_summary(self) -> Dict[str, Any]:
         """获取进度摘要"""
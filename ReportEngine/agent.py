@@ -3,107 +3,24 @@ Report Agent主类
 整合所有模块，实现完整的报告生成流程
 """
 
-import json
+import copy
 import os
+import threading
 from loguru import logger
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
-from .llms import LLMClient
+from .llms import LLMClient, GenerationCancelled
 from .nodes import (
     TemplateSelectionNode,
-    HTMLGenerationNode
+    HTMLGenerationNode,
+    SectionedHTMLGenerationNode
 )
 from .state import ReportState
 from .utils.config import settings, Settings
-
-
-class FileCountBaseline:
-    """文件数量基准管理器"""
-    
-    def __init__(self):
-        self.baseline_file = 'logs/report_baseline.json'
-        self.baseline_data = self._load_baseline()
-    
-    def _load_baseline(self) -> Dict[str, int]:
-        """加载基准数据"""
-        try:
-            if os.path.exists(self.baseline_file):
-                with open(self.baseline_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.exception(f"加载基准数据失败: {e}")
-        return {}
-    
-    def _save_baseline(self):
-        """保存基准数据"""
-        try:
-            os.makedirs(os.path.dirname(self.baseline_file), exist_ok=True)
-            with open(self.baseline_file, 'w', encoding='utf-8') as f:
-                json.dump(self.baseline_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.exception(f"保存基准数据失败: {e}")
-    
-    def initialize_baseline(self, directories: Dict[str, str]) -> Dict[str, int]:
-        """初始化文件数量基准"""
-        current_counts = {}
-        
-        for engine, directory in directories.items():
-            if os.path.exists(directory):
-                md_files = [f for f in os.listdir(directory) if f.endswith('.md')]
-                current_counts[engine] = len(md_files)
-            else:
-                current_counts[engine] = 0
-        
-        # 保存基准数据
-        self.baseline_data = current_counts.copy()
-        self._save_baseline()
-        
-        logger.info(f"文件数量基准已初始化: {current_counts}")
-        return current_counts
-    
-    def check_new_files(self, directories: Dict[str, str]) -> Dict[str, Any]:
-        """检查是否有新文件"""
-        current_counts = {}
-        new_files_found = {}
-        all_have_new = True
-        
-        for engine, directory in directories.items():
-            if os.path.exists(directory):
-                md_files = [f for f in os.listdir(directory) if f.endswith('.md')]
-                current_counts[engine] = len(md_files)
-                baseline_count = self.baseline_data.get(engine, 0)
-                
-                if current_counts[engine] > baseline_count:
-                    new_files_found[engine] = current_counts[engine] - baseline_count
-                else:
-                    new_files_found[engine] = 0
-                    all_have_new = False
-            else:
-                current_counts[engine] = 0
-                new_files_found[engine] = 0
-                all_have_new = False
-        
-        return {
-            'ready': all_have_new,
-            'baseline_counts': self.baseline_data,
-            'current_counts': current_counts,
-            'new_files_found': new_files_found,
-            'missing_engines': [engine for engine, count in new_files_found.items() if count == 0]
-        }
-    
-    def get_latest_files(self, directories: Dict[str, str]) -> Dict[str, str]:
-        """获取每个目录的最新文件"""
-        latest_files = {}
-        
-        for engine, directory in directories.items():
-            if os.path.exists(directory):
-                md_files = [f for f in os.listdir(directory) if f.endswith('.md')]
-                if md_files:
-                    latest_file = max(md_files, key=lambda x: os.path.getmtime(os.path.join(directory, x)))
-                    latest_files[engine] = os.path.join(directory, latest_file)
-        
-        return latest_files
+from .utils.event_stream import ReportEventStream
+from .utils.section_utils import split_template_sections
+from utils.report_registry import get_report_registry
 
 
 class ReportAgent:
@@ -119,8 +36,8 @@ class ReportAgent:
         # 加载配置
         self.config = config or settings
         
-        # 初始化文件基准管理器
-        self.file_baseline = FileCountBaseline()
+        # 引擎报告注册表（替代扫描报告目录的文件数量基准）
+        self.report_registry = get_report_registry()
         
         # 初始化日志
         self._setup_logging()
@@ -131,8 +48,8 @@ class ReportAgent:
         # 初始化节点
         self._initialize_nodes()
         
-        # 初始化文件数量基准
-        self._initialize_file_baseline()
+        # 记录注册表基准，之后登记的报告才视为新输入
+        self.input_baseline_id = self.report_registry.last_id()
         
         # 状态
         self.state = ReportState()
@@ -152,15 +69,6 @@ class ReportAgent:
         # 创建专用的logger，避免与其他模块冲突
         logger.add(self.config.LOG_FILE, level="INFO")
         
-    def _initialize_file_baseline(self):
-        """初始化文件数量基准"""
-        directories = {
-            'insight': 'insight_engine_streamlit_reports',
-            'media': 'media_engine_streamlit_reports',
-            'query': 'query_engine_streamlit_reports'
-        }
-        self.file_baseline.initialize_baseline(directories)
-    
     def _initialize_llm(self) -> LLMClient:
         """初始化LLM客户端"""
         return LLMClient(
@@ -176,9 +84,18 @@ class ReportAgent:
             self.config.TEMPLATE_DIR
         )
         self.html_generation_node = HTMLGenerationNode(self.llm_client)
+        self.sectioned_html_generation_node = SectionedHTMLGenerationNode(
+            self.llm_client,
+            max_workers=self.config.SECTION_MAX_WORKERS,
+            max_retries=self.config.SECTION_MAX_RETRIES,
+            excerpt_chars=self.config.SECTION_EXCERPT_CHARS,
+            checkpoint_dir=self.config.SECTION_CHECKPOINT_DIR
+        )
     
     def generate_report(self, query: str, reports: List[Any], forum_logs: str = "", 
-                       custom_template: str = "", save_report: bool = True) -> str:
+                       custom_template: str = "", save_report: bool = True,
+                       event_stream: Optional[ReportEventStream] = None,
+                       cancel_event: Optional[threading.Event] = None) -> str:
         """
         生成综合报告
         
@@ -188,6 +105,8 @@ class ReportAgent:
             forum_logs: 论坛日志内容
             custom_template: 用户自定义模板（可选）
             save_report: 是否保存报告到文件
+            event_stream: 事件流（可选），生成过程中的LLM文本块或已完成章节会实时写入
+            cancel_event: 取消信号（可选），被设置后中断生成并抛出GenerationCancelled
             
         Returns:
             dict: 包含HTML内容与保存文件信息
@@ -208,7 +127,10 @@ class ReportAgent:
             template_result = self._select_template(query, reports, forum_logs, custom_template)
             
             # Step 2: 直接生成HTML报告
-            html_report = self._generate_html_report(query, reports, forum_logs, template_result)
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled()
+            html_report = self._generate_html_report(query, reports, forum_logs, template_result,
+                                                     event_stream, cancel_event)
             
             # Step 3: 保存报告
             saved_files = {}
@@ -271,9 +193,11 @@ class ReportAgent:
             self.state.metadata.template_used = fallback_template['template_name']
             return fallback_template
     
-    def _generate_html_report(self, query: str, reports: List[Any], forum_logs: str, template_result: Dict[str, Any]) -> str:
+    def _generate_html_report(self, query: str, reports: List[Any], forum_logs: str, template_result: Dict[str, Any],
+                              event_stream: Optional[ReportEventStream] = None,
+                              cancel_event: Optional[threading.Event] = None) -> str:
         """生成HTML报告"""
-        logger.info("多轮生成HTML报告...")
+        logger.info(f"生成HTML报告（模式: {self.config.HTML_GENERATION_MODE}）...")
         
         # 准备报告内容，确保有3个报告
         query_report = reports[0] if len(reports) > 0 else ""
@@ -294,8 +218,18 @@ class ReportAgent:
             'selected_template': template_result.get('template_content', '')
         }
         
-        # 使用HTML生成节点生成报告
-        html_content = self.html_generation_node.run(html_input)
+        # 使用HTML生成节点生成报告：分章节模式并行生成各章节，single模式一次性生成全文
+        html_content = None
+        if self.config.HTML_GENERATION_MODE == 'sectioned':
+            html_content = self._generate_sectioned_html(html_input, event_stream, cancel_event)
+        if html_content is None:
+            generation_kwargs = {'cancel_event': cancel_event}
+            if event_stream:
+                generation_kwargs.update({
+                    'on_chunk': event_stream.publish_chunk,
+                    'on_stream_start': event_stream.publish_reset,
+                })
+            html_content = self.html_generation_node.run(html_input, **generation_kwargs)
         
         # 更新状态
         self.state.html_content = html_content
@@ -304,6 +238,32 @@ class ReportAgent:
         logger.info("HTML报告生成完成")
         return html_content
     
+    def _generate_sectioned_html(self, html_input: Dict[str, Any], event_stream: Optional[ReportEventStream] = None,
+                                 cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        分章节并行生成HTML报告
+
+        Returns:
+            HTML内容；模板拆分不出多个章节或分章节生成出错时返回None，由调用方退回单次整体生成
+        """
+        sections = split_template_sections(html_input['selected_template'])['sections']
+        if len(sections) < 2:
+            logger.info("模板未拆分出多个章节，改用单次整体生成")
+            return None
+
+        generation_kwargs = {'cancel_event': cancel_event}
+        if event_stream:
+            generation_kwargs.update({
+                'on_outline': lambda titles: event_stream.publish('outline', {'titles': titles}),
+                'on_section': lambda index, section_html: event_stream.publish(
+                    'section', {'index': index, 'html': section_html}),
+            })
+        try:
+            return self.sectioned_html_generation_node.run(html_input, **generation_kwargs)
+        except Exception as e:
+            logger.exception(f"分章节生成失败，改用单次整体生成: {str(e)}")
+            return None
+
     def _get_fallback_template_content(self) -> str:
         """获取备用模板内容"""
         return """# 社会公共热点事件分析报告
@@ -388,6 +348,17 @@ class ReportAgent:
             'state_relative_path': rel_state_path
         }
     
+    def clone_for_task(self) -> "ReportAgent":
+        """
+        为并发执行的报告任务创建浅拷贝：共享LLM客户端、节点与配置，但拥有独立的状态
+        
+        Returns:
+            新的ReportAgent实例
+        """
+        agent = copy.copy(self)
+        agent.state = ReportState()
+        return agent
+    
     def get_progress_summary(self) -> Dict[str, Any]:
         """获取进度摘要"""
         return self.state.to_dict()
@@ -402,54 +373,54 @@ class ReportAgent:
         self.state.save_to_file(filepath)
         logger.info(f"状态已保存到 {filepath}")
     
-    def check_input_files(self, insight_dir: str, media_dir: str, query_dir: str, forum_log_path: str) -> Dict[str, Any]:
+    def check_input_files(self, insight_dir: str, media_dir: str, query_dir: str, forum_log_path: str,
+                          session_id: Optional[str] = None, wait_timeout: float = 0) -> Dict[str, Any]:
         """
-        检查输入文件是否准备就绪（基于文件数量增加）
+        检查输入文件是否准备就绪（基于引擎报告注册表）
         
         Args:
             insight_dir: InsightEngine报告目录
             media_dir: MediaEngine报告目录
             query_dir: QueryEngine报告目录
             forum_log_path: 论坛日志文件路径
+            session_id: 指定时只接受该搜索会话登记的报告，否则接受基准之后登记的报告
+            wait_timeout: 报告未全部就绪时等待新登记的最长秒数，0表示不等待
             
         Returns:
             检查结果字典
         """
-        # 检查各个报告目录的文件数量变化
         directories = {
             'insight': insight_dir,
             'media': media_dir,
             'query': query_dir
         }
         
-        # 使用文件基准管理器检查新文件
-        check_result = self.file_baseline.check_new_files(directories)
+        # 指定会话时不受基准限制，会话ID本身已区分了本次搜索的报告
+        after_id = 0 if session_id else self.input_baseline_id
+        records = self.report_registry.wait_for(directories, after_id, session_id, wait_timeout)
         
         # 检查论坛日志
         forum_ready = os.path.exists(forum_log_path)
         
         # 构建返回结果
         result = {
-            'ready': check_result['ready'] and forum_ready,
-            'baseline_counts': check_result['baseline_counts'],
-            'current_counts': check_result['current_counts'],
-            'new_files_found': check_result['new_files_found'],
+            'ready': all(records.values()) and forum_ready,
+            'baseline_id': after_id,
+            'session_id': session_id,
+            'registered_reports': records,
             'missing_files': [],
             'files_found': [],
             'latest_files': {}
         }
         
         # 构建详细信息
-        for engine, new_count in check_result['new_files_found'].items():
-            current_count = check_result['current_counts'][engine]
-            baseline_count = check_result['baseline_counts'].get(engine, 0)
-            
-            if new_count > 0:
-                result['files_found'].append(f"{engine}: {current_count}个文件 (新增{new_count}个)")
+        for engine, record in records.items():
+            if record:
+                result['files_found'].append(f"{engine}: {os.path.basename(record['file_path'])}")
             else:
-                result['missing_files'].append(f"{engine}: {current_count}个文件 (基准{baseline_count}个，无新增)")
+                scope = f"会话{session_id}" if session_id else "本次启动后"
+                result['missing_files'].append(f"{engine}: {scope}尚无新报告")
         
-        # 检查论坛日志
         if forum_ready:
             result['files_found'].append(f"forum: {os.path.basename(forum_log_path)}")
         else:
@@ -457,9 +428,8 @@ class ReportAgent:
         
         # 获取最新文件路径（用于实际报告生成）
         if result['ready']:
-            result['latest_files'] = self.file_baseline.get_latest_files(directories)
-            if forum_ready:
-                result['latest_files']['forum'] = forum_log_path
+            result['latest_files'] = {engine: record['file_path'] for engine, record in records.items()}
+            result['latest_files']['forum'] = forum_log_path
         
         return result
     
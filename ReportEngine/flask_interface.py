@@ -5,30 +5,42 @@ Report Engine Flask接口
 
 import os
 import json
-import threading
+import uuid
 import time
-from datetime import datetime
-from flask import Blueprint, request, jsonify, Response, send_file
-from typing import Dict, Any
+from flask import Blueprint, request, jsonify, Response, send_file, stream_with_context
+from typing import Dict, Any, Optional
 from loguru import logger
 from .agent import ReportAgent, create_agent
+from .llms import GenerationCancelled
+from .task_queue import ReportTask, TaskRegistry, ReportJobQueue
 from .utils.config import settings
 
+# SSE连接在无新事件时发送心跳的间隔（秒）
+STREAM_KEEPALIVE_SECONDS = 15
+
 
 # 创建Blueprint
 report_bp = Blueprint('report_engine', __name__)
 
 # 全局变量
 report_agent = None
-current_task = None
-task_lock = threading.Lock()
+job_queue: Optional[ReportJobQueue] = None
 
 
 def initialize_report_engine():
     """初始化Report Engine"""
-    global report_agent
+    global report_agent, job_queue
     try:
         report_agent = create_agent()
+        if job_queue is None:
+            job_queue = ReportJobQueue(
+                run_report_generation,
+                TaskRegistry(settings.REPORT_TASK_DB),
+                max_workers=settings.REPORT_MAX_CONCURRENT_TASKS,
+                max_tasks_per_user=settings.REPORT_MAX_TASKS_PER_USER
+            )
+            job_queue.start()
+            job_queue.restore()
         logger.info("Report Engine初始化成功")
         return True
     except Exception as e:
@@ -36,54 +48,15 @@ def initialize_report_engine():
         return False
 
 
-class ReportTask:
-    """报告生成任务"""
-
-    def __init__(self, query: str, task_id: str, custom_template: str = ""):
-        self.task_id = task_id
-        self.query = query
-        self.custom_template = custom_template
-        self.status = "pending"  # pending, running, completed, error
-        self.progress = 0
-        self.result = None
-        self.error_message = ""
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
-        self.html_content = ""
-        self.report_file_path = ""
-        self.report_file_relative_path = ""
-        self.report_file_name = ""
-        self.state_file_path = ""
-        self.state_file_relative_path = ""
-
-    def update_status(self, status: str, progress: int = None, error_message: str = ""):
-        """更新任务状态"""
-        self.status = status
-        if progress is not None:
-            self.progress = progress
-        if error_message:
-            self.error_message = error_message
-        self.updated_at = datetime.now()
-
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            'task_id': self.task_id,
-            'query': self.query,
-            'status': self.status,
-            'progress': self.progress,
-            'error_message': self.error_message,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'has_result': bool(self.html_content),
-            'report_file_ready': bool(self.report_file_path),
-            'report_file_name': self.report_file_name,
-            'report_file_path': self.report_file_relative_path
-        }
+def get_task(task_id: str) -> Optional[ReportTask]:
+    """按ID查找任务（进程内或注册表）"""
+    if not job_queue:
+        return None
+    return job_queue.get(task_id)
 
 
-def check_engines_ready() -> Dict[str, Any]:
-    """检查三个子引擎是否都有新文件"""
+def check_engines_ready(session_id: Optional[str] = None, wait_timeout: float = 0) -> Dict[str, Any]:
+    """检查三个子引擎是否都已登记新报告（可指定搜索会话，并等待至多wait_timeout秒）"""
     directories = {
         'insight': 'insight_engine_streamlit_reports',
         'media': 'media_engine_streamlit_reports',
@@ -102,37 +75,47 @@ def check_engines_ready() -> Dict[str, Any]:
         directories['insight'],
         directories['media'],
         directories['query'],
-        forum_log_path
+        forum_log_path,
+        session_id=session_id,
+        wait_timeout=wait_timeout
     )
 
 
-def run_report_generation(task: ReportTask, query: str, custom_template: str = ""):
-    """在后台线程中运行报告生成"""
-    global current_task
-
+def run_report_generation(task: ReportTask):
+    """在队列工作线程中运行报告生成"""
     try:
+        if task.cancel_event.is_set():
+            task.update_status("cancelled", 0, "用户取消任务")
+            return
+
         task.update_status("running", 10)
 
-        # 检查输入文件
-        check_result = check_engines_ready()
+        # 检查输入文件，指定搜索会话时等待该会话的三份报告登记完成
+        wait_timeout = settings.ENGINE_REPORT_WAIT_TIMEOUT if task.session_id else 0
+        check_result = check_engines_ready(task.session_id, wait_timeout)
         if not check_result['ready']:
             task.update_status("error", 0, f"输入文件未准备就绪: {check_result.get('missing_files', [])}")
             return
 
         task.update_status("running", 30)
 
+        # 每个任务使用独立的Agent副本，避免并发任务共享状态
+        agent = report_agent.clone_for_task()
+
         # 加载输入文件
-        content = report_agent.load_input_files(check_result['latest_files'])
+        content = agent.load_input_files(check_result['latest_files'])
 
         task.update_status("running", 50)
 
         # 生成报告
-        generation_result = report_agent.generate_report(
-            query=query,
+        generation_result = agent.generate_report(
+            query=task.query,
             reports=content['reports'],
             forum_logs=content['forum_logs'],
-            custom_template=custom_template,
-            save_report=True
+            custom_template=task.custom_template,
+            save_report=True,
+            event_stream=task.events,
+            cancel_event=task.cancel_event
         )
 
         html_report = generation_result.get('html_content', '')
@@ -148,20 +131,21 @@ def run_report_generation(task: ReportTask, query: str, custom_template: str = "
         task.state_file_relative_path = generation_result.get('state_relative_path', '')
         task.update_status("completed", 100)
 
+    except GenerationCancelled:
+        logger.info(f"报告任务已取消: {task.task_id}")
+        task.update_status("cancelled", 0, "用户取消任务")
+
     except Exception as e:
         logger.exception(f"报告生成过程中发生错误: {str(e)}")
         task.update_status("error", 0, str(e))
-        # 只在出错时清理任务
-        with task_lock:
-            if current_task and current_task.task_id == task.task_id:
-                current_task = None
 
 
 @report_bp.route('/status', methods=['GET'])
 def get_status():
     """获取Report Engine状态"""
     try:
-        engines_status = check_engines_ready()
+        engines_status = check_engines_ready(request.args.get('session_id') or None)
+        latest_task = job_queue.latest_task() if job_queue else None
 
         return jsonify({
             'success': True,
@@ -169,7 +153,9 @@ def get_status():
             'engines_ready': engines_status['ready'],
             'files_found': engines_status.get('files_found', []),
             'missing_files': engines_status.get('missing_files', []),
-            'current_task': current_task.to_dict() if current_task else None
+            'current_task': latest_task.to_dict() if latest_task else None,
+            'active_tasks': [task.to_dict() for task in job_queue.active_tasks()] if job_queue else [],
+            'queue': job_queue.stats() if job_queue else None
         })
     except Exception as e:
         logger.exception(f"获取Report Engine状态失败: {str(e)}")
@@ -181,67 +167,49 @@ def get_status():
 
 @report_bp.route('/generate', methods=['POST'])
 def generate_report():
-    """开始生成报告"""
-    global current_task
-
+    """提交报告生成任务（进入队列，按优先级与用户公平调度）"""
     try:
-        # 检查是否有任务在运行
-        with task_lock:
-            if current_task and current_task.status == "running":
-                return jsonify({
-                    'success': False,
-                    'error': '已有报告生成任务在运行中',
-                    'current_task': current_task.to_dict()
-                }), 400
-
-            # 如果有已完成的任务，清理它
-            if current_task and current_task.status in ["completed", "error"]:
-                current_task = None
-
         # 获取请求参数
         data = request.get_json() or {}
         query = data.get('query', '智能舆情分析报告')
         custom_template = data.get('custom_template', '')
-
-        # 清空日志文件
-        clear_report_log()
+        session_id = data.get('session_id') or None
+        user_id = str(data.get('user_id') or request.headers.get('X-User-Id') or request.remote_addr or 'anonymous')
+        try:
+            priority = int(data.get('priority', 0))
+        except (TypeError, ValueError):
+            priority = 0
 
         # 检查Report Engine是否初始化
-        if not report_agent:
+        if not report_agent or not job_queue:
             return jsonify({
                 'success': False,
                 'error': 'Report Engine未初始化'
             }), 500
 
-        # 检查输入文件是否准备就绪
-        engines_status = check_engines_ready()
-        if not engines_status['ready']:
+        # 检查输入文件是否准备就绪（指定搜索会话的任务会在队列中等待报告登记）
+        engines_status = check_engines_ready(session_id)
+        if not engines_status['ready'] and not session_id:
             return jsonify({
                 'success': False,
                 'error': '输入文件未准备就绪',
                 'missing_files': engines_status.get('missing_files', [])
             }), 400
 
-        # 创建新任务
-        task_id = f"report_{int(time.time())}"
-        task = ReportTask(query, task_id, custom_template)
-
-        with task_lock:
-            current_task = task
+        # 没有其他任务时清空日志文件，避免清掉并发任务的日志
+        if not job_queue.active_tasks():
+            clear_report_log()
 
-        # 在后台线程中运行报告生成
-        thread = threading.Thread(
-            target=run_report_generation,
-            args=(task, query, custom_template),
-            daemon=True
-        )
-        thread.start()
+        # 创建新任务并入队
+        task_id = f"report_{int(time.time())}_{uuid.uuid4().hex[:6]}"
+        task = job_queue.submit(ReportTask(query, task_id, custom_template, user_id, priority, session_id))
 
         return jsonify({
             'success': True,
             'task_id': task_id,
-            'message': '报告生成已启动',
-            'task': task.to_dict()
+            'message': '报告生成任务已加入队列',
+            'task': task.to_dict(),
+            'queue_position': job_queue.queue_position(task_id)
         })
 
     except Exception as e:
@@ -252,11 +220,46 @@ def generate_report():
         }), 500
 
 
+@report_bp.route('/tasks', methods=['GET'])
+def list_tasks():
+    """分页列出报告任务，可按status、user_id过滤"""
+    try:
+        if not job_queue:
+            return jsonify({
+                'success': False,
+                'error': 'Report Engine未初始化'
+            }), 500
+
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        tasks, total = job_queue.registry.list(
+            status=request.args.get('status') or None,
+            user_id=request.args.get('user_id') or None,
+            limit=limit,
+            offset=offset
+        )
+        return jsonify({
+            'success': True,
+            'tasks': tasks,
+            'total': total,
+            'limit': limit,
+            'offset': offset
+        })
+
+    except Exception as e:
+        logger.exception(f"获取报告任务列表失败: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @report_bp.route('/progress/<task_id>', methods=['GET'])
 def get_progress(task_id: str):
     """获取报告生成进度"""
     try:
-        if not current_task or current_task.task_id != task_id:
+        task = get_task(task_id)
+        if not task:
             # 如果任务不存在，可能是已经完成并被清理了
             # 返回一个默认的完成状态而不是404
             return jsonify({
@@ -275,7 +278,8 @@ def get_progress(task_id: str):
 
         return jsonify({
             'success': True,
-            'task': current_task.to_dict()
+            'task': task.to_dict(),
+            'queue_position': job_queue.queue_position(task_id)
         })
 
     except Exception as e:
@@ -286,25 +290,71 @@ def get_progress(task_id: str):
         }), 500
 
 
+@report_bp.route('/stream/<task_id>', methods=['GET'])
+def stream_report(task_id: str):
+    """以SSE形式推送报告生成过程
+
+    事件类型：status（进度）、outline（章节列表）、section（已完成章节HTML）、
+    chunk（LLM文本块）、reset（重试，丢弃已收到的文本块）、done、error。
+    客户端可通过Last-Event-ID请求头或cursor参数从指定事件之后续传。
+    """
+    task = job_queue.tasks.get(task_id) if job_queue else None
+    if not task:
+        return jsonify({
+            'success': False,
+            'error': '任务不存在'
+        }), 404
+
+    cursor = request.headers.get('Last-Event-ID', type=int)
+    if cursor is None:
+        cursor = request.args.get('cursor', 0, type=int)
+
+    def generate():
+        position = cursor
+        while True:
+            events = task.events.read(position, timeout=STREAM_KEEPALIVE_SECONDS)
+            if not events:
+                if task.events.closed:
+                    return
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                position = event['id']
+                payload = json.dumps(event['data'], ensure_ascii=False)
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+            if task.events.closed and position >= task.events.last_id:
+                return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @report_bp.route('/result/<task_id>', methods=['GET'])
 def get_result(task_id: str):
     """获取报告生成结果"""
     try:
-        if not current_task or current_task.task_id != task_id:
+        task = get_task(task_id)
+        if not task:
             return jsonify({
                 'success': False,
                 'error': '任务不存在'
             }), 404
 
-        if current_task.status != "completed":
+        if task.status != "completed":
             return jsonify({
                 'success': False,
                 'error': '报告尚未完成',
-                'task': current_task.to_dict()
+                'task': task.to_dict()
             }), 400
 
         return Response(
-            current_task.html_content,
+            task.load_html_content(),
             mimetype='text/html'
         )
 
@@ -320,23 +370,24 @@ def get_result(task_id: str):
 def get_result_json(task_id: str):
     """获取报告生成结果（JSON格式）"""
     try:
-        if not current_task or current_task.task_id != task_id:
+        task = get_task(task_id)
+        if not task:
             return jsonify({
                 'success': False,
                 'error': '任务不存在'
             }), 404
 
-        if current_task.status != "completed":
+        if task.status != "completed":
             return jsonify({
                 'success': False,
                 'error': '报告尚未完成',
-                'task': current_task.to_dict()
+                'task': task.to_dict()
             }), 400
 
         return jsonify({
             'success': True,
-            'task': current_task.to_dict(),
-            'html_content': current_task.html_content
+            'task': task.to_dict(),
+            'html_content': task.load_html_content()
         })
 
     except Exception as e:
@@ -351,27 +402,28 @@ def get_result_json(task_id: str):
 def download_report(task_id: str):
     """下载已生成的报告HTML文件"""
     try:
-        if not current_task or current_task.task_id != task_id:
+        task = get_task(task_id)
+        if not task:
             return jsonify({
                 'success': False,
                 'error': '任务不存在'
             }), 404
 
-        if current_task.status != "completed" or not current_task.report_file_path:
+        if task.status != "completed" or not task.report_file_path:
             return jsonify({
                 'success': False,
                 'error': '报告尚未完成或尚未保存'
             }), 400
 
-        if not os.path.exists(current_task.report_file_path):
+        if not os.path.exists(task.report_file_path):
             return jsonify({
                 'success': False,
                 'error': '报告文件不存在或已被删除'
             }), 404
 
-        download_name = current_task.report_file_name or os.path.basename(current_task.report_file_path)
+        download_name = task.report_file_name or os.path.basename(task.report_file_path)
         return send_file(
-            current_task.report_file_path,
+            task.report_file_path,
             mimetype='text/html',
             as_attachment=True,
             download_name=download_name
@@ -387,25 +439,17 @@ def download_report(task_id: str):
 
 @report_bp.route('/cancel/<task_id>', methods=['POST'])
 def cancel_task(task_id: str):
-    """取消报告生成任务"""
-    global current_task
-
+    """取消报告生成任务（排队中的任务直接出队，运行中的任务中断LLM生成）"""
     try:
-        with task_lock:
-            if current_task and current_task.task_id == task_id:
-                if current_task.status == "running":
-                    current_task.update_status("cancelled", 0, "用户取消任务")
-                current_task = None
-
-                return jsonify({
-                    'success': True,
-                    'message': '任务已取消'
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': '任务不存在或无法取消'
-                }), 404
+        if job_queue and job_queue.cancel(task_id):
+            return jsonify({
+                'success': True,
+                'message': '任务已取消'
+            })
+        return jsonify({
+            'success': False,
+            'error': '任务不存在或无法取消'
+        }), 404
 
     except Exception as e:
         logger.exception(f"取消报告生成任务失败: {str(e)}")
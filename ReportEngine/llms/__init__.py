@@ -2,6 +2,6 @@
 LLM module for the Report Engine.
 """
 
-from .base import LLMClient
+from .base import LLMClient, GenerationCancelled
 
-__all__ = ["LLMClient"]
+__all__ = ["LLMClient", "GenerationCancelled"]
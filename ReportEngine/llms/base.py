@@ -26,6 +26,13 @@ except ImportError:
     LLM_RETRY_CONFIG = None
 
 
+class GenerationCancelled(BaseException):
+    """报告生成被取消
+
+    继承BaseException，避免被重试装饰器与节点中的 except Exception 兜底逻辑吞掉。
+    """
+
+
 class LLMClient:
     """Minimal wrapper around the OpenAI-compatible chat completion API."""
 
@@ -108,11 +115,15 @@ class LLMClient:
                 **extra_params,
             )
             
-            for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta and delta.content:
-                        yield delta.content
+            try:
+                for chunk in stream:
+                    if chunk.choices and len(chunk.choices) > 0:
+                        delta = chunk.choices[0].delta
+                        if delta and delta.content:
+                            yield delta.content
+            finally:
+                # 调用方提前结束迭代（如任务取消）时及时关闭HTTP连接
+                stream.close()
         except Exception as e:
             logger.error(f"流式请求失败: {str(e)}")
             raise e
@@ -126,14 +137,36 @@ class LLMClient:
             system_prompt: 系统提示词
             user_prompt: 用户提示词
             **kwargs: 额外参数（temperature, top_p等）
+                - on_chunk: 每收到一个文本块时的回调，用于向客户端转发
+                - on_stream_start: 每次（含重试）开始流式请求时的回调
+                - cancel_event: threading.Event，被设置后立即中断流式请求
             
         Returns:
             完整的响应字符串
+
+        Raises:
+            GenerationCancelled: cancel_event被设置
         """
+        on_chunk = kwargs.pop("on_chunk", None)
+        on_stream_start = kwargs.pop("on_stream_start", None)
+        cancel_event = kwargs.pop("cancel_event", None)
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled()
+        if on_stream_start:
+            on_stream_start()
+
         # 以字节形式收集所有块
         byte_chunks = []
-        for chunk in self.stream_invoke(system_prompt, user_prompt, **kwargs):
-            byte_chunks.append(chunk.encode('utf-8'))
+        stream = self.stream_invoke(system_prompt, user_prompt, **kwargs)
+        try:
+            for chunk in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise GenerationCancelled()
+                byte_chunks.append(chunk.encode('utf-8'))
+                if on_chunk:
+                    on_chunk(chunk)
+        finally:
+            stream.close()
         
         # 拼接所有字节，然后一次性解码
         if byte_chunks:
@@ -39,6 +39,10 @@ class HTMLGenerationNode(StateMutationNode):
                 - insight_engine_report: InsightEngine报告内容
                 - forum_logs: 论坛日志内容
                 - selected_template: 选择的模板内容
+            **kwargs:
+                - on_chunk: LLM文本块回调，用于流式转发给客户端
+                - on_stream_start: 每次（含重试）开始流式请求时的回调
+                - cancel_event: 取消信号，被设置后中断LLM流式输出
                 
         Returns:
             生成的HTML内容
@@ -60,7 +64,13 @@ class HTMLGenerationNode(StateMutationNode):
             message = json.dumps(llm_input, ensure_ascii=False, indent=2)
             
             # 调用LLM生成HTML
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_HTML_GENERATION, message)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_HTML_GENERATION,
+                message,
+                on_chunk=kwargs.get('on_chunk'),
+                on_stream_start=kwargs.get('on_stream_start'),
+                cancel_event=kwargs.get('cancel_event')
+            )
             
             # 处理响应（简化版）
             processed_response = self.process_output(response)
@@ -0,0 +1,353 @@
+"""
+分章节HTML生成节点
+按模板章节拆分报告，并行生成各章节HTML片段后拼装到统一的页面外壳中
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from loguru import logger
+
+from .base_node import StateMutationNode
+from ..llms.base import LLMClient, GenerationCancelled
+from ..state.state import ReportState
+from ..prompts import SYSTEM_PROMPT_HTML_SECTION_GENERATION
+from ..utils.section_utils import split_template_sections, select_relevant_excerpts
+
+SECTION_TAG_PATTERN = re.compile(r'<section\b[\s\S]*</section>', re.IGNORECASE)
+
+REPORT_SHELL_STYLE = """
+        :root {
+            --bg: #f5f7fa; --card: #ffffff; --text: #2c3e50; --muted: #6c757d;
+            --accent: #3498db; --border: #e3e8ee; --highlight: #eef6fc;
+        }
+        body.dark {
+            --bg: #1e2228; --card: #272c34; --text: #e4e6eb; --muted: #9aa0a6;
+            --accent: #5dade2; --border: #3a404a; --highlight: #2f3a46;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'PingFang SC', 'Microsoft YaHei', sans-serif;
+            line-height: 1.75; color: var(--text); background: var(--bg);
+            margin: 0; padding: 20px; transition: background .3s, color .3s;
+        }
+        .container { max-width: 1200px; margin: 0 auto; background: var(--card); padding: 40px; border-radius: 10px; box-shadow: 0 2px 12px rgba(0,0,0,.08); }
+        .toolbar { display: flex; gap: 10px; justify-content: flex-end; }
+        .toolbar button { border: 1px solid var(--border); background: var(--card); color: var(--text); padding: 6px 14px; border-radius: 6px; cursor: pointer; }
+        h1 { border-bottom: 3px solid var(--accent); padding-bottom: 12px; }
+        h2 { margin-top: 40px; border-left: 5px solid var(--accent); padding-left: 12px; }
+        .meta { color: var(--muted); background: var(--highlight); padding: 14px 18px; border-radius: 6px; }
+        .toc { background: var(--highlight); padding: 16px 24px; border-radius: 6px; margin: 24px 0; }
+        .toc a { color: var(--accent); text-decoration: none; }
+        .report-section { margin-bottom: 36px; }
+        .highlight { background: var(--highlight); border-left: 4px solid var(--accent); padding: 12px 16px; margin: 16px 0; }
+        table { width: 100%; border-collapse: collapse; margin: 16px 0; }
+        th, td { border: 1px solid var(--border); padding: 8px 12px; text-align: left; }
+        blockquote { border-left: 4px solid var(--border); margin: 16px 0; padding: 4px 16px; color: var(--muted); }
+        canvas { max-width: 100%; margin: 16px 0; }
+        pre { white-space: pre-wrap; background: var(--highlight); padding: 14px; border-radius: 6px; }
+        .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid var(--border); text-align: center; color: var(--muted); }
+        @media (max-width: 768px) { .container { padding: 20px; } }
+        @media print { .toolbar { display: none; } body { background: #fff; } .container { box-shadow: none; } }
+"""
+
+
+class SectionedHTMLGenerationNode(StateMutationNode):
+    """分章节并行HTML生成处理节点"""
+
+    def __init__(self, llm_client: LLMClient, max_workers: int = 4, max_retries: int = 2,
+                 excerpt_chars: int = 6000, checkpoint_dir: str = "final_reports/.sections"):
+        """
+        初始化分章节HTML生成节点
+
+        Args:
+            llm_client: LLM客户端
+            max_workers: 并发生成章节的线程数
+            max_retries: 单个章节失败后的重试次数
+            excerpt_chars: 每个章节从单份源报告截取的最大字符数
+            checkpoint_dir: 已完成章节的检查点目录
+        """
+        super().__init__(llm_client, "SectionedHTMLGenerationNode")
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.excerpt_chars = excerpt_chars
+        self.checkpoint_dir = checkpoint_dir
+
+    def run(self, input_data: Dict[str, Any], **kwargs) -> str:
+        """
+        执行分章节HTML生成
+
+        Args:
+            input_data: 与HTMLGenerationNode相同的输入字典
+                - query: 原始查询
+                - query_engine_report: QueryEngine报告内容
+                - media_engine_report: MediaEngine报告内容
+                - insight_engine_report: InsightEngine报告内容
+                - forum_logs: 论坛日志内容
+                - selected_template: 选择的模板内容
+            **kwargs:
+                - on_outline: 章节拆分完成后的回调 on_outline(section_titles)
+                - on_section: 章节完成回调 on_section(index, section_html)
+                - cancel_event: 取消信号，被设置后中断所有章节的LLM流式输出
+
+        Returns:
+            拼装完成的HTML内容
+
+        Raises:
+            GenerationCancelled: 生成过程被取消（已完成章节的检查点会保留）
+        """
+        on_outline: Optional[Callable[[List[str]], None]] = kwargs.get('on_outline')
+        on_section: Optional[Callable[[int, str], None]] = kwargs.get('on_section')
+        cancel_event = kwargs.get('cancel_event')
+        query = input_data.get('query', '')
+        template = split_template_sections(input_data.get('selected_template', ''))
+        sections = template['sections']
+        report_title = query or template['title'] or '智能舆情分析报告'
+        all_titles = [section['title'] for section in sections]
+
+        if on_outline:
+            on_outline(all_titles)
+
+        checkpoint_path = self._checkpoint_path(input_data)
+        os.makedirs(checkpoint_path, exist_ok=True)
+
+        logger.info(f"开始分章节生成HTML报告，共{len(sections)}个章节，并发数: {self.max_workers}")
+
+        results: Dict[int, str] = {}
+        failed: List[int] = []
+        pending: List[int] = []
+        for index in range(len(sections)):
+            cached = self._load_checkpoint(checkpoint_path, index)
+            if cached is not None:
+                results[index] = cached
+                if on_section:
+                    on_section(index, cached)
+            else:
+                pending.append(index)
+        if results:
+            logger.info(f"从检查点恢复{len(results)}个已完成章节")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._generate_section, input_data, report_title, sections,
+                                all_titles, index, cancel_event): index
+                for index in pending
+            }
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    section_html, succeeded = future.result()
+                    results[index] = section_html
+                    if succeeded:
+                        self._save_checkpoint(checkpoint_path, index, section_html)
+                    else:
+                        failed.append(index)
+                    if on_section:
+                        on_section(index, section_html)
+            except GenerationCancelled:
+                executor.shutdown(wait=False, cancel_futures=True)
+                logger.info("分章节生成已取消，已完成章节的检查点已保留")
+                raise
+
+        html_content = self.assemble(report_title, all_titles, [results[i] for i in range(len(sections))])
+
+        if failed:
+            # 保留已完成章节的检查点，重新生成时只需补齐失败章节
+            logger.warning(f"{len(failed)}个章节使用了备用内容，检查点保留在: {checkpoint_path}")
+        else:
+            shutil.rmtree(checkpoint_path, ignore_errors=True)
+
+        logger.info(f"分章节HTML报告生成完成，长度: {len(html_content)} 字符")
+        return html_content
+
+    def mutate_state(self, input_data: Dict[str, Any], state: ReportState, **kwargs) -> ReportState:
+        """
+        修改报告状态，添加生成的HTML内容
+
+        Args:
+            input_data: 输入数据
+            state: 当前报告状态
+            **kwargs: 额外参数
+
+        Returns:
+            更新后的报告状态
+        """
+        state.html_content = self.run(input_data, **kwargs)
+        state.mark_completed()
+        return state
+
+    def _generate_section(self, input_data: Dict[str, Any], report_title: str,
+                          sections: List[Dict[str, str]], all_titles: List[str], index: int,
+                          cancel_event=None):
+        """生成单个章节，失败时按配置重试，最终失败返回备用片段"""
+        section = sections[index]
+        section_id = f"section-{index + 1}"
+        query = input_data.get('query', '')
+        outline = section['outline']
+        llm_input = {
+            "query": query,
+            "report_title": report_title,
+            "section_id": section_id,
+            "section_index": index + 1,
+            "section_count": len(sections),
+            "section_title": section['title'],
+            "section_outline": outline,
+            "all_section_titles": all_titles,
+            "query_engine_excerpt": select_relevant_excerpts(
+                input_data.get('query_engine_report', ''), query, outline, self.excerpt_chars),
+            "media_engine_excerpt": select_relevant_excerpts(
+                input_data.get('media_engine_report', ''), query, outline, self.excerpt_chars),
+            "insight_engine_excerpt": select_relevant_excerpts(
+                input_data.get('insight_engine_report', ''), query, outline, self.excerpt_chars),
+            "forum_excerpt": select_relevant_excerpts(
+                input_data.get('forum_logs', ''), query, outline, self.excerpt_chars // 3),
+        }
+        message = json.dumps(llm_input, ensure_ascii=False, indent=2)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.llm_client.stream_invoke_to_string(
+                    SYSTEM_PROMPT_HTML_SECTION_GENERATION, message, cancel_event=cancel_event)
+                section_html = self.process_output(response, section_id, section['title'])
+                if section_html:
+                    self.log_info(f"章节{index + 1}《{section['title']}》生成完成，长度: {len(section_html)} 字符")
+                    return section_html, True
+                self.log_error(f"章节{index + 1}返回内容为空（第{attempt + 1}次）")
+            except Exception as e:
+                self.log_error(f"章节{index + 1}生成失败（第{attempt + 1}次）: {str(e)}")
+
+        logger.warning(f"章节{index + 1}《{section['title']}》多次生成失败，使用备用内容")
+        return self._fallback_section(section_id, section['title'], llm_input), False
+
+    def process_output(self, output: str, section_id: str = "", section_title: str = "") -> str:
+        """
+        处理LLM输出，提取章节HTML片段
+
+        Args:
+            output: LLM原始输出
+            section_id: 章节锚点ID
+            section_title: 章节标题
+
+        Returns:
+            章节HTML片段，无有效内容时返回空字符串
+        """
+        content = output.strip()
+        if content.startswith('```'):
+            content = re.sub(r'^```[a-zA-Z]*\s*', '', content)
+            content = re.sub(r'\s*```$', '', content)
+        if not content:
+            return ""
+
+        match = SECTION_TAG_PATTERN.search(content)
+        if match:
+            return match.group(0)
+        return (f'<section id="{section_id}" class="report-section">\n'
+                f'<h2>{html.escape(section_title)}</h2>\n{content}\n</section>')
+
+    def assemble(self, report_title: str, section_titles: List[str], section_htmls: List[str]) -> str:
+        """
+        将章节片段拼装进统一的HTML页面外壳
+
+        Args:
+            report_title: 报告标题
+            section_titles: 章节标题列表（用于目录）
+            section_htmls: 与章节顺序一致的HTML片段
+
+        Returns:
+            完整HTML页面
+        """
+        generation_time = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
+        title = html.escape(report_title)
+        toc_items = '\n'.join(
+            f'            <li><a href="#section-{i + 1}">{html.escape(section_title)}</a></li>'
+            for i, section_title in enumerate(section_titles)
+        )
+        body = '\n'.join(section_htmls)
+
+        return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - 智能舆情分析报告</title>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <style>{REPORT_SHELL_STYLE}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="toolbar">
+            <button onclick="document.body.classList.toggle('dark')">暗色模式</button>
+            <button onclick="window.print()">打印 / 导出PDF</button>
+        </div>
+        <h1>{title}</h1>
+        <div class="meta">
+            <strong>报告生成时间:</strong> {generation_time}<br>
+            <strong>数据来源:</strong> QueryEngine、MediaEngine、InsightEngine、ForumEngine
+        </div>
+        <nav class="toc">
+            <strong>目录</strong>
+            <ol>
+{toc_items}
+            </ol>
+        </nav>
+{body}
+        <div class="footer">
+            <p>本报告由智能舆情分析平台自动生成</p>
+            <p>ReportEngine | 生成时间: {generation_time}</p>
+        </div>
+    </div>
+</body>
+</html>"""
+
+    def _fallback_section(self, section_id: str, section_title: str, llm_input: Dict[str, Any]) -> str:
+        """生成备用章节（直接展示相关源报告片段）"""
+        parts = [f'<section id="{section_id}" class="report-section">',
+                 f'<h2>{html.escape(section_title)}</h2>']
+        for key, label in (("query_engine_excerpt", "QueryEngine"),
+                           ("media_engine_excerpt", "MediaEngine"),
+                           ("insight_engine_excerpt", "InsightEngine")):
+            if llm_input.get(key):
+                parts.append(f'<h3>{label}相关内容</h3><pre>{html.escape(llm_input[key])}</pre>')
+        parts.append('</section>')
+        return '\n'.join(parts)
+
+    def _checkpoint_path(self, input_data: Dict[str, Any]) -> str:
+        """根据输入内容计算检查点目录，相同输入重跑时可复用已完成章节"""
+        fingerprint = json.dumps([
+            input_data.get('query', ''),
+            input_data.get('selected_template', ''),
+            input_data.get('query_engine_report', ''),
+            input_data.get('media_engine_report', ''),
+            input_data.get('insight_engine_report', ''),
+            input_data.get('forum_logs', ''),
+        ], ensure_ascii=False)
+        digest = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.checkpoint_dir, digest)
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str, index: int) -> Optional[str]:
+        path = os.path.join(checkpoint_path, f"section_{index:02d}.html")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except Exception as e:
+            logger.warning(f"读取章节检查点失败: {e}")
+            return None
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, index: int, section_html: str):
+        path = os.path.join(checkpoint_path, f"section_{index:02d}.html")
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(section_html)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"保存章节检查点失败: {e}")
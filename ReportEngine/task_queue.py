@@ -0,0 +1,395 @@
+"""
+Report Engine任务队列
+提供持久化的报告任务注册表（SQLite）与带并发上限、优先级和用户公平调度的工作线程池
+"""
+
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from loguru import logger
+
+from .utils.event_stream import ReportEventStream
+
+ACTIVE_STATUSES = ("pending", "running")
+FINISHED_STATUSES = ("completed", "error", "cancelled")
+
+# 进程内保留的已结束任务数量（更早的任务从注册表与报告文件中读取）
+MAX_FINISHED_TASKS_IN_MEMORY = 50
+
+
+class ReportTask:
+    """报告生成任务"""
+
+    def __init__(self, query: str, task_id: str, custom_template: str = "",
+                 user_id: str = "anonymous", priority: int = 0, session_id: Optional[str] = None):
+        self.task_id = task_id
+        self.query = query
+        self.custom_template = custom_template
+        self.user_id = user_id
+        self.priority = priority
+        self.session_id = session_id
+        self.status = "pending"  # pending, running, completed, error, cancelled
+        self.progress = 0
+        self.result = None
+        self.error_message = ""
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.html_content = ""
+        self.report_file_path = ""
+        self.report_file_relative_path = ""
+        self.report_file_name = ""
+        self.state_file_path = ""
+        self.state_file_relative_path = ""
+        self.events = ReportEventStream()
+        self.cancel_event = threading.Event()
+        self.on_change: Optional[Callable[["ReportTask"], None]] = None
+
+    def update_status(self, status: str, progress: int = None, error_message: str = ""):
+        """更新任务状态，写入事件流并持久化"""
+        self.status = status
+        if progress is not None:
+            self.progress = progress
+        if error_message:
+            self.error_message = error_message
+        self.updated_at = datetime.now()
+
+        if status == "completed":
+            self.events.publish('done', self.to_dict())
+        elif status in ("error", "cancelled"):
+            self.events.publish('error', self.to_dict())
+        else:
+            self.events.publish('status', self.to_dict())
+
+        if self.on_change:
+            self.on_change(self)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'task_id': self.task_id,
+            'query': self.query,
+            'user_id': self.user_id,
+            'priority': self.priority,
+            'session_id': self.session_id,
+            'status': self.status,
+            'progress': self.progress,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'has_result': bool(self.html_content or self.report_file_path),
+            'report_file_ready': bool(self.report_file_path),
+            'report_file_name': self.report_file_name,
+            'report_file_path': self.report_file_relative_path
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "ReportTask":
+        """从注册表记录恢复任务（不含HTML内容，需要时从报告文件读取）"""
+        task = cls(record['query'], record['task_id'], record.get('custom_template') or "",
+                   record.get('user_id') or "anonymous", record.get('priority') or 0,
+                   record.get('session_id'))
+        task.status = record['status']
+        task.progress = record.get('progress') or 0
+        task.error_message = record.get('error_message') or ""
+        task.created_at = datetime.fromisoformat(record['created_at'])
+        task.updated_at = datetime.fromisoformat(record['updated_at'])
+        task.report_file_path = record.get('report_file_path') or ""
+        task.report_file_relative_path = record.get('report_file_relative_path') or ""
+        task.report_file_name = record.get('report_file_name') or ""
+        task.state_file_path = record.get('state_file_path') or ""
+        task.state_file_relative_path = record.get('state_file_relative_path') or ""
+        return task
+
+    def load_html_content(self) -> str:
+        """获取报告HTML，内存中没有时从已保存的报告文件读取"""
+        if not self.html_content and self.report_file_path and os.path.exists(self.report_file_path):
+            with open(self.report_file_path, 'r', encoding='utf-8') as f:
+                self.html_content = f.read()
+        return self.html_content
+
+
+class TaskRegistry:
+    """基于SQLite的报告任务注册表"""
+
+    COLUMNS = (
+        'task_id', 'user_id', 'session_id', 'query', 'custom_template', 'priority', 'status', 'progress',
+        'error_message', 'created_at', 'updated_at', 'report_file_path', 'report_file_relative_path',
+        'report_file_name', 'state_file_path', 'state_file_relative_path'
+    )
+
+    def __init__(self, db_path: str = "logs/report_tasks.db"):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS report_tasks (
+                    task_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT,
+                    query TEXT NOT NULL,
+                    custom_template TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    error_message TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    report_file_path TEXT,
+                    report_file_relative_path TEXT,
+                    report_file_name TEXT,
+                    state_file_path TEXT,
+                    state_file_relative_path TEXT
+                )
+            """)
+            existing = {row['name'] for row in self._conn.execute("PRAGMA table_info(report_tasks)")}
+            if 'session_id' not in existing:
+                self._conn.execute("ALTER TABLE report_tasks ADD COLUMN session_id TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_report_tasks_status ON report_tasks (status)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_report_tasks_user ON report_tasks (user_id, created_at)")
+
+    def save(self, task: ReportTask):
+        """写入或更新任务记录"""
+        values = (
+            task.task_id, task.user_id, task.session_id, task.query, task.custom_template, task.priority, task.status,
+            task.progress, task.error_message, task.created_at.isoformat(), task.updated_at.isoformat(),
+            task.report_file_path, task.report_file_relative_path, task.report_file_name,
+            task.state_file_path, task.state_file_relative_path
+        )
+        placeholders = ', '.join('?' for _ in self.COLUMNS)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO report_tasks ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                    values
+                )
+        except Exception as e:
+            logger.exception(f"保存报告任务记录失败: {e}")
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """按任务ID读取记录"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM report_tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: Optional[str] = None, user_id: Optional[str] = None,
+             limit: int = 50, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        分页列出任务（按创建时间倒序）
+
+        Returns:
+            (任务记录列表, 满足条件的总数)
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ', '.join(column for column in self.COLUMNS if column != 'custom_template')
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM report_tasks {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM report_tasks {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """读取上次进程退出时仍未结束的任务"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM report_tasks WHERE status IN ('pending', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+class ReportJobQueue:
+    """报告任务队列
+
+    - 固定数量的工作线程，限制同时生成的报告数
+    - 每个用户维护独立的优先级队列；调度时先选出未达到单用户并发上限的用户，
+      取其队首优先级最高者，同优先级下优先调度最久未被服务的用户，避免单个用户占满工作线程
+    - 取消排队中的任务直接出队；取消运行中的任务通过cancel_event中断LLM流式输出
+    """
+
+    def __init__(self, runner: Callable[[ReportTask], None], registry: TaskRegistry,
+                 max_workers: int = 2, max_tasks_per_user: int = 1):
+        """
+        初始化任务队列
+
+        Args:
+            runner: 执行单个任务的函数
+            registry: 任务注册表
+            max_workers: 工作线程数（同时运行的任务上限）
+            max_tasks_per_user: 单个用户同时运行的任务上限
+        """
+        self.runner = runner
+        self.registry = registry
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_user = max(1, max_tasks_per_user)
+
+        self.tasks: Dict[str, ReportTask] = {}
+        self._finished_order = deque()
+        self._pending: Dict[str, list] = {}       # user_id -> [(-priority, seq, task_id)]
+        self._running: Dict[str, int] = {}        # user_id -> 运行中任务数
+        self._last_served: Dict[str, float] = {}  # user_id -> 最近一次被调度的时间
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+
+    def start(self):
+        """启动工作线程（可重复调用）"""
+        with self._condition:
+            if self._workers:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"report-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"报告任务队列已启动，工作线程数: {self.max_workers}")
+
+    def restore(self):
+        """将上次进程退出时未完成的任务重新入队（分章节检查点可使其从中断处继续）"""
+        for record in self.registry.unfinished():
+            task = ReportTask.from_record(record)
+            task.status = "pending"
+            task.progress = 0
+            logger.info(f"恢复未完成的报告任务: {task.task_id}")
+            self.submit(task)
+
+    def submit(self, task: ReportTask) -> ReportTask:
+        """提交任务到队列"""
+        task.on_change = self._on_task_change
+        with self._condition:
+            self.tasks[task.task_id] = task
+            heapq.heappush(self._pending.setdefault(task.user_id, []),
+                           (-task.priority, next(self._seq), task.task_id))
+            self._condition.notify()
+        task.update_status("pending", 0)
+        return task
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        取消任务
+
+        Returns:
+            任务存在且尚未结束时返回True
+        """
+        with self._condition:
+            task = self.tasks.get(task_id)
+            if not task or task.finished:
+                return False
+            task.cancel_event.set()
+            if task.status == "pending":
+                # 持锁出队并改为cancelled，调度时不会再被取出；排队中的任务不经过工作线程，在这里计入已结束任务
+                heap = self._pending.get(task.user_id, [])
+                heap[:] = [entry for entry in heap if entry[2] != task_id]
+                heapq.heapify(heap)
+                task.update_status("cancelled", 0, "用户取消任务")
+                self._remember_finished(task_id)
+        return True
+
+    def get(self, task_id: str) -> Optional[ReportTask]:
+        """获取任务，进程内没有时从注册表恢复只读副本"""
+        task = self.tasks.get(task_id)
+        if task:
+            return task
+        record = self.registry.get(task_id)
+        return ReportTask.from_record(record) if record else None
+
+    def queue_position(self, task_id: str) -> Optional[int]:
+        """返回排队任务前面还有多少个排队任务（按当前调度规则的近似值）"""
+        with self._condition:
+            task = self.tasks.get(task_id)
+            if not task or task.status != "pending":
+                return None
+            key = (-task.priority, task.created_at)
+            return sum(
+                1 for other in self.tasks.values()
+                if other.status == "pending" and other is not task and (-other.priority, other.created_at) < key
+            )
+
+    def active_tasks(self) -> List[ReportTask]:
+        """返回运行中和排队中的任务（运行中的在前）"""
+        with self._condition:
+            tasks = [task for task in self.tasks.values() if task.status in ACTIVE_STATUSES]
+        return sorted(tasks, key=lambda task: (task.status != "running", -task.priority, task.created_at))
+
+    def latest_task(self) -> Optional[ReportTask]:
+        """返回最近创建的任务，优先返回未结束的任务"""
+        active = self.active_tasks()
+        if active:
+            return active[0]
+        with self._condition:
+            if not self.tasks:
+                return None
+            return max(self.tasks.values(), key=lambda task: task.created_at)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = sum(1 for task in self.tasks.values() if task.status == "pending")
+            running = sum(self._running.values())
+        return {'running': running, 'pending': pending, 'max_workers': self.max_workers}
+
+    def _remember_finished(self, task_id: str):
+        """记录已结束的任务，超出内存上限时淘汰最早结束的任务（调用方需持有_condition）"""
+        self._finished_order.append(task_id)
+        while len(self._finished_order) > MAX_FINISHED_TASKS_IN_MEMORY:
+            self.tasks.pop(self._finished_order.popleft(), None)
+
+    def _on_task_change(self, task: ReportTask):
+        self.registry.save(task)
+
+    def _next_task(self) -> ReportTask:
+        """阻塞直到有可调度的任务，按优先级与用户公平性选出下一个任务"""
+        with self._condition:
+            while True:
+                best_key, best_user = None, None
+                for user_id, heap in self._pending.items():
+                    # 丢弃已取消或已淘汰的队首
+                    while heap and getattr(self.tasks.get(heap[0][2]), 'status', None) != "pending":
+                        heapq.heappop(heap)
+                    if not heap or self._running.get(user_id, 0) >= self.max_tasks_per_user:
+                        continue
+                    key = (heap[0][0], self._last_served.get(user_id, 0.0), heap[0][1])
+                    if best_key is None or key < best_key:
+                        best_key, best_user = key, user_id
+                if best_user is not None:
+                    _, _, task_id = heapq.heappop(self._pending[best_user])
+                    self._running[best_user] = self._running.get(best_user, 0) + 1
+                    self._last_served[best_user] = time.monotonic()
+                    return self.tasks[task_id]
+                self._condition.wait()
+
+    def _worker_loop(self):
+        while True:
+            task = self._next_task()
+            try:
+                self.runner(task)
+            except Exception as e:
+                logger.exception(f"报告任务 {task.task_id} 执行异常: {e}")
+                if not task.finished:
+                    task.update_status("error", 0, str(e))
+            finally:
+                with self._condition:
+                    self._running[task.user_id] -= 1
+                    self._remember_finished(task.task_id)
+                    self._condition.notify_all()
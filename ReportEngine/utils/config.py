@@ -24,6 +24,15 @@ class Settings(BaseSettings):
     LOG_FILE: str = Field("logs/report.log", description="日志输出文件")
     ENABLE_PDF_EXPORT: bool = Field(True, description="是否允许导出PDF")
     CHART_STYLE: str = Field("modern", description="图表样式：modern/classic/")
+    HTML_GENERATION_MODE: str = Field("sectioned", description="HTML生成模式：sectioned（分章节并行）/single（单次整体生成）")
+    SECTION_MAX_WORKERS: int = Field(4, description="分章节生成的最大并发数")
+    SECTION_MAX_RETRIES: int = Field(2, description="单个章节生成失败后的重试次数")
+    SECTION_EXCERPT_CHARS: int = Field(6000, description="每个章节从单份源报告中截取的最大字符数")
+    SECTION_CHECKPOINT_DIR: str = Field("final_reports/.sections", description="章节生成检查点目录")
+    REPORT_TASK_DB: str = Field("logs/report_tasks.db", description="报告任务注册表SQLite文件路径")
+    REPORT_MAX_CONCURRENT_TASKS: int = Field(2, description="同时生成的报告任务数上限")
+    REPORT_MAX_TASKS_PER_USER: int = Field(1, description="单个用户同时运行的报告任务数上限")
+    ENGINE_REPORT_WAIT_TIMEOUT: int = Field(900, description="指定搜索会话的任务等待三个引擎登记报告的最长秒数")
 
     class Config:
         env_file = ".env"
@@ -48,6 +57,9 @@ def print_config(config: Settings):
     message += f"日志文件: {config.LOG_FILE}\n"
     message += f"PDF 导出: {config.ENABLE_PDF_EXPORT}\n"
     message += f"图表样式: {config.CHART_STYLE}\n"
+    message += f"HTML生成模式: {config.HTML_GENERATION_MODE}\n"
+    message += f"章节并发数: {config.SECTION_MAX_WORKERS}\n"
+    message += f"报告任务并发数: {config.REPORT_MAX_CONCURRENT_TASKS}\n"
     message += f"LLM API Key: {'已配置' if config.REPORT_ENGINE_API_KEY else '未配置'}\n"
     message += "=========================\n"
     logger.info(message)
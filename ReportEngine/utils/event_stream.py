@@ -0,0 +1,85 @@
+"""
+报告生成事件流
+为单个报告任务缓存按序号排列的事件（进度、LLM文本块、已完成章节），
+供SSE接口回放与等待，客户端可凭游标断线续传
+"""
+
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+TERMINAL_EVENTS = ('done', 'error')
+
+
+class ReportEventStream:
+    """线程安全的只追加事件缓冲区
+
+    每个事件拥有从1开始递增的序号(id)，客户端以最后收到的序号作为游标，
+    重连时只会收到游标之后的事件。
+    """
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._has_chunks = False
+
+    @property
+    def closed(self) -> bool:
+        """是否已写入终止事件（done/error）"""
+        with self._condition:
+            return self._is_closed_locked()
+
+    @property
+    def last_id(self) -> int:
+        with self._condition:
+            return len(self._events)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> int:
+        """
+        追加一个事件并唤醒等待中的读者
+
+        Args:
+            event: 事件类型（status/outline/section/chunk/reset/done/error）
+            data: 事件数据（需可JSON序列化）
+
+        Returns:
+            事件序号
+        """
+        with self._condition:
+            if self._is_closed_locked():
+                return len(self._events)
+            event_id = len(self._events) + 1
+            self._events.append({'id': event_id, 'event': event, 'data': data, 'time': time.time()})
+            self._condition.notify_all()
+            return event_id
+
+    def publish_chunk(self, text: str) -> int:
+        """追加一段LLM输出文本"""
+        self._has_chunks = True
+        return self.publish('chunk', {'text': text})
+
+    def publish_reset(self):
+        """LLM流式调用重试时通知客户端丢弃已收到的文本块"""
+        if self._has_chunks:
+            self._has_chunks = False
+            self.publish('reset', {})
+
+    def read(self, cursor: int = 0, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        读取游标之后的事件，没有新事件时最多等待timeout秒
+
+        Args:
+            cursor: 客户端已收到的最后一个事件序号
+            timeout: 等待新事件的最长时间，None表示不等待
+
+        Returns:
+            游标之后的事件列表（可能为空）
+        """
+        cursor = max(cursor, 0)
+        with self._condition:
+            if timeout and len(self._events) <= cursor and not self._is_closed_locked():
+                self._condition.wait(timeout)
+            return self._events[cursor:]
+
+    def _is_closed_locked(self) -> bool:
+        return bool(self._events) and self._events[-1]['event'] in TERMINAL_EVENTS
@@ -0,0 +1,130 @@
+"""
+分章节报告生成辅助函数
+用于拆分报告模板章节、从源报告中挑选与章节相关的片段
+"""
+
+import re
+from typing import Dict, List, Any
+
+# 模板章节识别：顶层加粗列表项（- **1.0 报告摘要**）或二级Markdown标题（## 事件概况）
+_LIST_CHAPTER_PATTERN = re.compile(r'^-\s+\*\*(.+?)\*\*')
+_HEADING_CHAPTER_PATTERN = re.compile(r'^##\s+(.+)$')
+_MARKDOWN_HEADING_PATTERN = re.compile(r'^#{1,6}\s+')
+_NOISE_PATTERN = re.compile(r'[\s\*#\-_`>|:：，。、（）()\[\]{}0-9.]+')
+
+
+def split_template_sections(template: str) -> Dict[str, Any]:
+    """
+    将报告模板拆分为章节
+
+    Args:
+        template: 模板Markdown内容
+
+    Returns:
+        包含title（模板标题）和sections（章节列表，每项含title与outline）的字典
+    """
+    lines = template.strip().splitlines()
+    for pattern in (_LIST_CHAPTER_PATTERN, _HEADING_CHAPTER_PATTERN):
+        starts = [i for i, line in enumerate(lines) if pattern.match(line)]
+        if starts:
+            break
+    else:
+        starts = []
+
+    preamble = lines[:starts[0]] if starts else lines[:1]
+    title = next((line.strip().strip('#* ') for line in preamble if line.strip()), "")
+
+    sections = []
+    for n, start in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        heading = lines[start]
+        match = _LIST_CHAPTER_PATTERN.match(heading) or _HEADING_CHAPTER_PATTERN.match(heading)
+        sections.append({
+            'title': match.group(1).strip(),
+            'outline': '\n'.join(lines[start:end]).strip()
+        })
+
+    if not sections:
+        sections.append({'title': title or '报告正文', 'outline': template.strip()})
+
+    return {'title': title, 'sections': sections}
+
+
+def _bigrams(text: str) -> set:
+    """提取字符二元组（对中文无需分词即可衡量相关度）"""
+    text = _NOISE_PATTERN.sub('', text.lower())
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def split_report_chunks(report: str, max_chunk_chars: int = 1500) -> List[str]:
+    """
+    按Markdown标题与空行把报告切分为片段
+
+    Args:
+        report: 报告内容
+        max_chunk_chars: 单个片段最大字符数，超出时按段落继续切分
+
+    Returns:
+        片段列表（保持原顺序）
+    """
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+    for line in report.splitlines():
+        starts_new = bool(_MARKDOWN_HEADING_PATTERN.match(line)) or (not line.strip() and current_len >= max_chunk_chars)
+        if starts_new and current:
+            chunks.append('\n'.join(current).strip())
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line) + 1
+    if current:
+        chunks.append('\n'.join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+def select_relevant_excerpts(report: str, query: str, section_outline: str,
+                             max_chars: int = 6000) -> str:
+    """
+    从源报告中选出与章节最相关的片段
+
+    Args:
+        report: 源报告内容
+        query: 原始查询
+        section_outline: 章节标题与提纲
+        max_chars: 返回片段的总字符上限
+
+    Returns:
+        按原文顺序拼接的相关片段
+    """
+    if not report:
+        return ""
+    if len(report) <= max_chars:
+        return report
+
+    chunks = split_report_chunks(report)
+    section_grams = _bigrams(section_outline)
+    query_grams = _bigrams(query)
+
+    scored = []
+    for position, chunk in enumerate(chunks):
+        grams = _bigrams(chunk)
+        if not grams:
+            continue
+        # 章节提纲相关度为主，查询相关度为辅，按片段规模做归一化
+        score = (2 * len(grams & section_grams) + len(grams & query_grams)) / (len(grams) ** 0.5)
+        scored.append((score, position))
+
+    selected = []
+    used = 0
+    for score, position in sorted(scored, reverse=True):
+        chunk_len = len(chunks[position])
+        if used + chunk_len > max_chars:
+            continue
+        selected.append(position)
+        used += chunk_len
+
+    if not selected and scored:
+        best_position = max(scored)[1]
+        return chunks[best_position][:max_chars]
+
+    return '\n\n'.join(chunks[position] for position in sorted(selected))
@@ -96,13 +96,14 @@ def load_finetuned(model_root: str, subdir: str) -> Tuple[str, Dict[int, str]]:
     return finetuned_path, id2label
 
 
-def predict_topk(model: AutoModelForSequenceClassification, tokenizer: AutoTokenizer, device: torch.device, text: str, max_length: int = 128, top_k: int = 3) -> List[Tuple[str, float]]:
-    processed = preprocess_text(text or "")
+def predict_topk_batch(model: AutoModelForSequenceClassification, tokenizer: AutoTokenizer, device: torch.device, texts: List[str], max_length: int = 128, top_k: int = 3) -> List[List[Tuple[str, float]]]:
+    """对一个小批次做一次前向计算，按批次内最长文本动态padding"""
+    processed = [preprocess_text(text or "") for text in texts]
     encoded = tokenizer(
         processed,
         max_length=max_length,
         truncation=True,
-        padding="max_length",
+        padding="longest",
         return_tensors="pt",
     )
     input_ids = encoded["input_ids"].to(device)
@@ -110,18 +111,20 @@ def predict_topk(model: AutoModelForSequenceClassification, tokenizer: AutoToken
 
     with torch.no_grad():
         outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-        logits = outputs.logits
-        probs = torch.softmax(logits, dim=-1)[0]
+        probs = torch.softmax(outputs.logits, dim=-1)
         k = min(top_k, probs.shape[-1])
-        confs, idxs = torch.topk(probs, k)
+        confs, idxs = torch.topk(probs, k, dim=-1)
+    confs = confs.cpu().tolist()
+    idxs = idxs.cpu().tolist()
     id2label = getattr(model.config, "id2label", {}) if isinstance(getattr(model.config, "id2label", None), dict) else {}
-    results: List[Tuple[str, float]] = []
-    for i in range(k):
-        idx = int(idxs[i].item())
-        conf = float(confs[i].item())
-        label_name = id2label.get(idx, str(idx))
-        results.append((label_name, conf))
-    return results
+    return [
+        [(id2label.get(idx, str(idx)), float(conf)) for idx, conf in zip(row_idxs, row_confs)]
+        for row_idxs, row_confs in zip(idxs, confs)
+    ]
+
+
+def predict_topk(model: AutoModelForSequenceClassification, tokenizer: AutoTokenizer, device: torch.device, text: str, max_length: int = 128, top_k: int = 3) -> List[Tuple[str, float]]:
+    return predict_topk_batch(model, tokenizer, device, [text], max_length, top_k)[0]
 
 
 def main() -> None:
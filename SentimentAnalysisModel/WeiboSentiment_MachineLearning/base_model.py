@@ -6,6 +6,7 @@ import os
 import pickle
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Dict, Any
+import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, f1_score, classification_report
 from utils import load_corpus
@@ -41,6 +42,17 @@ class BaseModel(ABC):
         """
         predictions = self.predict([text])
         return predictions[0], 0.0  # 默认置信度为0
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """批量预测正面情感的概率
+
+        Args:
+            texts: 待预测文本列表（已分词预处理）
+
+        Returns:
+            形状为(len(texts),)的正面概率数组；子类未实现概率输出时退化为0/1标签
+        """
+        return np.asarray(self.predict(texts), dtype=float)
     
     def evaluate(self, test_data: List[Tuple[str, int]]) -> Dict[str, float]:
         """评估模型性能"""
@@ -3,6 +3,7 @@
 朴素贝叶斯情感分析模型训练脚本
 """
 import argparse
+import numpy as np
 import pandas as pd
 from typing import List, Tuple
 from sklearn.feature_extraction.text import CountVectorizer
@@ -93,6 +94,15 @@ class BayesModel(BaseModel):
         
         return int(prediction), float(confidence)
 
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """批量预测正面情感的概率（整批一次特征转换）"""
+        if not self.is_trained:
+            raise ValueError(f"模型 {self.model_name} 尚未训练，请先调用train方法")
+
+        X = self.vectorizer.transform(texts)
+        probabilities = self.model.predict_proba(X)
+        return probabilities[:, list(self.model.classes_).index(1)]
+
 
 def main():
     """主函数"""
@@ -11,6 +11,7 @@ from torch.utils.data import Dataset, DataLoader
 from transformers import BertTokenizer, BertModel
 from sklearn.metrics import accuracy_score, f1_score, classification_report, roc_auc_score
 from typing import List, Tuple
+import numpy as np
 import warnings
 import requests
 from pathlib import Path
@@ -220,11 +221,15 @@ class BertModel_Custom(BaseModel):
     
     def predict(self, texts: List[str]) -> List[int]:
         """预测文本情感"""
+        # 转换为类别标签
+        return (self.predict_proba(texts) > 0.5).astype(int).tolist()
+
+    def predict_proba(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """批量预测正面情感的概率"""
         if not self.is_trained:
             raise ValueError(f"模型 {self.model_name} 尚未训练，请先调用train方法")
         
-        predictions = []
-        batch_size = 32
+        probabilities = []
         
         self.bert.eval()
         self.classifier.eval()
@@ -245,13 +250,9 @@ class BertModel_Custom(BaseModel):
                 
                 # 分类器预测
                 outputs = self.classifier(bert_output)
-                outputs = outputs.view(-1)
-                
-                # 转换为类别标签
-                preds = (outputs > 0.5).cpu().numpy()
-                predictions.extend(preds.astype(int).tolist())
+                probabilities.append(outputs.view(-1).cpu().numpy())
         
-        return predictions
+        return np.concatenate(probabilities) if probabilities else np.zeros(0)
     
     def predict_single(self, text: str) -> Tuple[int, float]:
         """预测单条文本的情感"""
@@ -177,28 +177,37 @@ class LSTMModel(BaseModel):
     
     def predict(self, texts: List[str]) -> List[int]:
         """预测文本情感"""
+        # 转换为类别标签
+        return (self.predict_proba(texts) > 0.5).astype(int).tolist()
+
+    def predict_proba(self, texts: List[str], batch_size: int = 256) -> np.ndarray:
+        """批量预测正面情感的概率
+
+        结果与输入顺序一致；没有有效词向量的文本概率为0.5（与predict_single一致）
+        """
         if not self.is_trained:
             raise ValueError(f"模型 {self.model_name} 尚未训练，请先调用train方法")
-        
-        # 创建数据集
-        test_data = [(text, 0) for text in texts]  # 标签无关紧要
-        test_dataset = LSTMDataset(test_data, self.word2vec_model)
-        test_loader = DataLoader(test_dataset, batch_size=32, collate_fn=collate_fn)
-        
-        predictions = []
+
+        key_to_index = self.word2vec_model.wv.key_to_index
+        sequences = []
+        for index, text in enumerate(texts):
+            words = [word for word in text.split(" ") if word in key_to_index]
+            if words:
+                sequences.append((index, torch.from_numpy(np.asarray(self.word2vec_model.wv[words], dtype=np.float32))))
+
+        probabilities = np.full(len(texts), 0.5)
+        # 按长度降序排列：满足pack_padded_sequence的要求，同一批次内的padding也最少
+        sequences.sort(key=lambda item: len(item[1]), reverse=True)
+
         self.model.eval()
-        
         with torch.no_grad():
-            for x, _, lengths in test_loader:
-                x = x.to(self.device)
-                outputs = self.model(x, lengths)
-                outputs = outputs.view(-1)
-                
-                # 转换为类别标签
-                preds = (outputs > 0.5).cpu().numpy()
-                predictions.extend(preds.astype(int).tolist())
-        
-        return predictions
+            for start in range(0, len(sequences), batch_size):
+                chunk = sequences[start:start + batch_size]
+                x = pad_sequence([vectors for _, vectors in chunk], batch_first=True, padding_value=0).to(self.device)
+                outputs = self.model(x, [len(vectors) for _, vectors in chunk]).view(-1)
+                probabilities[[index for index, _ in chunk]] = outputs.cpu().numpy()
+
+        return probabilities
     
     def predict_single(self, text: str) -> Tuple[int, float]:
         """预测单条文本的情感"""
@@ -6,8 +6,10 @@
 import argparse
 import os
 import re
-from typing import Dict, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, List, Optional
 import warnings
+import numpy as np
 warnings.filterwarnings("ignore")
 
 # 导入所有模型类
@@ -149,6 +151,67 @@ class SentimentPredictor:
         
         return results
     
+    def predict_proba_batch(self, texts: List[str], max_workers: Optional[int] = None,
+                            processed: bool = False) -> Dict[str, np.ndarray]:
+        """批量预测各模型的正面概率
+
+        每条文本只做一次清洗和jieba分词，所有模型共享分词结果；
+        每个模型对整批文本做一次向量化推理，可选在线程池中并行运行各模型
+
+        Args:
+            texts: 待预测文本列表
+            max_workers: 并行运行模型的线程数，None或1表示顺序执行
+            processed: texts是否已经过processing预处理
+
+        Returns:
+            Dict[model_type, 形状为(len(texts),)的正面概率数组]，预测失败的模型不包含在内
+        """
+        processed_texts = texts if processed else [processing(text) for text in texts]
+
+        def run(name: str) -> Optional[np.ndarray]:
+            try:
+                return np.asarray(self.models[name].predict_proba(processed_texts), dtype=float)
+            except Exception as e:
+                print(f"模型 {name} 预测失败: {e}")
+                return None
+
+        names = list(self.models.keys())
+        if max_workers and max_workers > 1 and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+                outputs = list(executor.map(run, names))
+        else:
+            outputs = [run(name) for name in names]
+
+        return {name: output for name, output in zip(names, outputs) if output is not None}
+
+    def ensemble_predict_batch(self, texts: List[str], weights: Dict[str, float] = None,
+                               max_workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """批量集成预测（各模型正面概率加权平均）
+
+        Args:
+            texts: 待预测文本列表
+            weights: 模型权重，如果为None则平均权重
+            max_workers: 并行运行模型的线程数
+
+        Returns:
+            (predictions, confidences)，均为形状(len(texts),)的数组
+        """
+        if len(self.models) == 0:
+            raise ValueError("没有加载任何模型")
+
+        probabilities = self.predict_proba_batch(texts, max_workers=max_workers)
+        names = [name for name in probabilities if weights is None or name in weights]
+        weight_vector = np.array([1.0 if weights is None else weights[name] for name in names])
+
+        if not names or weight_vector.sum() == 0:
+            return np.zeros(len(texts), dtype=int), np.full(len(texts), 0.5)
+
+        # (模型数, 文本数)的概率矩阵按权重加权平均
+        final_prob = weight_vector @ np.vstack([probabilities[name] for name in names]) / weight_vector.sum()
+        predictions = (final_prob > 0.5).astype(int)
+        confidences = np.where(predictions == 1, final_prob, 1 - final_prob)
+        return predictions, confidences
+
     def ensemble_predict(self, text: str, weights: Dict[str, float] = None) -> Tuple[int, float]:
         """集成预测（多个模型投票）
         
@@ -159,33 +222,8 @@ class SentimentPredictor:
         Returns:
             (prediction, confidence)
         """
-        if len(self.models) == 0:
-            raise ValueError("没有加载任何模型")
-        
-        results = self.predict_single(text)
-        
-        if weights is None:
-            weights = {name: 1.0 for name in results.keys()}
-        
-        # 加权平均
-        total_weight = 0
-        weighted_prob = 0
-        
-        for model_name, (pred, conf) in results.items():
-            if model_name in weights:
-                weight = weights[model_name]
-                prob = conf if pred == 1 else 1 - conf
-                weighted_prob += prob * weight
-                total_weight += weight
-        
-        if total_weight == 0:
-            return 0, 0.5
-        
-        final_prob = weighted_prob / total_weight
-        final_pred = int(final_prob > 0.5)
-        final_conf = final_prob if final_pred == 1 else 1 - final_prob
-        
-        return final_pred, final_conf
+        predictions, confidences = self.ensemble_predict_batch([text], weights)
+        return int(predictions[0]), float(confidences[0])
     
     def interactive_predict(self):
         """交互式预测模式"""
@@ -125,6 +125,14 @@ class XGBoostModel(BaseModel):
         confidence = prob if prediction == 1 else 1 - prob
         
         return prediction, float(confidence)
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """批量预测正面情感的概率（整批一次特征转换）"""
+        if not self.is_trained:
+            raise ValueError(f"模型 {self.model_name} 尚未训练，请先调用train方法")
+
+        X = self.vectorizer.transform(texts)
+        return self.model.predict(xgb.DMatrix(X))
     
     def evaluate(self, test_data: List[Tuple[str, int]]) -> dict:
         """评估模型性能，包含AUC指标"""
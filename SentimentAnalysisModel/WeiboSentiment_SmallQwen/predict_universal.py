@@ -8,8 +8,10 @@ Qwen3微博情感分析统一预测接口
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import torch
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 
 # 添加当前目录到路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -151,31 +153,67 @@ class Qwen3UniversalPredictor:
         
         return results
     
-    def ensemble_predict(self, text: str) -> Tuple[int, float]:
-        """集成预测"""
+    def predict_proba_batch(self, texts: List[str], max_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """批量预测各模型的正面概率
+
+        每个模型对整批文本做批量推理，可选在线程池中并行运行各模型
+
+        Args:
+            texts: 待预测文本列表
+            max_workers: 并行运行模型的线程数，None或1表示顺序执行
+
+        Returns:
+            {model_key: 形状为(len(texts),)的正面概率数组}，预测失败的模型不包含在内
+        """
+        def run(model_key: str) -> Optional[np.ndarray]:
+            model_info = self.models[model_key]
+            try:
+                return np.asarray(model_info['model'].predict_proba(texts), dtype=float)
+            except Exception as e:
+                print(f"模型 {model_info['display_name']} 预测失败: {e}")
+                return None
+
+        model_keys = list(self.models.keys())
+        if max_workers and max_workers > 1 and len(model_keys) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(model_keys))) as executor:
+                outputs = list(executor.map(run, model_keys))
+        else:
+            outputs = [run(model_key) for model_key in model_keys]
+
+        return {model_key: output for model_key, output in zip(model_keys, outputs) if output is not None}
+
+    def ensemble_predict_batch(self, texts: List[str], weights: Dict[str, float] = None,
+                               max_workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """批量集成预测（各模型正面概率加权平均）
+
+        Args:
+            texts: 待预测文本列表
+            weights: {model_key: 权重}，None表示简单平均
+            max_workers: 并行运行模型的线程数
+
+        Returns:
+            (predictions, confidences)，均为形状(len(texts),)的数组
+        """
         if len(self.models) < 2:
             raise ValueError("集成预测需要至少2个模型")
-        
-        results = self.predict_single(text)
-        
-        # 加权平均（这里使用简单平均，可以根据模型性能调整权重）
-        total_weight = 0
-        weighted_prob = 0
-        
-        for model_name, (pred, conf) in results.items():
-            if conf > 0:  # 只考虑有效预测
-                prob = conf if pred == 1 else 1 - conf
-                weighted_prob += prob
-                total_weight += 1
-        
-        if total_weight == 0:
-            return 0, 0.5
-        
-        final_prob = weighted_prob / total_weight
-        final_pred = int(final_prob > 0.5)
-        final_conf = final_prob if final_pred == 1 else 1 - final_prob
-        
-        return final_pred, final_conf
+
+        probabilities = self.predict_proba_batch(texts, max_workers=max_workers)
+        model_keys = [key for key in probabilities if weights is None or key in weights]
+        weight_vector = np.array([1.0 if weights is None else weights[key] for key in model_keys])
+
+        if not model_keys or weight_vector.sum() == 0:
+            return np.zeros(len(texts), dtype=int), np.full(len(texts), 0.5)
+
+        # (模型数, 文本数)的概率矩阵按权重加权平均
+        final_prob = weight_vector @ np.vstack([probabilities[key] for key in model_keys]) / weight_vector.sum()
+        predictions = (final_prob > 0.5).astype(int)
+        confidences = np.where(predictions == 1, final_prob, 1 - final_prob)
+        return predictions, confidences
+
+    def ensemble_predict(self, text: str) -> Tuple[int, float]:
+        """集成预测"""
+        predictions, confidences = self.ensemble_predict_batch([text])
+        return int(predictions[0]), float(confidences[0])
     
     def _select_and_load_model(self):
         """让用户选择并加载模型"""
@@ -10,6 +10,7 @@ import torch.nn as nn
 from torch.utils.data import Dataset, DataLoader
 from transformers import AutoTokenizer, AutoModel
 from typing import List, Tuple
+import numpy as np
 import warnings
 from tqdm import tqdm
 
@@ -224,11 +225,14 @@ class Qwen3EmbeddingUniversal(BaseQwenModel):
     
     def predict(self, texts: List[str]) -> List[int]:
         """预测文本情感"""
+        return (self.predict_proba(texts) > 0.5).astype(int).tolist()
+
+    def predict_proba(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """批量预测正面情感的概率"""
         if not self.is_trained:
             raise ValueError(f"模型 {self.model_name} 尚未训练")
         
-        predictions = []
-        batch_size = 32
+        probabilities = []
         
         self.classifier_model.eval()
         with torch.no_grad():
@@ -247,10 +251,10 @@ class Qwen3EmbeddingUniversal(BaseQwenModel):
                 attention_mask = encodings['attention_mask'].to(self.device)
                 
                 outputs = self.classifier_model(input_ids, attention_mask)
-                preds = (outputs > 0.5).cpu().numpy()
-                predictions.extend(preds.astype(int).tolist())
+                # 单条批次时forward的squeeze()会得到0维张量，这里统一展平
+                probabilities.append(outputs.reshape(-1).cpu().numpy())
         
-        return predictions
+        return np.concatenate(probabilities) if probabilities else np.zeros(0)
     
     def predict_single(self, text: str) -> Tuple[int, float]:
         """预测单条文本的情感"""
@@ -16,6 +16,7 @@ from transformers import (
 from peft import LoraConfig, get_peft_model, TaskType, PeftModel
 from datasets import Dataset
 from typing import List, Tuple
+import numpy as np
 import warnings
 from tqdm import tqdm
 
@@ -261,9 +262,9 @@ class Qwen3LoRAUniversal(BaseQwenModel):
         self.is_trained = True
         print(f"Qwen3-{self.model_size}-LoRA 模型训练完成！")
     
-    def _extract_sentiment(self, generated_text: str, instruction: str) -> int:
-        """从生成的文本中提取情感标签"""
-        response = generated_text[len(instruction):].strip()
+    def _extract_sentiment(self, response: str) -> int:
+        """从模型的回答（不含指令）中提取情感标签"""
+        response = response.strip()
         
         if "正面" in response:
             return 1
@@ -274,18 +275,51 @@ class Qwen3LoRAUniversal(BaseQwenModel):
     
     def predict(self, texts: List[str]) -> List[int]:
         """预测文本情感"""
+        return (self.predict_proba(texts) > 0.5).astype(int).tolist()
+
+    def predict_proba(self, texts: List[str], batch_size: int = 16) -> np.ndarray:
+        """批量预测正面情感的概率
+
+        多条指令左填充后一起generate；生成式模型没有校准的概率，
+        与predict_single一致使用固定置信度0.8换算
+        """
         if not self.is_trained:
             raise ValueError(f"模型 {self.model_name} 尚未训练")
-        
+
         predictions = []
-        
+        padding_side = self.tokenizer.padding_side
+        # 批量生成时需要左填充，保证每条指令的末尾紧接生成位置
+        self.tokenizer.padding_side = "left"
         self.lora_model.eval()
-        with torch.no_grad():
-            for text in tqdm(texts, desc=f"Qwen3-{self.model_size}预测中"):
-                pred, _ = self.predict_single(text)
-                predictions.append(pred)
-        
-        return predictions
+        try:
+            with torch.no_grad():
+                for start in tqdm(range(0, len(texts), batch_size), desc=f"Qwen3-{self.model_size}预测中"):
+                    instructions = [
+                        f"请分析以下微博文本的情感倾向，回答'正面'或'负面'。\n\n文本：{text}\n\n情感："
+                        for text in texts[start:start + batch_size]
+                    ]
+                    inputs = self.tokenizer(instructions, return_tensors="pt", padding=True)
+                    if torch.cuda.is_available():
+                        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                    outputs = self.lora_model.generate(
+                        **inputs,
+                        max_new_tokens=10,
+                        do_sample=True,
+                        temperature=0.1,
+                        pad_token_id=self.tokenizer.pad_token_id,
+                        eos_token_id=self.tokenizer.eos_token_id,
+                    )
+                    # 输出包含（左填充后的）指令token，只解码其后新生成的部分；指令本身含"正面"二字，不能按字符串长度截取
+                    prompt_length = inputs["input_ids"].shape[-1]
+                    for output in outputs:
+                        response = self.tokenizer.decode(output[prompt_length:], skip_special_tokens=True)
+                        predictions.append(self._extract_sentiment(response))
+        finally:
+            self.tokenizer.padding_side = padding_side
+
+        confidence = 0.8
+        predictions = np.asarray(predictions, dtype=float)
+        return np.where(predictions == 1, confidence, 1 - confidence)
     
     def predict_single(self, text: str) -> Tuple[int, float]:
         """预测单条文本的情感"""
@@ -312,11 +346,11 @@ class Qwen3LoRAUniversal(BaseQwenModel):
                 eos_token_id=self.tokenizer.eos_token_id,
             )
         
-        # 解码生成的文本
-        generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        # 只解码指令之后新生成的token
+        response = self.tokenizer.decode(outputs[0][inputs["input_ids"].shape[-1]:], skip_special_tokens=True)
         
         # 提取情感标签
-        prediction = self._extract_sentiment(generated_text, instruction)
+        prediction = self._extract_sentiment(response)
         confidence = 0.8  # 生成式模型的置信度计算较复杂，这里给个固定值
         
         return prediction, confidence
@@ -0,0 +1,71 @@
+"""
+引擎配置构建
+Streamlit应用与无界面引擎工作进程共用的固定引擎配置（模型、反思次数、内容长度、报告目录）
+"""
+
+from config import settings
+
+# 各引擎的固定配置：默认模型、最大反思次数、内容长度字段及其取值、报告输出目录
+ENGINE_DEFAULTS = {
+    'insight': {
+        'model_name': "kimi-k2-0711-preview",  # Kimi支持长文本
+        'max_reflections': 2,
+        'content_length_field': 'MAX_CONTENT_LENGTH',
+        'max_content_length': 500000,
+        'output_dir': "insight_engine_streamlit_reports",
+    },
+    'media': {
+        'model_name': "gemini-2.5-pro",
+        'max_reflections': 2,
+        'content_length_field': 'SEARCH_CONTENT_MAX_LENGTH',
+        'max_content_length': 20000,
+        'output_dir': "media_engine_streamlit_reports",
+    },
+    'query': {
+        'model_name': "deepseek-chat",
+        'max_reflections': 2,
+        'content_length_field': 'SEARCH_CONTENT_MAX_LENGTH',
+        'max_content_length': 20000,
+        'output_dir': "query_engine_streamlit_reports",
+    },
+}
+
+
+def build_engine_config(engine: str, engine_settings_cls):
+    """
+    按固定配置与全局配置构建引擎Settings（字段必须用大写，以适配各引擎的Settings类）
+
+    Args:
+        engine: 引擎名（insight/media/query）
+        engine_settings_cls: 引擎的Settings类
+
+    Returns:
+        引擎Settings实例
+    """
+    if engine not in ENGINE_DEFAULTS:
+        raise ValueError(f"未知引擎: {engine}")
+    defaults = ENGINE_DEFAULTS[engine]
+    prefix = f"{engine.upper()}_ENGINE"
+    fields = {
+        f"{prefix}_API_KEY": getattr(settings, f"{prefix}_API_KEY"),
+        f"{prefix}_BASE_URL": getattr(settings, f"{prefix}_BASE_URL"),
+        f"{prefix}_MODEL_NAME": getattr(settings, f"{prefix}_MODEL_NAME") or defaults['model_name'],
+        'MAX_REFLECTIONS': defaults['max_reflections'],
+        defaults['content_length_field']: defaults['max_content_length'],
+        'OUTPUT_DIR': defaults['output_dir'],
+    }
+    if engine == 'insight':
+        fields.update(
+            DB_HOST=settings.DB_HOST,
+            DB_USER=settings.DB_USER,
+            DB_PASSWORD=settings.DB_PASSWORD,
+            DB_NAME=settings.DB_NAME,
+            DB_PORT=settings.DB_PORT,
+            DB_CHARSET=settings.DB_CHARSET,
+            DB_DIALECT=settings.DB_DIALECT,
+        )
+    elif engine == 'media':
+        fields['BOCHA_WEB_SEARCH_API_KEY'] = settings.BOCHA_WEB_SEARCH_API_KEY
+    elif engine == 'query':
+        fields['TAVILY_API_KEY'] = settings.TAVILY_API_KEY
+    return engine_settings_cls(**fields)
@@ -0,0 +1,371 @@
+"""
+无界面引擎工作进程
+在单个长期运行的进程中一次性预加载Insight/Media/Query引擎及其依赖（torch、SQLAlchemy、OpenAI等），
+从任务队列中执行DeepSearchAgent研究任务，并以结构化事件报告进度。
+Streamlit界面不再是必需的，可作为可选的轻量客户端。
+各引擎的日志与进度事件写入logs/{engine}.log（与Streamlit应用的输出相同），ForumEngine照常监控。
+
+启动方式：
+    python SingleEngineApp/engine_worker.py --port 8600 --engines insight media query
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from queue import Queue
+from typing import Dict, Any, List, Optional, Callable
+
+from flask import Flask, request, jsonify, Response, stream_with_context
+from loguru import logger
+
+# 设置UTF-8编码环境
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+os.environ['PYTHONUTF8'] = '1'
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from SingleEngineApp.engine_config import build_engine_config
+
+ENGINE_MODULES = {
+    'insight': 'InsightEngine',
+    'media': 'MediaEngine',
+    'query': 'QueryEngine'
+}
+TERMINAL_EVENTS = ('done', 'error')
+# SSE连接在无新事件时发送心跳的间隔（秒）
+STREAM_KEEPALIVE_SECONDS = 15
+# 进程内保留的已结束任务数量
+MAX_FINISHED_JOBS = 100
+# 引擎日志目录：ForumEngine/monitor.py 监控其中的 insight.log、media.log、query.log
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs')
+
+
+def engine_log_filter(engine: str) -> Callable[[Dict[str, Any]], bool]:
+    """只接收指定引擎的日志：引擎工作线程中的记录，或绑定了该引擎名的记录（如引擎内部线程池中的日志）"""
+    thread_name = f"engine-worker-{engine}"
+
+    def accept(record: Dict[str, Any]) -> bool:
+        return record["extra"].get("engine") == engine or record["thread"].name == thread_name
+
+    return accept
+
+
+def add_engine_log_sinks(engines: List[str], log_dir: str = DEFAULT_LOG_DIR) -> List[int]:
+    """
+    为每个引擎添加写入 logs/{engine}.log 的日志输出，格式与Streamlit应用的控制台输出一致，
+    ForumEngine据此检测SummaryNode输出并驱动论坛讨论
+
+    Args:
+        engines: 引擎列表
+        log_dir: 日志目录
+
+    Returns:
+        loguru的sink id列表
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    return [
+        logger.add(os.path.join(log_dir, f"{engine}.log"), filter=engine_log_filter(engine),
+                   encoding='utf-8', enqueue=True)
+        for engine in engines
+    ]
+
+
+class ResearchJob:
+    """单个引擎的研究任务及其事件序列"""
+
+    def __init__(self, engine: str, query: str, session_id: Optional[str] = None, run_id: Optional[str] = None):
+        self.job_id = f"{engine}_{int(time.time())}_{uuid.uuid4().hex[:6]}"
+        self.engine = engine
+        self.query = query
+        self.session_id = session_id
+        self.run_id = run_id
+        self.status = "pending"  # pending, running, completed, error
+        self.progress = 0
+        self.error_message = ""
+        self.report_file_path = ""
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self._events: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+
+    def publish(self, event: str, progress: Optional[int] = None, **data) -> Dict[str, Any]:
+        """追加一个结构化进度事件"""
+        with self._condition:
+            if progress is not None:
+                self.progress = progress
+            self.updated_at = datetime.now()
+            record = {
+                'id': len(self._events) + 1,
+                'event': event,
+                'job_id': self.job_id,
+                'engine': self.engine,
+                'progress': self.progress,
+                'time': time.time(),
+                'data': data
+            }
+            self._events.append(record)
+            self._condition.notify_all()
+        return record
+
+    def read_events(self, cursor: int = 0, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """读取游标之后的事件，没有新事件时最多等待timeout秒"""
+        with self._condition:
+            if timeout and len(self._events) <= cursor and not self.finished:
+                self._condition.wait(timeout)
+            return self._events[max(cursor, 0):]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'engine': self.engine,
+            'query': self.query,
+            'session_id': self.session_id,
+            'run_id': self.run_id,
+            'status': self.status,
+            'progress': self.progress,
+            'error_message': self.error_message,
+            'report_file_path': self.report_file_path,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+
+class EngineWorkerRuntime:
+    """引擎工作进程运行时
+
+    每个引擎一个任务队列和一个工作线程：不同引擎的研究并行执行，
+    同一引擎的任务按提交顺序依次执行（每个任务使用新的DeepSearchAgent实例）。
+    """
+
+    def __init__(self, engines: Optional[List[str]] = None,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        初始化运行时
+
+        Args:
+            engines: 要加载的引擎列表，默认全部
+            on_event: 每个进度事件的回调（例如写入日志或转发到消息总线）
+        """
+        self.engines = list(engines or ENGINE_MODULES.keys())
+        self.on_event = on_event
+        self.modules: Dict[str, Any] = {}
+        self.jobs: Dict[str, ResearchJob] = {}
+        self._finished: List[str] = []
+        self._queues: Dict[str, Queue] = {engine: Queue() for engine in self.engines}
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """一次性导入各引擎模块（共享的重量级依赖只加载一次）"""
+        for engine in self.engines:
+            if engine in self.modules:
+                continue
+            started = time.monotonic()
+            self.modules[engine] = importlib.import_module(ENGINE_MODULES[engine])
+            logger.info(f"{engine} 引擎已加载，耗时 {time.monotonic() - started:.1f}s")
+
+    def start(self) -> "EngineWorkerRuntime":
+        """加载引擎并启动工作线程"""
+        self.preload()
+        for engine in self.engines:
+            threading.Thread(target=self._worker_loop, args=(engine,), name=f"engine-worker-{engine}",
+                             daemon=True).start()
+        return self
+
+    def submit(self, engine: str, query: str, session_id: Optional[str] = None,
+               run_id: Optional[str] = None) -> ResearchJob:
+        """提交研究任务"""
+        if engine not in self._queues:
+            raise ValueError(f"引擎未加载: {engine}")
+        job = ResearchJob(engine, query, session_id, run_id)
+        with self._lock:
+            self.jobs[job.job_id] = job
+        self._publish(job, 'queued', 0, position=self._queues[engine].qsize())
+        self._queues[engine].put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ResearchJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = [job.job_id for job in self.jobs.values() if job.status == "running"]
+        return {
+            'engines': self.engines,
+            'loaded': list(self.modules.keys()),
+            'queued': {engine: queue.qsize() for engine, queue in self._queues.items()},
+            'running': running
+        }
+
+    def _publish(self, job: ResearchJob, event: str, progress: Optional[int] = None, **data):
+        record = job.publish(event, progress, **data)
+        if self.on_event:
+            try:
+                self.on_event(record)
+            except Exception as e:
+                logger.error(f"处理引擎事件失败: {e}")
+
+    def _worker_loop(self, engine: str):
+        while True:
+            job = self._queues[engine].get()
+            try:
+                self._run_job(job)
+            finally:
+                with self._lock:
+                    self._finished.append(job.job_id)
+                    while len(self._finished) > MAX_FINISHED_JOBS:
+                        self.jobs.pop(self._finished.pop(0), None)
+
+    def _run_job(self, job: ResearchJob):
+        """分步执行研究（与Streamlit应用相同的步骤），每一步发布进度事件"""
+        with logger.contextualize(engine=job.engine):
+            self._run_job_steps(job)
+
+    def _run_job_steps(self, job: ResearchJob):
+        module = self.modules[job.engine]
+        job.status = "running"
+        self._publish(job, 'started', 5)
+        try:
+            agent = module.DeepSearchAgent(build_engine_config(job.engine, module.Settings))
+            agent.session_id = job.session_id
+            self._publish(job, 'agent_ready', 10)
+
+            agent._generate_report_structure(job.query)
+            paragraphs = [paragraph.title for paragraph in agent.state.paragraphs]
+            self._publish(job, 'structure', 20, paragraphs=paragraphs)
+
+            total = len(paragraphs)
+            for i in range(total):
+                self._publish(job, 'paragraph', int(20 + i / total * 60), index=i, total=total,
+                              title=paragraphs[i], stage='search')
+                agent._initial_search_and_summary(i)
+                self._publish(job, 'paragraph', int(20 + (i + 0.5) / total * 60), index=i, total=total,
+                              title=paragraphs[i], stage='reflection')
+                agent._reflection_loop(i)
+                agent.state.paragraphs[i].research.mark_completed()
+                self._publish(job, 'paragraph', int(20 + (i + 1) / total * 60), index=i, total=total,
+                              title=paragraphs[i], stage='completed')
+
+            self._publish(job, 'final_report', 85)
+            final_report = agent._generate_final_report()
+
+            job.report_file_path = agent._save_report(final_report)
+
+            job.status = "completed"
+            self._publish(job, 'done', 100, report_file_path=job.report_file_path,
+                          report_length=len(final_report))
+            logger.info(f"{job.engine} 研究任务完成: {job.job_id}")
+
+        except Exception as e:
+            logger.exception(f"{job.engine} 研究任务失败: {e}")
+            job.status = "error"
+            job.error_message = str(e)
+            self._publish(job, 'error', error=str(e))
+
+
+def create_worker_app(runtime: EngineWorkerRuntime) -> Flask:
+    """创建工作进程的HTTP接口"""
+    app = Flask(__name__)
+
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        return jsonify({'success': True, **runtime.stats()})
+
+    @app.route('/api/search', methods=['POST'])
+    def search():
+        """向指定引擎（默认全部已加载引擎）提交研究任务"""
+        data = request.get_json() or {}
+        query = (data.get('query') or '').strip()
+        if not query:
+            return jsonify({'success': False, 'message': '搜索查询不能为空'}), 400
+
+        engines = data.get('engines') or runtime.engines
+        unknown = [engine for engine in engines if engine not in runtime.engines]
+        if unknown:
+            return jsonify({'success': False, 'message': f'引擎未加载: {unknown}'}), 400
+
+        jobs = {
+            engine: runtime.submit(engine, query, data.get('session_id'), data.get('run_id')).to_dict()
+            for engine in engines
+        }
+        return jsonify({'success': True, 'query': query, 'jobs': jobs})
+
+    @app.route('/api/jobs/<job_id>', methods=['GET'])
+    def get_job(job_id: str):
+        job = runtime.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': '任务不存在'}), 404
+        return jsonify({'success': True, 'job': job.to_dict()})
+
+    @app.route('/api/jobs/<job_id>/events', methods=['GET'])
+    def stream_job(job_id: str):
+        """以SSE形式推送任务进度事件，支持Last-Event-ID或cursor续传"""
+        job = runtime.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': '任务不存在'}), 404
+
+        cursor = request.headers.get('Last-Event-ID', type=int)
+        if cursor is None:
+            cursor = request.args.get('cursor', 0, type=int)
+
+        def generate():
+            position = cursor
+            while True:
+                events = job.read_events(position, timeout=STREAM_KEEPALIVE_SECONDS)
+                if not events:
+                    if job.finished:
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                for event in events:
+                    position = event['id']
+                    payload = json.dumps(event, ensure_ascii=False)
+                    yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+                    if event['event'] in TERMINAL_EVENTS:
+                        return
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面引擎工作进程")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINE_MODULES.keys()),
+                        default=list(ENGINE_MODULES.keys()))
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR,
+                        help="引擎日志目录，需与主应用的logs目录一致，ForumEngine从中读取各引擎日志")
+    args = parser.parse_args()
+
+    add_engine_log_sinks(args.engines, args.log_dir)
+
+    def log_event(record: Dict[str, Any]):
+        # 结构化事件写入对应引擎的日志（logs/{engine}.log）
+        logger.bind(engine=record['engine']).info(
+            f"engine_event {json.dumps(record, ensure_ascii=False)}")
+
+    runtime = EngineWorkerRuntime(args.engines, on_event=log_event).start()
+    app = create_worker_app(runtime)
+    logger.info(f"引擎工作进程已启动: http://{args.host}:{args.port}，引擎: {runtime.engines}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
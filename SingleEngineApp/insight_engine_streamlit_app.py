@@ -29,6 +29,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from InsightEngine import DeepSearchAgent, Settings
 from config import settings
+from SingleEngineApp.engine_config import build_engine_config
 from utils.github_issues import error_with_issue_link
 
 
@@ -50,18 +51,13 @@ def main():
         query_params = st.query_params
         auto_query = query_params.get('query', '')
         auto_search = query_params.get('auto_search', 'false').lower() == 'true'
+        session_id = query_params.get('session_id', '') or None
     except AttributeError:
         # 兼容旧版本
         query_params = st.experimental_get_query_params()
         auto_query = query_params.get('query', [''])[0]
         auto_search = query_params.get('auto_search', ['false'])[0].lower() == 'true'
-
-    # ----- 配置被硬编码 -----
-    # 强制使用 Kimi
-    model_name = settings.INSIGHT_ENGINE_MODEL_NAME or "kimi-k2-0711-preview"
-    # 默认高级配置
-    max_reflections = 2
-    max_content_length = 500000  # Kimi支持长文本
+        session_id = query_params.get('session_id', [''])[0] or None
 
     # 简化的研究查询展示区域
 
@@ -101,36 +97,14 @@ def main():
             logger.error("请在您的环境变量中设置INSIGHT_ENGINE_API_KEY")
             return
 
-        # 自动使用配置文件中的API密钥和数据库配置
-        db_host = settings.DB_HOST
-        db_user = settings.DB_USER
-        db_password = settings.DB_PASSWORD
-        db_name = settings.DB_NAME
-        db_port = settings.DB_PORT
-        db_charset = settings.DB_CHARSET
-
-        # 创建Settings配置（字段必须用大写，以适配Settings类）
-        config = Settings(
-            INSIGHT_ENGINE_API_KEY=settings.INSIGHT_ENGINE_API_KEY,
-            INSIGHT_ENGINE_BASE_URL=settings.INSIGHT_ENGINE_BASE_URL,
-            INSIGHT_ENGINE_MODEL_NAME=model_name,
-            DB_HOST=db_host,
-            DB_USER=db_user,
-            DB_PASSWORD=db_password,
-            DB_NAME=db_name,
-            DB_PORT=db_port,
-            DB_CHARSET=db_charset,
-            DB_DIALECT=settings.DB_DIALECT,
-            MAX_REFLECTIONS=max_reflections,
-            MAX_CONTENT_LENGTH=max_content_length,
-            OUTPUT_DIR="insight_engine_streamlit_reports"
-        )
+        # 固定配置（模型、反思次数、内容长度）与无界面引擎工作进程共用
+        config = build_engine_config('insight', Settings)
 
         # 执行研究
-        execute_research(query, config)
+        execute_research(query, config, session_id)
 
 
-def execute_research(query: str, config: Settings):
+def execute_research(query: str, config: Settings, session_id: str = None):
     """执行研究"""
     try:
         # 创建进度条
@@ -140,6 +114,7 @@ def execute_research(query: str, config: Settings):
         # 初始化Agent
         status_text.text("正在初始化Agent...")
         agent = DeepSearchAgent(config)
+        agent.session_id = session_id
         st.session_state.agent = agent
 
         progress_bar.progress(10)
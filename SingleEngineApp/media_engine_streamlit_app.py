@@ -29,6 +29,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from MediaEngine import DeepSearchAgent, Settings
 from config import settings
+from SingleEngineApp.engine_config import build_engine_config
 from utils.github_issues import error_with_issue_link
 
 
@@ -51,18 +52,13 @@ def main():
         query_params = st.query_params
         auto_query = query_params.get('query', '')
         auto_search = query_params.get('auto_search', 'false').lower() == 'true'
+        session_id = query_params.get('session_id', '') or None
     except AttributeError:
         # 兼容旧版本
         query_params = st.experimental_get_query_params()
         auto_query = query_params.get('query', [''])[0]
         auto_search = query_params.get('auto_search', ['false'])[0].lower() == 'true'
-
-    # ----- 配置被硬编码 -----
-    # 强制使用 Gemini
-    model_name = settings.MEDIA_ENGINE_MODEL_NAME or "gemini-2.5-pro"
-    # 默认高级配置
-    max_reflections = 2
-    max_content_length = 20000
+        session_id = query_params.get('session_id', [''])[0] or None
 
     # 简化的研究查询展示区域
 
@@ -106,26 +102,14 @@ def main():
             logger.error("请在您的环境变量中设置BOCHA_WEB_SEARCH_API_KEY")
             return
 
-        # 自动使用配置文件中的API密钥
-        engine_key = settings.MEDIA_ENGINE_API_KEY
-        bocha_key = settings.BOCHA_WEB_SEARCH_API_KEY
-
-        # 构建 Settings（pydantic_settings风格，优先大写环境变量）
-        config = Settings(
-            MEDIA_ENGINE_API_KEY=engine_key,
-            MEDIA_ENGINE_BASE_URL=settings.MEDIA_ENGINE_BASE_URL,
-            MEDIA_ENGINE_MODEL_NAME=model_name,
-            BOCHA_WEB_SEARCH_API_KEY=bocha_key,
-            MAX_REFLECTIONS=max_reflections,
-            SEARCH_CONTENT_MAX_LENGTH=max_content_length,
-            OUTPUT_DIR="media_engine_streamlit_reports",
-        )
+        # 固定配置（模型、反思次数、内容长度）与无界面引擎工作进程共用
+        config = build_engine_config('media', Settings)
 
         # 执行研究
-        execute_research(query, config)
+        execute_research(query, config, session_id)
 
 
-def execute_research(query: str, config: Settings):
+def execute_research(query: str, config: Settings, session_id: str = None):
     """执行研究"""
     try:
         # 创建进度条
@@ -135,6 +119,7 @@ def execute_research(query: str, config: Settings):
         # 初始化Agent
         status_text.text("正在初始化Agent...")
         agent = DeepSearchAgent(config)
+        agent.session_id = session_id
         st.session_state.agent = agent
 
         progress_bar.progress(10)
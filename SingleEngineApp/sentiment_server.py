@@ -0,0 +1,52 @@
+"""
+共享情感分析推理服务进程
+加载一次WeiboMultilingualSentiment模型，为同一主机上的所有引擎进程与Celery worker提供推理，
+并发请求在最长等待窗口内合并为微批次。各进程配置SENTIMENT_SERVICE_URL后自动改用此服务。
+
+启动方式：
+    python SingleEngineApp/sentiment_server.py --port 8700
+"""
+
+import argparse
+import os
+import sys
+
+from loguru import logger
+
+# 设置UTF-8编码环境
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+os.environ['PYTHONUTF8'] = '1'
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config import settings
+from utils.sentiment_service import MicroBatcher, create_sentiment_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="共享情感分析推理服务")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--max-batch-size', type=int, default=settings.SENTIMENT_SERVICE_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=int, default=settings.SENTIMENT_SERVICE_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    from InsightEngine.tools.sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+
+    # 服务进程自身必须在本地加载模型
+    analyzer = WeiboMultilingualSentimentAnalyzer(service_url="")
+    if not analyzer.initialize():
+        logger.error(f"情感模型加载失败: {analyzer.disable_reason}")
+        sys.exit(1)
+
+    batcher = MicroBatcher(analyzer.predict_texts, max_batch_size=args.max_batch_size,
+                           max_wait=args.max_wait_ms / 1000).start()
+    app = create_sentiment_app(analyzer, batcher)
+    logger.info(f"情感分析服务已启动: http://{args.host}:{args.port}，"
+                f"微批次上限 {args.max_batch_size}，等待窗口 {args.max_wait_ms}ms")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,21 +2,31 @@
 Flask主应用 - 统一管理三个Streamlit应用
 """
 
+import math
 import os
 import sys
 import subprocess
 import time
 import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from queue import Queue
 from flask import Flask, render_template, request, jsonify, Response
 from flask_socketio import SocketIO, emit
 import atexit
 import requests
+from requests.adapters import HTTPAdapter
 from loguru import logger
 import importlib
 from pathlib import Path
+# 以模块引用配置：reload_settings()会替换config.settings，这里总是读取最新实例
+import config
 from MindSpider.main import MindSpider
+from utils.forum_index import AGENT_SOURCES
+from utils.forum_reader import get_forum_history
+from utils.health_supervisor import HealthSupervisor
+from utils.log_pipeline import ProcessLogPipeline, format_log_line
 
 # 导入ReportEngine
 try:
@@ -399,6 +409,7 @@ def monitor_forum_log():
                     new_lines = f.readlines()
                     
                     if new_lines:
+                        console_lines = []
                         for line in new_lines:
                             line = line.rstrip('\n\r')
                             if line.strip():
@@ -416,12 +427,15 @@ def monitor_forum_log():
                                     socketio.emit('forum_message', parsed_message)
                                 
                                 # 只有在控制台显示forum时才发送控制台消息
-                                timestamp = datetime.now().strftime('%H:%M:%S')
-                                formatted_line = f"[{timestamp}] {line}"
-                                socketio.emit('console_output', {
-                                    'app': 'forum',
-                                    'line': formatted_line
-                                })
+                                console_lines.append(format_log_line(line))
+                        
+                        # 本轮新增的行合并为一个事件推送
+                        if console_lines:
+                            socketio.emit('console_output_batch', {
+                                'app': 'forum',
+                                'lines': console_lines,
+                                'dropped': 0
+                            })
                         
                         last_position = f.tell()
                         
@@ -489,75 +503,9 @@ def read_log_from_file(app_name, tail_lines=None):
         return []
 
 def read_process_output(process, app_name):
-    """读取进程输出并写入文件"""
-    import select
-    import sys
-    
-    while True:
-        try:
-            if process.poll() is not None:
-                # 进程结束，读取剩余输出
-                remaining_output = process.stdout.read()
-                if remaining_output:
-                    lines = remaining_output.decode('utf-8', errors='replace').split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line:
-                            timestamp = datetime.now().strftime('%H:%M:%S')
-                            formatted_line = f"[{timestamp}] {line}"
-                            write_log_to_file(app_name, formatted_line)
-                            socketio.emit('console_output', {
-                                'app': app_name,
-                                'line': formatted_line
-                            })
-                break
-            
-            # 使用非阻塞读取
-            if sys.platform == 'win32':
-                # Windows下使用不同的方法
-                output = process.stdout.readline()
-                if output:
-                    line = output.decode('utf-8', errors='replace').strip()
-                    if line:
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        formatted_line = f"[{timestamp}] {line}"
-                        
-                        # 写入日志文件
-                        write_log_to_file(app_name, formatted_line)
-                        
-                        # 发送到前端
-                        socketio.emit('console_output', {
-                            'app': app_name,
-                            'line': formatted_line
-                        })
-                else:
-                    # 没有输出时短暂休眠
-                    time.sleep(0.1)
-            else:
-                # Unix系统使用select
-                ready, _, _ = select.select([process.stdout], [], [], 0.1)
-                if ready:
-                    output = process.stdout.readline()
-                    if output:
-                        line = output.decode('utf-8', errors='replace').strip()
-                        if line:
-                            timestamp = datetime.now().strftime('%H:%M:%S')
-                            formatted_line = f"[{timestamp}] {line}"
-                            
-                            # 写入日志文件
-                            write_log_to_file(app_name, formatted_line)
-                            
-                            # 发送到前端
-                            socketio.emit('console_output', {
-                                'app': app_name,
-                                'line': formatted_line
-                            })
-                            
-        except Exception as e:
-            error_msg = f"Error reading output for {app_name}: {e}"
-            logger.exception(error_msg)
-            write_log_to_file(app_name, f"[{datetime.now().strftime('%H:%M:%S')}] {error_msg}")
-            break
+    """读取进程输出，经日志管道批量写入文件并批量推送到前端（进程结束后返回）"""
+    pipeline = ProcessLogPipeline(app_name, LOG_DIR / f"{app_name}.log", socketio.emit).start()
+    pipeline.pump(process.stdout)
 
 def start_streamlit_app(app_name, script_path, port):
     """启动Streamlit应用"""
@@ -615,6 +563,7 @@ def start_streamlit_app(app_name, script_path, port):
         
         processes[app_name]['process'] = process
         processes[app_name]['status'] = 'starting'
+        health_supervisor.wake()
         processes[app_name]['output'] = []
         
         # 启动输出读取线程
@@ -650,6 +599,7 @@ def stop_streamlit_app(app_name):
         
         processes[app_name]['process'] = None
         processes[app_name]['status'] = 'stopped'
+        health_supervisor.wake()
         
         return True, f"{app_name} 应用已停止"
         
@@ -664,57 +614,22 @@ def _build_healthcheck_url(port):
     return f"http://127.0.0.1:{port}{HEALTHCHECK_PATH}"
 
 
-def check_app_status():
-    """检查应用状态"""
-    for app_name, info in processes.items():
-        if info['process'] is not None:
-            if info['process'].poll() is None:
-                # 进程仍在运行，检查端口是否可访问
-                try:
-                    response = requests.get(
-                        _build_healthcheck_url(info['port']),
-                        timeout=2,
-                        proxies=HEALTHCHECK_PROXIES
-                    )
-                    if response.status_code == 200:
-                        info['status'] = 'running'
-                    else:
-                        info['status'] = 'starting'
-                except Exception as exc:
-                    logger.warning(f"{app_name} 健康检查失败: {exc}")
-                    info['status'] = 'starting'
-            else:
-                # 进程已结束
-                info['process'] = None
-                info['status'] = 'stopped'
+def _emit_status_update(snapshot):
+    socketio.emit('status_update', snapshot)
 
-def wait_for_app_startup(app_name, max_wait_time=90):
-    """等待应用启动完成"""
-    import time
-    start_time = time.time()
-    while time.time() - start_time < max_wait_time:
-        info = processes[app_name]
-        if info['process'] is None:
-            return False, "进程已停止"
-        
-        if info['process'].poll() is not None:
-            return False, "进程启动失败"
-        
-        try:
-            response = requests.get(
-                _build_healthcheck_url(info['port']),
-                timeout=2,
-                proxies=HEALTHCHECK_PROXIES
-            )
-            if response.status_code == 200:
-                info['status'] = 'running'
-                return True, "启动成功"
-        except Exception as exc:
-            logger.warning(f"{app_name} 健康检查失败: {exc}")
 
-        time.sleep(1)
+# 后台健康监督器：并发探测各应用并缓存状态，状态变化时推送status_update（探测线程在服务启动时开启）
+health_supervisor = HealthSupervisor(
+    processes,
+    _build_healthcheck_url,
+    on_change=_emit_status_update,
+    proxies=HEALTHCHECK_PROXIES
+)
+
 
-    return False, "启动超时"
+def wait_for_app_startup(app_name, max_wait_time=90):
+    """等待应用启动完成（由健康监督器在探测后唤醒）"""
+    return health_supervisor.wait_until_running(app_name, max_wait_time)
 
 def cleanup_processes():
     """清理所有进程"""
@@ -738,16 +653,11 @@ def index():
 
 @app.route('/api/status')
 def get_status():
-    """获取所有应用状态"""
-    check_app_status()
-    return jsonify({
-        app_name: {
-            'status': info['status'],
-            'port': info['port'],
-            'output_lines': len(info['output'])
-        }
-        for app_name, info in processes.items()
-    })
+    """获取所有应用状态（读取健康监督器缓存）"""
+    snapshot = health_supervisor.snapshot()
+    for app_name, entry in snapshot.items():
+        entry['output_lines'] = len(processes[app_name]['output'])
+    return jsonify(snapshot)
 
 @app.route('/api/start/<app_name>')
 def start_app(app_name):
@@ -872,8 +782,35 @@ def stop_forum_monitoring_api():
 
 @app.route('/api/forum/log')
 def get_forum_log():
-    """获取ForumEngine的forum.log内容"""
+    """获取ForumEngine的forum.log内容
+
+    传入limit参数时基于增量索引分页返回（可选offset、session），无需读取整个日志文件。
+    """
     try:
+        if request.args.get('limit') is not None:
+            offset = request.args.get('offset', 0, type=int)
+            limit = request.args.get('limit', 50, type=int)
+            session = request.args.get('session', None, type=int)
+            history = get_forum_history(str(LOG_DIR), offset=offset, limit=limit, session=session)
+            parsed_messages = [
+                {
+                    'type': 'agent',
+                    'sender': f"{item['source']} Engine",
+                    'content': item['content'],
+                    'timestamp': item['timestamp'],
+                    'source': item['source']
+                }
+                for item in history['items'] if item['source'] in AGENT_SOURCES and item['content']
+            ]
+            return jsonify({
+                'success': True,
+                'items': history['items'],
+                'parsed_messages': parsed_messages,
+                'offset': offset,
+                'limit': limit,
+                'total': history['total']
+            })
+
         forum_log_file = LOG_DIR / "forum.log"
         if not forum_log_file.exists():
             return jsonify({
@@ -903,44 +840,164 @@ def get_forum_log():
     except Exception as e:
         return jsonify({'success': False, 'message': f'读取forum.log失败: {str(e)}'})
 
+# 各引擎的搜索API端口
+SEARCH_API_PORTS = {'insight': 8601, 'media': 8602, 'query': 8603}
+# 单个引擎的搜索派发期限（秒）
+SEARCH_DISPATCH_TIMEOUT = 10
+SEARCH_CONNECT_TIMEOUT = 3
+
+# 复用连接的搜索派发会话与线程池
+search_session = requests.Session()
+search_session.trust_env = False
+search_session.mount('http://', HTTPAdapter(pool_connections=len(SEARCH_API_PORTS),
+                                            pool_maxsize=len(SEARCH_API_PORTS) * 2))
+search_executor = ThreadPoolExecutor(max_workers=len(SEARCH_API_PORTS) * 2, thread_name_prefix='search-dispatch')
+
+
+def parse_search_timeout(value):
+    """
+    解析请求中的派发期限，上限为SEARCH_DISPATCH_TIMEOUT
+
+    Returns:
+        期限秒数；不是有限正数时返回None
+    """
+    if value is None:
+        return SEARCH_DISPATCH_TIMEOUT
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(timeout) or timeout <= 0:
+        return None
+    return min(timeout, SEARCH_DISPATCH_TIMEOUT)
+
+
+def _dispatch_search_to_app(app_name, payload, timeout):
+    """向单个引擎发送搜索请求，返回带耗时的结果"""
+    started = time.monotonic()
+    try:
+        # 调用Streamlit应用的API端点
+        response = search_session.post(
+            f"http://localhost:{SEARCH_API_PORTS[app_name]}/api/search",
+            json=payload,
+            timeout=(min(SEARCH_CONNECT_TIMEOUT, timeout), timeout)
+        )
+        if response.status_code == 200:
+            result = response.json()
+        else:
+            result = {'success': False, 'message': 'API调用失败'}
+    except Exception as e:
+        result = {'success': False, 'message': str(e)}
+    result['elapsed_ms'] = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+
+def dispatch_search(app_names, payload, timeout=SEARCH_DISPATCH_TIMEOUT):
+    """并发向多个引擎发送搜索请求，超过期限未返回的引擎标记为超时（部分结果）"""
+    futures = {
+        search_executor.submit(_dispatch_search_to_app, app_name, payload, timeout): app_name
+        for app_name in app_names
+    }
+    done, _ = wait(futures, timeout=timeout + 1)
+    results = {}
+    for future, app_name in futures.items():
+        if future in done:
+            results[app_name] = future.result()
+        else:
+            results[app_name] = {'success': False, 'message': '请求超时', 'timed_out': True}
+    return results
+
+
+def dispatch_search_async(run_id, app_names, payload, timeout=SEARCH_DISPATCH_TIMEOUT):
+    """异步派发搜索请求，每个引擎的受理结果通过search_dispatch事件推送"""
+    remaining = {'count': len(app_names)}
+    lock = threading.Lock()
+
+    def on_done(future, app_name):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'success': False, 'message': str(e)}
+        socketio.emit('search_dispatch', {'run_id': run_id, 'app': app_name, 'result': result})
+        with lock:
+            remaining['count'] -= 1
+            finished = remaining['count'] == 0
+        if finished:
+            socketio.emit('search_dispatch_complete', {'run_id': run_id})
+
+    for app_name in app_names:
+        future = search_executor.submit(_dispatch_search_to_app, app_name, payload, timeout)
+        future.add_done_callback(lambda f, name=app_name: on_done(f, name))
+
+
+def submit_to_engine_worker(worker_url, query, data):
+    """向无界面引擎工作进程提交研究任务，返回各引擎的任务信息"""
+    payload = {'query': query, 'run_id': uuid.uuid4().hex[:12]}
+    for key in ('session_id', 'engines'):
+        if data.get(key):
+            payload[key] = data[key]
+    try:
+        response = search_session.post(
+            f"{worker_url.rstrip('/')}/api/search",
+            json=payload,
+            timeout=(SEARCH_CONNECT_TIMEOUT, SEARCH_DISPATCH_TIMEOUT)
+        )
+        result = response.json()
+    except Exception as e:
+        return {'success': False, 'message': f'引擎工作进程不可用: {e}'}
+    result.update({'run_id': payload['run_id'], 'worker': worker_url})
+    return result
+
+
 @app.route('/api/search', methods=['POST'])
 def search():
-    """统一搜索接口"""
-    data = request.get_json()
+    """统一搜索接口
+
+    并发向运行中的引擎派发搜索请求。请求体中async为true时立即返回run_id，
+    各引擎的受理结果随后通过Socket.IO的search_dispatch事件推送。
+    """
+    data = request.get_json() or {}
     query = data.get('query', '').strip()
     
     if not query:
         return jsonify({'success': False, 'message': '搜索查询不能为空'})
+    timeout = parse_search_timeout(data.get('timeout'))
+    if timeout is None:
+        return jsonify({'success': False, 'message': 'timeout必须是大于0的秒数'}), 400
+    
+    # 配置了无界面引擎工作进程时，直接把研究任务提交给它（工作进程写入logs/{engine}.log，ForumEngine照常监控）
+    engine_worker_url = config.settings.ENGINE_WORKER_URL
+    if engine_worker_url:
+        return jsonify(submit_to_engine_worker(engine_worker_url, query, data))
     
     # ForumEngine论坛已经在后台运行，会自动检测搜索活动
     # logger.info("ForumEngine: 搜索请求已收到，论坛将自动检测日志变化")
     
-    # 检查哪些应用正在运行
-    check_app_status()
-    running_apps = [name for name, info in processes.items() if info['status'] == 'running']
+    # 检查哪些应用正在运行（读取健康监督器缓存）
+    running_apps = [
+        name for name, info in processes.items()
+        if info['status'] == 'running' and name in SEARCH_API_PORTS
+    ]
     
     if not running_apps:
         return jsonify({'success': False, 'message': '没有运行中的应用'})
     
-    # 向运行中的应用发送搜索请求
-    results = {}
-    api_ports = {'insight': 8601, 'media': 8602, 'query': 8603}
-    
-    for app_name in running_apps:
-        try:
-            api_port = api_ports[app_name]
-            # 调用Streamlit应用的API端点
-            response = requests.post(
-                f"http://localhost:{api_port}/api/search",
-                json={'query': query},
-                timeout=10
-            )
-            if response.status_code == 200:
-                results[app_name] = response.json()
-            else:
-                results[app_name] = {'success': False, 'message': 'API调用失败'}
-        except Exception as e:
-            results[app_name] = {'success': False, 'message': str(e)}
+    run_id = uuid.uuid4().hex[:12]
+    payload = {'query': query, 'run_id': run_id}
+    if data.get('session_id'):
+        payload['session_id'] = data['session_id']
+
+    if data.get('async'):
+        dispatch_search_async(run_id, running_apps, payload, timeout)
+        return jsonify({
+            'success': True,
+            'query': query,
+            'run_id': run_id,
+            'apps': running_apps
+        }), 202
+
+    # 向运行中的应用并发发送搜索请求
+    results = dispatch_search(running_apps, payload, timeout)
     
     # 搜索完成后可以选择停止监控，或者让它继续运行以捕获后续的处理日志
     # 这里我们让监控继续运行，用户可以通过其他接口手动停止
@@ -948,7 +1005,9 @@ def search():
     return jsonify({
         'success': True,
         'query': query,
-        'results': results
+        'run_id': run_id,
+        'results': results,
+        'partial': any(result.get('timed_out') for result in results.values())
     })
 
 
@@ -1033,14 +1092,7 @@ def handle_connect():
 @socketio.on('request_status')
 def handle_status_request():
     """请求状态更新"""
-    check_app_status()
-    emit('status_update', {
-        app_name: {
-            'status': info['status'],
-            'port': info['port']
-        }
-        for app_name, info in processes.items()
-    })
+    emit('status_update', health_supervisor.snapshot())
 
 if __name__ == '__main__':
     # 从配置文件读取 HOST 和 PORT
@@ -1048,6 +1100,7 @@ if __name__ == '__main__':
     HOST = settings.HOST
     PORT = settings.PORT
     
+    health_supervisor.start()
     logger.info("等待配置确认，系统将在前端指令后启动组件...")
     logger.info(f"Flask服务器已启动，访问地址: http://{HOST}:{PORT}")
     
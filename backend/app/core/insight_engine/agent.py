@@ -113,6 +113,8 @@ class DeepSearchAgent:
                 - "search_topic_by_date": 按日期搜索话题
                 - "get_comments_for_topic": 获取话题评论
                 - "search_topic_on_platform": 平台定向搜索
+                - "get_sentiment_trend": 话题趋势聚合（读取预聚合结果）
+                - "search_by_crawl_keyword": 爬取关键词精确查询
                 - "analyze_sentiment": 对查询结果进行情感分析
             query: 搜索关键词/话题
             **kwargs: 额外参数（如start_date, end_date, platform, limit, enable_sentiment等）
@@ -158,6 +160,37 @@ class DeepSearchAgent:
                 metadata=sentiment_result
             )
         
+        # 趋势聚合直接读取预聚合表，按来源关键词匹配，不做关键词优化和实时情感分析
+        if tool_name == "get_sentiment_trend":
+            return self.search_agency.get_sentiment_trend(
+                topic=query,
+                start_date=kwargs.get("start_date"),
+                end_date=kwargs.get("end_date"),
+                platform=kwargs.get("platform"),
+                granularity=kwargs.get("granularity", "day")
+            )
+
+        # 爬取关键词精确查询走keyword_id索引，关键词需与爬取时一致，不做关键词优化；关键词未被爬取过时改用全局搜索
+        if tool_name == "search_by_crawl_keyword":
+            response = self.search_agency.search_by_crawl_keyword(
+                keyword=query,
+                start_date=kwargs.get("start_date"),
+                end_date=kwargs.get("end_date"),
+                platform=kwargs.get("platform"),
+                limit_per_table=self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE
+            )
+            if response.error_message is None:
+                enable_sentiment = kwargs.get("enable_sentiment", True)
+                if enable_sentiment and response.results:
+                    logger.info(f"  🎭 开始对搜索结果进行情感分析...")
+                    sentiment_analysis = self._perform_sentiment_analysis(response.results)
+                    if sentiment_analysis:
+                        response.parameters["sentiment_analysis"] = sentiment_analysis
+                        logger.info(f"  ✅ 情感分析完成")
+                return response
+            logger.info(f"  {response.error_message}，改用全局搜索")
+            tool_name = "search_topic_globally"
+
         # 对于需要搜索词的工具，使用关键词优化中间件
         optimized_response = keyword_optimizer.optimize_keywords(
             original_query=query,
@@ -274,8 +307,13 @@ class DeepSearchAgent:
             情感分析结果字典，如果失败则返回None
         """
         try:
+            # 全部结果都已有离线打分时无需加载模型
+            needs_model = any(not getattr(result, "sentiment_label", None) for result in results)
+
             # 初始化情感分析器（如果尚未初始化且未被禁用）
-            if not self.sentiment_analyzer.is_initialized and not self.sentiment_analyzer.is_disabled:
+            if not needs_model:
+                logger.info("    使用离线情感打分结果")
+            elif not self.sentiment_analyzer.is_initialized and not self.sentiment_analyzer.is_disabled:
                 logger.info("    初始化情感分析模型...")
                 if not self.sentiment_analyzer.initialize():
                     logger.info("     情感分析模型初始化失败，将直接透传原始文本")
@@ -290,7 +328,9 @@ class DeepSearchAgent:
                     "platform": result.platform,
                     "author": result.author_nickname,
                     "url": result.url,
-                    "publish_time": str(result.publish_time) if result.publish_time else None
+                    "publish_time": str(result.publish_time) if result.publish_time else None,
+                    "sentiment_label": getattr(result, "sentiment_label", None),
+                    "sentiment_confidence": getattr(result, "sentiment_confidence", None)
                 }
                 results_dict.append(result_dict)
             
@@ -469,7 +509,7 @@ class DeepSearchAgent:
         search_kwargs = {}
         
         # 处理需要日期的工具
-        if search_tool in ["search_topic_by_date", "search_topic_on_platform"]:
+        if search_tool in ["search_topic_by_date", "search_topic_on_platform", "get_sentiment_trend", "search_by_crawl_keyword"]:
             start_date = search_output.get("start_date")
             end_date = search_output.get("end_date")
             
@@ -496,6 +536,8 @@ class DeepSearchAgent:
             else:
                 logger.warning(f"    search_topic_on_platform工具缺少平台参数，改用全局搜索")
                 search_tool = "search_topic_globally"
+        elif search_tool in ["get_sentiment_trend", "search_by_crawl_keyword"] and search_output.get("platform"):
+            search_kwargs["platform"] = search_output["platform"]
         
         # 处理限制参数，使用配置文件中的默认值而不是agent提供的参数
         if search_tool == "search_hot_content":
@@ -599,7 +641,7 @@ class DeepSearchAgent:
             search_kwargs = {}
             
             # 处理需要日期的工具
-            if search_tool in ["search_topic_by_date", "search_topic_on_platform"]:
+            if search_tool in ["search_topic_by_date", "search_topic_on_platform", "get_sentiment_trend", "search_by_crawl_keyword"]:
                 start_date = reflection_output.get("start_date")
                 end_date = reflection_output.get("end_date")
                 
@@ -626,6 +668,8 @@ class DeepSearchAgent:
                 else:
                     logger.warning(f"      search_topic_on_platform工具缺少平台参数，改用全局搜索")
                     search_tool = "search_topic_globally"
+            elif search_tool in ["get_sentiment_trend", "search_by_crawl_keyword"] and reflection_output.get("platform"):
+                search_kwargs["platform"] = reflection_output["platform"]
             
             # 处理限制参数
             if search_tool == "search_hot_content":
@@ -3,21 +3,12 @@ Unified OpenAI-compatible LLM client for the Insight Engine, with retry support.
 """
 
 import os
-import sys
 from datetime import datetime
 from typing import Any, Dict, Optional, Iterator, Generator
 from loguru import logger
 
-from openai import OpenAI
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(os.path.dirname(current_dir))
-utils_dir = os.path.join(project_root, "utils")
-if utils_dir not in sys.path:
-    sys.path.append(utils_dir)
-
 try:
-    from retry_helper import with_retry, LLM_RETRY_CONFIG
+    from utils.retry_helper import with_retry, LLM_RETRY_CONFIG
 except ImportError:
     def with_retry(config=None):
         def decorator(func):
@@ -52,6 +43,9 @@ class LLMClient:
         }
         if base_url:
             client_kwargs["base_url"] = base_url
+        # openai SDK导入较慢，推迟到首次创建客户端时
+        from openai import OpenAI
+
         self.client = OpenAI(**client_kwargs)
 
     @with_retry(LLM_RETRY_CONFIG)
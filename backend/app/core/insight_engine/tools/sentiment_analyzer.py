@@ -3,33 +3,58 @@
 基于WeiboMultilingualSentiment模型为InsightEngine提供情感分析功能
 """
 
+import importlib.util
 import os
-import sys
 from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import re
 
-try:
-    import torch
+from config import settings
+from utils.sentiment_service import SentimentServiceClient
 
-    TORCH_AVAILABLE = True
-    torch.classes.__path__ = []
-except ImportError:
-    torch = None  # type: ignore
-    TORCH_AVAILABLE = False
+# 仅探测依赖是否安装，torch/transformers的实际导入推迟到initialize()，
+# 避免导入InsightEngine时就加载数秒的深度学习框架
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
 
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+torch = None  # type: ignore
+AutoTokenizer = None  # type: ignore
+AutoModelForSequenceClassification = None  # type: ignore
 
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    AutoTokenizer = None  # type: ignore
-    AutoModelForSequenceClassification = None  # type: ignore
-    TRANSFORMERS_AVAILABLE = False
+
+def _load_backends() -> bool:
+    """
+    首次使用时导入torch与transformers
+
+    Returns:
+        是否导入成功
+    """
+    global torch, AutoTokenizer, AutoModelForSequenceClassification, TORCH_AVAILABLE, TRANSFORMERS_AVAILABLE
+    if torch is not None and AutoTokenizer is not None:
+        return True
+    try:
+        import torch as _torch
+
+        _torch.classes.__path__ = []
+        torch = _torch
+    except ImportError:
+        TORCH_AVAILABLE = False
+        return False
+    try:
+        from transformers import AutoTokenizer as _AutoTokenizer, AutoModelForSequenceClassification as _AutoModel
+
+        AutoTokenizer = _AutoTokenizer
+        AutoModelForSequenceClassification = _AutoModel
+    except ImportError:
+        TRANSFORMERS_AVAILABLE = False
+        return False
+    return True
 
 
 # INFO：若想跳过情感分析，可手动切换此开关为False
 SENTIMENT_ANALYSIS_ENABLED = True
+# 本地推理时单次前向计算的最大文本数
+LOCAL_INFERENCE_BATCH_SIZE = 32
 
 
 def _describe_missing_dependencies() -> str:
@@ -41,14 +66,13 @@ def _describe_missing_dependencies() -> str:
     return " / ".join(missing)
 
 
-# 添加项目根目录到路径，以便导入WeiboMultilingualSentiment
+# WeiboMultilingualSentiment模型目录（本地模型缓存位置）
 project_root = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 )
 weibo_sentiment_path = os.path.join(
     project_root, "SentimentAnalysisModel", "WeiboMultilingualSentiment"
 )
-sys.path.append(weibo_sentiment_path)
 
 
 @dataclass
@@ -82,8 +106,18 @@ class WeiboMultilingualSentimentAnalyzer:
     封装WeiboMultilingualSentiment模型，为AI Agent提供情感分析功能
     """
 
-    def __init__(self):
-        """初始化情感分析器"""
+    def __init__(self, service_url: Optional[str] = None):
+        """
+        初始化情感分析器
+
+        Args:
+            service_url: 共享推理服务地址，默认读取配置SENTIMENT_SERVICE_URL；传入空字符串强制本地推理
+        """
+        if service_url is None:
+            service_url = settings.SENTIMENT_SERVICE_URL
+        # 配置了共享推理服务时，模型由服务进程加载，本进程不需要torch/transformers
+        self.service_client = SentimentServiceClient(service_url) if service_url else None
+        self.use_service = False
         self.model = None
         self.tokenizer = None
         self.device = None
@@ -102,7 +136,7 @@ class WeiboMultilingualSentimentAnalyzer:
 
         if not SENTIMENT_ANALYSIS_ENABLED:
             self.disable("情感分析功能已在配置中关闭。")
-        elif not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+        elif self.service_client is None and not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。")
 
@@ -131,7 +165,7 @@ class WeiboMultilingualSentimentAnalyzer:
         if not SENTIMENT_ANALYSIS_ENABLED:
             self.disable("情感分析功能已在配置中关闭。")
             return False
-        if not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+        if self.service_client is None and not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。")
             return False
@@ -141,9 +175,8 @@ class WeiboMultilingualSentimentAnalyzer:
 
     def _select_device(self):
         """Select the best available torch device."""
-        if not TORCH_AVAILABLE:
+        if not TORCH_AVAILABLE or torch is None:
             return None
-        assert torch is not None
         if torch.cuda.is_available():
             return torch.device("cuda")
         mps_backend = getattr(torch.backends, "mps", None)
@@ -167,6 +200,16 @@ class WeiboMultilingualSentimentAnalyzer:
             print(f"情感分析功能已禁用，跳过模型加载：{reason}")
             return False
 
+        if self.use_service:
+            return True
+        if self.service_client is not None:
+            if self.service_client.health():
+                self.use_service = True
+                self.is_initialized = True
+                print(f"已连接共享情感分析服务: {self.service_client.base_url}")
+                return True
+            print(f"共享情感分析服务不可用: {self.service_client.base_url}，尝试在本进程加载模型")
+
         if not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。", drop_state=True)
@@ -177,6 +220,12 @@ class WeiboMultilingualSentimentAnalyzer:
             print("模型已经初始化，无需重复加载")
             return True
 
+        if not _load_backends():
+            missing = _describe_missing_dependencies() or "未知依赖"
+            self.disable(f"缺少依赖: {missing}，情感分析已禁用。", drop_state=True)
+            print(f"导入依赖失败: {missing}，无法加载情感分析模型。")
+            return False
+
         try:
             print("正在加载多语言情感分析模型...")
             assert AutoTokenizer is not None
@@ -290,12 +339,32 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False,
             )
 
-        try:
-            # 预处理文本
-            processed_text = self._preprocess_text(text)
+        return self.predict_texts([text])[0]
+
+    def predict_texts(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        批量预测文本情感（需已初始化）
+
+        使用共享服务时整批提交给服务；本地推理时按LOCAL_INFERENCE_BATCH_SIZE分块，
+        每块做一次带padding的前向计算
+
+        Args:
+            texts: 文本列表
 
-            if not processed_text:
-                return SentimentResult(
+        Returns:
+            与输入顺序一致的SentimentResult列表
+        """
+        if self.use_service:
+            return self._predict_remote(texts)
+
+        results: List[Optional[SentimentResult]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            processed_text = self._preprocess_text(text)
+            if processed_text:
+                pending.append((index, processed_text))
+            else:
+                results[index] = SentimentResult(
                     text=text,
                     sentiment_label="输入错误",
                     confidence=0.0,
@@ -304,55 +373,89 @@ class WeiboMultilingualSentimentAnalyzer:
                     error_message="输入文本为空或无效内容",
                     analysis_performed=False,
                 )
-            assert self.tokenizer is not None
-            # 分词编码
-            inputs = self.tokenizer(
-                processed_text,
-                max_length=512,
-                padding=True,
-                truncation=True,
-                return_tensors="pt",
-            )
 
-            # 转移到设备
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            # 预测
-            assert torch is not None
-            assert self.model is not None
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=1)
-                prediction = int(torch.argmax(probabilities, dim=1).item())
+        for start in range(0, len(pending), LOCAL_INFERENCE_BATCH_SIZE):
+            chunk = pending[start:start + LOCAL_INFERENCE_BATCH_SIZE]
+            try:
+                chunk_results = self._predict_chunk([texts[index] for index, _ in chunk],
+                                                    [processed for _, processed in chunk])
+            except Exception as e:
+                chunk_results = [
+                    SentimentResult(
+                        text=texts[index],
+                        sentiment_label="分析失败",
+                        confidence=0.0,
+                        probability_distribution={},
+                        success=False,
+                        error_message=f"预测时发生错误: {str(e)}",
+                        analysis_performed=False,
+                    )
+                    for index, _ in chunk
+                ]
+            for (index, _), result in zip(chunk, chunk_results):
+                results[index] = result
+
+        return results  # type: ignore[return-value]
+
+    def _predict_chunk(self, texts: List[str], processed_texts: List[str]) -> List[SentimentResult]:
+        """对一块已预处理的文本做一次前向计算"""
+        assert self.tokenizer is not None
+        # 分词编码
+        inputs = self.tokenizer(
+            processed_texts,
+            max_length=512,
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+        )
 
-            # 构建结果
-            confidence = probabilities[0][prediction].item()
-            label = self.sentiment_map[prediction]
+        # 转移到设备
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
-            # 构建概率分布字典
-            prob_dist = {}
-            for label_name, prob in zip(self.sentiment_map.values(), probabilities[0]):
-                prob_dist[label_name] = prob.item()
+        # 预测
+        assert torch is not None
+        assert self.model is not None
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probabilities = torch.softmax(outputs.logits, dim=1)
+            predictions = torch.argmax(probabilities, dim=1).tolist()
+        probabilities = probabilities.cpu().tolist()
 
-            return SentimentResult(
-                text=text,
-                sentiment_label=label,
-                confidence=confidence,
-                probability_distribution=prob_dist,
-                success=True,
+        results = []
+        for text, prediction, row in zip(texts, predictions, probabilities):
+            results.append(
+                SentimentResult(
+                    text=text,
+                    sentiment_label=self.sentiment_map[prediction],
+                    confidence=row[prediction],
+                    probability_distribution=dict(zip(self.sentiment_map.values(), row)),
+                    success=True,
+                )
             )
+        return results
 
+    def _predict_remote(self, texts: List[str]) -> List[SentimentResult]:
+        """通过共享推理服务预测，服务不可用时返回失败结果"""
+        try:
+            payloads = self.service_client.analyze(texts)
         except Exception as e:
-            return SentimentResult(
-                text=text,
-                sentiment_label="分析失败",
-                confidence=0.0,
-                probability_distribution={},
-                success=False,
-                error_message=f"预测时发生错误: {str(e)}",
-                analysis_performed=False,
-            )
+            return [
+                SentimentResult(
+                    text=text,
+                    sentiment_label="分析失败",
+                    confidence=0.0,
+                    probability_distribution={},
+                    success=False,
+                    error_message=f"共享情感分析服务调用失败: {str(e)}",
+                    analysis_performed=False,
+                )
+                for text in texts
+            ]
+        field_names = {field.name for field in fields(SentimentResult)}
+        return [
+            SentimentResult(**{key: value for key, value in payload.items() if key in field_names})
+            for payload in payloads
+        ]
 
     def analyze_batch(
         self, texts: List[str], show_progress: bool = True
@@ -399,20 +502,11 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False,
             )
 
-        results = []
-        success_count = 0
-        total_confidence = 0.0
-
-        for i, text in enumerate(texts):
-            if show_progress and len(texts) > 1:
-                print(f"处理进度: {i + 1}/{len(texts)}")
-
-            result = self.analyze_single_text(text)
-            results.append(result)
-
-            if result.success:
-                success_count += 1
-                total_confidence += result.confidence
+        if show_progress and len(texts) > 1:
+            print(f"批量分析 {len(texts)} 条文本...")
+        results = self.predict_texts(texts)
+        success_count = sum(1 for result in results if result.success)
+        total_confidence = sum(result.confidence for result in results if result.success)
 
         average_confidence = (
             total_confidence / success_count if success_count > 0 else 0.0
@@ -425,7 +519,7 @@ class WeiboMultilingualSentimentAnalyzer:
             success_count=success_count,
             failed_count=failed_count,
             average_confidence=average_confidence,
-            analysis_performed=True,
+            analysis_performed=success_count > 0 or any(result.analysis_performed for result in results),
         )
 
     def _build_passthrough_analysis(
@@ -472,7 +566,8 @@ class WeiboMultilingualSentimentAnalyzer:
     ) -> Dict[str, Any]:
         """
         对查询结果进行情感分析
-        专门用于分析从MediaCrawlerDB返回的查询结果
+        专门用于分析从MediaCrawlerDB返回的查询结果；已带有离线打分结果
+        （sentiment_label/sentiment_confidence字段）的条目直接复用，只对其余条目调用模型
 
         Args:
             query_results: 查询结果列表，每个元素包含文本内容
@@ -518,18 +613,39 @@ class WeiboMultilingualSentimentAnalyzer:
                 }
             }
 
-        if self.is_disabled:
+        # 离线任务已打分的条目直接读取结果
+        merged_results: List[Optional[SentimentResult]] = [None] * len(texts_to_analyze)
+        pending_indices = []
+        for index, (text_content, item) in enumerate(zip(texts_to_analyze, original_data)):
+            if item.get("sentiment_label"):
+                merged_results[index] = SentimentResult(
+                    text=text_content,
+                    sentiment_label=item["sentiment_label"],
+                    confidence=float(item.get("sentiment_confidence") or 0.0),
+                    probability_distribution={},
+                )
+            else:
+                pending_indices.append(index)
+        precomputed_count = len(texts_to_analyze) - len(pending_indices)
+
+        if self.is_disabled and not precomputed_count:
             return self._build_passthrough_analysis(
                 original_data=original_data,
                 reason=self.disable_reason or "情感分析模型不可用",
                 texts=texts_to_analyze,
             )
 
-        # 执行批量情感分析
-        print(f"正在对{len(texts_to_analyze)}条内容进行情感分析...")
-        batch_result = self.analyze_batch(texts_to_analyze, show_progress=True)
-
-        if not batch_result.analysis_performed:
+        # 仅对未打分的条目执行批量情感分析
+        pending_texts = [texts_to_analyze[index] for index in pending_indices]
+        if precomputed_count:
+            print(f"{precomputed_count}条内容已有离线情感打分结果，{len(pending_texts)}条需要实时分析")
+        if pending_texts:
+            print(f"正在对{len(pending_texts)}条内容进行情感分析...")
+        batch_result = self.analyze_batch(pending_texts, show_progress=True)
+        for index, result in zip(pending_indices, batch_result.results):
+            merged_results[index] = result
+
+        if not batch_result.analysis_performed and not precomputed_count:
             reason = self.disable_reason or "情感分析功能不可用"
             if batch_result.results:
                 candidate_error = next(
@@ -549,8 +665,8 @@ class WeiboMultilingualSentimentAnalyzer:
         sentiment_distribution = {}
         high_confidence_results = []
 
-        for result, original_item in zip(batch_result.results, original_data):
-            if result.success:
+        for result, original_item in zip(merged_results, original_data):
+            if result is not None and result.success:
                 # 统计情感分布
                 sentiment = result.sentiment_label
                 if sentiment not in sentiment_distribution:
@@ -571,7 +687,9 @@ class WeiboMultilingualSentimentAnalyzer:
                     )
 
         # 生成情感分析摘要
-        total_analyzed = batch_result.success_count
+        successful = [result for result in merged_results if result is not None and result.success]
+        total_analyzed = len(successful)
+        average_confidence = sum(result.confidence for result in successful) / total_analyzed if total_analyzed else 0.0
         if total_analyzed > 0:
             dominant_sentiment = max(sentiment_distribution.items(), key=lambda x: x[1])
             sentiment_summary = f"共分析{total_analyzed}条内容，主要情感倾向为'{dominant_sentiment[0]}'({dominant_sentiment[1]}条，占{dominant_sentiment[1] / total_analyzed * 100:.1f}%)"
@@ -581,8 +699,9 @@ class WeiboMultilingualSentimentAnalyzer:
         return {
             "sentiment_analysis": {
                 "total_analyzed": total_analyzed,
-                "success_rate": f"{batch_result.success_count}/{batch_result.total_processed}",
-                "average_confidence": round(batch_result.average_confidence, 4),
+                "success_rate": f"{total_analyzed}/{len(texts_to_analyze)}",
+                "average_confidence": round(average_confidence, 4),
+                "precomputed_count": precomputed_count,
                 "sentiment_distribution": sentiment_distribution,
                 "high_confidence_results": high_confidence_results,  # 返回所有高置信度结果，不做限制
                 "summary": sentiment_summary,
@@ -625,6 +744,7 @@ class WeiboMultilingualSentimentAnalyzer:
             "sentiment_levels": list(self.sentiment_map.values()),
             "is_initialized": self.is_initialized,
             "device": str(self.device) if self.device else "未设置",
+            "service_url": self.service_client.base_url if self.use_service else None,
         }
 
 
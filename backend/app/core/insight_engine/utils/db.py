@@ -10,12 +10,14 @@ from __future__ import annotations
 from urllib.parse import quote_plus
 import asyncio
 import os
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy import text
 from InsightEngine.utils.config import settings
 
+if TYPE_CHECKING:
+    # SQLAlchemy在首次查询时才导入，避免拖慢引擎包的导入
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
 __all__ = [
     "get_async_engine",
     "fetch_all",
@@ -49,6 +51,8 @@ def _build_database_url() -> str:
 def get_async_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
         database_url: str = _build_database_url()
         _engine = create_async_engine(
             database_url,
@@ -62,6 +66,8 @@ async def fetch_all(query: str, params: Optional[Union[Iterable[Any], Dict[str,
     """
     执行只读查询并返回字典列表。
     """
+    from sqlalchemy import text
+
     engine: AsyncEngine = get_async_engine()
     async with engine.connect() as conn:
         result = await conn.execute(text(query), params or {})
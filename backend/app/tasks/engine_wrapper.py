@@ -7,8 +7,6 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from app.core.insight_engine.agent import DeepSearchAgent as InsightAgent
-from app.core.media_engine.agent import DeepSearchAgent as MediaAgent
 from app.core.config import settings
 from loguru import logger
 import time
@@ -52,6 +50,9 @@ def run_insight_engine_logic(task_id: str, query: str):
     logger.add(CeleryLogger(task_id).write, format="{message}")
     
     try:
+        # Imported on first use so that worker boot does not pay for the engine packages
+        from app.core.insight_engine.agent import DeepSearchAgent as InsightAgent
+
         # Initialize Agent
         # Note: We might need to adjust Config passing here if InsightEngine relies on global settings
         # For now, assuming it reads from env or we can mock it
@@ -96,6 +96,14 @@ class Settings(BaseSettings):
     MAX_PARAGRAPHS: int = Field(6, description="最大段落数")
     SEARCH_TIMEOUT: int = Field(240, description="单次搜索请求超时")
     MAX_CONTENT_LENGTH: int = Field(500000, description="搜索最大内容长度")
+
+    # ======================= 引擎工作进程 =======================
+    ENGINE_WORKER_URL: Optional[str] = Field(None, description="无界面引擎工作进程地址（SingleEngineApp/engine_worker.py），例如 http://127.0.0.1:8600；配置后/api/search将研究任务提交到该进程")
+
+    # ======================= 共享情感分析服务 =======================
+    SENTIMENT_SERVICE_URL: Optional[str] = Field(None, description="共享情感分析推理服务地址（SingleEngineApp/sentiment_server.py），例如 http://127.0.0.1:8700；配置后各进程不再各自加载情感模型")
+    SENTIMENT_SERVICE_MAX_BATCH_SIZE: int = Field(32, description="推理服务单个微批次的最大文本数")
+    SENTIMENT_SERVICE_MAX_WAIT_MS: int = Field(10, description="推理服务凑批的最长等待时间（毫秒）")
     
     model_config = ConfigDict(
         env_file=ENV_FILE,
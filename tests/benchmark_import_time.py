@@ -0,0 +1,91 @@
+"""
+引擎包冷启动（导入耗时）基准脚本
+
+在独立子进程中运行 python -X importtime 导入各引擎包，汇总累计耗时并与预算比较，
+同时检查重依赖（torch/transformers/openai/sqlalchemy）是否被推迟到首次使用时才导入。
+
+用法:
+    python tests/benchmark_import_time.py                 # 检查默认模块
+    python tests/benchmark_import_time.py InsightEngine --budget 0.5 --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+# 默认检查的模块
+DEFAULT_MODULES = ["InsightEngine"]
+# 单个模块的导入耗时预算（秒）
+DEFAULT_BUDGET_SECONDS = 1.0
+# 导入引擎包时不应被加载的重依赖
+DEFERRED_MODULES = ("torch", "transformers", "openai", "sqlalchemy")
+
+
+def profile_import(module: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    在子进程中导入模块并解析 -X importtime 输出
+
+    Args:
+        module: 要导入的模块名
+
+    Returns:
+        (累计耗时秒数, [(自身耗时us, 累计耗时us, 模块名), ...])
+    """
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root), env=env, capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    total = next((cumulative for _, cumulative, name in reversed(rows) if name.strip() == module), 0)
+    return total / 1e6, rows
+
+
+def loaded_deferred_modules(rows: List[Tuple[int, int, str]]) -> List[str]:
+    """返回导入过程中被加载的重依赖顶层模块"""
+    loaded = {name.strip().split(".")[0] for _, _, name in rows}
+    return [name for name in DEFERRED_MODULES if name in loaded]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="引擎包导入耗时基准")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="要检查的模块")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="单个模块的耗时预算（秒）")
+    parser.add_argument("--top", type=int, default=10, help="显示累计耗时最高的N个子模块")
+    args = parser.parse_args()
+
+    results: Dict[str, bool] = {}
+    for module in args.modules:
+        print("=" * 60)
+        total, rows = profile_import(module)
+        eager = loaded_deferred_modules(rows)
+        within_budget = total <= args.budget
+        results[module] = within_budget and not eager
+
+        print(f"{module}: {total:.3f}s（预算 {args.budget:.3f}s）{'✓' if within_budget else '✗ 超出预算'}")
+        if eager:
+            print(f"✗ 导入时加载了应延迟的依赖: {', '.join(eager)}")
+        print(f"累计耗时最高的 {args.top} 个模块:")
+        for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:9.1f} ms  (self {self_us / 1000:7.1f} ms)  {name.strip()}")
+
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+MediaCrawler 签名吞吐基准脚本
+
+对比两种执行签名JS的方式每秒可生成的签名数：
+- spawn：与execjs相同，每次签名启动一个node进程加载整段签名脚本
+- pool：常驻node进程池（tools.js_signer.JsSignerPool），并发提交签名请求
+
+用法:
+    python tests/benchmark_js_signer.py                          # 抖音 a_bogus，默认参数
+    python tests/benchmark_js_signer.py --script zhihu -n 2000 --pool-size 4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from tools.js_signer import JsSignerPool
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+# 签名脚本 -> (函数名, 第i次调用的参数)
+SIGN_CASES = {
+    "douyin": ("sign_datail", lambda i: [f"device_platform=webapp&aid=6383&keyword=test&offset={i * 10}", USER_AGENT]),
+    "zhihu": ("get_sign", lambda i: [f"https://www.zhihu.com/api/v4/search_v3?q=test&offset={i * 20}", "d_c0=AbCdEfG1234567890;"]),
+}
+
+
+def bench_spawn(script_path: Path, fn: str, make_args: Callable[[int], List], count: int) -> float:
+    """
+    每次签名启动一个node进程（execjs的执行方式）
+
+    Returns:
+        每秒签名数
+    """
+    source = script_path.read_text(encoding="utf-8-sig")
+    started = time.perf_counter()
+    for i in range(count):
+        program = f"{source}\nprocess.stdout.write(JSON.stringify({fn}(...{json.dumps(make_args(i))})));"
+        subprocess.run(["node", "-e", program], check=True, capture_output=True)
+    return count / (time.perf_counter() - started)
+
+
+def bench_pool(script_path: Path, fn: str, make_args: Callable[[int], List], count: int,
+               pool_size: int, concurrency: int) -> Tuple[float, float]:
+    """
+    常驻进程池，concurrency个协程并发签名
+
+    Returns:
+        (预热耗时秒数, 每秒签名数)
+    """
+    started = time.perf_counter()
+    pool = JsSignerPool(str(script_path), size=pool_size).start()
+    warm_seconds = time.perf_counter() - started
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def sign(i: int):
+            async with semaphore:
+                return await pool.acall(fn, *make_args(i))
+
+        begin = time.perf_counter()
+        await asyncio.gather(*(sign(i) for i in range(count)))
+        return count / (time.perf_counter() - begin)
+
+    try:
+        return warm_seconds, asyncio.run(run())
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="签名JS吞吐基准")
+    parser.add_argument("--script", choices=sorted(SIGN_CASES), default="douyin", help="签名脚本")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="常驻进程池的签名次数")
+    parser.add_argument("--spawn-count", type=int, default=20, help="逐次启动node的签名次数")
+    parser.add_argument("--pool-size", type=int, default=2, help="常驻node进程数")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发签名协程数")
+    args = parser.parse_args()
+
+    if not shutil.which("node"):
+        print("未找到node，无法运行基准")
+        return 1
+
+    script_path = media_crawler_root / "libs" / f"{args.script}.js"
+    fn, make_args = SIGN_CASES[args.script]
+    spawn_rate = bench_spawn(script_path, fn, make_args, args.spawn_count)
+    warm_seconds, pool_rate = bench_pool(script_path, fn, make_args, args.count, args.pool_size, args.concurrency)
+
+    print(f"签名脚本: libs/{args.script}.js ({fn})")
+    print(f"  spawn（每次启动node）: {spawn_rate:10.1f} 次/秒  ({args.spawn_count} 次)")
+    print(f"  pool（{args.pool_size}个常驻进程）:  {pool_rate:10.1f} 次/秒  ({args.count} 次，并发 {args.concurrency}，预热 {warm_seconds:.2f}s)")
+    print(f"  加速: {pool_rate / spawn_rate:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+MediaCrawler 贴吧页面提取吞吐基准脚本
+
+用 media_platform/tieba/test_data 下的页面测量 TieBaExtractor 每秒可提取的页面数：
+- inline：在当前进程中逐页提取
+- pool：配置解析进程（TieBaExtractor(parse_workers=N)），并发提交页面
+
+用法:
+    python tests/benchmark_tieba_extractor.py                     # 每类页面跑1秒
+    python tests/benchmark_tieba_extractor.py --seconds 3 --workers 4 --pool-pages 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from media_platform.tieba.help import TieBaExtractor
+from model.m_baidu_tieba import TiebaComment
+
+TEST_DATA_DIR = media_crawler_root / "media_platform" / "tieba" / "test_data"
+
+PARENT_COMMENT = TiebaComment(comment_id="123456", content="content", note_id="9117905169",
+                              note_url="https://tieba.baidu.com/p/9117905169", tieba_id="4513750",
+                              tieba_name="网球风云吧", tieba_link="https://tieba.baidu.com/f?kw=网球风云吧")
+
+# 页面 -> (提取方法名, 除页面内容外的参数)
+PAGE_CASES: Dict[str, Tuple[str, Tuple]] = {
+    "search_keyword_notes.html": ("extract_search_note_list", ()),
+    "tieba_note_list.html": ("extract_tieba_note_list", ()),
+    "note_detail.html": ("extract_note_detail", ()),
+    "note_comments.html": ("extract_tieba_note_parment_comments", ("9117905169",)),
+    "note_sub_comments.html": ("extract_tieba_note_sub_comments", (PARENT_COMMENT,)),
+}
+
+
+def pages_per_second(fn: Callable[[], object], seconds: float) -> float:
+    """
+    在seconds秒内反复调用fn
+
+    Returns:
+        每秒调用次数
+    """
+    fn()
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def bench_pool(pages: Dict[str, str], workers: int, total_pages: int) -> float:
+    """
+    解析进程池，所有页面类型轮流并发提交
+
+    Returns:
+        每秒页面数
+    """
+    extractor = TieBaExtractor(parse_workers=workers)
+    cases = list(PAGE_CASES.items())
+
+    async def run():
+        # 预热：启动解析进程
+        await asyncio.gather(*(extractor.run(method, pages[name], *args) for name, (method, args) in cases))
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            extractor.run(method, pages[name], *args)
+            for name, (method, args) in (cases[i % len(cases)] for i in range(total_pages))
+        ))
+        return total_pages / (time.perf_counter() - started)
+
+    try:
+        return asyncio.run(run())
+    finally:
+        extractor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="贴吧页面提取吞吐基准")
+    parser.add_argument("--seconds", type=float, default=1.0, help="每类页面的测量秒数")
+    parser.add_argument("--workers", type=int, default=2, help="解析进程数，0 表示不测进程池")
+    parser.add_argument("--pool-pages", type=int, default=100, help="进程池测量的页面总数")
+    args = parser.parse_args()
+
+    pages = {name: (TEST_DATA_DIR / name).read_text(encoding="utf-8") for name in PAGE_CASES}
+    extractor = TieBaExtractor()
+    print("inline（当前进程逐页提取）:")
+    for name, (method, extra_args) in PAGE_CASES.items():
+        rate = pages_per_second(lambda: getattr(extractor, method)(pages[name], *extra_args), args.seconds)
+        print(f"  {name:28s} {len(pages[name]) / 1024:7.0f} KB  {rate:8.1f} 页/秒")
+
+    if args.workers > 0:
+        rate = bench_pool(pages, args.workers, args.pool_pages)
+        print(f"pool（{args.workers}个解析进程，各类页面混合）: {rate:8.1f} 页/秒  ({args.pool_pages} 页)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+测试公共配置
+
+项目根目录的config.py与MediaCrawler的config包同名。MediaCrawler相关测试会把MediaCrawler目录插到sys.path最前面，
+从项目根目录运行pytest时还会先收集MediaCrawler自带的测试，之后导入的`from config import settings`
+就会解析到MediaCrawler的config包。这里在收集每个测试模块时先换上项目根目录的config，收集完成后恢复sys.path
+与sys.modules中的config，各测试模块对导入路径的修改互不影响。
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+root_config_file = project_root / "config.py"
+
+
+def load_root_config():
+    """返回项目根目录的config模块；sys.modules中已是该模块时直接复用"""
+    module = sys.modules.get("config")
+    if module is not None and Path(getattr(module, "__file__", "") or "").resolve() == root_config_file.resolve():
+        return module
+    spec = importlib.util.spec_from_file_location("config", root_config_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+root_config = load_root_config()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    if not isinstance(collector, pytest.Module):
+        yield
+        return
+
+    saved_path = list(sys.path)
+    saved_config = sys.modules.get("config")
+    sys.modules["config"] = root_config
+    try:
+        yield
+    finally:
+        sys.path[:] = saved_path
+        if saved_config is None:
+            sys.modules.pop("config", None)
+        else:
+            sys.modules["config"] = saved_config
@@ -0,0 +1,64 @@
+"""
+测试MediaCrawler布隆过滤器
+
+覆盖：
+1. 已加入的元素不会漏判，整数id与其字符串形式视为同一元素
+2. 容量内的实际误判率接近按内存与目标误判率计算的值
+3. 落盘后加载，位数组、元素数与附加信息一致，损坏的文件抛出ValueError
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from tools.bloom_filter import BloomFilter
+
+
+class TestBloomFilter:
+    """测试布隆过滤器"""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter.for_memory(4096, 0.01)
+        for comment_id in range(1000):
+            assert bloom.add(comment_id) is False
+
+        assert all(comment_id in bloom for comment_id in range(1000))
+        assert "42" in bloom
+        assert bloom.add("42") is True
+        assert bloom.count == 1000
+
+    def test_false_positive_rate_within_capacity(self):
+        bloom = BloomFilter.for_memory(16 * 1024, 0.01)
+        capacity = bloom.capacity(0.01)
+        assert bloom.memory_bytes == 16 * 1024
+        assert bloom.num_hashes == 7
+        assert 13000 < capacity < 14000
+
+        for i in range(capacity):
+            bloom.add(f"note-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+
+        assert false_positives / 20000 < 0.02
+        assert bloom.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.1)
+
+    def test_save_and_load(self, tmp_path):
+        bloom = BloomFilter.for_memory(1024, 0.001)
+        for user_id in ("a", "b", "c"):
+            bloom.add(user_id)
+        path = tmp_path / "seen_ids" / "sqlite_xhs_note.note_id.bloom"
+        bloom.save(str(path), {"scanned_max_pk": 3})
+
+        loaded, meta = BloomFilter.load(str(path))
+
+        assert (loaded.num_bits, loaded.num_hashes, loaded.count) == (bloom.num_bits, bloom.num_hashes, 3)
+        assert meta == {"scanned_max_pk": 3}
+        assert all(user_id in loaded for user_id in ("a", "b", "c"))
+
+        path.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(ValueError):
+            BloomFilter.load(str(path))
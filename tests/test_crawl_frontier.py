@@ -0,0 +1,90 @@
+"""
+测试MediaCrawler增量爬取断点
+
+覆盖：
+1. 崩溃后重新打开时从最早未处理完的页续爬，没有未完成内容时从断点的下一页开始
+2. 成功处理的内容记录指纹，指纹未变化时跳过，失败的内容下次仍会爬取
+3. 搜索断点按天区分，第二天从起始页重新开始
+4. 流水线在每条数据离开时回调on_finished并给出是否成功
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from base.crawl_frontier import CrawlFrontier, make_fingerprint
+from base.crawl_pipeline import CrawlPipeline
+
+
+class TestCrawlFrontier:
+    """测试断点与指纹"""
+
+    def test_resume_after_crash(self, tmp_path):
+        db_path = str(tmp_path / "frontier.db")
+        frontier = CrawlFrontier("weibo", db_path, crawl_day="2025-08-20")
+        assert frontier.resume_page("高考", 1) == 1
+        for page, note_ids in ((1, ["a", "b"]), (2, ["c"])):
+            for note_id in note_ids:
+                frontier.enqueue("高考", page, note_id, make_fingerprint(3, 10))
+            frontier.save_page("高考", page + 1)
+        frontier.complete("高考", "a", True)
+        frontier.close()
+
+        # 重启后：第1页的b尚未处理完
+        frontier = CrawlFrontier("weibo", db_path, crawl_day="2025-08-20")
+        assert frontier.resume_page("高考", 1) == 1
+        frontier.complete("高考", "b", True)
+        frontier.complete("高考", "c", False)
+        assert frontier.resume_page("高考", 1) == 3
+        assert frontier.resume_page("暴雨", 1) == 1
+
+        assert frontier.is_unchanged("a", "3|10")
+        assert not frontier.is_unchanged("a", "4|10")
+        assert not frontier.is_unchanged("c", "3|10")
+        frontier.close()
+
+        next_day = CrawlFrontier("weibo", db_path, crawl_day="2025-08-21")
+        assert next_day.resume_page("高考", 1) == 1
+        assert next_day.is_unchanged("b", "3|10")
+        next_day.close()
+
+    def test_missing_counts_always_crawl(self):
+        frontier = CrawlFrontier("xhs")
+        assert make_fingerprint(None, None) is None
+        assert make_fingerprint(5, None) == "5|"
+        frontier.enqueue("高考", 1, "n1", None)
+        frontier.complete("高考", "n1", True)
+        assert not frontier.is_unchanged("n1", None)
+        frontier.close()
+
+
+class TestPipelineOnFinished:
+    """测试流水线完成回调"""
+
+    def test_reports_each_produced_item(self):
+        finished = {}
+
+        async def producer(emit):
+            for item in range(4):
+                await emit(item)
+
+        async def detail(item, emit):
+            if item == 1:
+                raise ValueError("blocked")
+            if item != 2:  # 2没有详情，不再下传
+                await emit(item * 10)
+
+        async def comments(item, emit):
+            pass
+
+        async def on_finished(item, succeeded):
+            finished[item] = succeeded
+
+        pipeline = CrawlPipeline("test").add_stage("detail", detail).add_stage("comments", comments)
+        asyncio.run(pipeline.run(producer, on_finished=on_finished))
+
+        assert finished == {0: True, 1: False, 2: False, 3: True}
@@ -0,0 +1,75 @@
+"""
+测试MediaCrawlerDB的search_by_crawl_keyword精确查询工具
+
+覆盖：
+1. 先按关键词取id，再按keyword_id与发布时间查询各表，时间边界与列格式一致
+2. 平台过滤与不含评论时只查询对应的表
+3. 关键词未被爬取过时返回错误信息
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools.search import MediaCrawlerDB
+
+
+class TestSearchByCrawlKeyword:
+    """测试爬取关键词精确查询"""
+
+    def test_queries_by_keyword_id_and_time(self, monkeypatch):
+        db = MediaCrawlerDB()
+        queries = []
+
+        def fake_query(query, params=None, raise_errors=False):
+            queries.append((query, params))
+            if 'crawl_keyword' in query:
+                return [{'id': 7}]
+            if 'weibo_note_comment' in query:
+                return [{'id': 3, 'content': '支持', 'create_time': 1724112000}]
+            return []
+
+        monkeypatch.setattr(db, '_execute_query', fake_query)
+        response = db.search_by_crawl_keyword('高考', start_date='2025-08-20', end_date='2025-08-21', platform='weibo')
+
+        assert response.error_message is None
+        assert queries[0][1] == {'keyword': '高考'}
+        tables = [query.split(' WHERE ')[0] for query, _ in queries[1:] if 'keyword_id =' in query]
+        assert tables == ['SELECT * FROM `weibo_note`', 'SELECT * FROM `weibo_note_comment`']
+        _, params = queries[1]
+        assert params['keyword_id'] == 7
+        assert params['start_value'] == int(datetime(2025, 8, 20).timestamp())
+        assert params['end_value'] == int(datetime(2025, 8, 22).timestamp())
+        assert response.results_count == 1
+        result = response.results[0]
+        assert (result.source_table, result.row_id, result.source_keyword) == ('weibo_note_comment', 3, '高考')
+
+    def test_content_only_on_millisecond_platform(self, monkeypatch):
+        db = MediaCrawlerDB()
+        queries = []
+
+        def fake_query(query, params=None, raise_errors=False):
+            queries.append((query, params))
+            return [{'id': 1}] if 'crawl_keyword' in query else []
+
+        monkeypatch.setattr(db, '_execute_query', fake_query)
+        db.search_by_crawl_keyword('高考', start_date='2025-08-20', platform='xhs', include_comments=False)
+
+        assert len(queries) == 2
+        query, params = queries[1]
+        assert '`xhs_note`' in query and 'ORDER BY `time` DESC' in query
+        assert params['start_value'] == int(datetime(2025, 8, 20).timestamp() * 1000)
+        assert 'end_value' not in params
+
+    def test_unknown_keyword(self, monkeypatch):
+        db = MediaCrawlerDB()
+        monkeypatch.setattr(db, '_execute_query', lambda query, params=None, raise_errors=False: [])
+
+        response = db.search_by_crawl_keyword('没有爬过的词')
+
+        assert response.error_message
+        assert response.results_count == 0
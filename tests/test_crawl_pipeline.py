@@ -0,0 +1,96 @@
+"""
+测试MediaCrawler爬虫流水线与请求预算
+
+覆盖：
+1. 数据依次经过各阶段，worker处理时恢复emit时的contextvars（搜索关键词）
+2. 单条数据处理失败不影响其余数据与后续阶段
+3. 请求预算同时限制并发数与请求速率
+"""
+
+import asyncio
+import contextvars
+import sys
+import time
+from pathlib import Path
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from base.crawl_pipeline import CrawlBudget, CrawlPipeline
+
+keyword_var = contextvars.ContextVar("keyword", default="")
+
+
+class TestCrawlPipeline:
+    """测试多阶段流水线"""
+
+    def test_items_flow_through_stages_with_context(self):
+        stored, commented = [], []
+
+        async def producer(emit):
+            for keyword in ("高考", "暴雨"):
+                keyword_var.set(keyword)
+                for page in range(3):
+                    await emit(f"{keyword}-{page}")
+
+        async def store(item, emit):
+            stored.append((keyword_var.get(), item))
+            await emit(item)
+
+        async def comments(item, emit):
+            await asyncio.sleep(0)
+            commented.append((keyword_var.get(), item))
+
+        pipeline = CrawlPipeline("test", queue_size=1)
+        pipeline.add_stage("store", store).add_stage("comments", comments, workers=3)
+        asyncio.run(pipeline.run(producer))
+
+        assert len(stored) == 6
+        assert sorted(commented) == sorted(stored)
+        assert all(item.startswith(keyword) for keyword, item in commented)
+
+    def test_failed_item_does_not_stop_pipeline(self):
+        done = []
+
+        async def producer(emit):
+            for item in range(5):
+                await emit(item)
+
+        async def detail(item, emit):
+            if item == 2:
+                raise ValueError("blocked")
+            await emit(item)
+
+        async def comments(item, emit):
+            done.append(item)
+
+        pipeline = CrawlPipeline("test").add_stage("detail", detail, workers=2).add_stage("comments", comments)
+        asyncio.run(pipeline.run(producer))
+
+        assert sorted(done) == [0, 1, 3, 4]
+
+
+class TestCrawlBudget:
+    """测试请求预算"""
+
+    def test_limits_concurrency_and_rate(self):
+        budget = CrawlBudget(max_concurrency=2, requests_per_second=50, burst=1)
+        active, peak, started = [0], [0], []
+
+        async def request():
+            async with budget:
+                started.append(time.monotonic())
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+
+        async def main():
+            await asyncio.gather(*(request() for _ in range(5)))
+
+        asyncio.run(main())
+
+        assert peak[0] <= 2
+        # 突发为1时，5个请求至少间隔4个令牌周期（50次/秒 -> 0.08秒）
+        assert started[-1] - started[0] >= 0.07
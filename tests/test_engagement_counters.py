@@ -0,0 +1,93 @@
+"""
+测试MediaCrawler互动计数解析与数值列填充
+
+覆盖：
+1. "万"、"w"、"k"、"亿"、千分位等文本计数解析为整数，无法识别时返回None
+2. 入库前按表的列映射填充_num数值列
+3. 重复爬取时Core更新语句的更新字典补齐_num数值列
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from database.counters import fill_typed_counters, parse_count, typed_counter_values
+
+
+class TestParseCount:
+    """测试文本计数解析"""
+
+    def test_units_and_separators(self):
+        assert parse_count("1.2万") == 12000
+        assert parse_count("3w") == 30000
+        assert parse_count("1.5k") == 1500
+        assert parse_count("2亿") == 200_000_000
+        assert parse_count("10万+") == 100000
+        assert parse_count("1,234") == 1234
+        assert parse_count(" 56 ") == 56
+        assert parse_count(78) == 78
+
+    def test_decimal_units_not_truncated(self):
+        assert parse_count("1.13万") == 11300
+        assert parse_count("0.57万") == 5700
+        assert parse_count("2.3k") == 2300
+        assert parse_count("1.1亿") == 110_000_000
+
+    def test_unparseable_values(self):
+        assert parse_count(None) is None
+        assert parse_count("") is None
+        assert parse_count("赞") is None
+        assert parse_count("-") is None
+
+
+class TestFillTypedCounters:
+    """测试数值列填充"""
+
+    def test_fills_mapped_columns_only(self):
+        note = SimpleNamespace(liked_count="1.2万", comments_count="35", shared_count=None, shared_count_num=7)
+
+        fill_typed_counters("weibo_note", note)
+
+        assert note.liked_count_num == 12000
+        assert note.comments_count_num == 35
+        assert note.shared_count_num == 7
+
+    def test_unknown_table_is_noop(self):
+        row = SimpleNamespace(liked_count="3w")
+        fill_typed_counters("unknown_table", row)
+        assert not hasattr(row, "liked_count_num")
+
+
+class TestTypedCounterValues:
+    """测试重复爬取时更新字典的数值列"""
+
+    def test_recrawl_update_refreshes_num_columns(self):
+        # 首次入库时before_update/before_insert事件填充的数值列
+        row = SimpleNamespace(liked_count="1.2万", comment_count="35")
+        fill_typed_counters("xhs_note", row)
+        assert (row.liked_count_num, row.comment_count_num) == (12000, 35)
+
+        # 重复爬取：与XhsDbStoreImplement.update_content相同的更新字典
+        update_data = {
+            "last_modify_ts": 1700000000000,
+            "liked_count": "1.13万",
+            "collected_count": "None",
+            "comment_count": "40",
+            "share_count": "0.57万",
+        }
+        filled = typed_counter_values("xhs_note", update_data)
+
+        assert filled["liked_count_num"] == 11300
+        assert filled["comment_count_num"] == 40
+        assert filled["share_count_num"] == 5700
+        assert filled["collected_count_num"] is None
+        assert filled["last_modify_ts"] == 1700000000000
+        assert "liked_count_num" not in update_data
+
+    def test_unmapped_table_unchanged(self):
+        update_data = {"fans": "3w"}
+        assert typed_counter_values("xhs_creator", update_data) == update_data
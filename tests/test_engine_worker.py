@@ -0,0 +1,96 @@
+"""
+测试SingleEngineApp/engine_worker.py中的无界面引擎工作进程
+
+覆盖：
+1. 研究任务在引擎工作线程中执行，引擎日志与结构化事件写入logs/{engine}.log，供ForumEngine监控
+2. 各引擎日志互不混入
+3. 引擎配置由Streamlit应用与工作进程共用的build_engine_config构建
+"""
+
+import sys
+import time
+import types
+from pathlib import Path
+
+from loguru import logger
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from SingleEngineApp.engine_config import build_engine_config
+from SingleEngineApp.engine_worker import EngineWorkerRuntime, add_engine_log_sinks
+
+
+class FakeParagraph:
+    def __init__(self, title):
+        self.title = title
+        self.research = types.SimpleNamespace(mark_completed=lambda: None)
+
+
+class FakeAgent:
+    """按DeepSearchAgent的分步接口记录日志的假引擎"""
+
+    def __init__(self, config):
+        self.config = config
+        self.state = types.SimpleNamespace(paragraphs=[])
+
+    def _generate_report_structure(self, query):
+        self.state.paragraphs = [FakeParagraph(f"{query}-段落{i}") for i in range(2)]
+
+    def _initial_search_and_summary(self, index):
+        logger.info(f"FirstSummaryNode 正在生成首次段落总结: {self.state.paragraphs[index].title}")
+
+    def _reflection_loop(self, index):
+        logger.info("ReflectionSummaryNode 正在生成反思总结")
+
+    def _generate_final_report(self):
+        return "# 报告"
+
+    def _save_report(self, report):
+        return "reports/fake.md"
+
+
+def fake_engine_module():
+    return types.SimpleNamespace(DeepSearchAgent=FakeAgent, Settings=lambda **fields: fields)
+
+
+class TestEngineWorker:
+    """测试引擎工作进程写入引擎日志"""
+
+    def test_job_logs_written_per_engine(self, tmp_path):
+        sink_ids = add_engine_log_sinks(['insight', 'media'], str(tmp_path))
+        runtime = EngineWorkerRuntime(['insight', 'media'], on_event=lambda record: logger.bind(
+            engine=record['engine']).info(f"engine_event {record['event']}"))
+        # 已加载的引擎不会再导入真实模块
+        runtime.modules = {'insight': fake_engine_module(), 'media': fake_engine_module()}
+        try:
+            runtime.start()
+            insight_job = runtime.submit('insight', '小米汽车')
+            media_job = runtime.submit('media', '雷军')
+            deadline = time.time() + 10
+            while not (insight_job.finished and media_job.finished) and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            for sink_id in sink_ids:
+                logger.remove(sink_id)
+
+        assert insight_job.status == media_job.status == "completed"
+        insight_log = (tmp_path / "insight.log").read_text(encoding="utf-8")
+        media_log = (tmp_path / "media.log").read_text(encoding="utf-8")
+        assert "正在生成首次段落总结: 小米汽车-段落0" in insight_log
+        assert "| INFO     |" in insight_log
+        assert "engine_event queued" in insight_log and "engine_event done" in insight_log
+        assert "正在生成首次段落总结: 雷军-段落1" in media_log
+        assert "小米汽车" not in media_log and "雷军" not in insight_log
+
+    def test_build_engine_config(self):
+        insight = build_engine_config('insight', lambda **fields: fields)
+        assert insight['MAX_CONTENT_LENGTH'] == 500000
+        assert insight['OUTPUT_DIR'] == "insight_engine_streamlit_reports"
+        assert 'DB_DIALECT' in insight
+
+        query = build_engine_config('query', lambda **fields: fields)
+        assert query['SEARCH_CONTENT_MAX_LENGTH'] == 20000
+        assert query['QUERY_ENGINE_MODEL_NAME']
+        assert 'TAVILY_API_KEY' in query
@@ -0,0 +1,102 @@
+"""
+测试utils/forum_index.py中的forum.log增量索引
+
+覆盖：
+1. 最新HOST发言、最近Agent发言查询
+2. 增量追加（包括未写完的半行）
+3. 日志清空后的索引重建与磁盘持久化
+4. 按会话分页
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.forum_index import ForumLogIndex
+
+
+SESSION_START = "[12:00:00] [SYSTEM] === ForumEngine 监控开始 - 2025-08-27 12:00:00 ===\n"
+
+
+def write_lines(path: Path, lines, mode='a'):
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(lines))
+
+
+class TestForumLogIndex:
+    """测试ForumLogIndex的查询与增量更新"""
+
+    def test_latest_host_and_recent_agents(self, tmp_path):
+        """测试最新HOST与最近Agent发言"""
+        log = tmp_path / "forum.log"
+        write_lines(log, [
+            SESSION_START,
+            "[12:00:01] [QUERY] 查询发言1\n",
+            "[12:00:02] [HOST] 主持人发言1\\n第二行\n",
+            "[12:00:03] [MEDIA] 媒体发言1\n",
+            "[12:00:04] [INSIGHT] 洞察发言1\n",
+        ], mode='w')
+
+        index = ForumLogIndex(log)
+        latest = index.latest('HOST')
+        assert latest['content'] == "主持人发言1\n第二行"
+        assert latest['timestamp'] == "12:00:02"
+
+        recent = index.recent_agent_speeches(limit=2)
+        assert [s['source'] for s in recent] == ['MEDIA', 'INSIGHT']
+
+    def test_incremental_append_and_partial_line(self, tmp_path):
+        """测试增量追加时只索引完整行"""
+        log = tmp_path / "forum.log"
+        write_lines(log, [SESSION_START, "[12:00:01] [HOST] 第一次\n"], mode='w')
+        index = ForumLogIndex(log)
+        assert index.latest('HOST')['content'] == "第一次"
+
+        write_lines(log, ["[12:00:05] [HOST] 第二"])
+        assert index.latest('HOST')['content'] == "第一次"
+
+        write_lines(log, ["次\n"])
+        assert index.latest('HOST')['content'] == "第二次"
+        assert len(index.speeches('HOST')) == 2
+
+    def test_rebuild_after_truncate_and_persistence(self, tmp_path):
+        """测试日志清空后重建索引，以及索引持久化后可被新实例复用"""
+        log = tmp_path / "forum.log"
+        write_lines(log, [SESSION_START, "[12:00:01] [HOST] 旧发言\n"], mode='w')
+        index = ForumLogIndex(log)
+        assert index.latest('HOST')['content'] == "旧发言"
+
+        write_lines(log, ["[13:00:00] [SYSTEM] === ForumEngine 监控开始 - 2025-08-27 13:00:00 ===\n"], mode='w')
+        assert index.latest('HOST') is None
+
+        write_lines(log, ["[13:00:01] [HOST] 新发言\n"])
+        assert index.latest('HOST')['content'] == "新发言"
+
+        reloaded = ForumLogIndex(log)
+        assert reloaded.indexed_size == log.stat().st_size
+        assert reloaded.latest('HOST')['content'] == "新发言"
+
+    def test_page_by_session(self, tmp_path):
+        """测试分页与按会话过滤"""
+        log = tmp_path / "forum.log"
+        write_lines(log, [
+            SESSION_START,
+            "[12:00:01] [QUERY] a\n",
+            "[12:00:02] [QUERY] b\n",
+            "[12:10:00] [SYSTEM] === ForumEngine 论坛结束 - 2025-08-27 12:10:00 ===\n",
+            "[12:20:00] [SYSTEM] === ForumEngine 监控开始 - 2025-08-27 12:20:00 ===\n",
+            "[12:20:01] [MEDIA] c\n",
+        ], mode='w')
+        index = ForumLogIndex(log)
+
+        page = index.page(offset=1, limit=2)
+        assert page['total'] == 6
+        assert [item['content'] for item in page['items']] == ['a', 'b']
+
+        latest_session = index.page(limit=10, session=-1)
+        assert latest_session['total'] == 2
+        assert latest_session['items'][-1]['content'] == 'c'
+        assert latest_session['items'][-1]['session'] == 1
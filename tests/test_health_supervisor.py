@@ -0,0 +1,100 @@
+"""
+测试utils/health_supervisor.py中的应用健康监督器
+
+覆盖：
+1. 探测结果带时间戳缓存，缓存新鲜时snapshot不发起探测；status以进程表为准，停止操作在下一轮探测前即可反映
+2. 后台线程未启动或缓存超过stale_after未刷新时，snapshot先同步探测一轮；状态变化时回调推送
+3. 导入app.py不会启动探测线程，监督器在服务启动时开启
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.health_supervisor import HealthSupervisor
+
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+def make_supervisor(status_code=200, **kwargs):
+    processes = {
+        'insight': {'process': FakeProcess(), 'port': 8501, 'status': 'starting', 'output': []},
+        'forum': {'process': None, 'port': None, 'status': 'running', 'output': []},
+    }
+    changes = []
+    supervisor = HealthSupervisor(processes, lambda port: f"http://127.0.0.1:{port}/_stcore/health",
+                                  on_change=changes.append, **kwargs)
+    probes = []
+
+    def fake_get(url, timeout=None):
+        probes.append(url)
+        return SimpleNamespace(status_code=status_code)
+
+    supervisor._session.get = fake_get
+    return supervisor, processes, probes, changes
+
+
+class TestHealthSupervisor:
+    """测试状态缓存与过期回退"""
+
+    def test_cached_snapshot(self):
+        supervisor, processes, probes, changes = make_supervisor(stale_after=60)
+
+        supervisor.check_now()
+        snapshot = supervisor.snapshot()
+        supervisor.snapshot()
+
+        assert probes == ["http://127.0.0.1:8501/_stcore/health"]
+        assert snapshot['insight']['status'] == 'running'
+        assert snapshot['insight']['port'] == 8501
+        assert snapshot['insight']['latency_ms'] is not None
+        assert time.time() - snapshot['insight']['checked_at'] < 5
+        assert snapshot['forum']['status'] == 'running'
+        assert snapshot['forum']['checked_at'] is None
+        assert [change['insight']['status'] for change in changes] == ['starting', 'running']
+
+        # 停止应用后，下一轮探测前读取到的即为进程表中的状态
+        processes['insight'].update(process=None, status='stopped')
+        assert supervisor.snapshot()['insight']['status'] == 'stopped'
+        assert len(probes) == 1
+
+    def test_stale_snapshot_falls_back_to_probe(self):
+        supervisor, processes, probes, changes = make_supervisor(status_code=503, stale_after=0.05)
+
+        first = supervisor.snapshot()
+        assert supervisor._thread is None
+        assert len(probes) == 1
+        assert first['insight']['status'] == 'starting'
+
+        supervisor.snapshot()
+        assert len(probes) == 1
+        time.sleep(0.1)
+        supervisor._session.get = lambda url, timeout=None: probes.append(url) or SimpleNamespace(status_code=200)
+        refreshed = supervisor.snapshot()
+
+        assert len(probes) == 2
+        assert refreshed['insight']['status'] == 'running'
+        assert refreshed['insight']['checked_at'] > first['insight']['checked_at']
+        assert changes[-1]['insight']['status'] == 'running'
+
+        # 进程退出后不再探测，标记为stopped
+        processes['insight']['process'].returncode = 1
+        time.sleep(0.1)
+        assert supervisor.snapshot()['insight']['status'] == 'stopped'
+        assert len(probes) == 2
+
+    def test_app_import_does_not_start_probing(self):
+        import app as flask_app
+
+        assert flask_app.health_supervisor._thread is None
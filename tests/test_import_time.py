@@ -0,0 +1,40 @@
+"""
+测试引擎包的延迟导入
+
+覆盖：
+1. 导入InsightEngine不会加载torch/transformers/openai/sqlalchemy
+2. 关键词优化器全局实例在首次使用时才创建
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_import_time import profile_import, loaded_deferred_modules
+
+
+class TestLazyImports:
+    """测试引擎包导入边界"""
+
+    def test_insight_engine_defers_heavy_dependencies(self):
+        total, rows = profile_import("InsightEngine")
+
+        assert rows
+        assert total > 0
+        assert loaded_deferred_modules(rows) == []
+
+    def test_keyword_optimizer_created_on_first_use(self, monkeypatch):
+        # InsightEngine.tools的同名属性是全局实例，这里需要取模块本身
+        module = importlib.import_module("InsightEngine.tools.keyword_optimizer")
+
+        monkeypatch.setattr(module, "_keyword_optimizer", None)
+        monkeypatch.setattr(module.settings, "KEYWORD_OPTIMIZER_API_KEY", "test-key")
+
+        assert module._keyword_optimizer is None
+        assert module.keyword_optimizer.api_key == "test-key"
+        assert module._keyword_optimizer is module.get_keyword_optimizer()
@@ -0,0 +1,138 @@
+"""
+测试MediaCrawler常驻JS签名进程池
+
+覆盖：
+1. 并发签名请求分发到多个常驻进程，结果按id回填，签名脚本的console输出不干扰应答
+2. 签名脚本抛错时返回JsSignerError，进程退出后下一次调用自动补齐
+3. 知乎签名脚本经进程池与逐次启动node（execjs方式）执行的结果一致
+4. 异步调用在线程中启动进程，不阻塞事件循环；调用超时后移除在途请求，迟到的应答不影响后续调用
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from tools.js_signer import JsSignerError, JsSignerPool
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="需要node")
+
+SIGN_SCRIPT = """
+const crypto = require('crypto');
+
+function sign(params, salt) {
+    console.log('signing', params);
+    return crypto.createHash('md5').update(params + salt).digest('hex');
+}
+
+function fail() {
+    throw new Error('bad params');
+}
+
+function slow(ms) {
+    const end = Date.now() + ms;
+    while (Date.now() < end) {}
+    return 'late';
+}
+"""
+
+
+@pytest.fixture
+def sign_script(tmp_path):
+    path = tmp_path / "sign.js"
+    path.write_text(SIGN_SCRIPT, encoding="utf-8")
+    return path
+
+
+class TestJsSignerPool:
+    """测试签名进程池"""
+
+    def test_concurrent_calls_across_workers(self, sign_script):
+        import hashlib
+
+        pool = JsSignerPool(str(sign_script), size=2).start()
+
+        async def main():
+            return await asyncio.gather(*(pool.acall("sign", f"offset={i}", "salt") for i in range(200)))
+
+        try:
+            results = asyncio.run(main())
+            assert len({worker.process.pid for worker in pool._workers}) == 2
+        finally:
+            pool.close()
+
+        assert results == [hashlib.md5(f"offset={i}salt".encode()).hexdigest() for i in range(200)]
+
+    def test_errors_and_restart(self, sign_script):
+        pool = JsSignerPool(str(sign_script), size=1).start()
+        try:
+            with pytest.raises(JsSignerError, match="bad params"):
+                pool.call("fail")
+            assert len(pool.call("sign", "a", "b")) == 32
+
+            pool._workers[0].process.kill()
+            pool._workers[0].process.wait()
+            assert len(pool.call("sign", "a", "b")) == 32
+        finally:
+            pool.close()
+
+    def test_zhihu_sign_matches_spawned_node(self, tmp_path):
+        # x-zse-96的首字节取自Math.random，固定后两种执行方式的结果应完全一致
+        source = "Math.random = () => 0.5;\n" + (media_crawler_root / "libs" / "zhihu.js").read_text(encoding="utf-8-sig")
+        script_path = tmp_path / "zhihu.js"
+        script_path.write_text(source, encoding="utf-8")
+        url, cookies = "https://www.zhihu.com/api/v4/search_v3?q=test", "d_c0=AbCdEfG1234567890;"
+        program = f"{source}\nprocess.stdout.write(JSON.stringify(get_sign({json.dumps(url)}, {json.dumps(cookies)})));"
+        expected = json.loads(subprocess.run(["node", "-e", program], check=True, capture_output=True, text=True).stdout)
+
+        pool = JsSignerPool(str(script_path), size=1).start()
+        try:
+            assert pool.call("get_sign", url, cookies) == expected
+        finally:
+            pool.close()
+
+    def test_acall_starts_workers_off_event_loop(self, sign_script, monkeypatch):
+        pool = JsSignerPool(str(sign_script), size=2)
+        start = pool.start
+        start_threads = []
+
+        def recording_start():
+            start_threads.append(threading.current_thread())
+            return start()
+
+        monkeypatch.setattr(pool, "start", recording_start)
+        try:
+            result = asyncio.run(pool.acall("sign", "a", "b"))
+        finally:
+            pool.close()
+
+        assert len(result) == 32
+        assert start_threads and threading.main_thread() not in start_threads
+
+    def test_timeout_discards_pending_request(self, sign_script):
+        pool = JsSignerPool(str(sign_script), size=1, call_timeout=0.2).start()
+        worker = pool._workers[0]
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(pool.acall("slow", 600))
+            assert worker.in_flight == 0
+            with pytest.raises(concurrent.futures.TimeoutError):
+                pool.call("slow", 600)
+            assert worker.in_flight == 0
+
+            # 迟到的应答被丢弃，读应答线程继续工作
+            pool.call_timeout = 5
+            assert len(pool.call("sign", "a", "b")) == 32
+            assert pool._workers == [worker] and worker.in_flight == 0
+        finally:
+            pool.close()
@@ -0,0 +1,82 @@
+"""
+测试utils/log_pipeline.py中的子进程日志管道
+
+覆盖：
+1. 按块读取、半行拼接与批量写入文件
+2. 批量推送（每个事件包含多行）
+3. 推送积压时丢弃最旧批次并报告丢弃行数
+"""
+
+import io
+import sys
+import threading
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.log_pipeline import ProcessLogPipeline
+
+
+class ChunkedStream(io.RawIOBase):
+    """按固定块返回数据的二进制流，模拟管道分段到达"""
+
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def read(self, size=-1):
+        chunk = self.data[self.position:self.position + min(size, self.chunk_size)]
+        self.position += len(chunk)
+        return chunk
+
+
+class TestProcessLogPipeline:
+    """测试ProcessLogPipeline的批量写入与推送"""
+
+    def test_batches_lines_to_file_and_emit(self, tmp_path):
+        events = []
+        log_path = tmp_path / "query.log"
+        data = b"".join(f"line {i}\n".encode() for i in range(1000)) + "中文结尾".encode()
+        pipeline = ProcessLogPipeline("query", log_path, lambda event, payload: events.append((event, payload)),
+                                      batch_size=100).start()
+
+        # 7字节一块，保证大量行被拆在两个块之间
+        pipeline.pump(ChunkedStream(data, 7))
+        pipeline._emitter_thread.join(5)
+
+        lines = log_path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1001
+        assert lines[0].endswith("line 0")
+        assert lines[-1].endswith("中文结尾")
+
+        emitted = [line for _, payload in events for line in payload['lines']]
+        assert emitted == lines
+        assert all(event == 'console_output_batch' for event, _ in events)
+        assert len(events) < 1001 / 10
+
+    def test_drops_oldest_batches_when_emit_is_slow(self, tmp_path):
+        release = threading.Event()
+        events = []
+
+        def slow_emit(event, payload):
+            release.wait(5)
+            events.append(payload)
+
+        pipeline = ProcessLogPipeline("media", tmp_path / "media.log", slow_emit,
+                                      batch_size=10, flush_interval=0.01, max_pending_batches=2).start()
+        for i in range(200):
+            pipeline.feed(f"line {i}")
+        pipeline.close()
+        release.set()
+        pipeline._emitter_thread.join(5)
+
+        # 文件中的日志完整，推送只保留最新的批次
+        assert len((tmp_path / "media.log").read_text(encoding='utf-8').splitlines()) == 200
+        emitted = sum(len(payload['lines']) for payload in events)
+        dropped = sum(payload['dropped'] for payload in events)
+        assert dropped > 0
+        assert emitted + dropped == 200
+        assert events[-1]['lines'][-1] == "line 199"
@@ -0,0 +1,123 @@
+"""
+测试MediaCrawlerDB读取离线情感打分结果
+
+覆盖：
+1. 查询结果按(来源表, 行id)填充离线打分的标签与置信度
+2. 结果表不存在时不影响查询，且不再重复尝试；连接中断等其他错误只影响本次查询
+3. 全部结果已有离线打分时，情感分析不调用模型
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools.search import MediaCrawlerDB, QueryResult
+from InsightEngine.tools.sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+
+
+def make_result(table: str, row_id: int, content: str) -> QueryResult:
+    return QueryResult(platform=table.split('_')[0], content_type='comment', title_or_content=content,
+                       source_table=table, row_id=row_id)
+
+
+class TestAttachPrecomputedSentiment:
+    """测试离线打分结果的读取"""
+
+    def test_fills_label_by_table_and_row_id(self, monkeypatch):
+        db = MediaCrawlerDB()
+        scored = {
+            'weibo_note_comment': [{'row_id': 1, 'sentiment_label': '正面', 'confidence': 0.9}],
+            'xhs_note_comment': [{'row_id': 1, 'sentiment_label': '负面', 'confidence': 0.8}],
+        }
+        queries = []
+
+        def fake_query(query, params=None, raise_errors=False):
+            queries.append(params)
+            return scored[params['source_table']]
+
+        monkeypatch.setattr(MediaCrawlerDB, '_precomputed_sentiment_available', True)
+        monkeypatch.setattr(db, '_execute_query', fake_query)
+        results = [make_result('weibo_note_comment', 1, 'a'), make_result('weibo_note_comment', 2, 'b'),
+                   make_result('xhs_note_comment', 1, 'c')]
+
+        db._attach_precomputed_sentiment(results)
+
+        assert len(queries) == 2
+        assert (results[0].sentiment_label, results[0].sentiment_confidence) == ('正面', 0.9)
+        assert results[1].sentiment_label is None
+        assert results[2].sentiment_label == '负面'
+
+    def test_missing_table_disables_lookup(self, monkeypatch):
+        db = MediaCrawlerDB()
+        calls = []
+
+        def missing_table(query, params=None, raise_errors=False):
+            calls.append(query)
+            raise RuntimeError("Table 'content_sentiment' doesn't exist")
+
+        monkeypatch.setattr(MediaCrawlerDB, '_precomputed_sentiment_available', True)
+        monkeypatch.setattr(db, '_execute_query', missing_table)
+        results = [make_result('weibo_note', 1, 'a')]
+
+        assert db._attach_precomputed_sentiment(results) == results
+        db._attach_precomputed_sentiment(results)
+        assert len(calls) == 1
+        assert results[0].sentiment_label is None
+
+    def test_transient_error_only_skips_current_call(self, monkeypatch):
+        db = MediaCrawlerDB()
+        errors = [ConnectionError("Lost connection to MySQL server during query")]
+
+        def flaky_query(query, params=None, raise_errors=False):
+            if errors:
+                raise errors.pop()
+            return [{'row_id': 1, 'sentiment_label': '正面', 'confidence': 0.9}]
+
+        monkeypatch.setattr(MediaCrawlerDB, '_precomputed_sentiment_available', True)
+        monkeypatch.setattr(db, '_execute_query', flaky_query)
+        results = [make_result('weibo_note', 1, 'a')]
+
+        db._attach_precomputed_sentiment(results)
+        assert results[0].sentiment_label is None
+        assert MediaCrawlerDB._precomputed_sentiment_available
+
+        db._attach_precomputed_sentiment(results)
+        assert results[0].sentiment_label == '正面'
+
+    def test_missing_table_error_detection(self):
+        class DriverError(Exception):
+            pass
+
+        undefined_table = DriverError('relation "content_sentiment" does not exist')
+        undefined_table.sqlstate = '42P01'
+        wrapped = RuntimeError("(ProgrammingError)")
+        wrapped.orig = undefined_table
+
+        assert MediaCrawlerDB._is_missing_table_error(wrapped)
+        assert MediaCrawlerDB._is_missing_table_error(DriverError(1146, "Table 'db.content_sentiment' doesn't exist"))
+        assert MediaCrawlerDB._is_missing_table_error(DriverError("no such table: content_sentiment"))
+        assert not MediaCrawlerDB._is_missing_table_error(DriverError(2013, "Lost connection to MySQL server"))
+        assert not MediaCrawlerDB._is_missing_table_error(DriverError('column "confidence" does not exist'))
+
+
+class TestAnalyzeQueryResults:
+    """测试情感分析复用离线打分结果"""
+
+    def test_precomputed_results_skip_model(self):
+        analyzer = WeiboMultilingualSentimentAnalyzer(service_url="")
+        analyzer.disable("测试中不加载模型")
+        items = [
+            {'content': '很好', 'sentiment_label': '正面', 'sentiment_confidence': 0.9},
+            {'content': '很差', 'sentiment_label': '负面', 'sentiment_confidence': 0.7},
+            {'content': '一般', 'sentiment_label': '正面', 'sentiment_confidence': 0.4},
+        ]
+
+        analysis = analyzer.analyze_query_results(items)['sentiment_analysis']
+
+        assert analysis['total_analyzed'] == 3
+        assert analysis['precomputed_count'] == 3
+        assert analysis['sentiment_distribution'] == {'正面': 2, '负面': 1}
+        assert len(analysis['high_confidence_results']) == 2
@@ -0,0 +1,107 @@
+"""
+测试Qwen3-LoRA情感模型的生成结果解析
+
+覆盖：
+1. 批量预测时按输入token长度截去（左填充后的）指令，只解析新生成的回答；指令本身含"正面"二字不影响结果
+2. 单条预测同样只解析新生成的回答
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加小模型情感分析目录到路径
+small_qwen_dir = Path(__file__).parent.parent / "SentimentAnalysisModel" / "WeiboSentiment_SmallQwen"
+sys.path.insert(0, str(small_qwen_dir))
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("peft")
+pytest.importorskip("datasets")
+pytest.importorskip("sklearn")
+
+from qwen3_lora_universal import Qwen3LoRAUniversal
+
+
+class CharTokenizer:
+    """逐字符编码的假分词器，按padding_side填充；与真实分词器一样，解码结果不一定与原文逐字相同（连续换行解码为一个）"""
+
+    pad_token_id = 0
+    eos_token_id = 1
+
+    def __init__(self):
+        self.padding_side = "right"
+        self.vocab = {}
+        self.chars = {}
+
+    def encode(self, text):
+        ids = []
+        for piece in text.replace("\n\n", "\0"):
+            if piece not in self.vocab:
+                self.vocab[piece] = len(self.vocab) + 2
+                self.chars[self.vocab[piece]] = "\n" if piece == "\0" else piece
+            ids.append(self.vocab[piece])
+        return ids
+
+    def __call__(self, texts, return_tensors="pt", padding=False):
+        encoded = [self.encode(text) for text in ([texts] if isinstance(texts, str) else texts)]
+        width = max(len(ids) for ids in encoded)
+        rows, masks = [], []
+        for ids in encoded:
+            pad = [self.pad_token_id] * (width - len(ids))
+            mask = [0] * len(pad)
+            rows.append(pad + ids if self.padding_side == "left" else ids + pad)
+            masks.append(mask + [1] * len(ids) if self.padding_side == "left" else [1] * len(ids) + mask)
+        return {"input_ids": torch.tensor(rows), "attention_mask": torch.tensor(masks)}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return "".join(self.chars.get(int(token), "") for token in ids)
+
+
+class FakeLoraModel:
+    """在输入之后追加回答：文本含"喜欢"时回答正面，否则回答负面"""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.padding_sides = []
+
+    def eval(self):
+        return self
+
+    def generate(self, input_ids, attention_mask, **kwargs):
+        self.padding_sides.append(self.tokenizer.padding_side)
+        responses = []
+        for row in input_ids:
+            prompt = self.tokenizer.decode(row)
+            responses.append(self.tokenizer.encode("正面" if "喜欢" in prompt else "负面") + [self.tokenizer.eos_token_id])
+        return torch.cat([input_ids, torch.tensor(responses)], dim=-1)
+
+
+def make_model() -> Qwen3LoRAUniversal:
+    model = Qwen3LoRAUniversal("0.6B")
+    model.tokenizer = CharTokenizer()
+    model.lora_model = FakeLoraModel(model.tokenizer)
+    model.is_trained = True
+    return model
+
+
+class TestQwen3LoRAPredict:
+    """测试生成结果只解析新生成的token"""
+
+    def test_batch_predict_slices_generated_tokens(self):
+        model = make_model()
+        texts = ["今天天气真好，我很喜欢", "排队两个小时，太失望了", "喜欢", "这家店以后再也不来了，服务差"]
+
+        proba = model.predict_proba(texts, batch_size=3)
+
+        assert proba.tolist() == pytest.approx([0.8, 0.2, 0.8, 0.2])
+        assert model.predict(texts) == [1, 0, 1, 0]
+        assert model.lora_model.padding_sides[0] == "left"
+        assert model.tokenizer.padding_side == "right"
+
+    def test_predict_single_slices_generated_tokens(self):
+        model = make_model()
+
+        assert model.predict_single("质量太差了") == (0, 0.8)
+        assert model.predict_single("很喜欢这个设计") == (1, 0.8)
@@ -0,0 +1,199 @@
+"""
+测试MediaCrawler客户端自适应限速
+
+覆盖：
+1. 本地模拟限流的服务返回429时降速、退避并记录限流次数，恢复正常后逐步提速
+2. 响应体中的风控信号可单独上报，请求异常时不调整速率
+3. 接口按路径区分，路径中的内容id归一
+4. 在限速上下文内上报的响应体风控码连续出现时退避递增；B站客户端连续收到-412时逐次加长退避
+"""
+
+import asyncio
+import importlib
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from base.rate_control import RateController
+
+
+class RiskControlHandler(BaseHTTPRequestHandler):
+    """HTTP 200，响应体为B站风控码-412"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"code": -412, "message": "request was banned"}')
+
+    def log_message(self, *args):
+        pass
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """前throttled_requests个请求返回429，之后返回200"""
+
+    throttled_requests = 2
+    served = 0
+
+    def do_GET(self):
+        type(self).served += 1
+        status = 429 if type(self).served <= type(self).throttled_requests else 200
+        self.send_response(status)
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def media_crawler_config(monkeypatch):
+    """平台客户端按模块名导入config，测试期间换成MediaCrawler的配置（项目根目录也有config.py）"""
+    monkeypatch.delitem(sys.modules, "config", raising=False)
+    monkeypatch.syspath_prepend(str(media_crawler_root))
+    return importlib.import_module("config")
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def fake_server():
+    ThrottlingHandler.served = 0
+    server = serve(ThrottlingHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def risk_control_server():
+    server = serve(RiskControlHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def fetch_status(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def make_controller(**kwargs) -> RateController:
+    params = dict(rate=20, min_rate=1, max_rate=40, increase_step=5, decrease_factor=0.5,
+                  backoff_base=0.02, backoff_max=0.05, metrics_interval=0)
+    params.update(kwargs)
+    return RateController("test", **params)
+
+
+class TestRateController:
+    """测试AIMD限速与指标"""
+
+    def test_backs_off_on_throttling_server_and_recovers(self, fake_server):
+        controller = make_controller()
+        url = f"{fake_server}/api/search"
+        rates = []
+
+        async def crawl():
+            for _ in range(5):
+                async with controller.request(url) as ticket:
+                    ticket.observe(await asyncio.to_thread(fetch_status, url))
+                rates.append(controller.limiter(url).rate)
+
+        asyncio.run(crawl())
+
+        assert rates[:2] == [10, 5]
+        assert rates[2:] == [10, 15, 20]
+        metrics = controller.log_metrics()
+        assert metrics["requests"] == 5
+        assert metrics["throttle_events"] == 2
+        assert metrics["peak_concurrency"] == 1
+        assert 0 < metrics["effective_concurrency"] <= 1
+        assert controller.snapshot()["requests"] == 0
+
+    def test_body_signal_and_errors(self):
+        controller = make_controller()
+        url = "https://api.example.com/x/v2/reply"
+
+        async def crawl():
+            async with controller.request(url):
+                pass
+            controller.report_throttle(url, "code -412")
+            with pytest.raises(ConnectionError):
+                async with controller.request(url):
+                    raise ConnectionError("reset")
+
+        asyncio.run(crawl())
+
+        assert controller.limiter(url).rate == pytest.approx(12.5)
+        assert controller.throttle_events == 1
+        assert controller.requests == 2
+        assert controller.in_flight == 0
+
+    def test_consecutive_body_throttles_escalate_backoff(self, monkeypatch):
+        controller = make_controller(backoff_base=1, backoff_max=60)
+        url = "https://api.bilibili.com/x/web-interface/wbi/search/type"
+        monkeypatch.setattr("base.rate_control.random.uniform", lambda low, high: high)
+        limiter = controller.limiter(url)
+        monkeypatch.setattr(limiter, "acquire", lambda: asyncio.sleep(0))
+        on_throttle = limiter.on_throttle
+        backoffs = []
+        monkeypatch.setattr(limiter, "on_throttle", lambda: backoffs.append(on_throttle()) or backoffs[-1])
+
+        async def crawl():
+            for _ in range(3):
+                async with controller.request(url) as ticket:
+                    # 响应体风控码在上下文内上报
+                    ticket.throttle("code -412")
+
+        asyncio.run(crawl())
+
+        assert backoffs == [1, 2, 4]
+        assert limiter._consecutive_throttles == 3
+        assert controller.throttle_events == 3
+
+    def test_bilibili_client_escalates_on_risk_control_code(self, risk_control_server, media_crawler_config, monkeypatch):
+        pytest.importorskip("httpx")
+        pytest.importorskip("playwright")
+        from media_platform.bilibili import client as bilibili_client
+        from media_platform.bilibili.exception import DataFetchError
+
+        controller = make_controller(backoff_base=1, backoff_max=60)
+        monkeypatch.setattr(bilibili_client, "get_rate_controller", lambda platform: controller)
+        client = bilibili_client.BilibiliClient(headers={}, playwright_page=None, cookie_dict={})
+        url = f"{risk_control_server}/x/v2/reply"
+        limiter = controller.limiter(url)
+        monkeypatch.setattr(limiter, "acquire", lambda: asyncio.sleep(0))
+
+        async def crawl():
+            for _ in range(3):
+                with pytest.raises(DataFetchError):
+                    await client.request("GET", url)
+
+        asyncio.run(crawl())
+
+        assert limiter._consecutive_throttles == 3
+        assert controller.throttle_events == 3
+        assert limiter.rate == pytest.approx(2.5)
+
+    def test_endpoint_normalization(self):
+        assert RateController.endpoint_of("https://m.weibo.cn/detail/5012345678?x=1") == "/detail/{id}"
+        assert RateController.endpoint_of("https://www.xiaohongshu.com/explore/64a1b2c3d4e5f6a7b8c9d0e1") == "/explore/{id}"
+        assert RateController.endpoint_of("https://edith.xiaohongshu.com/api/sns/web/v1/search/notes") == "/api/sns/web/v1/search/notes"
@@ -0,0 +1,81 @@
+"""
+测试utils/report_registry.py中的引擎报告注册表
+
+覆盖：
+1. 基准之后的最新报告查询与按目录过滤
+2. 按搜索会话区分报告
+3. 等待新报告登记（同进程唤醒与超时）
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.report_registry import ReportRegistry
+
+
+ENGINE_DIRS = {
+    'insight': 'insight_engine_streamlit_reports',
+    'media': 'media_engine_streamlit_reports',
+    'query': 'query_engine_streamlit_reports'
+}
+
+
+def register_all(registry: ReportRegistry, name: str, session_id=None):
+    for engine, directory in ENGINE_DIRS.items():
+        registry.register(engine, f"{directory}/{name}.md", "武汉大学舆情", session_id)
+
+
+class TestReportRegistry:
+    """测试ReportRegistry的登记、查询与等待"""
+
+    def test_latest_after_baseline(self, tmp_path):
+        registry = ReportRegistry(str(tmp_path / "registry.db"))
+        register_all(registry, "old")
+        baseline = registry.last_id()
+
+        assert registry.latest('query', baseline) is None
+
+        registry.register('query', "query_engine_streamlit_reports/new.md", "武汉大学舆情")
+        registry.register('query', "other_dir/ignored.md", "武汉大学舆情")
+
+        record = registry.latest('query', baseline, output_dir=ENGINE_DIRS['query'])
+        assert record['file_path'] == "query_engine_streamlit_reports/new.md"
+        assert registry.latest('media', baseline) is None
+
+    def test_session_scoping(self, tmp_path):
+        registry = ReportRegistry(str(tmp_path / "registry.db"))
+        register_all(registry, "first", session_id="s1")
+        register_all(registry, "second", session_id="s2")
+
+        records = registry.latest_for_engines(ENGINE_DIRS, session_id="s1")
+        assert all(record['file_path'].endswith("first.md") for record in records.values())
+
+        records = registry.latest_for_engines(ENGINE_DIRS, session_id="s3")
+        assert not any(records.values())
+
+    def test_wait_for_registration(self, tmp_path):
+        registry = ReportRegistry(str(tmp_path / "registry.db"))
+        baseline = registry.last_id()
+
+        timer = threading.Timer(0.1, register_all, args=(registry, "later", "s1"))
+        timer.start()
+        start = time.monotonic()
+        records = registry.wait_for(ENGINE_DIRS, baseline, "s1", timeout=5)
+        timer.join()
+
+        assert all(records.values())
+        assert time.monotonic() - start < 2
+
+    def test_wait_timeout(self, tmp_path):
+        registry = ReportRegistry(str(tmp_path / "registry.db"))
+        registry.register('insight', "insight_engine_streamlit_reports/a.md")
+
+        records = registry.wait_for(ENGINE_DIRS, timeout=0.2)
+        assert records['insight'] is not None
+        assert records['media'] is None and records['query'] is None
@@ -0,0 +1,216 @@
+"""
+测试ReportEngine的分章节并行HTML生成
+
+覆盖：
+1. 报告模板按顶层加粗列表项或二级标题拆分章节，识别不出章节时整篇作为一个章节
+2. 各章节并行生成，完成顺序与模板顺序不同时仍按模板顺序拼装；失败章节重试后使用备用内容并保留检查点，重跑只补齐失败章节
+3. 模板拆分不出多个章节或分章节生成出错时退回单次整体生成，取消信号不会被退回逻辑吞掉
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ReportEngine.agent import ReportAgent
+from ReportEngine.llms import GenerationCancelled
+from ReportEngine.nodes import HTMLGenerationNode, SectionedHTMLGenerationNode
+from ReportEngine.prompts import SYSTEM_PROMPT_HTML_SECTION_GENERATION
+from ReportEngine.state import ReportState
+from ReportEngine.utils.section_utils import split_template_sections
+
+LIST_TEMPLATE = """# 品牌声誉分析报告模板
+
+- **1.0 报告摘要**
+  - 核心结论
+- **2.0 舆情走势**
+  - 声量变化
+  - 情感分布
+- **3.0 应对建议**
+"""
+
+HEADING_TEMPLATE = """# 社会公共热点事件分析报告
+
+## 执行摘要
+概述事件与核心发现
+
+## 事件概况
+### 时间线
+事件经过
+
+## 结论与展望
+"""
+
+
+class StubLLMClient:
+    """按系统提示词区分章节生成与整体生成的假LLM客户端，章节越靠前返回越慢"""
+
+    def __init__(self, fail_sections=(), section_delay: float = 0.05):
+        self.fail_sections = set(fail_sections)
+        self.section_delay = section_delay
+        self.section_calls = []
+        self.single_calls = 0
+        self.max_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def stream_invoke_to_string(self, system_prompt, user_prompt, **kwargs):
+        if system_prompt != SYSTEM_PROMPT_HTML_SECTION_GENERATION:
+            self.single_calls += 1
+            return "```html\n<html><body>单次整体生成</body></html>\n```"
+
+        llm_input = json.loads(user_prompt)
+        with self._lock:
+            self.section_calls.append(llm_input['section_title'])
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            time.sleep(self.section_delay * (llm_input['section_count'] - llm_input['section_index']))
+            if llm_input['section_title'] in self.fail_sections:
+                raise RuntimeError("LLM服务不可用")
+            return (f'<section id="{llm_input["section_id"]}" class="report-section">'
+                    f'<h2>{llm_input["section_title"]}</h2></section>')
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+def make_input(template: str) -> dict:
+    return {
+        'query': '武汉大学舆情',
+        'query_engine_report': '## 舆情走势\n声量在三天内上升',
+        'media_engine_report': '',
+        'insight_engine_report': '## 情感分布\n负面情绪占比下降',
+        'forum_logs': '',
+        'selected_template': template,
+    }
+
+
+def make_agent(llm_client, checkpoint_dir, mode: str = 'sectioned') -> ReportAgent:
+    """跳过LLM与注册表初始化，只装配HTML生成所需的节点"""
+    agent = ReportAgent.__new__(ReportAgent)
+    agent.config = SimpleNamespace(HTML_GENERATION_MODE=mode)
+    agent.state = ReportState(query='武汉大学舆情')
+    agent.html_generation_node = HTMLGenerationNode(llm_client)
+    agent.sectioned_html_generation_node = SectionedHTMLGenerationNode(
+        llm_client, max_workers=3, max_retries=1, checkpoint_dir=str(checkpoint_dir))
+    return agent
+
+
+def generate(agent: ReportAgent, template: str, **kwargs) -> str:
+    return agent._generate_html_report('武汉大学舆情', ['报告'], '', {'template_content': template}, **kwargs)
+
+
+class TestSplitTemplateSections:
+    """测试模板章节拆分"""
+
+    def test_list_and_heading_templates(self):
+        listed = split_template_sections(LIST_TEMPLATE)
+        assert listed['title'] == '品牌声誉分析报告模板'
+        assert [section['title'] for section in listed['sections']] == ['1.0 报告摘要', '2.0 舆情走势', '3.0 应对建议']
+        assert listed['sections'][1]['outline'].splitlines()[1:] == ['  - 声量变化', '  - 情感分布']
+
+        headed = split_template_sections(HEADING_TEMPLATE)
+        assert [section['title'] for section in headed['sections']] == ['执行摘要', '事件概况', '结论与展望']
+        assert '### 时间线' in headed['sections'][1]['outline']
+
+    def test_template_without_chapters(self):
+        result = split_template_sections("# 简要报告\n直接概述事件即可")
+
+        assert result['sections'] == [{'title': '简要报告', 'outline': "# 简要报告\n直接概述事件即可"}]
+
+
+class TestSectionedHTMLGeneration:
+    """测试并行生成、拼装顺序与章节重试"""
+
+    def test_parallel_sections_assembled_in_template_order(self, tmp_path):
+        llm = StubLLMClient()
+        node = SectionedHTMLGenerationNode(llm, max_workers=3, checkpoint_dir=str(tmp_path))
+        finished = []
+
+        html_content = node.run(make_input(HEADING_TEMPLATE),
+                                on_section=lambda index, section_html: finished.append(index))
+
+        assert llm.max_concurrency > 1
+        assert finished[0] == 2 and sorted(finished) == [0, 1, 2]
+        positions = [html_content.index(f'id="section-{i}"') for i in (1, 2, 3)]
+        assert positions == sorted(positions)
+        assert html_content.index('href="#section-1"') < html_content.index('href="#section-3"')
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_section_falls_back_and_resumes(self, tmp_path):
+        failing = StubLLMClient(fail_sections={'2.0 舆情走势'}, section_delay=0)
+        node = SectionedHTMLGenerationNode(failing, max_workers=2, max_retries=1, checkpoint_dir=str(tmp_path))
+
+        html_content = node.run(make_input(LIST_TEMPLATE))
+
+        assert failing.section_calls.count('2.0 舆情走势') == 2
+        assert '<h3>QueryEngine相关内容</h3>' in html_content
+        checkpoints = list(tmp_path.iterdir())
+        assert len(checkpoints) == 1
+        assert sorted(path.name for path in checkpoints[0].iterdir()) == ['section_00.html', 'section_02.html']
+
+        recovered = StubLLMClient(section_delay=0)
+        node.llm_client = recovered
+        html_content = node.run(make_input(LIST_TEMPLATE))
+
+        assert recovered.section_calls == ['2.0 舆情走势']
+        assert '<h3>QueryEngine相关内容</h3>' not in html_content
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSinglePassFallback:
+    """测试ReportAgent退回单次整体生成"""
+
+    def test_sectioned_mode_uses_sectioned_node(self, tmp_path):
+        llm = StubLLMClient(section_delay=0)
+
+        html_content = generate(make_agent(llm, tmp_path), LIST_TEMPLATE)
+
+        assert llm.single_calls == 0
+        assert len(llm.section_calls) == 3
+        assert 'id="section-3"' in html_content
+
+    def test_template_without_chapters_uses_single_pass(self, tmp_path):
+        llm = StubLLMClient()
+        agent = make_agent(llm, tmp_path)
+
+        html_content = generate(agent, "# 简要报告\n直接概述事件即可")
+
+        assert html_content == "<html><body>单次整体生成</body></html>"
+        assert llm.section_calls == []
+        assert agent.state.html_content == html_content
+
+    def test_sectioned_error_falls_back_to_single_pass(self, tmp_path):
+        llm = StubLLMClient()
+        # 检查点目录无法创建，分章节生成整体失败
+        blocked = tmp_path / "sections"
+        blocked.write_text("", encoding="utf-8")
+
+        html_content = generate(make_agent(llm, blocked), LIST_TEMPLATE)
+
+        assert html_content == "<html><body>单次整体生成</body></html>"
+        assert llm.single_calls == 1
+
+    def test_cancel_is_not_swallowed(self, tmp_path):
+        llm = StubLLMClient()
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        def cancelled(system_prompt, user_prompt, **kwargs):
+            if kwargs.get('cancel_event') is not None and kwargs['cancel_event'].is_set():
+                raise GenerationCancelled()
+            return ""
+
+        llm.stream_invoke_to_string = cancelled
+
+        with pytest.raises(GenerationCancelled):
+            generate(make_agent(llm, tmp_path), LIST_TEMPLATE, cancel_event=cancel_event)
@@ -0,0 +1,77 @@
+"""
+测试ReportEngine/task_queue.py中的报告任务队列
+
+覆盖：
+1. 取消排队中的任务时持锁出队并标记cancelled，不会再被工作线程取出执行
+2. 排队中取消的任务计入已结束任务，超出内存上限后被淘汰
+3. 执行函数抛出异常时任务标记为error，工作线程继续处理后续任务
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ReportEngine import task_queue
+from ReportEngine.task_queue import ReportJobQueue, ReportTask, TaskRegistry
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestReportJobQueue:
+    """测试取消与工作线程异常处理"""
+
+    def test_cancel_pending_task(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(task_queue, "MAX_FINISHED_TASKS_IN_MEMORY", 3)
+        release = threading.Event()
+        executed = []
+
+        def runner(task):
+            executed.append(task.task_id)
+            release.wait(5)
+            task.update_status("completed", 100)
+
+        queue = ReportJobQueue(runner, TaskRegistry(str(tmp_path / "tasks.db")), max_workers=1)
+        queue.start()
+        blocker = queue.submit(ReportTask("占用工作线程", "blocker"))
+        assert wait_until(lambda: executed == ["blocker"])
+
+        for i in range(5):
+            queue.submit(ReportTask(f"排队任务{i}", f"pending-{i}"))
+        assert all(queue.cancel(f"pending-{i}") for i in range(5))
+        assert not queue.cancel("pending-0")
+
+        assert all(not heap for heap in queue._pending.values())
+        assert list(queue._finished_order) == ["pending-2", "pending-3", "pending-4"]
+        assert set(queue.tasks) == {"blocker", "pending-2", "pending-3", "pending-4"}
+        assert queue.registry.get("pending-0")["status"] == "cancelled"
+
+        release.set()
+        assert wait_until(lambda: blocker.finished)
+        queue.submit(ReportTask("后续任务", "after"))
+        assert wait_until(lambda: queue.get("after").finished)
+        assert executed == ["blocker", "after"]
+
+    def test_runner_exception_marks_error(self, tmp_path):
+        def runner(task):
+            if task.query == "失败":
+                raise RuntimeError("LLM不可用")
+            task.update_status("completed", 100)
+
+        queue = ReportJobQueue(runner, TaskRegistry(str(tmp_path / "tasks.db")), max_workers=1)
+        queue.start()
+        failing = queue.submit(ReportTask("失败", "failing"))
+        succeeding = queue.submit(ReportTask("成功", "succeeding"))
+
+        assert wait_until(lambda: failing.finished and succeeding.finished)
+        assert (failing.status, failing.error_message) == ("error", "LLM不可用")
+        assert succeeding.status == "completed"
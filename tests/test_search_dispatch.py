@@ -0,0 +1,108 @@
+"""
+测试app.py中的统一搜索派发
+
+覆盖：
+1. 超过期限未返回的引擎标记为超时，其余引擎的结果照常返回（部分结果）
+2. timeout不是有限正数时返回400，超过上限时按SEARCH_DISPATCH_TIMEOUT截断
+3. async请求立即返回202，各引擎的受理结果通过search_dispatch事件推送，全部结束后推送search_dispatch_complete
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import app as flask_app
+
+
+def fake_dispatch(delays):
+    """按引擎名延迟返回的假派发函数，记录收到的期限"""
+    timeouts = []
+
+    def dispatch(app_name, payload, timeout):
+        timeouts.append(timeout)
+        time.sleep(delays.get(app_name, 0))
+        return {'success': True, 'app': app_name, 'query': payload['query']}
+
+    return dispatch, timeouts
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(flask_app.config.settings, 'ENGINE_WORKER_URL', None)
+    for name in flask_app.SEARCH_API_PORTS:
+        monkeypatch.setitem(flask_app.processes[name], 'status', 'running')
+    return flask_app.app.test_client()
+
+
+class TestDispatchSearch:
+    """测试并发派发与部分结果"""
+
+    def test_partial_results_on_timeout(self, monkeypatch):
+        dispatch, _ = fake_dispatch({'media': 3})
+        monkeypatch.setattr(flask_app, '_dispatch_search_to_app', dispatch)
+
+        started = time.monotonic()
+        results = flask_app.dispatch_search(['insight', 'media', 'query'], {'query': '武汉大学'}, timeout=0.5)
+
+        assert time.monotonic() - started < 2.5
+        assert results['insight'] == {'success': True, 'app': 'insight', 'query': '武汉大学'}
+        assert results['query']['success']
+        assert results['media'] == {'success': False, 'message': '请求超时', 'timed_out': True}
+
+    def test_parse_search_timeout(self):
+        assert flask_app.parse_search_timeout(None) == flask_app.SEARCH_DISPATCH_TIMEOUT
+        assert flask_app.parse_search_timeout("2.5") == 2.5
+        assert flask_app.parse_search_timeout(600) == flask_app.SEARCH_DISPATCH_TIMEOUT
+        for value in (0, -1, "nan", "inf", "abc", [1]):
+            assert flask_app.parse_search_timeout(value) is None
+
+
+class TestSearchEndpoint:
+    """测试/api/search的期限校验与异步派发"""
+
+    def test_rejects_invalid_timeout(self, client, monkeypatch):
+        dispatch, timeouts = fake_dispatch({})
+        monkeypatch.setattr(flask_app, '_dispatch_search_to_app', dispatch)
+
+        for value in (0, -1, "nan", "abc"):
+            response = client.post('/api/search', json={'query': '武汉大学', 'timeout': value})
+            assert response.status_code == 400
+            assert not response.get_json()['success']
+        assert timeouts == []
+
+        response = client.post('/api/search', json={'query': '武汉大学', 'timeout': 1})
+        body = response.get_json()
+        assert response.status_code == 200
+        assert not body['partial']
+        assert set(body['results']) == set(flask_app.SEARCH_API_PORTS)
+        assert timeouts == [1.0] * len(flask_app.SEARCH_API_PORTS)
+
+    def test_async_dispatch_emits_events(self, client, monkeypatch):
+        dispatch, _ = fake_dispatch({'insight': 0.1})
+        monkeypatch.setattr(flask_app, '_dispatch_search_to_app', dispatch)
+        events = []
+        completed = threading.Event()
+
+        def emit(event, data):
+            events.append((event, data))
+            if event == 'search_dispatch_complete':
+                completed.set()
+
+        monkeypatch.setattr(flask_app.socketio, 'emit', emit)
+
+        response = client.post('/api/search', json={'query': '武汉大学', 'async': True})
+        body = response.get_json()
+
+        assert response.status_code == 202
+        assert completed.wait(5)
+        dispatched = [data for event, data in events if event == 'search_dispatch']
+        assert sorted(data['app'] for data in dispatched) == sorted(body['apps'])
+        assert all(data['run_id'] == body['run_id'] and data['result']['success'] for data in dispatched)
+        assert events[-1] == ('search_dispatch_complete', {'run_id': body['run_id']})
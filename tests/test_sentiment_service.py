@@ -0,0 +1,87 @@
+"""
+测试utils/sentiment_service.py中的共享情感分析服务
+
+覆盖：
+1. 并发调用方的文本被合并为微批次，且不超过批次上限
+2. 批量推理失败时所有调用方收到异常
+3. 客户端经HTTP接口按顺序取回结果
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from werkzeug.serving import make_server
+
+from utils.sentiment_service import MicroBatcher, SentimentServiceClient, create_sentiment_app
+
+
+class RecordingModel:
+    """记录每次批量推理输入的模型替身"""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_texts(self, texts):
+        self.batches.append(list(texts))
+        return [{'text': text, 'sentiment_label': '正面' if '好' in text else '负面', 'confidence': 0.9,
+                 'probability_distribution': {}, 'success': True} for text in texts]
+
+    def get_model_info(self):
+        return {'model_name': 'recording'}
+
+
+class TestMicroBatcher:
+    """测试MicroBatcher的凑批与错误传播"""
+
+    def test_concurrent_callers_share_batches(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict_texts, max_batch_size=8, max_wait=0.05).start()
+        outputs = {}
+
+        def call(caller: int):
+            outputs[caller] = batcher.predict([f"{caller}-{i}" for i in range(3)], timeout=5)
+
+        threads = [threading.Thread(target=call, args=(caller,)) for caller in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        for caller in range(6):
+            assert [result['text'] for result in outputs[caller]] == [f"{caller}-{i}" for i in range(3)]
+        assert sum(len(batch) for batch in model.batches) == 18
+        assert len(model.batches) < 6
+        assert max(len(batch) for batch in model.batches) <= 8
+
+    def test_failure_propagates_to_callers(self):
+        def broken(texts):
+            raise RuntimeError("CUDA out of memory")
+
+        batcher = MicroBatcher(broken, max_wait=0).start()
+        futures = batcher.submit(["a", "b"])
+        for future in futures:
+            assert isinstance(future.exception(5), RuntimeError)
+
+
+class TestSentimentServiceClient:
+    """测试客户端与HTTP接口"""
+
+    def test_analyze_over_http(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict_texts).start()
+        server = make_server('127.0.0.1', 0, create_sentiment_app(model, batcher), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = SentimentServiceClient(f"http://127.0.0.1:{server.server_port}")
+            assert client.health()
+
+            results = client.analyze(["今天天气真好", "太差了"])
+            assert [result['sentiment_label'] for result in results] == ['正面', '负面']
+        finally:
+            server.shutdown()
@@ -0,0 +1,73 @@
+"""
+测试MediaCrawlerDB的get_sentiment_trend预聚合查询工具
+
+覆盖：
+1. 小时级汇总按天合并，并计算情感分布与负面占比
+2. 平台过滤与时间窗口参数传入查询
+3. 日期格式错误时返回错误信息
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools.search import MediaCrawlerDB
+
+
+def rollup_row(platform, hour, **counters):
+    row = dict.fromkeys(MediaCrawlerDB.ROLLUP_COUNTER_COLUMNS, 0)
+    row.update(counters)
+    row.update({'platform': platform, 'hour_ts': int(hour.timestamp())})
+    return row
+
+
+class TestSentimentTrend:
+    """测试趋势聚合工具"""
+
+    def test_merges_hours_into_days(self, monkeypatch):
+        db = MediaCrawlerDB()
+        captured = {}
+        rows = [
+            rollup_row('weibo', datetime(2025, 8, 20, 9), comment_count=3, likes=10, negative=2, positive=1),
+            rollup_row('weibo', datetime(2025, 8, 20, 21), comment_count=1, very_negative=1),
+            rollup_row('weibo', datetime(2025, 8, 21, 8), content_count=2, neutral=1, unscored=1),
+        ]
+
+        def fake_query(query, params=None, raise_errors=False):
+            captured['query'], captured['params'] = query, params
+            return rows
+
+        monkeypatch.setattr(db, '_execute_query', fake_query)
+        response = db.get_sentiment_trend('高考', start_date='2025-08-20', end_date='2025-08-21', platform='weibo')
+
+        assert response.error_message is None
+        assert captured['params']['platform'] == 'weibo'
+        assert captured['params']['start_ts'] == int(datetime(2025, 8, 20).timestamp())
+        assert captured['params']['end_ts'] == int(datetime(2025, 8, 22).timestamp())
+
+        first, second = response.aggregates
+        assert (first['bucket'], first['comment_count'], first['engagement']['likes']) == ('2025-08-20', 4, 10)
+        assert first['sentiment_distribution']['负面'] == 2
+        assert first['negative_ratio'] == 0.75
+        assert (second['bucket'], second['content_count'], second['unscored']) == ('2025-08-21', 2, 1)
+        assert response.results_count == 2
+        assert response.results[0].content_type == 'aggregate'
+
+    def test_total_granularity_single_bucket(self, monkeypatch):
+        db = MediaCrawlerDB()
+        rows = [rollup_row('weibo', datetime(2025, 8, 20, 9), positive=1),
+                rollup_row('weibo', datetime(2025, 8, 21, 9), positive=1)]
+        monkeypatch.setattr(db, '_execute_query', lambda query, params=None, raise_errors=False: rows)
+
+        response = db.get_sentiment_trend('高考', start_date='2025-08-20', end_date='2025-08-21', granularity='total')
+
+        assert len(response.aggregates) == 1
+        assert response.aggregates[0]['sentiment_distribution']['正面'] == 2
+
+    def test_invalid_date(self):
+        response = MediaCrawlerDB().get_sentiment_trend('高考', start_date='2025/08/20')
+        assert response.error_message
@@ -0,0 +1,114 @@
+"""
+测试MediaCrawler贴吧页面提取
+
+覆盖：
+1. 基于预编译XPath的单次解析，从tieba/test_data各页面提取的字段正确
+2. 楼中楼按首条、其余的顺序返回，创作者主页的关注数、粉丝数、性别、IP等字段正确
+3. 配置解析进程时，在进程池中提取的结果与直接提取一致
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+pytest.importorskip("lxml")
+
+from media_platform.tieba.help import TieBaExtractor
+from model.m_baidu_tieba import TiebaComment
+
+TEST_DATA_DIR = media_crawler_root / "media_platform" / "tieba" / "test_data"
+
+CREATOR_PAGE = """
+<html><body>
+<div class="userinfo_left_head"><img src="https://example.com/avatar.jpg"></div>
+<span class="userinfo_username ">测试用户</span>
+<div class="userinfo_userdata"><span class="userinfo_sex sex_female"></span><span>IP属地:广东</span></div>
+<span class="concern_num">(<a href="/home/concern?id=1">12</a>)</span>
+<span class="concern_num">(<a href="/home/fans?id=1">345</a>)</span>
+<p class="space"><a href="/home/main?un=%E6%B5%8B%E8%AF%95&id=tb.1.abc">主页</a></p>
+<ul class="new_list clearfix">
+<div class="thread_name"><a href="/p/111?fr=home">a</a><a href="/p/999">b</a></div>
+<div class="thread_name"><a href="/p/222">c</a></div>
+</ul>
+</body></html>
+"""
+
+
+def read_test_data(name: str) -> str:
+    return (TEST_DATA_DIR / name).read_text(encoding="utf-8")
+
+
+def make_parent_comment() -> TiebaComment:
+    return TiebaComment(comment_id="123456", content="content", note_id="9117905169",
+                        note_url="https://tieba.baidu.com/p/9117905169", tieba_id="4513750",
+                        tieba_name="网球风云吧", tieba_link="https://tieba.baidu.com/f?kw=网球风云吧")
+
+
+class TestTieBaExtractor:
+    """测试贴吧页面提取"""
+
+    def test_extract_pages(self):
+        extractor = TieBaExtractor()
+
+        notes = extractor.extract_search_note_list(read_test_data("search_keyword_notes.html"))
+        assert len(notes) == 10
+        assert (notes[0].note_id, notes[0].user_nickname, notes[0].tieba_name, notes[0].publish_time) == (
+            "9117888152", "VR虚拟达人", "武汉交互空间", "2024-08-05 16:45")
+
+        notes = extractor.extract_tieba_note_list(read_test_data("tieba_note_list.html"))
+        assert len(notes) == 48
+        assert (notes[0].note_id, notes[0].user_nickname, notes[0].total_replay_num) == ("9079949995", "公子伯仲", 18)
+
+        note = extractor.extract_note_detail(read_test_data("note_detail.html"))
+        assert (note.note_id, note.title, note.tieba_name) == ("9117905169", "对于一个父亲来说，这个女儿14岁就死了", "以太比特吧")
+        assert (note.ip_location, note.publish_time) == ("广东", "2024-08-05 16:56")
+        assert (note.total_replay_num, note.total_replay_page) == (786, 13)
+
+        comments = extractor.extract_tieba_note_parment_comments(read_test_data("note_comments.html"), "123456")
+        assert len(comments) == 30
+        assert (comments[0].comment_id, comments[0].content, comments[0].tieba_name) == (
+            "150726491368", "中国队第22金！无悬念！", "网球风云吧")
+        assert (comments[0].ip_location, comments[0].publish_time) == ("福建", "2024-08-06 22:09")
+        assert (comments[5].ip_location, comments[5].sub_comment_count) == ("湖北", 7)
+
+    def test_sub_comments_and_creator(self):
+        extractor = TieBaExtractor()
+
+        sub_comments = extractor.extract_tieba_note_sub_comments(
+            read_test_data("note_sub_comments.html"), make_parent_comment())
+        assert len(sub_comments) == 10
+        assert (sub_comments[0].comment_id, sub_comments[0].user_nickname) == ("150726504693", "heinzfrentzen")
+        assert (sub_comments[1].content, sub_comments[1].publish_time) == ("陈芋汐水花也不小", "2024-8-6 22:12")
+        assert all(comment.parent_comment_id == "123456" for comment in sub_comments)
+
+        creator = extractor.extract_creator_info(CREATOR_PAGE)
+        assert (creator.user_id, creator.user_name, creator.nickname) == ("tb.1.abc", "测试", "测试用户")
+        assert (creator.gender, creator.ip_location, creator.follows, creator.fans) == ("女", "广东", 12, 345)
+        assert extractor.extract_tieba_thread_id_list_from_creator_page(CREATOR_PAGE) == ["111", "222"]
+
+    def test_process_pool_matches_inline(self):
+        page_content = read_test_data("note_comments.html")
+        inline = TieBaExtractor().extract_tieba_note_parment_comments(page_content, "123456")
+
+        extractor = TieBaExtractor(parse_workers=2)
+
+        async def main():
+            return await asyncio.gather(
+                *(extractor.run("extract_tieba_note_parment_comments", page_content, "123456") for _ in range(4)),
+                extractor.run("extract_tieba_note_sub_comments", read_test_data("note_sub_comments.html"),
+                              make_parent_comment()),
+            )
+
+        try:
+            *pooled, sub_comments = asyncio.run(main())
+        finally:
+            extractor.close()
+
+        assert all(result == inline for result in pooled)
+        assert len(sub_comments) == 10
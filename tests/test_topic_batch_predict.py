@@ -0,0 +1,126 @@
+"""
+测试话题分类批量标注的数据库输入输出
+
+覆盖：
+1. DbSource按方言给表名/列名加引号，desc等保留字列可作文本字段，按主键键集分页读取
+2. DbSink同一窗口先删后插，重复写入不产生重复行；close不释放与DbSource共用的engine
+3. 数据库到数据库的流式标注按断点续跑
+4. JsonlSink重新开始时覆盖已有输出，续跑时截去断点之后多写出的行
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加话题分类目录到路径（batch_predict按脚本方式导入predict）
+topic_dir = Path(__file__).parent.parent / "SentimentAnalysisModel" / "BertTopicDetection_Finetuned"
+sys.path.insert(0, str(topic_dir))
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+import batch_predict
+from batch_predict import Checkpoint, DbSink, DbSource, JsonlSink, JsonlSource, run_batch
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'notes.db'}", future=True)
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text('CREATE TABLE xhs_note (note_id INTEGER PRIMARY KEY, "desc" TEXT)'))
+        conn.execute(sqlalchemy.text('INSERT INTO xhs_note (note_id, "desc") VALUES (:id, :desc)'),
+                     [{"id": i, "desc": f"笔记{i}" * i} for i in range(1, 8)])
+    yield engine
+    engine.dispose()
+
+
+def fake_predict_topk_batch(model, tokenizer, device, texts, max_length, top_k):
+    return [[(f"话题{len(text) % 3}", 0.9), ("其他", 0.1)] for text in texts]
+
+
+class TestDbSourceAndSink:
+    """测试数据库读取与写回"""
+
+    def test_reserved_word_column_and_pagination(self, engine):
+        source = DbSource(engine, "xhs_note", "note_id", "desc", fetch_size=3)
+
+        records = list(source.iter_records(None))
+
+        assert source.text_field == '"desc"'
+        assert [record_id for _, record_id, _ in records] == [str(i) for i in range(1, 8)]
+        assert records[1] == (2, "2", "笔记2笔记2")
+        assert [position for position, _, _ in source.iter_records(5)] == [6, 7]
+        with pytest.raises(ValueError):
+            DbSource(engine, "xhs_note; DROP TABLE xhs_note", "note_id", "desc")
+
+    def test_sink_rewrite_and_close(self, engine):
+        sink = DbSink(engine, "xhs_note_topics")
+        sink.write([("1", ["话题1"], [0.9]), ("2", ["话题2"], [0.8])])
+        sink.write([("2", ["话题0"], [0.7])])
+        sink.close()
+
+        with engine.connect() as conn:
+            rows = conn.execute(sqlalchemy.text(
+                "SELECT record_id, labels, scores FROM xhs_note_topics ORDER BY record_id")).fetchall()
+        assert [(row[0], json.loads(row[1]), json.loads(row[2])) for row in rows] == [
+            ("1", ["话题1"], [0.9]), ("2", ["话题0"], [0.7])]
+
+    def test_db_round_trip_resumes_from_checkpoint(self, engine, tmp_path, monkeypatch):
+        monkeypatch.setattr(batch_predict, "predict_topk_batch", fake_predict_topk_batch)
+        checkpoint = Checkpoint(str(tmp_path / "topics.checkpoint.json"))
+        sink = DbSink(engine, "xhs_note_topics")
+
+        processed = run_batch(None, None, None, DbSource(engine, "xhs_note", "note_id", "desc", fetch_size=2),
+                              sink, checkpoint, batch_size=2, window_batches=1, top_k=2)
+        assert processed == 7
+        assert checkpoint.load()["position"] == 7
+
+        with engine.begin() as conn:
+            conn.execute(sqlalchemy.text('INSERT INTO xhs_note (note_id, "desc") VALUES (8, :desc)'), {"desc": "新笔记"})
+        state = checkpoint.load()
+        processed = run_batch(None, None, None, DbSource(engine, "xhs_note", "note_id", "desc"), sink, checkpoint,
+                              start=state["position"], processed=state["processed"], batch_size=2, window_batches=1)
+        sink.close()
+
+        assert processed == 8
+        with engine.connect() as conn:
+            rows = dict(conn.execute(sqlalchemy.text("SELECT record_id, labels FROM xhs_note_topics")).fetchall())
+        assert sorted(rows, key=int) == [str(i) for i in range(1, 9)]
+        assert json.loads(rows["8"]) == ["话题0", "其他"]
+
+
+class TestJsonlSink:
+    """测试JSONL输出的覆盖与续跑"""
+
+    def test_fresh_run_overwrites_and_resume_trims(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(batch_predict, "predict_topk_batch", fake_predict_topk_batch)
+        input_path, output_path = tmp_path / "notes.jsonl", tmp_path / "topics.jsonl"
+        input_path.write_text("".join(json.dumps({"id": i, "text": "文" * i}) + "\n" for i in range(1, 7)),
+                              encoding="utf-8")
+        checkpoint = Checkpoint(str(tmp_path / "topics.checkpoint.json"))
+
+        def run(keep_rows, start=None, processed=0):
+            sink = JsonlSink(str(output_path), keep_rows=keep_rows)
+            try:
+                return run_batch(None, None, None, JsonlSource(str(input_path), "id", "text"), sink, checkpoint,
+                                 start=start, processed=processed, batch_size=2, window_batches=1)
+            finally:
+                sink.close()
+
+        def output_ids():
+            return [json.loads(line)["id"] for line in output_path.read_text(encoding="utf-8").splitlines()]
+
+        run(None)
+        run(None)
+        assert output_ids() == [str(i) for i in range(1, 7)]
+
+        # 模拟中断：断点停在第4行，输出文件多写出了第5行与半行
+        checkpoint.save(4, 4)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps({"id": str(i)}) + "\n" for i in range(1, 6)) + '{"id": "6", "lab')
+        state = checkpoint.load()
+        assert run(state["processed"], start=state["position"], processed=state["processed"]) == 6
+        assert output_ids() == [str(i) for i in range(1, 7)]
@@ -0,0 +1,120 @@
+"""
+测试MediaCrawler流式词频统计
+
+覆盖：
+1. 逐个读出JSON数组文件的元素（元素跨越读取块、字符串中含括号与转义、数字在小数点/指数/负号处被切开），
+   非数组文件读出整个值，截断的文件抛出ValueError，文件中间的非法内容不读完整个文件就报错
+2. 词汇量超过容量时TopKCounter只保留高频词，计数误差不超过max_error
+3. 分词进程池逐块统计的词频与整体分词统计一致，停用词与自定义词生效
+"""
+
+import asyncio
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+from tools.word_frequency import TopKCounter, WordFrequencyCounter, iter_json_array
+
+
+class TestIterJsonArray:
+    """测试逐个读出JSON数组元素"""
+
+    def test_stream_items(self, tmp_path):
+        comments = [
+            {"comment_id": i, "content": f"第{i}条评论 [\"引号\"] {{括号}} \\ 反斜杠", "like_count": i * 1000}
+            for i in range(200)
+        ]
+        path = tmp_path / "comments.json"
+        path.write_text(json.dumps(comments, ensure_ascii=False, indent=4), encoding="utf-8")
+
+        assert list(iter_json_array(str(path), read_size=7)) == comments
+        assert list(iter_json_array(str(path))) == comments
+
+        path.write_text('{"content": "单条"}', encoding="utf-8")
+        assert list(iter_json_array(str(path))) == [{"content": "单条"}]
+        path.write_text(" [ ] ", encoding="utf-8")
+        assert list(iter_json_array(str(path))) == []
+        path.write_text('[{"content": "a"}, {"content": "b', encoding="utf-8")
+        with pytest.raises(ValueError, match="truncated"):
+            list(iter_json_array(str(path), read_size=4))
+
+    def test_numbers_split_across_reads(self, tmp_path):
+        values = [-3.5, 1e-7, -2.25E+3, 0.125, 12345, -0.0, True, False, None, "1.5", [1.5, -2e3], {"x": -3.5}]
+        path = tmp_path / "numbers.json"
+        for text in (json.dumps(values), json.dumps(values, indent=2), "[-3.5]", "[ 1.5e-3 ,-7 ]"):
+            path.write_text(text, encoding="utf-8")
+            expected = json.loads(text)
+            for read_size in (1, 2, 3, 5):
+                assert list(iter_json_array(str(path), read_size=read_size)) == expected
+
+        path.write_text("[1.5, 2", encoding="utf-8")
+        for read_size in (1, 2, 64):
+            with pytest.raises(ValueError, match="truncated"):
+                list(iter_json_array(str(path), read_size=read_size))
+
+    def test_invalid_content_fails_fast(self, tmp_path):
+        path = tmp_path / "invalid.json"
+        tail = ", ".join(json.dumps({"content": f"评论{i}"}, ensure_ascii=False) for i in range(20000))
+        path.write_text(f'[{{"content": "a"}}, {{"content": "b"}} oops, {tail}]', encoding="utf-8")
+
+        items = []
+        with pytest.raises(ValueError, match="invalid"):
+            for item in iter_json_array(str(path), read_size=16):
+                items.append(item)
+        assert items == [{"content": "a"}]
+
+        path.write_text(f'[{{"content": "a"}}, {{"content": bad}}, {tail}]', encoding="utf-8")
+        with pytest.raises(ValueError, match="invalid"):
+            list(iter_json_array(str(path), read_size=16))
+
+
+class TestTopKCounter:
+    """测试有界词频计数"""
+
+    def test_keeps_heavy_hitters(self):
+        exact = Counter()
+        counter = TopKCounter(capacity=50)
+        for batch in range(100):
+            counts = Counter({f"高频{i}": 20 for i in range(10)})
+            counts.update({f"长尾{batch}-{i}": 1 for i in range(40)})
+            exact.update(counts)
+            counter.update(counts)
+
+        assert len(counter) <= 100
+        assert counter.prunes > 0
+        assert counter.total == sum(exact.values())
+        top = dict(counter.most_common(10))
+        assert set(top) == {f"高频{i}" for i in range(10)}
+        assert all(exact[word] - counter.max_error <= count <= exact[word] for word, count in top.items())
+
+        unbounded = TopKCounter()
+        unbounded.update(exact)
+        assert unbounded.most_common() == exact.most_common()
+
+
+class TestWordFrequencyCounter:
+    """测试分词进程池统计词频"""
+
+    def test_process_pool_matches_single_pass(self):
+        jieba = pytest.importorskip("jieba")
+        texts = [f"小米汽车的续航表现不错，雷军说高频词第{i % 7}次出现" for i in range(300)]
+        stop_words = {"的", "，", "说"}
+        jieba.add_word("高频词")
+        expected = Counter(word for word in jieba.lcut(" ".join(texts)) if word not in stop_words and word.strip())
+
+        counter = WordFrequencyCounter(stop_words, custom_words=["高频词"], workers=2, chunk_size=32)
+        result = asyncio.run(counter.count(iter(texts)))
+
+        assert dict(result.most_common()) == dict(expected)
+        assert result.counts["高频词"] == 300
+        assert "的" not in result.counts
+
+        counter = WordFrequencyCounter(stop_words, custom_words=["高频词"], workers=0, chunk_size=1000)
+        assert asyncio.run(counter.count(texts)).counts == expected
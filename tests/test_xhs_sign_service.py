@@ -0,0 +1,175 @@
+"""
+测试MediaCrawler小红书签名服务
+
+覆盖：
+1. 等待中的签名请求在一次evaluate中批量调用window.mnsv2，每批不超过batch_size，结果与请求一一对应
+2. b1按缓存时间复用，invalidate或过期后重新读取localStorage
+3. 补开签名页面后各页面并行签名，打开失败的页面被关闭并保留已打开的页面；close关闭补开页面并结束等待中的请求
+4. evaluate进行中close时，本批次在途的请求以RuntimeError结束，不会一直挂起
+"""
+
+import asyncio
+import base64
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加MediaCrawler目录到路径
+media_crawler_root = Path(__file__).parent.parent / "MindSpider" / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.insert(0, str(media_crawler_root))
+
+pytest.importorskip("playwright")
+pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def sign_service_module(monkeypatch):
+    """media_platform.xhs按模块名导入config，测试期间换成MediaCrawler的配置（项目根目录也有config.py）"""
+    monkeypatch.delitem(sys.modules, "config", raising=False)
+    monkeypatch.syspath_prepend(str(media_crawler_root))
+    importlib.import_module("config")
+    return importlib.import_module("media_platform.xhs.sign_service")
+
+
+class FakePage:
+    """按脚本应答evaluate的假页面，记录每次批量签名的请求数"""
+
+    def __init__(self, name: str, b1: str = "b1-value", fail_goto: bool = False, delay: float = 0.01):
+        self.name = name
+        self.b1 = b1
+        self.fail_goto = fail_goto
+        self.delay = delay
+        self.batches = []
+        self.b1_reads = 0
+        self.closed = False
+
+    async def evaluate(self, script, arg=None):
+        if "localStorage" in script:
+            self.b1_reads += 1
+            return self.b1
+        self.batches.append(len(arg))
+        await asyncio.sleep(self.delay)
+        return [f"{self.name}:{d}" for _, d in arg]
+
+    async def goto(self, url):
+        if self.fail_goto:
+            raise TimeoutError(f"goto {url} timeout")
+
+    async def wait_for_function(self, script, timeout=None):
+        return True
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowserContext:
+    def __init__(self, pages):
+        self._pages = list(pages)
+
+    async def new_page(self):
+        return self._pages.pop(0)
+
+
+def decode_mnsv2(x_s: str) -> str:
+    return json.loads(base64.b64decode(x_s[len("XYS_"):]))["x3"]
+
+
+class TestXhsSignService:
+    """测试签名批量、b1缓存与页面池"""
+
+    def test_batches_pending_requests(self, sign_service_module):
+        page = FakePage("main")
+        service = sign_service_module.XhsSignService(page, batch_size=8, metrics_interval=0)
+
+        async def main():
+            try:
+                return await asyncio.gather(*(service._mnsv2(f"c{i}", f"d{i}") for i in range(20)))
+            finally:
+                await service.close()
+
+        results = asyncio.run(main())
+
+        assert results == [f"main:d{i}" for i in range(20)]
+        assert page.batches == [8, 8, 4]
+        assert service.batches == 3
+
+    def test_b1_cache_and_invalidate(self, sign_service_module):
+        page = FakePage("main")
+        service = sign_service_module.XhsSignService(page, metrics_interval=0)
+
+        async def main():
+            try:
+                first = await asyncio.gather(*(
+                    service.sign(f"/api/sns/web/v1/feed?id={i}", None, a1="a1") for i in range(5)))
+                page.b1 = "b1-refreshed"
+                cached = await service.sign("/api/sns/web/v1/feed", {"source_note_id": "1"}, a1="a1")
+                service.invalidate()
+                refreshed = await service.get_b1()
+                return first, cached, refreshed, service.snapshot()
+            finally:
+                await service.close()
+
+        first, cached, refreshed, metrics = asyncio.run(main())
+
+        assert page.b1_reads == 2
+        assert refreshed == "b1-refreshed"
+        assert all(set(signs) == {"x-s", "x-t", "x-s-common", "x-b3-traceid"} for signs in first)
+        assert decode_mnsv2(cached["x-s"]).startswith("main:")
+        assert (metrics["signed"], metrics["failed"]) == (6, 0)
+
+        expiring = sign_service_module.XhsSignService(FakePage("main"), b1_cache_sec=0, metrics_interval=0)
+
+        async def read_twice():
+            await expiring.get_b1()
+            await expiring.get_b1()
+
+        asyncio.run(read_twice())
+        assert expiring._primary_page.b1_reads == 2
+
+    def test_expand_page_pool_and_close(self, sign_service_module):
+        main_page = FakePage("main", delay=0.05)
+        extra_pages = [FakePage("extra1", delay=0.05), FakePage("extra2", delay=0.05), FakePage("broken", fail_goto=True)]
+        service = sign_service_module.XhsSignService(main_page, batch_size=2, metrics_interval=0)
+        context = FakeBrowserContext(extra_pages)
+
+        async def main():
+            # 第一个请求先启动主页面的worker，补开页面后新增的worker一起消费队列
+            first = asyncio.ensure_future(service._mnsv2("c", "first"))
+            await asyncio.sleep(0)
+            await service.expand(context, "https://www.xiaohongshu.com", pool_size=4)
+            results = await asyncio.gather(first, *(service._mnsv2("c", f"d{i}") for i in range(12)))
+            waiting = asyncio.ensure_future(service._mnsv2("c", "late"))
+            await service.close()
+            return results, waiting
+
+        results, waiting = asyncio.run(main())
+
+        assert len(service.pages) == 1
+        assert [page.closed for page in extra_pages] == [True, True, True]
+        assert results[0] == "main:first"
+        assert sorted(result.split(":")[1] for result in results[1:]) == sorted(f"d{i}" for i in range(12))
+        signers = {result.split(":")[0] for result in results}
+        assert signers == {"main", "extra1", "extra2"}
+        assert all(size <= 2 for page in (main_page, *extra_pages[:2]) for size in page.batches)
+        assert waiting.done()
+        with pytest.raises((RuntimeError, asyncio.CancelledError)):
+            waiting.result()
+
+    def test_close_during_evaluate_fails_in_flight_requests(self, sign_service_module):
+        page = FakePage("main", delay=10)
+        service = sign_service_module.XhsSignService(page, batch_size=4, metrics_interval=0)
+
+        async def main():
+            in_flight = [asyncio.ensure_future(service._mnsv2("c", f"d{i}")) for i in range(3)]
+            while not page.batches:
+                await asyncio.sleep(0)
+            await service.close()
+            return await asyncio.wait_for(asyncio.gather(*in_flight, return_exceptions=True), timeout=1)
+
+        results = asyncio.run(main())
+
+        assert page.batches == [3]
+        assert all(isinstance(result, RuntimeError) and "closed" in str(result) for result in results)
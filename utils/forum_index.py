@@ -0,0 +1,244 @@
+"""
+Forum日志增量索引
+为forum.log维护按发言者/会话分组的字节偏移索引，增量追加新内容，
+使“最新HOST发言”“最近N条Agent发言”“分页历史”等查询无需重复读取整个日志文件
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+from loguru import logger
+
+# 匹配格式: [时间] [来源] 内容
+FORUM_LINE_PATTERN = re.compile(r'\[(\d{2}:\d{2}:\d{2})\]\s*\[([A-Z]+)\]\s*(.*)')
+AGENT_SOURCES = ('INSIGHT', 'MEDIA', 'QUERY')
+SESSION_START_MARKER = '=== ForumEngine 监控开始'
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+HEAD_FINGERPRINT_BYTES = 64
+
+
+class ForumLogIndex:
+    """forum.log的增量字节偏移索引（线程安全）
+
+    每条发言记录为 [offset, length, timestamp, source, session]，
+    并按来源维护条目下标列表，查询时只需seek到对应偏移读取单行。
+    索引以JSON形式持久化在日志旁（forum.log.idx），进程重启后继续增量追加。
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.index_path = self.log_path.with_name(self.log_path.name + INDEX_SUFFIX)
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        """清空内存中的索引状态"""
+        self.indexed_size = 0
+        self.inode = None
+        self.head = ''
+        self.entries: List[list] = []
+        self.by_source: Dict[str, List[int]] = {}
+        self.agent_entries: List[int] = []
+        self.sessions: List[int] = []  # 每个会话第一条记录的下标
+
+    def _load(self):
+        """从磁盘加载已持久化的索引"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return
+            self.indexed_size = data['indexed_size']
+            self.inode = data['inode']
+            self.head = data['head']
+            self.entries = data['entries']
+            self.sessions = data['sessions']
+            for i, entry in enumerate(self.entries):
+                self._register(i, entry[3])
+        except Exception as e:
+            logger.warning(f"加载forum索引失败，将重建: {e}")
+            self._reset()
+
+    def _save(self):
+        """原子写入索引文件"""
+        data = {
+            'version': INDEX_VERSION,
+            'indexed_size': self.indexed_size,
+            'inode': self.inode,
+            'head': self.head,
+            'entries': self.entries,
+            'sessions': self.sessions,
+        }
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.warning(f"保存forum索引失败: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _register(self, entry_idx: int, source: str):
+        self.by_source.setdefault(source, []).append(entry_idx)
+        if source in AGENT_SOURCES:
+            self.agent_entries.append(entry_idx)
+
+    def _read_head(self) -> str:
+        with open(self.log_path, 'rb') as f:
+            return f.read(HEAD_FINGERPRINT_BYTES).hex()
+
+    def refresh(self) -> bool:
+        """追加索引日志中新写入的完整行
+
+        日志被清空或重建（inode变化、文件变短、开头内容改变）时重建索引。
+
+        Returns:
+            日志文件是否存在
+        """
+        with self._lock:
+            try:
+                stat = self.log_path.stat()
+            except FileNotFoundError:
+                if self.entries or self.indexed_size:
+                    self._reset()
+                return False
+
+            if stat.st_size == self.indexed_size and stat.st_ino == self.inode:
+                return True
+
+            head = self._read_head()
+            if (stat.st_ino != self.inode or stat.st_size < self.indexed_size
+                    or not head.startswith(self.head)):
+                self._reset()
+            self.inode = stat.st_ino
+            self.head = head
+
+            if stat.st_size > self.indexed_size:
+                previous_size = self.indexed_size
+                self._tail(stat.st_size)
+                if self.indexed_size != previous_size:
+                    self._save()
+            return True
+
+    def _tail(self, size: int):
+        """从上次索引位置读取到文件末尾，只索引以换行结尾的完整行"""
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.indexed_size)
+            chunk = f.read(size - self.indexed_size)
+
+        offset = self.indexed_size
+        for raw_line in chunk.splitlines(keepends=True):
+            if not raw_line.endswith(b'\n'):
+                break  # 写入中的半行，留待下次追加
+            line = raw_line.decode('utf-8', errors='ignore')
+            match = FORUM_LINE_PATTERN.match(line)
+            if match:
+                timestamp, source, content = match.groups()
+                if source == 'SYSTEM' and content.startswith(SESSION_START_MARKER):
+                    self.sessions.append(len(self.entries))
+                entry = [offset, len(raw_line), timestamp, source, max(len(self.sessions) - 1, 0)]
+                self._register(len(self.entries), source)
+                self.entries.append(entry)
+            offset += len(raw_line)
+        self.indexed_size = offset
+
+    def _read_entries(self, entry_indices: List[int]) -> List[Dict[str, Any]]:
+        """按偏移读取若干条记录的内容"""
+        results = []
+        if not entry_indices:
+            return results
+        with open(self.log_path, 'rb') as f:
+            for idx in entry_indices:
+                offset, length, timestamp, source, session = self.entries[idx]
+                f.seek(offset)
+                line = f.read(length).decode('utf-8', errors='ignore')
+                match = FORUM_LINE_PATTERN.match(line)
+                content = match.group(3) if match else ''
+                results.append({
+                    'timestamp': timestamp,
+                    'source': source,
+                    'session': session,
+                    # 处理转义的换行符，还原为实际换行
+                    'content': content.replace('\\n', '\n').strip(),
+                })
+        return results
+
+    def latest(self, source: str) -> Optional[Dict[str, Any]]:
+        """获取指定来源的最新一条发言"""
+        if not self.refresh():
+            return None
+        with self._lock:
+            indices = self.by_source.get(source)
+            if not indices:
+                return None
+            return self._read_entries(indices[-1:])[0]
+
+    def speeches(self, source: str) -> List[Dict[str, Any]]:
+        """获取指定来源的全部发言"""
+        if not self.refresh():
+            return []
+        with self._lock:
+            return self._read_entries(self.by_source.get(source, []))
+
+    def recent_agent_speeches(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """获取最近limit条Agent发言（时间顺序）"""
+        if not self.refresh() or limit <= 0:
+            return []
+        with self._lock:
+            return self._read_entries(self.agent_entries[-limit:])
+
+    def page(self, offset: int = 0, limit: int = 50, session: Optional[int] = None) -> Dict[str, Any]:
+        """分页获取历史记录
+
+        Args:
+            offset: 起始条目位置
+            limit: 每页条数
+            session: 只返回指定会话的记录，-1表示最新会话，None表示全部
+
+        Returns:
+            包含items和total的字典
+        """
+        if not self.refresh():
+            return {'items': [], 'total': 0}
+        with self._lock:
+            start, end = 0, len(self.entries)
+            if session is not None and self.sessions:
+                session_idx = session if session >= 0 else len(self.sessions) + session
+                if 0 <= session_idx < len(self.sessions):
+                    start = self.sessions[session_idx]
+                    if session_idx + 1 < len(self.sessions):
+                        end = self.sessions[session_idx + 1]
+                else:
+                    start = end
+            total = end - start
+            first = start + max(offset, 0)
+            last = min(first + max(limit, 0), end)
+            items = self._read_entries(list(range(first, last)))
+            return {'items': items, 'total': total}
+
+
+_indexes: Dict[str, ForumLogIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_forum_index(log_dir: str = "logs") -> ForumLogIndex:
+    """获取指定日志目录下forum.log的进程内共享索引"""
+    log_path = (Path(log_dir) / "forum.log").resolve()
+    key = str(log_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = ForumLogIndex(log_path)
+            _indexes[key] = index
+        return index
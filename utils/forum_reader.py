@@ -3,11 +3,12 @@ Forum日志读取工具
 用于读取forum.log中的最新HOST发言
 """
 
-import re
-from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 from loguru import logger
 
+from utils.forum_index import get_forum_index
+
+
 def get_latest_host_speech(log_dir: str = "logs") -> Optional[str]:
     """
     获取forum.log中最新的HOST发言
@@ -19,25 +20,13 @@ def get_latest_host_speech(log_dir: str = "logs") -> Optional[str]:
         最新的HOST发言内容，如果没有则返回None
     """
     try:
-        forum_log_path = Path(log_dir) / "forum.log"
-        
-        if not forum_log_path.exists():
+        index = get_forum_index(log_dir)
+        if not index.refresh():
             logger.debug("forum.log文件不存在")
             return None
-            
-        with open(forum_log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
         
-        # 从后往前查找最新的HOST发言
-        host_speech = None
-        for line in reversed(lines):
-            # 匹配格式: [时间] [HOST] 内容
-            match = re.match(r'\[(\d{2}:\d{2}:\d{2})\]\s*\[HOST\]\s*(.+)', line)
-            if match:
-                _, content = match.groups()
-                # 处理转义的换行符，还原为实际换行
-                host_speech = content.replace('\\n', '\n').strip()
-                break
+        latest = index.latest('HOST')
+        host_speech = latest['content'] if latest else None
         
         if host_speech:
             logger.info(f"找到最新的HOST发言，长度: {len(host_speech)}字符")
@@ -62,27 +51,15 @@ def get_all_host_speeches(log_dir: str = "logs") -> List[Dict[str, str]]:
         包含所有HOST发言的列表，每个元素是包含timestamp和content的字典
     """
     try:
-        forum_log_path = Path(log_dir) / "forum.log"
-        
-        if not forum_log_path.exists():
+        index = get_forum_index(log_dir)
+        if not index.refresh():
             logger.debug("forum.log文件不存在")
             return []
-            
-        with open(forum_log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
         
-        host_speeches = []
-        for line in lines:
-            # 匹配格式: [时间] [HOST] 内容
-            match = re.match(r'\[(\d{2}:\d{2}:\d{2})\]\s*\[HOST\]\s*(.+)', line)
-            if match:
-                timestamp, content = match.groups()
-                # 处理转义的换行符
-                content = content.replace('\\n', '\n').strip()
-                host_speeches.append({
-                    'timestamp': timestamp,
-                    'content': content
-                })
+        host_speeches = [
+            {'timestamp': speech['timestamp'], 'content': speech['content']}
+            for speech in index.speeches('HOST')
+        ]
         
         logger.info(f"找到{len(host_speeches)}条HOST发言")
         return host_speeches
@@ -104,38 +81,37 @@ def get_recent_agent_speeches(log_dir: str = "logs", limit: int = 5) -> List[Dic
         包含最近Agent发言的列表
     """
     try:
-        forum_log_path = Path(log_dir) / "forum.log"
-        
-        if not forum_log_path.exists():
-            return []
-            
-        with open(forum_log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        agent_speeches = []
-        for line in reversed(lines):  # 从后往前读取
-            # 匹配格式: [时间] [AGENT_NAME] 内容
-            match = re.match(r'\[(\d{2}:\d{2}:\d{2})\]\s*\[(INSIGHT|MEDIA|QUERY)\]\s*(.+)', line)
-            if match:
-                timestamp, agent, content = match.groups()
-                # 处理转义的换行符
-                content = content.replace('\\n', '\n').strip()
-                agent_speeches.append({
-                    'timestamp': timestamp,
-                    'agent': agent,
-                    'content': content
-                })
-                if len(agent_speeches) >= limit:
-                    break
-        
-        agent_speeches.reverse()  # 恢复时间顺序
-        return agent_speeches
+        return [
+            {'timestamp': speech['timestamp'], 'agent': speech['source'], 'content': speech['content']}
+            for speech in get_forum_index(log_dir).recent_agent_speeches(limit)
+        ]
         
     except Exception as e:
         logger.error(f"读取forum.log失败: {str(e)}")
         return []
 
 
+def get_forum_history(log_dir: str = "logs", offset: int = 0, limit: int = 50,
+                      session: Optional[int] = None) -> Dict[str, Any]:
+    """
+    分页获取forum.log中的发言历史
+    
+    Args:
+        log_dir: 日志目录路径
+        offset: 起始条目位置
+        limit: 每页条数
+        session: 会话序号，-1表示最新会话，None表示全部会话
+        
+    Returns:
+        包含items（发言列表）和total（总条数）的字典
+    """
+    try:
+        return get_forum_index(log_dir).page(offset=offset, limit=limit, session=session)
+    except Exception as e:
+        logger.error(f"读取forum.log失败: {str(e)}")
+        return {'items': [], 'total': 0}
+
+
 def format_host_speech_for_prompt(host_speech: str) -> str:
     """
     格式化HOST发言，用于添加到prompt中
@@ -0,0 +1,206 @@
+"""
+子应用健康监督器
+在后台线程中按计划并发探测各Streamlit应用的健康检查接口，缓存带时间戳的状态，
+请求处理函数直接读取缓存；状态变化时通过回调（Socket.IO）推送给前端
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Tuple
+import requests
+from loguru import logger
+
+# 所有应用稳定运行时的探测间隔（秒）
+DEFAULT_INTERVAL = 5.0
+# 有应用处于启动中时的探测间隔（秒）
+DEFAULT_STARTING_INTERVAL = 1.0
+# 单次健康检查超时（秒）
+DEFAULT_PROBE_TIMEOUT = 2.0
+# 缓存超过若干个探测间隔未刷新时视为过期
+STALE_INTERVALS = 3
+
+
+class HealthSupervisor:
+    """并发、带缓存的应用健康监督器
+
+    processes为app.py中的进程表（应用名 -> {'process', 'port', 'status', ...}），
+    监督器负责更新其中带进程的应用的status字段；没有进程的条目（如forum）只读取其状态。
+    后台线程未启动或停止刷新时，snapshot发现缓存过期会同步探测一轮再返回。
+    """
+
+    def __init__(self, processes: Dict[str, Dict[str, Any]], build_url: Callable[[int], str],
+                 on_change: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+                 interval: float = DEFAULT_INTERVAL, starting_interval: float = DEFAULT_STARTING_INTERVAL,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT, proxies: Optional[Dict[str, Any]] = None,
+                 stale_after: Optional[float] = None):
+        """
+        初始化监督器
+
+        Args:
+            processes: 进程表
+            build_url: 根据端口生成健康检查URL
+            on_change: 任一应用状态变化时以最新快照调用
+            interval: 稳定状态下的探测间隔
+            starting_interval: 有应用启动中时的探测间隔
+            probe_timeout: 单次探测超时
+            proxies: 健康检查使用的代理设置
+            stale_after: 缓存过期时长，默认为STALE_INTERVALS个稳定探测间隔
+        """
+        self.processes = processes
+        self.build_url = build_url
+        self.on_change = on_change
+        self.interval = interval
+        self.starting_interval = starting_interval
+        self.probe_timeout = probe_timeout
+        self.stale_after = stale_after if stale_after is not None else interval * STALE_INTERVALS
+
+        self._session = requests.Session()
+        self._session.trust_env = False
+        if proxies:
+            self._session.proxies.update(proxies)
+        self._executor = ThreadPoolExecutor(max_workers=max(len(processes), 1), thread_name_prefix="health-probe")
+        self._condition = threading.Condition()
+        self._fallback_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._refresh_snapshot({})
+
+    def start(self) -> "HealthSupervisor":
+        """启动后台探测线程（可重复调用）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="health-supervisor", daemon=True)
+            self._thread.start()
+        return self
+
+    def wake(self):
+        """立即触发一轮探测（应用启动/停止后调用）"""
+        self._wake.set()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """返回缓存的状态快照；缓存过期时先同步探测一轮（同一时间只有一个请求执行探测）"""
+        if self._is_stale() and self._fallback_lock.acquire(blocking=False):
+            try:
+                self._probe_all()
+            finally:
+                self._fallback_lock.release()
+        with self._condition:
+            snapshot = {app_name: dict(entry) for app_name, entry in self._snapshot.items()}
+        # status以进程表为准，启动/停止操作在下一轮探测前即可反映
+        for app_name, entry in snapshot.items():
+            entry['status'] = self.processes[app_name]['status']
+        return snapshot
+
+    def wait_until_running(self, app_name: str, timeout: float) -> Tuple[bool, str]:
+        """
+        等待应用健康检查通过
+
+        Returns:
+            (是否成功, 说明信息)
+        """
+        # 启动结果依赖后台探测，监督器尚未启动时一并启动
+        self.start()
+        self.wake()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                info = self.processes[app_name]
+                if info['process'] is None:
+                    return False, "进程已停止"
+                if info['process'].poll() is not None:
+                    return False, "进程启动失败"
+                if self._snapshot.get(app_name, {}).get('status') == 'running':
+                    return True, "启动成功"
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, "启动超时"
+                self._condition.wait(remaining)
+
+    def check_now(self):
+        """同步执行一轮探测"""
+        self._probe_all()
+
+    def _is_stale(self) -> bool:
+        """带进程的应用中有从未探测或超过stale_after未刷新的，缓存即过期"""
+        now = time.time()
+        with self._condition:
+            for app_name, info in self.processes.items():
+                if info.get('process') is None:
+                    continue
+                checked_at = self._snapshot.get(app_name, {}).get('checked_at')
+                if checked_at is None or now - checked_at > self.stale_after:
+                    return True
+        return False
+
+    def _run(self):
+        while True:
+            try:
+                self._probe_all()
+            except Exception as e:
+                logger.exception(f"健康检查失败: {e}")
+            starting = any(info['status'] == 'starting' for info in self.processes.values())
+            self._wake.wait(self.starting_interval if starting else self.interval)
+            self._wake.clear()
+
+    def _probe(self, app_name: str, port: int) -> Dict[str, Any]:
+        started = time.monotonic()
+        try:
+            response = self._session.get(self.build_url(port), timeout=self.probe_timeout)
+            status = 'running' if response.status_code == 200 else 'starting'
+            error = '' if status == 'running' else f"HTTP {response.status_code}"
+        except Exception as exc:
+            status, error = 'starting', str(exc)
+        return {'status': status, 'latency_ms': round((time.monotonic() - started) * 1000, 1), 'error': error}
+
+    def _probe_all(self):
+        futures = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        for app_name, info in list(self.processes.items()):
+            process = info.get('process')
+            if process is None:
+                continue
+            if process.poll() is not None:
+                # 进程已结束
+                info['process'] = None
+                info['status'] = 'stopped'
+                continue
+            futures[app_name] = self._executor.submit(self._probe, app_name, info['port'])
+
+        for app_name, future in futures.items():
+            result = future.result()
+            results[app_name] = result
+            info = self.processes[app_name]
+            # 探测期间应用可能已被停止
+            if info.get('process') is not None:
+                if result['status'] != 'running' and info['status'] == 'running':
+                    logger.warning(f"{app_name} 健康检查失败: {result['error']}")
+                info['status'] = result['status']
+
+        self._refresh_snapshot(results)
+
+    def _refresh_snapshot(self, results: Dict[str, Dict[str, Any]]):
+        now = time.time()
+        changed = False
+        with self._condition:
+            for app_name, info in self.processes.items():
+                previous = self._snapshot.get(app_name, {})
+                entry = {
+                    'status': info['status'],
+                    'port': info['port'],
+                    'checked_at': now if app_name in results else previous.get('checked_at'),
+                    'latency_ms': results.get(app_name, {}).get('latency_ms', previous.get('latency_ms')),
+                    'changed_at': previous.get('changed_at', now)
+                }
+                if previous.get('status') != entry['status']:
+                    entry['changed_at'] = now
+                    changed = True
+                self._snapshot[app_name] = entry
+            self._condition.notify_all()
+            snapshot = {app_name: dict(entry) for app_name, entry in self._snapshot.items()}
+
+        if changed and self.on_change:
+            try:
+                self.on_change(snapshot)
+            except Exception as e:
+                logger.error(f"推送应用状态失败: {e}")
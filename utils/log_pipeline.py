@@ -0,0 +1,204 @@
+"""
+子进程日志管道
+读取Streamlit子进程的输出，按行数/时间批量写入日志文件（长期打开的缓冲写入器），
+并以行数组的形式批量推送到前端；前端推送跟不上时丢弃最旧的批次并报告丢弃行数
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from queue import Queue, Empty, Full
+from typing import Callable, List, Optional, BinaryIO, Tuple
+from loguru import logger
+
+# 单批最多包含的行数
+DEFAULT_BATCH_SIZE = 200
+# 批次最长等待时间（秒），决定日志在前端出现的延迟上限
+DEFAULT_FLUSH_INTERVAL = 0.1
+# 待写入行的上限，超出时读取线程阻塞，进而让子进程写管道时阻塞（反压）
+DEFAULT_MAX_BUFFERED_LINES = 20000
+# 待推送批次的上限，超出时丢弃最旧的批次（前端可通过日志文件补全）
+DEFAULT_MAX_PENDING_BATCHES = 50
+# 每次从管道读取的字节数
+READ_CHUNK_BYTES = 65536
+
+_STOP = object()
+
+
+def format_log_line(line: str) -> str:
+    """为日志行添加时间戳前缀"""
+    return f"[{datetime.now().strftime('%H:%M:%S')}] {line}"
+
+
+class ProcessLogPipeline:
+    """单个应用的日志管道
+
+    - 读取线程（pump）按块读取管道并切分成行，放入有界队列
+    - 写入线程取出行，按行数或时间组成批次，一次性写入长期打开的日志文件后交给推送线程
+    - 推送线程把每个批次作为一个Socket.IO事件发送（console_output_batch），
+      积压过多时丢弃最旧批次，并在下一次推送中携带dropped计数
+    """
+
+    def __init__(self, app_name: str, log_path: Path, emit: Callable[[str, dict], None],
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_buffered_lines: int = DEFAULT_MAX_BUFFERED_LINES,
+                 max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES):
+        """
+        初始化日志管道
+
+        Args:
+            app_name: 应用名称（推送事件中的app字段）
+            log_path: 日志文件路径
+            emit: 推送函数，签名为emit(event, data)
+            batch_size: 单批最大行数
+            flush_interval: 批次最长等待时间（秒）
+            max_buffered_lines: 待写入行的上限
+            max_pending_batches: 待推送批次的上限
+        """
+        self.app_name = app_name
+        self.log_path = Path(log_path)
+        self.emit = emit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending_batches = max_pending_batches
+
+        self._lines: Queue = Queue(maxsize=max_buffered_lines)
+        self._batches = deque()
+        self._batches_condition = threading.Condition()
+        self._dropped = 0
+        self._closed = False
+        self._writer_thread: Optional[threading.Thread] = None
+        self._emitter_thread: Optional[threading.Thread] = None
+
+        self.stats = {'lines': 0, 'batches': 0, 'emitted': 0, 'dropped': 0}
+
+    def start(self) -> "ProcessLogPipeline":
+        """启动写入与推送线程"""
+        self._writer_thread = threading.Thread(
+            target=self._write_loop, name=f"log-writer-{self.app_name}", daemon=True)
+        self._emitter_thread = threading.Thread(
+            target=self._emit_loop, name=f"log-emitter-{self.app_name}", daemon=True)
+        self._writer_thread.start()
+        self._emitter_thread.start()
+        return self
+
+    def feed(self, line: str):
+        """提交一行日志（队列满时阻塞，形成反压）"""
+        self._lines.put(line)
+        self.stats['lines'] += 1
+
+    def pump(self, stream: BinaryIO):
+        """
+        读取子进程输出直到EOF，然后关闭管道
+
+        Args:
+            stream: 子进程的二进制stdout（无缓冲）
+        """
+        pending = b""
+        try:
+            while True:
+                chunk = stream.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                pending += chunk
+                *complete, pending = pending.split(b'\n')
+                for raw in complete:
+                    self._feed_raw(raw)
+            if pending:
+                self._feed_raw(pending)
+        except Exception as e:
+            error_msg = f"Error reading output for {self.app_name}: {e}"
+            logger.exception(error_msg)
+            self.feed(format_log_line(error_msg))
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 5):
+        """写完剩余日志并停止线程"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._lines.put(_STOP, timeout=timeout)
+        except Full:
+            logger.warning(f"{self.app_name} 日志管道关闭超时，丢弃未写入的日志")
+            return
+        if self._writer_thread and self._writer_thread is not threading.current_thread():
+            self._writer_thread.join(timeout)
+
+    def _feed_raw(self, raw: bytes):
+        line = raw.decode('utf-8', errors='replace').strip()
+        if line:
+            self.feed(format_log_line(line))
+
+    def _next_batch(self) -> Tuple[List[str], bool]:
+        """按行数或时间凑出一个批次，返回(行列表, 是否已收到停止信号)"""
+        try:
+            first = self._lines.get(timeout=1)
+        except Empty:
+            return [], False
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._lines.get(timeout=remaining) if remaining > 0 else self._lines.get_nowait()
+            except Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write_loop(self):
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        stopping = False
+        with open(self.log_path, 'a', encoding='utf-8', buffering=1 << 16) as log_file:
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if not batch:
+                    continue
+                try:
+                    log_file.write('\n'.join(batch) + '\n')
+                    log_file.flush()
+                except Exception as e:
+                    logger.error(f"Error writing log for {self.app_name}: {e}")
+                self.stats['batches'] += 1
+                self._enqueue_batch(batch)
+
+        with self._batches_condition:
+            self._batches.append(_STOP)
+            self._batches_condition.notify()
+
+    def _enqueue_batch(self, batch: List[str]):
+        with self._batches_condition:
+            self._batches.append(batch)
+            while len(self._batches) > self.max_pending_batches:
+                dropped = self._batches.popleft()
+                self._dropped += len(dropped)
+                self.stats['dropped'] += len(dropped)
+            self._batches_condition.notify()
+
+    def _emit_loop(self):
+        while True:
+            with self._batches_condition:
+                while not self._batches:
+                    self._batches_condition.wait()
+                batch = self._batches.popleft()
+                dropped, self._dropped = self._dropped, 0
+            if batch is _STOP:
+                return
+            try:
+                self.emit('console_output_batch', {
+                    'app': self.app_name,
+                    'lines': batch,
+                    'dropped': dropped
+                })
+                self.stats['emitted'] += len(batch)
+            except Exception as e:
+                logger.error(f"推送{self.app_name}日志失败: {e}")
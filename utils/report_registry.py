@@ -0,0 +1,155 @@
+"""
+引擎报告注册表
+Insight/Media/Query三个引擎保存报告时在此登记（引擎、查询、会话ID、文件路径），
+ReportEngine据此判断输入是否就绪并等待新报告，无需反复扫描报告目录
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+from loguru import logger
+
+REGISTRY_DB = 'logs/report_registry.db'
+ENGINE_NAMES = ('insight', 'media', 'query')
+
+# 其他进程登记报告时无法直接唤醒本进程，等待时按此间隔重新查询
+CROSS_PROCESS_POLL_SECONDS = 0.5
+
+
+class ReportRegistry:
+    """基于SQLite的引擎报告注册表（线程安全，支持多进程并发写入）"""
+
+    def __init__(self, db_path: str = REGISTRY_DB):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS engine_reports (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    engine TEXT NOT NULL,
+                    query TEXT,
+                    session_id TEXT,
+                    output_dir TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_engine_reports_engine ON engine_reports (engine, output_dir, id)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_engine_reports_session ON engine_reports (session_id, engine, id)")
+
+    def register(self, engine: str, file_path: str, query: str = "", session_id: Optional[str] = None) -> int:
+        """
+        登记一份引擎报告
+
+        Args:
+            engine: 引擎名称（insight/media/query）
+            file_path: 报告文件路径
+            query: 报告对应的查询
+            session_id: 前端搜索会话ID（可选）
+
+        Returns:
+            登记记录ID
+        """
+        output_dir = os.path.normpath(os.path.dirname(file_path) or '.')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO engine_reports (engine, query, session_id, output_dir, file_path, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (engine, query, session_id, output_dir, file_path, time.time())
+            )
+            record_id = cursor.lastrowid
+        with self._condition:
+            self._condition.notify_all()
+        return record_id
+
+    def last_id(self) -> int:
+        """当前最大的登记记录ID（作为后续“新报告”的基准）"""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM engine_reports").fetchone()
+        return row[0] or 0
+
+    def latest(self, engine: str, after_id: int = 0, session_id: Optional[str] = None,
+               output_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        获取引擎在基准之后登记的最新报告
+
+        Args:
+            engine: 引擎名称
+            after_id: 只返回ID大于该值的记录
+            session_id: 指定时只匹配该会话的报告
+            output_dir: 指定时只匹配该目录下的报告
+
+        Returns:
+            登记记录字典，不存在时返回None
+        """
+        sql = "SELECT * FROM engine_reports WHERE engine = ? AND id > ?"
+        params = [engine, after_id]
+        if session_id:
+            sql += " AND session_id = ?"
+            params.append(session_id)
+        if output_dir:
+            sql += " AND output_dir = ?"
+            params.append(os.path.normpath(output_dir))
+        sql += " ORDER BY id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def latest_for_engines(self, engine_dirs: Dict[str, Optional[str]], after_id: int = 0,
+                           session_id: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """按引擎获取基准之后的最新报告（engine_dirs为引擎到报告目录的映射，目录可为None）"""
+        return {
+            engine: self.latest(engine, after_id, session_id, directory)
+            for engine, directory in engine_dirs.items()
+        }
+
+    def wait_for(self, engine_dirs: Dict[str, Optional[str]], after_id: int = 0,
+                 session_id: Optional[str] = None, timeout: float = 0) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        等待所有引擎都登记了新报告，或超时
+
+        同进程内的登记会立即唤醒等待者；其他进程（各引擎的Streamlit应用）的登记
+        在下一次短间隔重新查询时被发现。
+
+        Returns:
+            各引擎的最新报告（超时时未就绪的引擎为None）
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            records = self.latest_for_engines(engine_dirs, after_id, session_id)
+            remaining = deadline - time.monotonic()
+            if all(records.values()) or remaining <= 0:
+                return records
+            with self._condition:
+                self._condition.wait(min(remaining, CROSS_PROCESS_POLL_SECONDS))
+
+
+_registry: Optional[ReportRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_report_registry(db_path: str = REGISTRY_DB) -> ReportRegistry:
+    """获取进程内共享的报告注册表"""
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.db_path != db_path:
+            _registry = ReportRegistry(db_path)
+        return _registry
+
+
+def register_report(engine: str, file_path: str, query: str = "", session_id: Optional[str] = None):
+    """登记引擎报告，失败时只记录日志，不影响报告保存"""
+    try:
+        get_report_registry().register(engine, file_path, query, session_id)
+    except Exception as e:
+        logger.exception(f"登记{engine}报告失败: {e}")
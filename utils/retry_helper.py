@@ -9,12 +9,6 @@ from typing import Callable, Any, Tuple
 import requests
 from loguru import logger
 
-# 尝试导入 OpenAI 异常，以便精确捕获
-try:
-    from openai import APIConnectionError, APITimeoutError, RateLimitError, InternalServerError, APIError
-    OPENAI_EXCEPTIONS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError, APIError)
-except ImportError:
-    OPENAI_EXCEPTIONS = ()
 
 class RetryConfig:
     """重试配置类"""
@@ -52,8 +46,8 @@ class RetryConfig:
                 requests.exceptions.TooManyRedirects,
                 ConnectionError,
                 TimeoutError,
-                Exception  # 兜底捕获一般异常
-            ) + OPENAI_EXCEPTIONS
+                Exception  # 兜底捕获一般异常（包括OpenAI SDK的各类API异常，无需在导入时加载openai）
+            )
         else:
             self.retry_on_exceptions = retry_on_exceptions
 
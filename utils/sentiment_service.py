@@ -0,0 +1,187 @@
+"""
+共享情感分析推理服务
+由单个进程加载一次情感模型（SingleEngineApp/sentiment_server.py），通过本机HTTP接口为各Streamlit应用、
+Celery worker与引擎工作进程提供推理；并发调用方的文本在最长等待窗口内被合并成微批次一起前向计算
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, is_dataclass
+from queue import Queue, Empty
+from typing import Callable, List, Any, Dict, Optional, Tuple
+
+import requests
+from loguru import logger
+
+# 单个微批次的最大文本数
+DEFAULT_MAX_BATCH_SIZE = 32
+# 首条文本到达后等待凑批的最长时间（秒）
+DEFAULT_MAX_WAIT = 0.01
+# 单次请求允许提交的最大文本数
+MAX_TEXTS_PER_REQUEST = 2000
+
+
+class MicroBatcher:
+    """跨调用方的动态微批处理器
+
+    调用方提交的文本进入同一队列，后台线程取到第一条后在max_wait内继续收集，
+    凑满max_batch_size或等待超时即调用一次predict_batch，再把结果分发回各调用方。
+    predict_batch只在后台线程中调用，因此模型无需额外加锁。
+    """
+
+    def __init__(self, predict_batch: Callable[[List[str]], List[Any]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait: float = DEFAULT_MAX_WAIT):
+        """
+        初始化微批处理器
+
+        Args:
+            predict_batch: 批量推理函数，返回与输入等长的结果列表
+            max_batch_size: 单批最大文本数
+            max_wait: 凑批最长等待时间（秒）
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._queue: Queue = Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.stats = {'texts': 0, 'batches': 0, 'max_batch': 0}
+
+    def start(self) -> "MicroBatcher":
+        """启动后台推理线程（可重复调用）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, texts: List[str]) -> List[Future]:
+        """提交文本，返回与之对应的Future列表"""
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def predict(self, texts: List[str], timeout: Optional[float] = None) -> List[Any]:
+        """提交文本并等待全部结果"""
+        return [future.result(timeout) for future in self.submit(texts)]
+
+    def _next_batch(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for text, _ in batch]
+            try:
+                results = self.predict_batch(texts)
+                if len(results) != len(texts):
+                    raise RuntimeError(f"推理结果数量不匹配: {len(results)} != {len(texts)}")
+            except Exception as e:
+                logger.exception(f"情感推理批次失败: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._stats_lock:
+                self.stats['texts'] += len(texts)
+                self.stats['batches'] += 1
+                self.stats['max_batch'] = max(self.stats['max_batch'], len(texts))
+
+
+def _serialize(result: Any) -> Dict[str, Any]:
+    return asdict(result) if is_dataclass(result) else dict(result)
+
+
+def create_sentiment_app(analyzer, batcher: MicroBatcher):
+    """
+    创建推理服务的HTTP接口
+
+    Args:
+        analyzer: 已加载模型的情感分析器（提供get_model_info）
+        batcher: 包装analyzer批量推理的微批处理器
+    """
+    # 客户端一侧只需要SentimentServiceClient，Flask在创建服务时才导入
+    from flask import Flask, request, jsonify
+
+    app = Flask(__name__)
+
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        return jsonify({'success': True, 'model': analyzer.get_model_info(), 'stats': dict(batcher.stats)})
+
+    @app.route('/api/analyze', methods=['POST'])
+    def analyze():
+        """分析一组文本，返回与输入顺序一致的结果"""
+        data = request.get_json() or {}
+        texts = data.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({'success': False, 'error': 'texts必须是字符串列表'}), 400
+        if len(texts) > MAX_TEXTS_PER_REQUEST:
+            return jsonify({'success': False, 'error': f'单次最多提交{MAX_TEXTS_PER_REQUEST}条文本'}), 400
+        try:
+            results = batcher.predict(texts)
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+        return jsonify({'success': True, 'results': [_serialize(result) for result in results]})
+
+    return app
+
+
+class SentimentServiceClient:
+    """推理服务客户端"""
+
+    def __init__(self, base_url: str, timeout: float = 120):
+        """
+        初始化客户端
+
+        Args:
+            base_url: 服务地址，例如 http://127.0.0.1:8700
+            timeout: 单次请求超时（秒）
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+        # 本机服务不走系统代理
+        self._session.trust_env = False
+
+    def health(self, timeout: float = 2) -> bool:
+        """服务是否可用"""
+        try:
+            response = self._session.get(f"{self.base_url}/api/health", timeout=timeout)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def analyze(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        分析一组文本
+
+        Returns:
+            与输入顺序一致的结果字典列表（字段同SentimentResult）
+
+        Raises:
+            RuntimeError: 服务返回错误
+            requests.RequestException: 网络错误
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(texts), MAX_TEXTS_PER_REQUEST):
+            chunk = texts[start:start + MAX_TEXTS_PER_REQUEST]
+            response = self._session.post(f"{self.base_url}/api/analyze", json={'texts': chunk}, timeout=self.timeout)
+            payload = response.json()
+            if response.status_code != 200 or not payload.get('success'):
+                raise RuntimeError(payload.get('error') or f"HTTP {response.status_code}")
+            results.extend(payload['results'])
+        return results